@@ -1,17 +1,46 @@
 import json
 import os
 import customtkinter as ctk
+import tkinter as tk
 import threading
 import time
 
+try:
+    from gk_install_builder.utils.file_operations import write_file_atomically
+except ImportError:
+    from utils.file_operations import write_file_atomically
+
+# Seconds of inactivity before pending changes are written
+SAVE_DELAY = 1.0
+# Seconds the "Saved" status stays visible
+SAVED_STATUS_DURATION = 3.0
+
+
 class ConfigManager:
     def __init__(self):
         self.config = {}
         self.entries = {}
         self.save_status_label = None
-        self.save_timer = None
         self.save_in_progress = False
         self.config_file = "gk_install_config.json"
+
+        # Write-behind saver state: one background thread, woken by
+        # schedule_save(), writes once per burst of changes. The config is
+        # only serialized on the Tk thread; the saver writes that snapshot.
+        self._save_condition = threading.Condition()
+        self._save_thread = None
+        self._save_due = None
+        self._dirty_keys = set()
+        self._dirty_unknown = False
+        self._pending_snapshot = None
+        # Snapshots are numbered so an older one never overwrites a newer one
+        self._write_lock = threading.Lock()
+        self._snapshot_seq = 0
+        self._written_seq = 0
+        # Content of the file as last loaded/written, to skip no-op writes
+        self._saved_text = None
+        self._saved_values = {}
+
         self.load_config()
 
     def register_entry(self, key, entry, fixed_value=None):
@@ -26,11 +55,11 @@ class ConfigManager:
         
         # Add trace to entry for auto-save
         if hasattr(entry, "bind"):
-            entry.bind("<KeyRelease>", lambda event: self.schedule_save())
+            entry.bind("<KeyRelease>", lambda event: self._on_entry_change(key))
             
             # For dropdown/combobox, bind to the <<ComboboxSelected>> event
             if str(entry).find("combobox") != -1:
-                entry.bind("<<ComboboxSelected>>", lambda event: self.schedule_save())
+                entry.bind("<<ComboboxSelected>>", lambda event: self._on_entry_change(key))
 
     def get_entry(self, key):
         """Get an entry widget by its key"""
@@ -52,28 +81,26 @@ class ConfigManager:
 
     def _on_entry_change(self, key):
         """Handle entry value change"""
-        # Update config with the new value
-        entry = self.entries[key]
-        if hasattr(entry, 'get'):
-            self.config[key] = entry.get()
-        
         # Schedule a save after a short delay (debounce)
-        self._schedule_save()
+        self.schedule_save(key)
         
+    def _read_entry(self, key):
+        """Copy one registered entry's value into the config (Tk thread)"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return
+        if hasattr(entry, "_fixed_value"):
+            self.config[key] = entry._fixed_value
+        elif hasattr(entry, 'get'):
+            try:
+                self.config[key] = entry.get()
+            except Exception:
+                # Widget is gone; keep the existing config value
+                pass
+
     def _schedule_save(self):
         """Schedule a save after a short delay to avoid saving too frequently"""
-        # Cancel any existing timer
-        if self.save_timer:
-            self.save_timer.cancel()
-        
-        # Create a new timer
-        self.save_timer = threading.Timer(1.0, self.save_config)
-        self.save_timer.daemon = True
-        self.save_timer.start()
-        
-        # Show "Saving..." status
-        if self.save_status_label:
-            self.save_status_label.configure(text="Saving...", text_color="#FFA500")  # Orange color
+        self.schedule_save()
 
     def update_config_from_entries(self):
         """Update config from registered entries"""
@@ -86,6 +113,7 @@ class ConfigManager:
             try:
                 with open(self.config_file, "r") as f:
                     self.config = json.load(f)
+                self._remember_saved(json.dumps(self.config, indent=4))
                 print(f"Configuration loaded from {self.config_file}")
             except Exception as e:
                 print(f"Error loading configuration: {e}")
@@ -161,6 +189,15 @@ class ConfigManager:
             "mqtt_broker_system_type": "",  # Will be dynamically set based on URL
             "firebird_server_path": default_firebird_path,
             "firebird_driver_path_local": default_jaybird_path,
+            "download_mirrors": "",  # Comma-separated mirror base URLs tried before DSG
+            "download_mirror_timeout": 5,  # Seconds before GKInstall gives up on a mirror
+            "store_seed_address": "",  # Host[:port] of the workstation serving offline artifacts to its peers
+            "store_seed_port": 8765,
+            "store_seed_timeout": 5,  # Seconds before GKInstall gives up on the seed
+            "store_seed_serve_minutes": 60,  # How long the seed serves after its installation
+            "store_cache_ttl_minutes": 120,  # Minutes installations of a store reuse its cached structure data (0 = off)
+            "verify_launcher_downloads": False,  # Record Launcher size/SHA-256 at build time for GKInstall to verify
+            "verify_launcher_components": {"POS": True},  # Components whose Launchers are fetched for verification
             
             # Security Configuration
             "ssl_password": "changeit",
@@ -186,84 +223,214 @@ class ConfigManager:
 
     def save_config(self):
         """Save configuration to file"""
+        # Anything queued for the background saver is covered by this write
+        self._take_pending_changes()
         try:
-            # Update save status
-            if self.save_status_label:
-                self.save_status_label.configure(text="Saving...", text_color="orange")
-            
             # Set save in progress flag
             self.save_in_progress = True
+            self._set_save_status("Saving...", "orange")
             
             # Update config from entries using the safer method
             self.safe_update_config_from_entries()
             
-            # Save to file
-            with open(self.config_file, "w") as f:
-                json.dump(self.config, f, indent=4)
-            
-            # Update save status
-            if self.save_status_label:
-                self.save_status_label.configure(text="Saved", text_color="green")
-                
-                # Clear status after 3 seconds
-                if self.save_timer:
-                    self.save_timer.cancel()
-                self.save_timer = threading.Timer(3, self.clear_save_status)
-                self.save_timer.daemon = True
-                self.save_timer.start()
-            
-            # Reset save in progress flag
-            self.save_in_progress = False
-            
+            written = self._write_config()
+            self._show_save_result(written)
             return True
         except Exception as e:
             print(f"Error saving configuration: {e}")
-            
-            # Update save status
-            if self.save_status_label:
-                self.save_status_label.configure(
-                    text=f"Save failed: {str(e)}", 
-                    text_color="red"
-                )
-            
+            self._set_save_status(f"Save failed: {str(e)}", "red")
+            return False
+        finally:
             # Reset save in progress flag
             self.save_in_progress = False
-            
-            return False
 
     def save_config_silent(self):
         """Save configuration without updating UI"""
+        self._take_pending_changes()
         try:
             # Update config from entries using the safer method
             self.safe_update_config_from_entries()
-            
-            # Save to file
-            with open(self.config_file, "w") as f:
-                json.dump(self.config, f, indent=4)
-            
+            self._write_config()
             return True
         except Exception as e:
             print(f"Error saving configuration: {e}")
             return False
 
-    def schedule_save(self):
-        """Schedule a save operation after a short delay"""
-        # Cancel existing timer if any
-        if self.save_timer:
-            self.save_timer.cancel()
-        
-        # Don't schedule if save is already in progress
-        if self.save_in_progress:
-            return
-        
-        # Schedule save after 1 second of inactivity
-        self.save_timer = threading.Timer(1, self.save_config)
-        self.save_timer.daemon = True
-        self.save_timer.start()
+    def schedule_save(self, key=None):
+        """
+        Mark configuration as changed and save it after a short delay
+
+        Called from the Tk thread. Changes arriving within SAVE_DELAY of each
+        other are written once by the background saver thread.
+
+        Args:
+            key: Config key that changed.
+                 None if the changed keys are unknown.
+                 A registered entry for the key is read first.
+        """
+        if key is not None:
+            self._read_entry(key)
+        snapshot = self._snapshot()
+        with self._save_condition:
+            if key is None:
+                self._dirty_unknown = True
+            else:
+                self._dirty_keys.add(key)
+            self._pending_snapshot = snapshot
+            self._save_due = time.monotonic() + SAVE_DELAY
+            if self._save_thread is None or not self._save_thread.is_alive():
+                self._save_thread = threading.Thread(
+                    target=self._save_loop, name="ConfigSaver", daemon=True
+                )
+                self._save_thread.start()
+            self._save_condition.notify()
         
         # Update save status
-        if self.save_status_label:
-            self.save_status_label.configure(text="Changes pending...", text_color="orange")
+        self._set_save_status("Changes pending...", "orange")
+
+    def flush_pending_save(self):
+        """Write pending scheduled changes now (e.g. before closing)"""
+        dirty_keys, dirty_unknown, _snapshot = self._take_pending_changes()
+        if dirty_keys or dirty_unknown:
+            # Serialize again: the config may have changed since the last schedule_save()
+            return self._save_pending(dirty_keys, dirty_unknown, self._snapshot())
+        return True
+
+    def _take_pending_changes(self):
+        """Take and reset the pending dirty state and snapshot"""
+        with self._save_condition:
+            dirty_keys, dirty_unknown = self._dirty_keys, self._dirty_unknown
+            snapshot = self._pending_snapshot
+            self._dirty_keys = set()
+            self._dirty_unknown = False
+            self._pending_snapshot = None
+            self._save_due = None
+            return dirty_keys, dirty_unknown, snapshot
+
+    def _save_loop(self):
+        """Background saver: wait for a quiet period, then write once"""
+        while True:
+            with self._save_condition:
+                while self._save_due is None:
+                    self._save_condition.wait()
+                # Every new change pushes the deadline back
+                while self._save_due is not None:
+                    remaining = self._save_due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._save_condition.wait(remaining)
+            dirty_keys, dirty_unknown, snapshot = self._take_pending_changes()
+            if snapshot is not None:
+                self._save_pending(dirty_keys, dirty_unknown, snapshot)
+
+    def _save_pending(self, dirty_keys, dirty_unknown, snapshot):
+        """Write a scheduled snapshot, skipping the write if no value changed"""
+        values = snapshot[2]
+        if not dirty_unknown and all(
+            key in self._saved_values and values.get(key) == self._saved_values[key]
+            for key in dirty_keys
+        ):
+            self._set_save_status("", None)
+            return True
+        try:
+            self.save_in_progress = True
+            self._set_save_status("Saving...", "orange")
+            written = self._write_snapshot(snapshot)
+            self._show_save_result(written)
+            return True
+        except Exception as e:
+            print(f"Error saving configuration: {e}")
+            self._set_save_status(f"Save failed: {str(e)}", "red")
+            # Keep the changes pending so the next save retries them
+            with self._save_condition:
+                self._dirty_keys.update(dirty_keys)
+                self._dirty_unknown = self._dirty_unknown or dirty_unknown
+                if self._pending_snapshot is None:
+                    self._pending_snapshot = snapshot
+            return False
+        finally:
+            self.save_in_progress = False
+
+    def _snapshot(self):
+        """
+        Serialize the config (Tk thread, where the config is changed)
+
+        Returns:
+            tuple: (sequence number, JSON text, independent copy of the values)
+        """
+        text = json.dumps(self.config, indent=4)
+        with self._save_condition:
+            self._snapshot_seq += 1
+            return self._snapshot_seq, text, json.loads(text)
+
+    def _write_snapshot(self, snapshot):
+        """
+        Write a snapshot atomically unless a newer one was already written
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged or outdated
+        """
+        seq, text, _values = snapshot
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return False
+            written = text != self._saved_text
+            if written:
+                write_file_atomically(self.config_file, text)
+                self._remember_saved(text)
+            self._written_seq = seq
+            return written
+
+    def _write_config(self):
+        """
+        Serialize the config and write it atomically (Tk thread)
+
+        Returns:
+            bool: True if the file was written, False if it was unchanged
+        """
+        return self._write_snapshot(self._snapshot())
+
+    def _remember_saved(self, text):
+        """Record the file content (and an independent copy of its values)"""
+        self._saved_text = text
+        try:
+            self._saved_values = json.loads(text)
+        except ValueError:
+            self._saved_values = {}
+
+    def _show_save_result(self, written):
+        """Show "Saved" for a few seconds, or clear the status if nothing changed"""
+        if not written:
+            self._set_save_status("", None)
+            return
+        self._set_save_status("Saved", "green")
+        label = self.save_status_label
+        if label is not None and hasattr(label, "after"):
+            self._run_on_ui_thread(
+                lambda: label.after(int(SAVED_STATUS_DURATION * 1000), self.clear_save_status)
+            )
+
+    def _set_save_status(self, text, color):
+        """Update the save status label from any thread"""
+        label = self.save_status_label
+        if label is None:
+            return
+        if color:
+            self._run_on_ui_thread(lambda: label.configure(text=text, text_color=color))
+        else:
+            self._run_on_ui_thread(lambda: label.configure(text=text))
+
+    def _run_on_ui_thread(self, func):
+        """Run func now on the Tk (main) thread, or queue it there via after()"""
+        label = self.save_status_label
+        try:
+            if threading.current_thread() is threading.main_thread() or not hasattr(label, "after"):
+                func()
+            else:
+                label.after(0, func)
+        except (tk.TclError, RuntimeError):
+            # The window is already gone (shutdown)
+            pass
 
     def clear_save_status(self):
         """Clear the save status label"""
@@ -354,6 +521,24 @@ class ConfigManager:
             return True
         return False
     
+    def update_environment_fields(self, updates):
+        """Update fields of several environments and save once
+
+        Args:
+            updates: dict index -> dict of fields to set
+        """
+        environments = self.config.get("environments", [])
+        changed = False
+        for index, fields in updates.items():
+            if 0 <= index < len(environments):
+                for key, value in fields.items():
+                    if environments[index].get(key) != value:
+                        environments[index][key] = value
+                        changed = True
+        if changed:
+            self.save_config_silent()
+        return changed
+
     def delete_environment(self, index):
         """Delete an environment by index"""
         if "environments" not in self.config:
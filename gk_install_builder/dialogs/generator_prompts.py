@@ -0,0 +1,516 @@
+"""
+Tk prompt policy for the project generator
+
+Implements the prompts interface of generators.prompts.ConsolePrompts with
+customtkinter dialogs: file and version selection, re-download confirmation,
+messages, the generation summary and the download progress window. The
+generator core only imports this module when it is given a parent window.
+"""
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import messagebox
+import sys
+
+try:
+    from gk_install_builder.generators.prompts import ConsolePrompts
+    from gk_install_builder.dialogs.download_dialogs import ask_download_again, ask_download_dependencies_only
+    from gk_install_builder.dialogs.generation_summary import GenerationSummaryDialog
+except ImportError:
+    from generators.prompts import ConsolePrompts
+    from dialogs.download_dialogs import ask_download_again, ask_download_dependencies_only
+    from dialogs.generation_summary import GenerationSummaryDialog
+
+
+def create_progress_dialog(parent, total_files):
+    """
+    Create a progress dialog for tracking file downloads
+
+    Args:
+        parent: Parent window
+        total_files: Total number of files to download
+
+    Returns:
+        Tuple of (dialog, progress_bar, files_label, files_frame, file_progress_widgets, log_label)
+    """
+    progress_dialog = ctk.CTkToplevel(parent)
+    progress_dialog.title("Downloading Files")
+    progress_dialog.geometry("700x600")  # Increased size to accommodate multiple progress bars
+    progress_dialog.transient(parent)
+
+    # Force initial update
+    progress_dialog.update_idletasks()
+
+    # Linux-specific handling
+    if sys.platform.startswith('linux'):
+        progress_dialog.attributes("-topmost", True)
+        progress_dialog.update()
+
+    # Center the dialog on the parent window
+    x = parent.winfo_x() + (parent.winfo_width() // 2) - (700 // 2)
+    y = parent.winfo_y() + (parent.winfo_height() // 2) - (600 // 2)
+    progress_dialog.geometry(f"+{x}+{y}")
+
+    # Ensure focus and grab
+    progress_dialog.focus_force()
+    progress_dialog.grab_set()
+
+    # Title
+    ctk.CTkLabel(
+        progress_dialog,
+        text="Downloading Files",
+        font=("Helvetica", 16, "bold")
+    ).pack(pady=(20, 10), padx=20)
+
+    # Progress frame
+    progress_frame = ctk.CTkFrame(progress_dialog)
+    progress_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+    # Overall progress bar
+    ctk.CTkLabel(
+        progress_frame,
+        text="Overall Progress:",
+        font=("Helvetica", 12)
+    ).pack(pady=(10, 5), padx=10)
+
+    progress_bar = ctk.CTkProgressBar(progress_frame, width=650)
+    progress_bar.pack(pady=(0, 10), padx=10)
+    progress_bar.set(0)
+
+    # Files progress label
+    files_label = ctk.CTkLabel(
+        progress_frame,
+        text=f"0/{total_files} files completed",
+        font=("Helvetica", 12)
+    )
+    files_label.pack(pady=(0, 10), padx=10)
+
+    # Create a scrollable frame for individual file progress bars
+    ctk.CTkLabel(
+        progress_frame,
+        text="Individual File Progress:",
+        font=("Helvetica", 12, "bold")
+    ).pack(pady=(10, 5), padx=10, anchor="w")
+
+    files_frame = ctk.CTkScrollableFrame(progress_frame, width=650, height=350)
+    files_frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+    # One more update to ensure everything is displayed
+    progress_dialog.update_idletasks()
+
+    # Dictionary to store progress bars and labels for each file
+    file_progress_widgets = {}
+
+    # We're removing the download log section
+    # Return None for log_label since we're not using it anymore
+    return progress_dialog, progress_bar, files_label, files_frame, file_progress_widgets, None
+
+
+class TkDownloadProgress:
+    """
+    Download progress window.
+
+    Polling runs on the Tk thread via after(); closing the window asks for
+    confirmation and cancels the downloads.
+    """
+
+    poll_interval_ms = 100
+
+    def __init__(self, parent, total_files):
+        self.parent = parent
+        self.total_files = total_files
+        self.cancelled = False
+        self.closed = False
+        (self.dialog, self.progress_bar, self.files_label, self.files_frame,
+         self.file_progress_widgets, _) = create_progress_dialog(parent, total_files)
+        self.dialog.protocol("WM_DELETE_WINDOW", self._on_dialog_close)
+
+    def start(self, poll):
+        """Call poll() on the Tk thread until it returns True or downloads are cancelled."""
+        def tick():
+            if self.cancelled:
+                return
+            if not poll():
+                self.parent.after(self.poll_interval_ms, tick)
+        self.parent.after(self.poll_interval_ms, tick)
+
+    def file_progress(self, file_name, component_type, downloaded, total):
+        if self.closed:
+            return
+        # Create progress bar for this file if it doesn't exist yet
+        if file_name not in self.file_progress_widgets:
+            file_frame = ctk.CTkFrame(self.files_frame)
+            file_frame.pack(fill="x", padx=10, pady=(0, 5))
+
+            file_label = ctk.CTkLabel(file_frame, text=f"{file_name} ({component_type})", anchor="w")
+            file_label.pack(side="top", fill="x")
+
+            file_progress_bar = ctk.CTkProgressBar(file_frame, width=400)
+            file_progress_bar.pack(side="top", fill="x", pady=(0, 5))
+            file_progress_bar.set(0)
+
+            self.file_progress_widgets[file_name] = (file_frame, file_label, file_progress_bar)
+
+        _, _, file_progress_bar = self.file_progress_widgets[file_name]
+        if total > 0:
+            file_progress_bar.set(downloaded / total)
+
+    def overall_progress(self, completed_files, downloaded_bytes, total_bytes):
+        if self.closed or total_bytes <= 0:
+            return
+        overall_percentage = downloaded_bytes / total_bytes * 100
+        self.progress_bar.set(downloaded_bytes / total_bytes)
+        self.files_label.configure(text=f"{completed_files}/{self.total_files} files completed ({overall_percentage:.1f}%)")
+        self.dialog.update_idletasks()
+
+    def file_complete(self, file_name, component_type, completed_files):
+        if self.closed:
+            return
+        if file_name in self.file_progress_widgets:
+            _, file_label, file_progress_bar = self.file_progress_widgets[file_name]
+            file_progress_bar.set(1.0)
+            file_label.configure(text=f"{file_name} ({component_type}) - Complete")
+        self.files_label.configure(text=f"{completed_files}/{self.total_files} files completed")
+        self.progress_bar.set(completed_files / self.total_files)
+        self.dialog.update_idletasks()
+
+    def file_error(self, file_name, component_type, error_message, completed_files):
+        if self.closed:
+            return
+        if file_name in self.file_progress_widgets:
+            _, file_label, _ = self.file_progress_widgets[file_name]
+            file_label.configure(text=f"{file_name} ({component_type}) - Error: {error_message}")
+        self.dialog.update_idletasks()
+
+    def finish(self, download_errors, prompts):
+        """Close the window and report the result (called from a worker thread)."""
+        def close_and_report():
+            if self.closed:
+                return
+            self.closed = True
+            try:
+                self.dialog.destroy()
+            except tk.TclError:
+                pass
+            if download_errors:
+                prompts.show_error("Some files failed to download:\n" + "\n".join(download_errors))
+            else:
+                prompts.show_success("All files downloaded successfully")
+        try:
+            self.parent.after_idle(close_and_report)
+        except (tk.TclError, RuntimeError):
+            pass  # Main window already closed
+
+    def _on_dialog_close(self):
+        """Ask before interrupting the downloads"""
+        try:
+            if not messagebox.askyesno("Interrupt Download", "The download will be interrupted if you close this window. Do you want to continue?"):
+                return
+        except Exception as e:
+            print(f"Error showing confirmation dialog: {e}")
+        self.cancelled = True
+        self.closed = True
+        try:
+            self.dialog.destroy()
+        except Exception:
+            pass
+        try:
+            messagebox.showinfo("Downloads Cancelled", "Download process has been cancelled.")
+        except Exception:
+            pass
+
+
+def select_files_dialog(title, description, launcher_files, other_files, default_names,
+                        config=None, parent=None):
+    """
+    Let the user pick installers with checkboxes (launcher files are always included)
+
+    Args:
+        title: Dialog title
+        description: Dialog description
+        launcher_files: Files downloaded regardless of the selection
+        other_files: Files shown as checkboxes
+        default_names: Names of the pre-selected files
+        config: Configuration dictionary
+        parent: Parent window (a temporary root is created if None)
+
+    Returns:
+        List of selected file dictionaries
+    """
+    if config is None:
+        config = {}
+
+    # Create a dialog to select files
+    if parent:
+        dialog = ctk.CTkToplevel(parent)
+        dialog.transient(parent)  # Make it transient to the parent
+    else:
+        # Create a temporary root window if no parent is available
+        temp_root = tk.Tk()
+        temp_root.withdraw()  # Hide the temporary root
+        dialog = ctk.CTkToplevel(temp_root)
+
+    dialog.title(title)
+    dialog.geometry("600x500")  # Increased size for better visibility
+
+    # Force initial update for Linux
+    dialog.update_idletasks()
+
+    # Linux-specific handling
+    if sys.platform.startswith('linux'):
+        dialog.attributes("-topmost", True)
+        dialog.update()
+
+    # Focus and grab management
+    dialog.focus_force()
+    dialog.grab_set()
+
+    # Center the dialog on the parent window if available
+    if parent:
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - (600 // 2)
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - (500 // 2)
+        dialog.geometry(f"+{x}+{y}")
+
+    # Title and description
+    ctk.CTkLabel(
+        dialog,
+        text=title,
+        font=("Helvetica", 16, "bold")
+    ).pack(pady=(20, 5), padx=20)
+
+    ctk.CTkLabel(
+        dialog,
+        text=description,
+        font=("Helvetica", 12)
+    ).pack(pady=(0, 20), padx=20)
+
+    # If Launcher.exe exists, show a message that it will be downloaded automatically
+    if launcher_files:
+        # Get platform from config (default to Windows if not specified)
+        platform = config.get("platform", "Windows")
+
+        # Use appropriate launcher filename based on platform
+        launcher_filename = 'Launcher.run' if platform == 'Linux' else 'Launcher.exe'
+
+        launcher_label = ctk.CTkLabel(
+            dialog,
+            text=f"Note: {launcher_filename} will be downloaded automatically",
+            font=("Helvetica", 12, "italic"),
+            text_color="gray"
+        )
+        launcher_label.pack(pady=(0, 10), padx=20)
+
+    # Create a scrollable frame for the checkboxes
+    scroll_frame = ctk.CTkScrollableFrame(dialog, width=450, height=200)
+    scroll_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+    # Update to ensure scroll_frame is properly rendered
+    dialog.update_idletasks()
+
+    # Create variables to track selections
+    selected_vars = {}
+
+    for file in other_files:
+        var = ctk.BooleanVar(value=file['name'] in default_names)
+        selected_vars[file['name']] = var
+        checkbox = ctk.CTkCheckBox(
+            scroll_frame,
+            text=file['name'],
+            variable=var,
+            checkbox_width=20,
+            checkbox_height=20
+        )
+        checkbox.pack(anchor="w", pady=5, padx=10)
+
+    # Add select all / deselect all buttons
+    buttons_frame = ctk.CTkFrame(dialog)
+    buttons_frame.pack(fill="x", pady=(0, 10), padx=20)
+
+    def select_all():
+        for var in selected_vars.values():
+            var.set(True)
+
+    def deselect_all():
+        for var in selected_vars.values():
+            var.set(False)
+
+    ctk.CTkButton(
+        buttons_frame,
+        text="Select All",
+        command=select_all,
+        width=100,
+        height=25,
+        fg_color="#555555",
+        hover_color="#333333"
+    ).pack(side="left", padx=5)
+
+    ctk.CTkButton(
+        buttons_frame,
+        text="Deselect All",
+        command=deselect_all,
+        width=100,
+        height=25,
+        fg_color="#555555",
+        hover_color="#333333"
+    ).pack(side="left", padx=5)
+
+    # Result variable
+    result = []
+
+    # OK button handler
+    def on_ok():
+        nonlocal result
+        # Always include Launcher.exe files
+        result = launcher_files.copy()
+        # Add selected non-Launcher files
+        result.extend([file for file in other_files if selected_vars[file['name']].get()])
+        dialog.destroy()
+        if not parent:
+            temp_root.destroy()  # Clean up the temporary root if we created one
+
+    # Cancel button handler
+    def on_cancel():
+        nonlocal result
+        # Always include Launcher.exe files even on cancel
+        result = launcher_files.copy()
+        dialog.destroy()
+        if not parent:
+            temp_root.destroy()  # Clean up the temporary root if we created one
+
+    # Buttons
+    button_frame = ctk.CTkFrame(dialog)
+    button_frame.pack(fill="x", pady=20, padx=20)
+
+    ctk.CTkButton(
+        button_frame,
+        text="Cancel",
+        command=on_cancel,
+        width=100,
+        fg_color="#555555",
+        hover_color="#333333"
+    ).pack(side="left", padx=10)
+
+    ctk.CTkButton(
+        button_frame,
+        text="Download Selected",
+        command=on_ok,
+        width=150
+    ).pack(side="right", padx=10)
+
+    # Wait for the dialog to close
+    if parent:
+        parent.wait_window(dialog)
+    else:
+        # If we don't have a parent window, use a different approach
+        dialog.wait_window()
+
+    return result
+
+
+def select_version_dialog(version_names, title, description, parent=None):
+    """
+    Prompt user to select a version directory
+
+    Args:
+        version_names: Directory names, newest first (the first is pre-selected)
+
+    Returns:
+        Selected version name (string) or None if cancelled
+    """
+    selected_version = [None]  # Use list to allow modification in nested function
+
+    # Create dialog
+    if parent:
+        dialog = ctk.CTkToplevel(parent)
+        dialog.transient(parent)
+    else:
+        temp_root = tk.Tk()
+        temp_root.withdraw()
+        dialog = ctk.CTkToplevel(temp_root)
+
+    dialog.title(title)
+    dialog.geometry("400x400")
+    dialog.grab_set()
+
+    # Center dialog
+    if parent:
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - 200
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - 200
+        dialog.geometry(f"+{x}+{y}")
+
+    # Title
+    ctk.CTkLabel(dialog, text=title, font=("Helvetica", 16, "bold")).pack(pady=(20, 5))
+    ctk.CTkLabel(dialog, text=description, font=("Helvetica", 12)).pack(pady=(0, 10))
+
+    # Version list
+    list_frame = ctk.CTkScrollableFrame(dialog, width=350, height=250)
+    list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+
+    version_var = tk.StringVar()
+
+    for ver_name in version_names:
+        rb = ctk.CTkRadioButton(list_frame, text=ver_name, variable=version_var, value=ver_name)
+        rb.pack(anchor="w", pady=2)
+
+    # Select first version by default
+    if version_names:
+        version_var.set(version_names[0])
+
+    def on_ok():
+        selected_version[0] = version_var.get()
+        dialog.destroy()
+
+    def on_cancel():
+        dialog.destroy()
+
+    # Buttons
+    btn_frame = ctk.CTkFrame(dialog)
+    btn_frame.pack(fill="x", padx=20, pady=10)
+
+    ctk.CTkButton(btn_frame, text="OK", command=on_ok, width=100).pack(side="left", padx=5)
+    ctk.CTkButton(btn_frame, text="Cancel", command=on_cancel, width=100).pack(side="right", padx=5)
+
+    dialog.wait_window()
+
+    return selected_version[0]
+
+
+class TkPrompts(ConsolePrompts):
+    """
+    Prompt policy showing customtkinter dialogs.
+
+    Args:
+        parent_window: Main window, used when a prompt has no parent of its own
+    """
+
+    def __init__(self, parent_window):
+        self.parent_window = parent_window
+
+    def show_error(self, message):
+        messagebox.showerror("Error", message)
+
+    def show_success(self, message):
+        messagebox.showinfo("Success", message)
+
+    def show_info(self, title, message):
+        messagebox.showinfo(title, message)
+
+    def show_generation_summary(self, tracker):
+        GenerationSummaryDialog(self.parent_window, tracker)
+
+    def ask_download_again(self, component_type, existing_files, parent=None):
+        return ask_download_again(component_type, existing_files, parent or self.parent_window)
+
+    def ask_download_dependencies_only(self, component_type, parent=None, error_message=None):
+        return ask_download_dependencies_only(component_type, parent or self.parent_window, error_message)
+
+    def choose_files(self, title, description, launcher_files, other_files, default_names,
+                     config=None, parent=None):
+        return select_files_dialog(title, description, launcher_files, other_files, default_names,
+                                   config=config, parent=parent or self.parent_window)
+
+    def choose_version(self, version_names, title, description, parent=None):
+        return select_version_dialog(version_names, title, description, parent=parent or self.parent_window)
+
+    def create_download_progress(self, total_files, parent=None):
+        return TkDownloadProgress(parent or self.parent_window, total_files)
@@ -14,14 +14,28 @@ import traceback
 import urllib3
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Import UI helpers
 try:
     from gk_install_builder.ui.helpers import bind_mousewheel_to_frame
     from gk_install_builder.utils.tooltips import create_tooltip
+    from gk_install_builder.integrations.token_manager import get_token_manager
+    from gk_install_builder.generators.offline_package_helpers import CachedListingBrowser
+    from gk_install_builder.ui.virtual_list import VirtualListbox
+    from gk_install_builder.utils.directory_index import DirectoryIndex
 except ImportError:
     from ui.helpers import bind_mousewheel_to_frame
     from utils.tooltips import create_tooltip
+    from integrations.token_manager import get_token_manager
+    from generators.offline_package_helpers import CachedListingBrowser
+    from ui.virtual_list import VirtualListbox
+    from utils.directory_index import DirectoryIndex
+
+
+# Child folders of the current directory listed in the background
+BROWSER_PREFETCH_WORKERS = 2
+BROWSER_PREFETCH_LIMIT = 50
 
 
 # New class for the Offline Package Creator window
@@ -60,6 +74,16 @@ class OfflinePackageCreator:
     def on_window_close(self):
         """Handle window close event"""
         try:
+            # Stop receiving token refresh notifications for this window
+            if getattr(self, '_token_manager', None):
+                self._token_manager.remove_listener(self._on_token_refreshed)
+
+            # Drop queued directory loads and prefetches
+            self._load_generation = getattr(self, '_load_generation', 0) + 1
+            for executor in (getattr(self, '_load_executor', None), getattr(self, '_prefetch_executor', None)):
+                if executor:
+                    executor.shutdown(wait=False, cancel_futures=True)
+
             # Update config from entries
             self.config_manager.update_config_from_entries()
             
@@ -444,6 +468,51 @@ class OfflinePackageCreator:
         # Call update_dependencies to set initial state based on default selections
         # Removed: update_dependencies()
         
+        # Download plan options
+        plan_frame = ctk.CTkFrame(self.offline_package_frame)
+        plan_frame.pack(fill="x", pady=(10, 0), padx=10)
+
+        self.dry_run = ctk.BooleanVar(value=False)
+        dry_run_checkbox = ctk.CTkCheckBox(
+            plan_frame,
+            text="Dry run (plan only, no download)",
+            variable=self.dry_run,
+            checkbox_width=20,
+            checkbox_height=20
+        )
+        dry_run_checkbox.pack(side="left", pady=5, padx=10)
+        create_tooltip(dry_run_checkbox, "Resolve all selected files, check disk space and write offline_download_plan.json without downloading")
+
+        run_plan_button = ctk.CTkButton(
+            plan_frame,
+            text="Run Saved Plan...",
+            command=self.run_saved_plan,
+            width=140
+        )
+        run_plan_button.pack(side="right", pady=5, padx=10)
+
+        # Delta package options
+        delta_frame = ctk.CTkFrame(self.offline_package_frame)
+        delta_frame.pack(fill="x", pady=(5, 0), padx=10)
+
+        self.previous_manifest_path = None
+        delta_button = ctk.CTkButton(
+            delta_frame,
+            text="Previous Manifest...",
+            command=self.select_previous_manifest,
+            width=140
+        )
+        delta_button.pack(side="left", pady=5, padx=10)
+        create_tooltip(delta_button, "Select offline_package_manifest.json of a shipped package to build a delta package with only new or changed files")
+
+        self.delta_label = ctk.CTkLabel(
+            delta_frame,
+            text="Full package (no previous manifest)",
+            font=("Helvetica", 11),
+            text_color="gray"
+        )
+        self.delta_label.pack(side="left", pady=5, padx=10)
+
         # Create button - initially disabled
         self.create_button = ctk.CTkButton(
             self.offline_package_frame,
@@ -711,6 +780,23 @@ class OfflinePackageCreator:
         )
         self.refresh_btn.pack(side="left")
         
+        # Filter box - narrows the current folder as you type (substring or glob)
+        self.filter_var = tk.StringVar()
+        self.filter_entry = ctk.CTkEntry(
+            toolbar,
+            textvariable=self.filter_var,
+            placeholder_text="Filter (text or *.glob)",
+            width=200,
+            height=38,
+            corner_radius=6,
+            font=("Segoe UI", 11),
+            border_width=1,
+            border_color=colors['border_color']
+        )
+        self.filter_entry.pack(side="right", padx=(0, 12), pady=8)
+        self.filter_var.trace_add("write", lambda *args: self._apply_filter())
+        create_tooltip(self.filter_entry, "Filter the current folder by name, e.g. 'pos' or '*.jar'")
+        
         # Path breadcrumb display with subtle border
         breadcrumb_container = ctk.CTkFrame(toolbar, fg_color=colors['breadcrumb_bg'], corner_radius=6, height=38, border_width=1, border_color=colors['border_color'])
         breadcrumb_container.pack(side="left", fill="x", expand=True, padx=12, pady=8)
@@ -750,12 +836,14 @@ class OfflinePackageCreator:
             borderwidth=0,
             highlightthickness=0,
             activestyle="none",
-            yscrollcommand=scrollbar.set,
             height=20,
             relief="flat"
         )
         self.file_listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=self.file_listbox.yview)
+        
+        # Only the rows that fit are inserted into the listbox; the scrollbar
+        # and keys move a window over the full (filtered) listing
+        self.file_list = VirtualListbox(self.file_listbox, scrollbar)
         
         # Bind double-click, enter key, and right-click events
         self.file_listbox.bind("<Double-Button-1>", self._on_listbox_double_click)
@@ -793,10 +881,23 @@ class OfflinePackageCreator:
             'items': [],
             'display_mode': 'list'  # list or message
         }
+        # Index of the shown folder and (icon text, color) of each of its items
+        self._directory_index = None
+        self._item_styles = []
+
+        # Directory listings are loaded off the Tk thread and cached per path;
+        # a load is superseded (its result dropped) when the user navigates on
+        self._listing_cache = None
+        self._load_generation = 0
+        self._pending_load = None
+        self._prefetch_futures = []
+        self._load_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dsg-browse")
+        self._prefetch_executor = ThreadPoolExecutor(max_workers=BROWSER_PREFETCH_WORKERS,
+                                                     thread_name_prefix="dsg-browse-prefetch")
     
     def _clear_file_list(self):
         """Clear the file list"""
-        self.file_listbox.delete(0, 'end')
+        self.file_list.set_rows(0, None)
         self._hide_message()
     
     def _show_message(self, icon, text, color="#64748B"):
@@ -851,117 +952,180 @@ class OfflinePackageCreator:
         else:
             self.back_btn.configure(state="normal", fg_color=self._ui_colors['nav_btn'])
     
-    def _load_directory(self, path):
-        """Load and display directory contents"""
+    def _load_directory(self, path, refresh=False):
+        """Load and display directory contents without blocking the Tk thread
+
+        Args:
+            path: Directory path to show
+            refresh: Ignore a cached listing of the directory
+        """
         if not hasattr(self, 'webdav') or not self.webdav or not self._browser_state['connected']:
             self._show_error("Not connected to DSG API")
             return
-        
+
         # Normalize path
         path = self._normalize_path(path)
-        
-        # Check if already loading to prevent multiple requests
-        if self._browser_state.get('loading'):
-            return
-        
+
+        # Supersede any load still in flight and drop queued prefetches of the previous folder
+        self._load_generation += 1
+        generation = self._load_generation
+        self._cancel_prefetches()
+
+        if self._listing_cache is None:
+            self._listing_cache = CachedListingBrowser(self.webdav)
+        if refresh:
+            self._listing_cache.invalidate(path)
+
+        if path != self._browser_state['current_path']:
+            # A filter applies to one folder only
+            self._directory_index = None
+            self.filter_var.set("")
         self._browser_state['current_path'] = path
-        
+
         # Update UI - do breadcrumb first to avoid flicker
         self._update_breadcrumb(path)
+
+        print(f"\n=== Loading Directory ===")
+        print(f"Path: {path}")
+
+        if self._listing_cache.is_cached(path):
+            # Already listed (e.g. prefetched) - render without a loading state
+            self._on_directory_loaded(generation, path, self._listing_cache.list_directories(path), None)
+            return
+
         self._show_loading()
-        
-        try:
-            # Fetch directory contents
-            print(f"\n=== Loading Directory ===")
-            print(f"Path: {path}")
-            
-            items = self.webdav.list_directories(path)
-            
-            print(f"Found: {len(items)} items")
-            
-            # Update state
-            self._browser_state['items'] = items
-            self._browser_state['loading'] = False
-            
-            # Clear loading and show items (minimize operations)
-            self.file_listbox.delete(0, 'end')  # Clear directly without extra calls
-            
-            if not items:
-                self._show_empty_state()
-                return
-            
-            # Sort: directories first, then files alphabetically
-            items.sort(key=lambda x: (not x['is_directory'], x['name'].lower()))
-            
-            # Populate listbox with color coding (batch update to reduce flicker)
-            self._hide_message()
-            
-            # Disable updates during batch insert
-            self.file_listbox.config(state='normal')
-            
-            for idx, item in enumerate(items):
-                # Create display text with icon and determine color
-                if item['is_directory']:
-                    icon = "📁"
-                    fg_color = "#60A5FA"  # Blue for folders
-                elif item['name'].lower().endswith(('.zip', '.tar', '.gz', '.rar', '.7z')):
-                    icon = "📦"
-                    fg_color = "#A78BFA"  # Purple for archives
-                elif item['name'].lower().endswith(('.exe', '.msi')):
-                    icon = "⚙️"
-                    fg_color = "#34D399"  # Green for executables - IMPORTANT
-                elif item['name'].lower().endswith(('.jar', '.war')):
-                    icon = "☕"
-                    fg_color = "#FB923C"  # Orange for Java
-                else:
-                    icon = "📄"
-                    fg_color = "#94A3B8"  # Gray for other files
-                
-                display_text = f"{icon}  {item['name']}"
-                self.file_listbox.insert('end', display_text)
-                
-                # Apply color to this specific item
-                self.file_listbox.itemconfig(idx, fg=fg_color)
-            
-            # Re-enable updates
-            self.file_listbox.config(state='normal')
-        
-        except Exception as e:
-            print(f"Error loading directory: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            self._browser_state['loading'] = False
-            self._show_error(str(e))
-            
+
+        def load():
+            if generation != self._load_generation:
+                return  # Superseded while queued - never reaches the network
+            try:
+                items, error = self._listing_cache.list_directories(path), None
+            except Exception as e:
+                items, error = None, e
+            try:
+                self.window.after(0, lambda: self._on_directory_loaded(generation, path, items, error))
+            except (tk.TclError, RuntimeError):
+                pass  # Window closed while loading
+
+        if self._pending_load is not None:
+            self._pending_load.cancel()
+        self._pending_load = self._load_executor.submit(load)
+
+    def _on_directory_loaded(self, generation, path, items, error):
+        """Show a finished directory listing unless the user has navigated elsewhere"""
+        if generation != self._load_generation:
+            print(f"Discarding stale listing of {path}")
+            return
+
+        self._browser_state['loading'] = False
+
+        if error is not None:
+            print(f"Error loading directory: {error}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            self._show_error(str(error))
+
             # Update connection status
             if hasattr(self, 'webdav_status'):
                 self.webdav_status.configure(text="⚠ Error")
                 self.status_badge.configure(fg_color="#F59E0B")
-    
+            return
+
+        print(f"Found: {len(items)} items")
+
+        if not items:
+            # list_directories also returns [] on request errors, so do not keep it cached
+            self._listing_cache.invalidate(path)
+
+        # Sort a copy: directories first, then files alphabetically (cached lists stay untouched)
+        items = sorted(items, key=lambda x: (not x['is_directory'], x['name'].lower()))
+        self._directory_index = DirectoryIndex(items)
+        self._item_styles = [self._item_style(item) for item in items]
+        self._apply_filter()
+        self._prefetch_child_directories(path, items)
+
+    def _apply_filter(self):
+        """Show the items of the current folder that match the filter box"""
+        index = self._directory_index
+        if index is None:
+            return
+
+        if not len(index):
+            self._browser_state['items'] = []
+            self._clear_file_list()
+            self._show_empty_state()
+            return
+
+        pattern = self.filter_var.get()
+        matches = index.filter(pattern)
+        self._browser_state['items'] = [index.items[i] for i in matches]
+        if not matches:
+            self._clear_file_list()
+            self._show_message("🔍", f"No items match '{pattern.strip()}'", "#64748B")
+            return
+
+        self._hide_message()
+        styles = self._item_styles
+        self.file_list.set_rows(len(matches), lambda row: styles[matches[row]])
+
+    def _item_style(self, item):
+        """Display text with icon and color of a listing item"""
+        if item['is_directory']:
+            icon = "📁"
+            fg_color = "#60A5FA"  # Blue for folders
+        elif item['name'].lower().endswith(('.zip', '.tar', '.gz', '.rar', '.7z')):
+            icon = "📦"
+            fg_color = "#A78BFA"  # Purple for archives
+        elif item['name'].lower().endswith(('.exe', '.msi')):
+            icon = "⚙️"
+            fg_color = "#34D399"  # Green for executables - IMPORTANT
+        elif item['name'].lower().endswith(('.jar', '.war')):
+            icon = "☕"
+            fg_color = "#FB923C"  # Orange for Java
+        else:
+            icon = "📄"
+            fg_color = "#94A3B8"  # Gray for other files
+
+        return f"{icon}  {item['name']}", fg_color
+
+    def _prefetch_child_directories(self, path, items):
+        """List the subfolders of the current directory in the background"""
+        child_dirs = [item['name'] for item in items if item.get('is_directory')][:BROWSER_PREFETCH_LIMIT]
+        for name in child_dirs:
+            self._prefetch_futures.append(self._listing_cache.prefetch(self._prefetch_executor, f"{path}/{name}"))
+
+    def _cancel_prefetches(self):
+        """Cancel prefetches that have not started yet"""
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+
     def _on_listbox_double_click(self, event=None):
         """Handle double-click on listbox item - open folders or download files"""
-        selection = self.file_listbox.curselection()
-        if not selection:
+        item = self._selected_item()
+        if not item:
             return
         
-        index = selection[0]
-        if index < len(self._browser_state['items']):
-            item = self._browser_state['items'][index]
-            if item.get('is_directory'):
-                # Navigate into folder
-                self._navigate_into(item['name'])
-            else:
-                # Download file to project root
-                self._download_file_to_root(item)
+        if item.get('is_directory'):
+            # Navigate into folder
+            self._navigate_into(item['name'])
+        else:
+            # Download file to project root
+            self._download_file_to_root(item)
+    
+    def _selected_item(self):
+        """Listing item of the selected row (after filtering), or None"""
+        index = self.file_list.selected_index()
+        if index is None or index >= len(self._browser_state['items']):
+            return None
+        return self._browser_state['items'][index]
     
     def _show_context_menu(self, event):
         """Show context menu on right-click"""
         # Select the item under cursor
-        index = self.file_listbox.nearest(event.y)
-        self.file_listbox.selection_clear(0, 'end')
-        self.file_listbox.selection_set(index)
-        self.file_listbox.activate(index)
+        index = self.file_list.index_at(event.y)
+        if index is None:
+            return
+        self.file_list.select(index)
         
         # Get the selected item
         if index < len(self._browser_state['items']):
@@ -988,111 +1152,91 @@ class OfflinePackageCreator:
     
     def _context_open(self):
         """Context menu: Open folder"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                if item.get('is_directory'):
-                    self._navigate_into(item['name'])
+        item = self._selected_item()
+        if item:
+            if item.get('is_directory'):
+                self._navigate_into(item['name'])
     
     def _context_download(self):
         """Context menu: Download file"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                if not item.get('is_directory'):
-                    self._download_file_to_root(item)
+        item = self._selected_item()
+        if item:
+            if not item.get('is_directory'):
+                self._download_file_to_root(item)
     
     def _context_copy_path(self):
         """Context menu: Copy full path to clipboard"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
-                self.window.clipboard_clear()
-                self.window.clipboard_append(full_path)
-                print(f"Copied to clipboard: {full_path}")
+        item = self._selected_item()
+        if item:
+            full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
+            self.window.clipboard_clear()
+            self.window.clipboard_append(full_path)
+            print(f"Copied to clipboard: {full_path}")
     
     def _context_copy_name(self):
         """Context menu: Copy name to clipboard"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                self.window.clipboard_clear()
-                self.window.clipboard_append(item['name'])
-                print(f"Copied to clipboard: {item['name']}")
+        item = self._selected_item()
+        if item:
+            self.window.clipboard_clear()
+            self.window.clipboard_append(item['name'])
+            print(f"Copied to clipboard: {item['name']}")
     
     def _context_copy_download_url(self):
         """Context menu: Copy download URL to clipboard"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                
-                if item.get('is_directory'):
-                    # For folders, copy the API browse URL
-                    full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
-                    download_url = f"{self.webdav.base_url}/api/digital-content/services/rest/media/v1/files{full_path}"
-                else:
-                    # For files, get the actual download URL
-                    remote_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
-                    download_url = self.webdav.get_file_url(remote_path)
-                
-                self.window.clipboard_clear()
-                self.window.clipboard_append(download_url)
-                print(f"Copied download URL to clipboard: {download_url}")
-                
-                # Show success message
-                from tkinter import messagebox
-                messagebox.showinfo(
-                    "URL Copied",
-                    f"Download URL copied to clipboard!\n\n{download_url}"
-                )
+        item = self._selected_item()
+        if item:
+            if item.get('is_directory'):
+                # For folders, copy the API browse URL
+                full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
+                download_url = f"{self.webdav.base_url}/api/digital-content/services/rest/media/v1/files{full_path}"
+            else:
+                # For files, get the actual download URL
+                remote_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
+                download_url = self.webdav.get_file_url(remote_path)
+            
+            self.window.clipboard_clear()
+            self.window.clipboard_append(download_url)
+            print(f"Copied download URL to clipboard: {download_url}")
+            
+            # Show success message
+            from tkinter import messagebox
+            messagebox.showinfo(
+                "URL Copied",
+                f"Download URL copied to clipboard!\n\n{download_url}"
+            )
     
     def _context_properties(self):
         """Context menu: Show item properties"""
-        selection = self.file_listbox.curselection()
-        if selection:
-            index = selection[0]
-            if index < len(self._browser_state['items']):
-                item = self._browser_state['items'][index]
-                
-                # Create properties dialog
-                from tkinter import messagebox
-                
-                item_type = "Folder" if item.get('is_directory') else "File"
-                full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
-                
-                props = [
-                    f"Name: {item['name']}",
-                    f"Type: {item_type}",
-                    f"Path: {full_path}"
-                ]
-                
-                if item.get('size'):
-                    try:
-                        # Convert to int if it's a string
-                        size = int(item['size']) if isinstance(item['size'], str) else item['size']
-                        size_mb = size / (1024 * 1024)
-                        props.append(f"Size: {size_mb:.2f} MB ({size:,} bytes)")
-                    except (ValueError, TypeError):
-                        props.append(f"Size: {item['size']}")
-                
-                if item.get('mimeType'):
-                    props.append(f"MIME Type: {item['mimeType']}")
-                
-                if item.get('lastModification'):
-                    props.append(f"Last Modified: {item['lastModification']}")
-                
-                messagebox.showinfo("Properties", "\n".join(props))
+        item = self._selected_item()
+        if item:
+            # Create properties dialog
+            from tkinter import messagebox
+            
+            item_type = "Folder" if item.get('is_directory') else "File"
+            full_path = f"{self._browser_state['current_path']}/{item['name']}".replace('//', '/')
+            
+            props = [
+                f"Name: {item['name']}",
+                f"Type: {item_type}",
+                f"Path: {full_path}"
+            ]
+            
+            if item.get('size'):
+                try:
+                    # Convert to int if it's a string
+                    size = int(item['size']) if isinstance(item['size'], str) else item['size']
+                    size_mb = size / (1024 * 1024)
+                    props.append(f"Size: {size_mb:.2f} MB ({size:,} bytes)")
+                except (ValueError, TypeError):
+                    props.append(f"Size: {item['size']}")
+            
+            if item.get('mimeType'):
+                props.append(f"MIME Type: {item['mimeType']}")
+            
+            if item.get('lastModification'):
+                props.append(f"Last Modified: {item['lastModification']}")
+            
+            messagebox.showinfo("Properties", "\n".join(props))
     
     def _download_file_to_root(self, item):
         """Download a file to the output directory with progress dialog"""
@@ -1410,87 +1554,44 @@ class OfflinePackageCreator:
                 f"File downloaded successfully!\n\nSaved to:\n{local_path}"
             )
     
-    def _refresh_bearer_token(self):
-        """Refresh the bearer token when it expires (called by DSGRestBrowser on 401)"""
-        print("\n=== Refreshing Bearer Token ===")
-        
+    def _get_token_manager(self, base_url):
+        """Get the shared token manager for the configured tenant and credentials"""
+        manager = get_token_manager(base_url, self.config_manager.config)
+        if getattr(self, '_token_manager', None) is not manager:
+            if getattr(self, '_token_manager', None):
+                self._token_manager.remove_listener(self._on_token_refreshed)
+            manager.add_listener(self._on_token_refreshed)
+            self._token_manager = manager
+        return manager
+
+    def _on_token_refreshed(self, new_token):
+        """Token manager listener - may run on a download thread, so hand over to Tk"""
         try:
-            # Show token refresh in UI
-            self.status_label.configure(
-                text="🔄 Token expired - regenerating...",
-                text_color="#FFA500"
-            )
-            self.webdav_status.configure(text="🔄 Refreshing...")
-            self.status_badge.configure(fg_color="#FFA500")
-            self.window.update_idletasks()
-            
-            # Generate new token using existing method
-            base_url = self.config_manager.config["base_url"]
-            new_token = self._generate_api_token_for_dsg(base_url)
-            
-            if new_token:
-                # Update token in config and UI
-                self.config_manager.config["bearer_token"] = new_token
-                self.config_manager.save_config_silent()
-                
-                # Update token field if it exists
-                if hasattr(self, 'bearer_token'):
-                    self.bearer_token.delete(0, 'end')
-                    self.bearer_token.insert(0, new_token)
-                
-                # Update status
+            self.window.after(0, lambda: self._apply_refreshed_token(new_token))
+        except Exception as e:
+            print(f"Could not schedule token UI update: {e}")
+
+    def _apply_refreshed_token(self, new_token):
+        """Show a refreshed bearer token in config and UI"""
+        try:
+            self.config_manager.config["bearer_token"] = new_token
+            self.config_manager.save_config_silent()
+
+            if hasattr(self, 'bearer_token'):
+                self.bearer_token.delete(0, 'end')
+                self.bearer_token.insert(0, new_token)
+
+            if self._browser_state.get('connected'):
                 self.status_label.configure(
                     text="✅ Token refreshed automatically",
                     text_color="#53D86A"
                 )
                 self.webdav_status.configure(text="✅ Connected")
                 self.status_badge.configure(fg_color="#2ECC71")
-                
-                # Show notification to user
-                from tkinter import messagebox
-                messagebox.showinfo(
-                    "Token Refreshed",
-                    "Your access token has expired and was automatically refreshed.\n\n"
-                    "You can continue using the file browser normally."
-                )
-                
-                print(f"Token refreshed successfully")
-                return new_token
-            else:
-                # Token refresh failed
-                self.status_label.configure(
-                    text="❌ Token refresh failed",
-                    text_color="#FF6B6B"
-                )
-                self.webdav_status.configure(text="❌ Failed")
-                self.status_badge.configure(fg_color="#FF6B6B")
-                self._browser_state['connected'] = False
-                
-                from tkinter import messagebox
-                messagebox.showerror(
-                    "Token Refresh Failed",
-                    "Your access token has expired and could not be refreshed automatically.\n\n"
-                    "Please check your Security Configuration and try connecting again."
-                )
-                
-                print("Token refresh failed")
-                return None
-                
+            print("Token refreshed successfully")
         except Exception as e:
-            print(f"Error refreshing token: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            self.status_label.configure(
-                text="❌ Token refresh error",
-                text_color="#FF6B6B"
-            )
-            self.webdav_status.configure(text="❌ Error")
-            self.status_badge.configure(fg_color="#FF6B6B")
-            self._browser_state['connected'] = False
-            
-            return None
-    
+            print(f"Error updating UI after token refresh: {e}")
+
     def _navigate_into(self, dirname):
         """Navigate into a subdirectory"""
         current = self._browser_state['current_path'].rstrip('/')
@@ -1519,10 +1620,10 @@ class OfflinePackageCreator:
         self._load_directory(parent)
     
     def _refresh_current_directory(self):
-        """Refresh the current directory"""
+        """Refresh the current directory, bypassing the listing cache"""
         current_path = self._browser_state.get('current_path', '/SoftwarePackage')
         print(f"Refreshing: {current_path}")
-        self._load_directory(current_path)
+        self._load_directory(current_path, refresh=True)
     
     def refresh_listing(self):
         """Legacy method - redirects to new implementation"""
@@ -1544,8 +1645,8 @@ class OfflinePackageCreator:
         auto_generate = self.auto_generate_token.get() if hasattr(self, 'auto_generate_token') else True
         
         if auto_generate:
-            # Auto-generate mode: Always create fresh token
-            print("Auto-generate enabled - generating fresh token")
+            # Auto-generate mode: Use the managed token (refreshed before it expires)
+            print("Auto-generate enabled - using managed token")
             if bearer_token:
                 print(f"Existing token in field (last 10 chars): ...{bearer_token[-10:]}")
             
@@ -1554,8 +1655,8 @@ class OfflinePackageCreator:
             self.status_badge.configure(fg_color="#FFA500")
             self.window.update_idletasks()
             
-            # Generate a fresh token
-            bearer_token = self._generate_api_token_for_dsg(base_url)
+            # Get a valid token (cached until shortly before it expires)
+            bearer_token = self._get_token_manager(base_url).get_token()
             
             if not bearer_token:
                 self.webdav_status.configure(text="❌ Failed")
@@ -1608,8 +1709,8 @@ class OfflinePackageCreator:
             api_version  # Legacy/New API version
         )
         
-        # Set up token refresh callback for automatic token renewal
-        self.webdav.token_refresh_callback = self._refresh_bearer_token
+        # Set up token manager for automatic token renewal
+        self.webdav.token_manager = self._get_token_manager(base_url)
         
         # Connect to DSG REST API
         success, message = self.webdav.connect()
@@ -1646,6 +1747,7 @@ class OfflinePackageCreator:
             
             # Update browser state and load initial directory
             self._browser_state['connected'] = True
+            self._listing_cache = CachedListingBrowser(self.webdav)
             self._load_directory('/SoftwarePackage')
         else:
             self.webdav_status.configure(text="❌ Failed")
@@ -1751,7 +1853,9 @@ class OfflinePackageCreator:
             success, message = self.project_generator.prepare_offline_package(
                 self.config_manager.config,
                 selected_components,
-                dialog_parent=self.window
+                dialog_parent=self.window,
+                dry_run=self.dry_run.get(),
+                previous_manifest_path=self.previous_manifest_path
             )
             
             if success:
@@ -1763,6 +1867,54 @@ class OfflinePackageCreator:
             self.show_error("Error", f"Failed to create offline package: {str(e)}")
             import traceback
             traceback.print_exc()
+
+    def select_previous_manifest(self):
+        """Select (or clear) the manifest of a previously shipped package for delta packages"""
+        from tkinter import filedialog
+        manifest_path = filedialog.askopenfilename(
+            parent=self.window,
+            title="Select Previous Package Manifest",
+            filetypes=[("Package manifest", "*.json"), ("All files", "*.*")]
+        )
+        if manifest_path:
+            self.previous_manifest_path = manifest_path
+            self.delta_label.configure(text=f"Delta against: {os.path.basename(os.path.dirname(manifest_path))}/{os.path.basename(manifest_path)}")
+        else:
+            self.previous_manifest_path = None
+            self.delta_label.configure(text="Full package (no previous manifest)")
+
+    def run_saved_plan(self):
+        """Download the files of a previously saved download plan"""
+        try:
+            if not hasattr(self, 'webdav') or not getattr(self.webdav, 'connected', False):
+                self.show_error("DSG API Connection Required", "Please connect to DSG API first before proceeding.")
+                return
+
+            from tkinter import filedialog
+            plan_path = filedialog.askopenfilename(
+                parent=self.window,
+                title="Select Download Plan",
+                initialdir=os.path.abspath(self.config_manager.config.get("output_dir", "generated_scripts")),
+                filetypes=[("Download plan", "*.json"), ("All files", "*.*")]
+            )
+            if not plan_path:
+                return
+
+            success, message = self.project_generator.prepare_offline_package(
+                self.config_manager.config,
+                [],
+                dialog_parent=self.window,
+                plan_path=plan_path
+            )
+
+            if success:
+                self.show_info("Success", message)
+            else:
+                self.show_error("Error", message)
+
+        except Exception as e:
+            self.show_error("Error", f"Failed to run download plan: {str(e)}")
+            traceback.print_exc()
     
     def show_error(self, title, message):
         """Show error dialog"""
@@ -1772,86 +1924,6 @@ class OfflinePackageCreator:
         """Show info dialog"""
         messagebox.showinfo(title, message)
 
-    def _generate_api_token_for_dsg(self, base_url):
-        """Generate API bearer token for DSG REST API (same method as PPD/PPF)"""
-        try:
-            import base64
-            import urllib.parse
-            import requests
-            import urllib3
-            
-            # Disable SSL warnings
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            
-            # Get credentials from config (same as PPD/PPF)
-            basic_auth_password = self.config_manager.config.get("launchpad_oauth2", "")
-            form_password = self.config_manager.config.get("eh_launchpad_password", "")
-            
-            if not basic_auth_password or not form_password:
-                print("Missing credentials for token generation")
-                return None
-            
-            # Handle both base64 encoded and plain text passwords
-            try:
-                # Try to decode as base64 first
-                basic_auth_password = base64.b64decode(basic_auth_password).decode('utf-8')
-                form_password = base64.b64decode(form_password).decode('utf-8')
-            except Exception:
-                # Use the passwords as-is (they're already plain text)
-                pass
-            
-            # Create Basic Auth header
-            username = "launchpad"
-            auth_string = f"{username}:{basic_auth_password}"
-            auth_b64 = base64.b64encode(auth_string.encode('ascii')).decode('ascii')
-            
-            # Prepare form data
-            # Get username from config (same as PPD/PPF)
-            form_username = self.config_manager.config.get("eh_launchpad_username", "1001")  # Fallback to 1001 if not set
-            form_data_dict = {
-                'username': form_username,
-                'password': form_password,
-                'grant_type': 'password'
-            }
-            
-            # URL encode form data
-            encoded_pairs = []
-            for key, value in form_data_dict.items():
-                encoded_key = urllib.parse.quote_plus(str(key))
-                encoded_value = urllib.parse.quote_plus(str(value))
-                encoded_pairs.append(f"{encoded_key}={encoded_value}")
-            
-            form_data = '&'.join(encoded_pairs)
-            
-            # Make OAuth token request
-            tenant_id = self.config_manager.config.get("tenant_id", "001")
-            token_url = f"https://{base_url}/auth-service/tenants/{tenant_id}/oauth/token"
-            headers = {
-                'Authorization': f'Basic {auth_b64}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            }
-            
-            print(f"Requesting OAuth token from: {token_url}")
-            response = requests.post(token_url, headers=headers, data=form_data, timeout=30, verify=False)
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                access_token = token_data.get('access_token')
-                if access_token:
-                    print("Bearer token generated successfully")
-                    return access_token
-            else:
-                print(f"Token generation failed with status: {response.status_code}")
-                print(f"Response: {response.text}")
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error generating bearer token: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
-
     def get_basic_auth_password_from_keepass(self, target_entry=None, password_type="basic_auth"):
         """Delegate to the parent app's get_basic_auth_password_from_keepass method"""
         # Use the stored reference to the parent app (GKInstallBuilder instance)
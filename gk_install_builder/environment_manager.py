@@ -1,3 +1,4 @@
+import threading
 import customtkinter as ctk
 from tkinter import messagebox
 import tkinter as tk
@@ -125,6 +126,13 @@ class EnvironmentManager:
             hover_color="#601a1a"
         )
         delete_btn.pack(side="left", padx=2)
+
+        self.resolve_all_btn = ctk.CTkButton(
+            list_frame,
+            text="🔑 Resolve All from KeePass",
+            command=self._resolve_all_credentials
+        )
+        self.resolve_all_btn.pack(fill="x", padx=5, pady=(0, 5))
         
         # Right side - Environment details
         self.details_frame = ctk.CTkScrollableFrame(content_frame, width=400)
@@ -282,6 +290,141 @@ class EnvironmentManager:
             else:
                 messagebox.showerror("Error", "Failed to delete environment.")
     
+    def _get_keepass_login(self):
+        """Return the KeePass session or login to use for this run
+
+        Returns:
+            (client, username, password, remember) where client is the reusable
+            session or None when a new login must be authenticated, or None if cancelled
+        """
+        from gk_install_builder.integrations.keepass_handler import KeePassHandler
+
+        client = KeePassHandler.keepass_client
+        if client is not None and client.is_token_valid():
+            return client, None, None, False
+
+        username = KeePassHandler.keepass_username
+        password = KeePassHandler.keepass_password
+        if username and password:
+            return None, username, password, True
+
+        username, password, remember = self._ask_keepass_login()
+        if not (username and password):
+            return None
+        return None, username, password, remember
+
+    def _ask_keepass_login(self):
+        """Ask for KeePass username and password
+
+        Returns:
+            (username, password, remember), or (None, None, False) if cancelled
+        """
+        result = [None, None, False]
+        login = ctk.CTkToplevel(self.window)
+        login.title("KeePass Login")
+        login.geometry("360x240")
+        login.transient(self.window)
+
+        username_entry = ctk.CTkEntry(login, width=250, placeholder_text="Username")
+        username_entry.pack(pady=(20, 5))
+        password_entry = ctk.CTkEntry(login, width=250, placeholder_text="Password", show="*")
+        password_entry.pack(pady=5)
+        remember_var = tk.BooleanVar(value=True)
+        ctk.CTkCheckBox(login, text="Remember credentials for this session",
+                        variable=remember_var).pack(pady=5)
+
+        def on_ok():
+            result[0] = username_entry.get().strip()
+            result[1] = password_entry.get()
+            result[2] = remember_var.get()
+            login.destroy()
+
+        button_frame = ctk.CTkFrame(login)
+        button_frame.pack(pady=15)
+        ctk.CTkButton(button_frame, text="Connect", width=100, command=on_ok).pack(side="left", padx=5)
+        ctk.CTkButton(button_frame, text="Cancel", width=100, command=login.destroy,
+                      fg_color="gray", hover_color="darkgray").pack(side="left", padx=5)
+
+        login.wait_visibility()
+        login.grab_set()
+        username_entry.focus_set()
+        self.window.wait_window(login)
+        return result[0], result[1], result[2]
+
+    def _resolve_all_credentials(self):
+        """Resolve the Launchpad OAuth2 password of every environment from KeePass in one pass"""
+        from gk_install_builder.integrations.credential_resolver import (
+            KEEPASS_SERVER_URL, resolve_environment_credentials
+        )
+        from gk_install_builder.pleasant_password_client import PleasantPasswordClient
+
+        environments = [env.copy() for env in self.config_manager.get_environments()]
+        if not environments:
+            messagebox.showinfo("No Environments", "There are no environments to resolve.")
+            return
+
+        login = self._get_keepass_login()
+        if login is None:
+            return
+        client, username, password, remember = login
+
+        self.resolve_all_btn.configure(state="disabled", text=f"Resolving {len(environments)} environments...")
+
+        def worker():
+            session = None
+            try:
+                if client is None:
+                    # Authenticate off the Tk thread; the session is only kept if remember is checked
+                    authenticated = PleasantPasswordClient(
+                        base_url=KEEPASS_SERVER_URL, username=username, password=password
+                    )
+                    if remember:
+                        session = (authenticated, username, password)
+                else:
+                    authenticated = client
+                results = resolve_environment_credentials(authenticated, environments)
+                error = None
+            except Exception as e:
+                results, error = None, e
+            try:
+                self.window.after(0, lambda: self._on_credentials_resolved(environments, results, error, session))
+            except (tk.TclError, RuntimeError):
+                pass
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_credentials_resolved(self, environments, results, error, session=None):
+        """Store resolved passwords and report resolved and missing environments"""
+        from gk_install_builder.integrations.keepass_handler import KeePassHandler
+
+        self.resolve_all_btn.configure(state="normal", text="🔑 Resolve All from KeePass")
+        if session is not None:
+            KeePassHandler.keepass_client, KeePassHandler.keepass_username, KeePassHandler.keepass_password = session
+        if error is not None:
+            messagebox.showerror("KeePass Error", f"Credential resolution failed:\n{str(error)}")
+            return
+
+        # Only apply to environments that are unchanged since the resolution started
+        current = self.config_manager.get_environments()
+        updates = {
+            result["index"]: {"launchpad_oauth2": result["password"]}
+            for result in results
+            if result["resolved"] and result["index"] < len(current)
+            and current[result["index"]].get("base_url") == environments[result["index"]].get("base_url")
+        }
+        self.config_manager.update_environment_fields(updates)
+
+        resolved = [r for r in results if r["resolved"]]
+        missing = [r for r in results if not r["resolved"]]
+        lines = [f"Resolved ({len(resolved)}):"]
+        lines += [f"  ✓ {r['alias']} - {r['project']}/{r['environment']}" for r in resolved] or ["  none"]
+        lines += ["", f"Missing ({len(missing)}):"]
+        lines += [f"  ✗ {r['alias']} - {r['reason']}" for r in missing] or ["  none"]
+
+        if self.selected_index is not None:
+            self._show_environment_details(self.selected_index)
+        messagebox.showinfo("KeePass Credentials", "\n".join(lines))
+
     def _open_environment_dialog(self, mode="add", index=None):
         """Open dialog to add or edit environment
         
@@ -9,6 +9,11 @@ class VersionManager:
     """Manages version configuration UI for components"""
 
     def __init__(self, parent_window, config_manager, api_client, main_frame):
+        """
+        Args:
+            api_client: APIClient, or a zero-argument callable returning it
+                (lets the caller create the client on first use)
+        """
         self.root = parent_window
         self.config_manager = config_manager
         self.api_client = api_client
@@ -31,6 +36,7 @@ class VersionManager:
         self.version_override_var = None
         self.use_default_versions_var = None
         self.version_source_var = None
+        self.pin_versions_var = None
 
     def create_tooltip(self, widget, text):
         """Create a tooltip for a widget"""
@@ -76,6 +82,37 @@ class VersionManager:
         default_versions_checkbox.grid(row=1, column=0, columnspan=2, padx=10, pady=5, sticky="w")
         self.create_tooltip(default_versions_checkbox, "When enabled, the installation script will fetch component versions from the selected API instead of using hardcoded versions")
 
+        # Pin versions at build time checkbox
+        self.pin_versions_var = ctk.BooleanVar(value=self.config_manager.config.get("pin_versions_at_build", False))
+        pin_versions_checkbox = ctk.CTkCheckBox(
+            grid_frame,
+            text="Pin Versions at Build Time",
+            variable=self.pin_versions_var,
+            command=self.toggle_pin_versions
+        )
+        pin_versions_checkbox.grid(row=1, column=2, padx=10, pady=5, sticky="w")
+        self.create_tooltip(pin_versions_checkbox, "Resolve the default versions once while generating and embed them in the package.\nThe installation script uses the pinned versions and only calls the API if they are missing or do not match the tenant.")
+
+        # Verify Launcher downloads checkbox
+        self.verify_downloads_var = ctk.BooleanVar(value=self.config_manager.config.get("verify_launcher_downloads", False))
+        verify_downloads_checkbox = ctk.CTkCheckBox(
+            grid_frame,
+            text="Verify Launcher Downloads",
+            variable=self.verify_downloads_var,
+            command=self.toggle_verify_downloads
+        )
+        verify_downloads_checkbox.grid(row=0, column=2, padx=10, pady=5, sticky="w")
+        self.create_tooltip(verify_downloads_checkbox, "Fetch the Launcher of each selected component once while generating and record its size and SHA-256.\nThe installation script rejects a downloaded Launcher that does not match.\nNeeds fixed versions (or pinned default versions).")
+
+        verify_components_button = ctk.CTkButton(
+            grid_frame,
+            text="Components...",
+            command=self.open_verify_components,
+            width=100
+        )
+        verify_components_button.grid(row=0, column=3, padx=10, pady=5, sticky="w")
+        self.create_tooltip(verify_components_button, "Select the components whose Launchers are verified")
+
         # Version source selection (FP/FPD vs Config-Service)
         version_source_label = ctk.CTkLabel(grid_frame, text="API Source:")
         version_source_label.grid(row=2, column=0, padx=10, pady=5, sticky="w")
@@ -202,6 +239,8 @@ class VersionManager:
         # Register the checkboxes with config manager
         self.config_manager.register_entry("use_version_override", self.version_override_var)
         self.config_manager.register_entry("use_default_versions", self.use_default_versions_var)
+        self.config_manager.register_entry("pin_versions_at_build", self.pin_versions_var)
+        self.config_manager.register_entry("verify_launcher_downloads", self.verify_downloads_var)
 
         # Initialize state based on config
         self.toggle_version_override()
@@ -264,6 +303,74 @@ class VersionManager:
         source_name = "Function Pack (FP/FPD)" if choice == "FP" else "Config-Service"
         print(f"Version source changed to: {source_name}")
 
+    def toggle_pin_versions(self):
+        """Toggle pinning of default versions at build time"""
+        enabled = self.pin_versions_var.get()
+        self.config_manager.config["pin_versions_at_build"] = enabled
+        self.config_manager.save_config_silent()
+        if enabled:
+            print("Version pinning enabled: Default versions will be resolved once during generation")
+        else:
+            print("Version pinning disabled: Installation script will fetch default versions at install time")
+
+    def toggle_verify_downloads(self):
+        """Toggle recording Launcher checksums at build time"""
+        enabled = self.verify_downloads_var.get()
+        self.config_manager.config["verify_launcher_downloads"] = enabled
+        self.config_manager.save_config_silent()
+        if enabled:
+            print("Download verification enabled: Launcher checksums will be recorded during generation")
+        else:
+            print("Download verification disabled: Launcher downloads are only resumed and retried")
+
+    def open_verify_components(self):
+        """Open dialog to select the components whose Launcher downloads are verified"""
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Verified Launcher Downloads")
+        dialog.geometry("380x400")
+        dialog.resizable(False, False)
+        dialog.transient(self.root)
+        dialog.after(100, lambda: dialog.grab_set())
+
+        header = ctk.CTkLabel(dialog, text="Select components to verify",
+                              font=ctk.CTkFont(size=14, weight="bold"))
+        header.pack(pady=(15, 5))
+
+        desc = ctk.CTkLabel(dialog, text="Each selected Launcher is fetched once while generating.",
+                            font=ctk.CTkFont(size=12), text_color="gray")
+        desc.pack(pady=(0, 10))
+
+        components = self.config_manager.config.get("verify_launcher_components") or {"POS": True}
+        display_names = {
+            "POS": "POS",
+            "ONEX-POS": "OneX POS",
+            "WDM": "WDM",
+            "FLOW-SERVICE": "Flow Service",
+            "LPA-SERVICE": "LPA Service",
+            "STOREHUB-SERVICE": "StoreHub Service",
+            "RCS-SERVICE": "RCS Service",
+            "MQTT-BROKER": "Store MQTT Broker",
+        }
+
+        comp_vars = {}
+        frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        frame.pack(padx=20, pady=5, fill="x")
+        for comp_key, name in display_names.items():
+            var = ctk.BooleanVar(value=components.get(comp_key, False))
+            comp_vars[comp_key] = var
+            ctk.CTkCheckBox(frame, text=name, variable=var).pack(anchor="w", pady=3, padx=10)
+
+        def save_and_close():
+            self.config_manager.config["verify_launcher_components"] = {k: v.get() for k, v in comp_vars.items()}
+            self.config_manager.save_config_silent()
+            dialog.destroy()
+
+        action_frame = ctk.CTkFrame(dialog, fg_color="transparent")
+        action_frame.pack(pady=(10, 15))
+        ctk.CTkButton(action_frame, text="Save", width=100, command=save_and_close).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Cancel", width=100, fg_color="gray",
+                      command=dialog.destroy).pack(side="left", padx=5)
+
     def toggle_default_versions(self):
         """Toggle the use default versions setting"""
         enabled = self.use_default_versions_var.get()
@@ -362,4 +469,5 @@ class VersionManager:
 
     def test_default_versions_api(self):
         """Test the API to fetch default versions"""
-        self.api_client.test_default_versions_api()
+        api_client = self.api_client() if callable(self.api_client) else self.api_client
+        api_client.test_default_versions_api()
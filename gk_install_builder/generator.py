@@ -2,7 +2,6 @@ import os
 import re
 import json
 import shutil
-import customtkinter as ctk
 import base64
 import platform
 from urllib3.exceptions import InsecureRequestWarning
@@ -49,14 +48,42 @@ try:
         copy_helper_files,
         generate_environments_json,
         download_file_thread,
-        create_progress_dialog,
         prompt_for_file_selection,
         process_platform_dependency,
         process_component,
         process_onex_ui_package,
-        fetch_installer_properties,
-        build_installer_preferences
+        build_installer_preferences,
+        CachedListingBrowser,
+        prefetch_offline_metadata,
+        ConsolePrompts,
+        resolve_file_sizes,
+        build_download_plan,
+        refresh_plan_disk_check,
+        write_download_plan,
+        load_download_plan,
+        plan_to_download_list,
+        record_download_throughput,
+        format_plan_summary,
+        load_package_manifest,
+        apply_previous_manifest,
+        build_package_manifest,
+        write_package_manifest,
+        write_artifact_index,
+        write_delta_file,
+        build_version_manifest,
+        write_version_manifest,
+        read_version_manifest,
+        remove_version_manifest,
+        write_mirror_files,
+        write_seed_config,
+        write_artifact_checksums,
+        plan_download_manifest,
+        fetch_download_manifest_entries,
+        save_download_manifest,
+        FetchCancelled
     )
+    from .integrations.version_resolver import resolve_component_versions, normalize_version_source
+    from .integrations.token_manager import get_token_manager
 except ImportError:
     # Fall back to direct imports when run from gk_install_builder directory
     from gen_config.generator_config import TEMPLATE_DIR, HELPER_STRUCTURE, DEFAULT_DOWNLOAD_WORKERS, DEFAULT_CHUNK_SIZE, LAUNCHER_TEMPLATES
@@ -80,14 +107,49 @@ except ImportError:
     from generators.launcher_generator import create_default_template
     from generators.offline_package_helpers import (
         download_file_thread,
-        create_progress_dialog,
         prompt_for_file_selection,
         process_platform_dependency,
         process_component,
         process_onex_ui_package,
-        fetch_installer_properties,
-        build_installer_preferences
+        build_installer_preferences,
+        CachedListingBrowser,
+        prefetch_offline_metadata
     )
+    from generators.prompts import ConsolePrompts
+    from generators.offline_download_plan import (
+        resolve_file_sizes,
+        build_download_plan,
+        refresh_plan_disk_check,
+        write_download_plan,
+        load_download_plan,
+        plan_to_download_list,
+        record_download_throughput,
+        format_plan_summary
+    )
+    from generators.offline_package_manifest import (
+        load_package_manifest,
+        apply_previous_manifest,
+        build_package_manifest,
+        write_package_manifest,
+        write_artifact_index,
+        write_delta_file
+    )
+    from generators.version_manifest import (
+        build_version_manifest,
+        write_version_manifest,
+        read_version_manifest,
+        remove_version_manifest
+    )
+    from generators.download_mirrors import write_mirror_files
+    from generators.store_seed import write_seed_config, write_artifact_checksums
+    from generators.download_manifest import (
+        plan_download_manifest,
+        fetch_download_manifest_entries,
+        save_download_manifest,
+        FetchCancelled
+    )
+    from integrations.version_resolver import resolve_component_versions, normalize_version_source
+    from integrations.token_manager import get_token_manager
 
 # Disable insecure request warnings
 urllib3.disable_warnings(InsecureRequestWarning)
@@ -105,8 +167,8 @@ class DSGRestBrowser:
         self.current_path = "/SoftwarePackage"
         self.api_version = api_version
 
-        # Token refresh callback - set by parent to handle token regeneration
-        self.token_refresh_callback = None
+        # Token manager - set by parent to refresh expiring/rejected tokens
+        self.token_manager = None
 
         # REST API endpoint based on API version
         if api_version == "legacy":
@@ -140,24 +202,46 @@ class DSGRestBrowser:
         
         return headers
 
+    def _sync_token(self):
+        """Adopt a proactively refreshed token if the current one came from the token manager"""
+        if self.token_manager and self.bearer_token and self.token_manager.current_token() == self.bearer_token:
+            token = self.token_manager.get_token()
+            if token:
+                self.bearer_token = token
+
+    def refresh_token(self, stale_token):
+        """
+        Replace a token rejected with 401. Concurrent callers share one refresh.
+
+        Returns:
+            str: New token, or None if it could not be refreshed
+        """
+        if not self.token_manager:
+            return None
+        new_token = self.token_manager.refresh(stale_token)
+        if new_token:
+            self.bearer_token = new_token
+        return new_token
+
     def _handle_api_request(self, request_func, retry_on_401=True):
         """Handle API requests with automatic token refresh on 401"""
+        self._sync_token()
+        sent_token = self.bearer_token
         try:
             response = request_func()
             response.raise_for_status()
             return response
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401 and retry_on_401 and self.token_refresh_callback:
+            if e.response.status_code == 401 and retry_on_401 and self.token_manager:
                 print("\n=== Token Expired (401) - Refreshing ===")
-                print(f"Old token (last 10 chars): ...{self.bearer_token[-10:] if self.bearer_token else 'None'}")
-                
-                # Try to refresh the token
-                new_token = self.token_refresh_callback()
+                print(f"Old token (last 10 chars): ...{sent_token[-10:] if sent_token else 'None'}")
+
+                # Try to refresh the token (shared with other threads hitting 401)
+                new_token = self.refresh_token(sent_token)
                 if new_token:
-                    self.bearer_token = new_token
                     print(f"New token (last 10 chars): ...{self.bearer_token[-10:]}")
                     print("Token updated successfully, retrying request with new token...")
-                    
+
                     # Retry the request once with new token (headers will be regenerated)
                     response = request_func()
                     response.raise_for_status()
@@ -166,7 +250,7 @@ class DSGRestBrowser:
                 else:
                     print("Token refresh failed - no new token returned")
             raise
-    
+
     def list_directories(self, path="/SoftwarePackage"):
         """List files and directories using REST API with auto token refresh"""
         try:
@@ -295,11 +379,19 @@ class DSGRestBrowser:
 WebDAVBrowser = DSGRestBrowser
 
 class ProjectGenerator:
-    def __init__(self, parent_window=None):
+    def __init__(self, parent_window=None, prompts=None):
+        """
+        Args:
+            parent_window: Main Tk window, or None when running without a GUI
+            prompts: Prompt policy for messages, selections and download progress
+                (see generators.prompts). Defaults to the Tk dialogs when a
+                parent window is given, otherwise to ConsolePrompts.
+        """
         self.template_dir = TEMPLATE_DIR
         self.helper_structure = HELPER_STRUCTURE
         self.dsg_api_browser = None
         self.parent_window = parent_window  # Rename to parent_window for consistency
+        self.prompts = prompts if prompts is not None else self._default_prompts(parent_window)
         self.detection_manager = DetectionManager()
 
         # Enable file detection by default
@@ -320,6 +412,17 @@ class ProjectGenerator:
             ),
         )
 
+    @staticmethod
+    def _default_prompts(parent_window):
+        """Tk dialogs for a GUI parent window, console prompts otherwise (Tk is only imported for the GUI)"""
+        if parent_window is None:
+            return ConsolePrompts()
+        try:
+            from .dialogs.generator_prompts import TkPrompts
+        except ImportError:
+            from dialogs.generator_prompts import TkPrompts
+        return TkPrompts(parent_window)
+
     def create_dsg_api_browser(self, base_url, username=None, password=None, bearer_token=None, api_version="new"):
         """Create a new DSG REST API browser instance"""
         self.dsg_api_browser = DSGRestBrowser(base_url, username, password, bearer_token, api_version)
@@ -378,10 +481,32 @@ class ProjectGenerator:
             # Generate environments.json if environments are configured
             self._generate_environments_json(output_dir, config, tracker)
 
+            # Resolve and pin component versions if enabled
+            self._pin_component_versions(output_dir, config, tracker)
+
+            # Write the download mirror list and the files mirrors must host
+            self._generate_mirror_files(output_dir, config, tracker)
+
+            # Write the store seed configuration for Store-LAN seeding
+            self._generate_seed_config(output_dir, config, tracker)
+
+            # Record size and checksum of the Launchers GKInstall downloads; with
+            # a window the summary is shown once the fetch is done
+            on_manifest_done = None
+            if self.parent_window is not None:
+                on_manifest_done = lambda: self.parent_window.after(
+                    0, lambda: self._show_generation_summary(tracker))
+            manifest_fetch = self._generate_download_manifest(output_dir, config, tracker, on_manifest_done)
+
             # Update tracker with absolute output dir for Open Folder button
             tracker._config_snapshot["output_dir"] = output_dir
 
-            self._show_generation_summary(tracker)
+            if manifest_fetch is None:
+                self._show_generation_summary(tracker)
+            elif on_manifest_done is None:
+                # Headless runs wait for the manifest before reporting
+                manifest_fetch.join()
+                self._show_generation_summary(tracker)
         except Exception as e:
             self._show_error(f"Failed to generate project: {str(e)}")
             # Print detailed error for debugging
@@ -425,6 +550,141 @@ class ProjectGenerator:
                 tracker.add_note("No environments configured")
         return result
 
+    def _pin_component_versions(self, output_dir, config, tracker=None):
+        """Resolve component versions once and write the pinned versions manifest"""
+        if not (config.get("use_default_versions", False) and config.get("pin_versions_at_build", False)):
+            remove_version_manifest(output_dir)
+            return None
+
+        version_source = normalize_version_source(config.get("default_version_source", "FP"))
+        versions = resolve_component_versions(config)
+        manifest_text = build_version_manifest(versions, config, version_source) if versions else None
+
+        if not manifest_text:
+            # Never ship pins from an earlier build; GKInstall falls back to the API
+            remove_version_manifest(output_dir)
+            print("[VERSION PIN] Could not resolve component versions, scripts will query the API")
+            if tracker:
+                tracker.add_note("Version pinning failed - scripts will fetch versions from the API")
+            return None
+
+        manifest_path = write_version_manifest(output_dir, manifest_text)
+        if tracker:
+            pinned = sum(1 for data in versions.values() if data.get("value"))
+            tracker.add_file("versions/pinned_versions.properties", GenerationTracker.CONFIGS)
+            tracker.add_note(f"{pinned}/{len(versions)} component versions pinned ({version_source})")
+        return manifest_path
+
+    def _generate_mirror_files(self, output_dir, config, tracker=None):
+        """Write helper/mirrors/ if download mirrors are configured"""
+        mirrors_path = write_mirror_files(output_dir, config, read_version_manifest(output_dir))
+        if mirrors_path and tracker:
+            tracker.add_file("mirrors/mirrors.txt", GenerationTracker.CONFIGS)
+            tracker.add_file("mirrors/mirror_manifest.txt", GenerationTracker.CONFIGS)
+            tracker.add_note("Download mirrors configured - see helper/mirrors/mirror_manifest.txt for the files to host")
+        return mirrors_path
+
+    def _generate_seed_config(self, output_dir, config, tracker=None):
+        """Write helper/seed/seed.txt if a store seed is configured"""
+        seed_path = write_seed_config(output_dir, config)
+        if seed_path and tracker:
+            tracker.add_file("seed/seed.txt", GenerationTracker.CONFIGS)
+            tracker.add_note("Store-LAN seeding configured - the seed workstation serves the offline artifacts to its peers")
+        return seed_path
+
+    def _generate_download_manifest(self, output_dir, config, tracker=None, on_done=None):
+        """Write helper/downloads/download_manifest.txt if download verification is enabled
+
+        Entries of unchanged Launchers are reused; the others are fetched in a
+        worker thread that reports through the same progress as other downloads.
+
+        Args:
+            on_done: Optional callable run by the worker once the manifest is saved or the fetch cancelled
+
+        Returns:
+            threading.Thread: The fetch worker, or None if nothing had to be fetched
+        """
+        planned = plan_download_manifest(output_dir, config, read_version_manifest(output_dir))
+        if planned is None:
+            if tracker and config.get("verify_launcher_downloads", False):
+                tracker.add_note("Launcher download verification skipped - versions not known at build time")
+            return None
+
+        entries, to_fetch = planned
+        if not to_fetch:
+            manifest_path = save_download_manifest(output_dir, entries)
+            if tracker:
+                if manifest_path:
+                    tracker.add_file("downloads/download_manifest.txt", GenerationTracker.CONFIGS)
+                    tracker.add_note("Launcher downloads are verified against helper/downloads/download_manifest.txt")
+                else:
+                    tracker.add_note("Launcher download verification skipped - no components selected")
+            return None
+
+        events = queue.Queue()
+        progress = self.prompts.create_download_progress(len(to_fetch))
+        completed_files = 0
+
+        def process_events():
+            """Forward fetch events to the progress reporter; True when all Launchers are done"""
+            nonlocal completed_files
+            while not events.empty():
+                status, data = events.get_nowait()
+                if status == "progress":
+                    component, path, downloaded, total = data
+                    progress.file_progress(path, component, downloaded, total)
+                else:
+                    component, path, error = data
+                    completed_files += 1
+                    if error is None:
+                        progress.file_complete(path, component, completed_files)
+                    else:
+                        progress.file_error(path, component, str(error), completed_files)
+            return completed_files >= len(to_fetch)
+
+        def fetch():
+            errors = []
+
+            def on_result(component, path, error):
+                if error is not None:
+                    errors.append(f"Could not fetch {component} Launcher ({path}): {error}")
+                events.put(("result", (component, path, error)))
+
+            try:
+                fetched = fetch_download_manifest_entries(
+                    config, to_fetch,
+                    on_progress=lambda *data: events.put(("progress", data)),
+                    on_result=on_result,
+                    should_stop=lambda: progress.cancelled
+                )
+            except FetchCancelled:
+                print("[DOWNLOAD MANIFEST] Cancelled, download manifest not updated")
+                if tracker:
+                    tracker.add_note("Launcher checksum fetch cancelled - download manifest not updated")
+            except Exception as e:
+                print(f"[DOWNLOAD MANIFEST] ERROR: {e}")
+                if tracker:
+                    tracker.add_note(f"Download manifest not written: {e}")
+                progress.finish([f"Download manifest not written: {e}"], self.prompts)
+            else:
+                manifest_path = save_download_manifest(output_dir, entries + fetched)
+                if tracker and manifest_path:
+                    tracker.add_file("downloads/download_manifest.txt", GenerationTracker.CONFIGS)
+                    tracker.add_note(f"Launcher checksums: {len(entries)} reused, {len(fetched)} fetched - "
+                                     "Launchers GKInstall downloads are verified against "
+                                     "helper/downloads/download_manifest.txt")
+                if tracker and errors:
+                    tracker.add_note(f"{len(errors)} Launcher(s) could not be fetched and are not verified")
+                progress.finish(errors, self.prompts)
+            finally:
+                if on_done:
+                    on_done()
+
+        progress.start(process_events)
+        worker = threading.Thread(target=fetch, daemon=True)
+        worker.start()
+        return worker
+
     def _generate_gk_install(self, output_dir, config, tracker=None):
         """Generate GKInstall script with replaced values based on platform"""
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -573,48 +833,192 @@ class ProjectGenerator:
         replace_urls_in_json(data, new_base_url)
 
     def _show_error(self, message):
-        """Show error dialog"""
-        dialog = ctk.CTkInputDialog(
-            text=f"Error: {message}",
-            title="Error"
-        )
-        dialog.destroy()
+        """Show error message (delegates to the prompt policy)"""
+        self.prompts.show_error(message)
 
     def _show_success(self, message):
-        """Show success dialog"""
-        dialog = ctk.CTkInputDialog(
-            text=message,
-            title="Success"
-        )
-        dialog.destroy()
+        """Show success message (delegates to the prompt policy)"""
+        self.prompts.show_success(message)
 
     def _show_generation_summary(self, tracker):
-        """Show generation summary dialog"""
-        if self.parent_window:
-            try:
-                from .dialogs.generation_summary import GenerationSummaryDialog
-            except ImportError:
-                from dialogs.generation_summary import GenerationSummaryDialog
-            GenerationSummaryDialog(self.parent_window, tracker)
-        else:
-            # No GUI — print summary to console (for tests / CLI usage)
-            print(f"\nGeneration complete: {tracker.get_total_file_count()} files generated")
-            for note in tracker.get_notes():
-                print(f"  - {note}")
+        """Show generation summary (dialog with a GUI, console output otherwise)"""
+        self.prompts.show_generation_summary(tracker)
 
     def _ask_download_dependencies_only(self, component_type, parent=None, error_message=None):
         """Ask user if they want to download dependencies even if component files are not found"""
-        try:
-            from .dialogs import ask_download_dependencies_only
-        except ImportError:
-            from dialogs.download_dialogs import ask_download_dependencies_only
-        return ask_download_dependencies_only(component_type, parent or self.parent_window, error_message)
+        return self.prompts.ask_download_dependencies_only(component_type, parent, error_message)
+
+    def _prompt_for_file_selection(self, files, component_type, dialog_parent, parent_window, **kwargs):
+        """Select installer files, asking through the prompt policy when there is a choice"""
+        return prompt_for_file_selection(files, component_type, dialog_parent, parent_window,
+                                         prompts=self.prompts, **kwargs)
 
     def get_component_version(self, system_type, config):
         """Determine the correct version for a component based on its system type"""
         return get_component_version(system_type, config)
 
-    def prepare_offline_package(self, config, selected_components, dialog_parent=None):
+    def _collect_offline_files(self, config, selected_components, dialog_parent, output_dir, download_errors,
+                               dsg_api_browser=None):
+        """Resolve the files to download for the selected components and platform dependencies.
+
+        All component listings and installer.properties files are fetched
+        concurrently up front; the selection steps then read them from the
+        listing cache of dsg_api_browser (a CachedListingBrowser).
+
+        Returns:
+            list: (remote_path, local_path, file_name, component_type) tuples
+        """
+        files_to_download = []
+        platform_dependencies = config.get("platform_dependencies", {})
+
+        # Pre-scan: fetch installer.properties from selected component version directories
+        print("\n=== Pre-scanning for installer.properties ===")
+        component_version_map = {
+            "POS": ("pos", "CSE-OPOS-CLOUD"),
+            "ONEX-POS": ("onex_pos", "CSE-OPOS-ONEX-CLOUD"),
+            "WDM": ("wdm", "CSE-wdm"),
+            "FLOW-SERVICE": ("flow_service", "GKR-FLOWSERVICE-CLOUD"),
+            "LPA-SERVICE": ("lpa_service", "CSE-lps-lpa"),
+            "STOREHUB-SERVICE": ("storehub_service", "CSE-sh-cloud"),
+            "RCS-SERVICE": ("rcs", "GKR-Resource-Cache-Service"),
+            "MQTT-BROKER": ("mqtt_broker", "GKR-Store-MQTT-Broker"),
+        }
+
+        browser = dsg_api_browser or CachedListingBrowser(self.dsg_api_browser)
+
+        version_paths = []
+        for comp_key, (cfg_key, default_sys_type) in component_version_map.items():
+            if comp_key in selected_components:
+                system_type = config.get(f"{cfg_key}_system_type") or default_sys_type
+                version_to_use = self.get_component_version(system_type, config)
+                version_paths.append(f"/SoftwarePackage/{system_type}/{version_to_use}")
+
+        dependency_paths = [
+            path for dep_key, path in (
+                ("JAVA", "/SoftwarePackage/Java"),
+                ("TOMCAT", "/SoftwarePackage/Tomcat"),
+                ("JAYBIRD", "/SoftwarePackage/Drivers"),
+            ) if platform_dependencies.get(dep_key, False)
+        ]
+
+        all_installer_properties = prefetch_offline_metadata(browser, version_paths, dependency_paths)
+
+        installer_preferences = build_installer_preferences(all_installer_properties, config)
+
+        if all_installer_properties:
+            print(f"[INSTALLER PROPS] Pre-scan complete: found properties in {len(all_installer_properties)} component(s)")
+        else:
+            print("[INSTALLER PROPS] Pre-scan complete: no installer.properties found in any component")
+        print("=== End pre-scan ===\n")
+
+        # Process platform dependencies
+        process_platform_dependency(
+            "Java", "JAVA", "/SoftwarePackage/Java", "zip",
+            platform_dependencies, browser,
+            self._ask_download_again, dialog_parent,
+            output_dir, files_to_download, download_errors,
+            self._prompt_for_file_selection, config,
+            installer_preferences=installer_preferences, prompts=self.prompts
+        )
+        process_platform_dependency(
+            "Tomcat", "TOMCAT", "/SoftwarePackage/Tomcat", "zip",
+            platform_dependencies, browser,
+            self._ask_download_again, dialog_parent,
+            output_dir, files_to_download, download_errors,
+            self._prompt_for_file_selection, config,
+            installer_preferences=installer_preferences, prompts=self.prompts
+        )
+        process_platform_dependency(
+            "Jaybird", "JAYBIRD", "/SoftwarePackage/Drivers", "jar",
+            platform_dependencies, browser,
+            self._ask_download_again, dialog_parent,
+            output_dir, files_to_download, download_errors,
+            self._prompt_for_file_selection, config,
+            file_filter=lambda files: [f for f in files if f.get('name', '').endswith('.jar')],
+            installer_preferences=installer_preferences, prompts=self.prompts
+        )
+
+        # Process application components
+        process_component(
+            "POS", "POS", "pos", "CSE-OPOS-CLOUD",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "ONEX-POS", "ONEX-POS", "onex_pos", "CSE-OPOS-ONEX-CLOUD",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="OneX POS Client",
+            installer_preferences=installer_preferences
+        )
+        process_onex_ui_package(
+            selected_components, output_dir, config, self.get_component_version,
+            browser, files_to_download,
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "WDM", "WDM", "wdm", "CSE-wdm",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "FLOW-SERVICE", "FLOW-SERVICE", "flow_service", "GKR-FLOWSERVICE-CLOUD",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="Flow Service",
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "LPA", "LPA-SERVICE", "lpa_service", "CSE-lps-lpa",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="LPA Service",
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "SH", "STOREHUB-SERVICE", "storehub_service", "CSE-sh-cloud",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="StoreHub Service",
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "RCS", "RCS-SERVICE", "rcs", "GKR-Resource-Cache-Service",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="RCS Service",
+            installer_preferences=installer_preferences
+        )
+        process_component(
+            "MQTT-BROKER", "MQTT-BROKER", "mqtt_broker", "GKR-Store-MQTT-Broker",
+            selected_components, output_dir, config, self.get_component_version,
+            browser, self._prompt_for_file_selection,
+            files_to_download, dialog_parent, self.parent_window,
+            display_name="Store MQTT Broker",
+            installer_preferences=installer_preferences
+        )
+
+        return files_to_download
+
+    def prepare_offline_package(self, config, selected_components, dialog_parent=None, dry_run=False, plan_path=None,
+                                previous_manifest_path=None):
+        """Plan and download the offline package files.
+
+        A download plan (files, sizes, disk space check, duration estimate) is
+        always written to the output directory first. With dry_run the method
+        stops after planning; with plan_path a previously saved plan is executed
+        instead of resolving the selection again. With previous_manifest_path
+        only new or changed artifacts are downloaded (delta package).
+        """
         try:
             import threading
             import queue
@@ -674,6 +1078,7 @@ class ProjectGenerator:
                     config.get("bearer_token"),  # Add bearer token support
                     config.get("api_version", "new")  # Legacy/New API version
                 )
+                self.dsg_api_browser.token_manager = get_token_manager(config["base_url"], config)
                 success, message = self.dsg_api_browser.connect()
                 if not success:
                     raise Exception(f"Failed to connect to DSG REST API: {message}")
@@ -683,391 +1088,165 @@ class ProjectGenerator:
             download_queue = queue.Queue()
             downloaded_files = []
             download_errors = []
-            # Collect all files to download first
-            files_to_download = []
-
-            # Pre-scan: fetch installer.properties from selected component version directories
-            print("\n=== Pre-scanning for installer.properties ===")
-            all_installer_properties = {}
-            component_version_map = {
-                "POS": ("pos", "CSE-OPOS-CLOUD"),
-                "ONEX-POS": ("onex_pos", "CSE-OPOS-ONEX-CLOUD"),
-                "WDM": ("wdm", "CSE-wdm"),
-                "FLOW-SERVICE": ("flow_service", "GKR-FLOWSERVICE-CLOUD"),
-                "LPA-SERVICE": ("lpa_service", "CSE-lps-lpa"),
-                "STOREHUB-SERVICE": ("storehub_service", "CSE-sh-cloud"),
-                "RCS-SERVICE": ("rcs", "GKR-Resource-Cache-Service"),
-                "MQTT-BROKER": ("mqtt_broker", "GKR-Store-MQTT-Broker"),
-            }
-
-            for comp_key, (cfg_key, default_sys_type) in component_version_map.items():
-                if comp_key in selected_components:
-                    system_type = config.get(f"{cfg_key}_system_type") or default_sys_type
-                    version_to_use = self.get_component_version(system_type, config)
-                    version_path = f"/SoftwarePackage/{system_type}/{version_to_use}"
-                    props = fetch_installer_properties(self.dsg_api_browser, version_path)
-                    if props:
-                        all_installer_properties[version_path] = props
 
-            installer_preferences = build_installer_preferences(all_installer_properties, config)
-
-            if all_installer_properties:
-                print(f"[INSTALLER PROPS] Pre-scan complete: found properties in {len(all_installer_properties)} component(s)")
+            if plan_path:
+                # Execute a previously saved plan without resolving or prompting again
+                print(f"\nLoading download plan: {plan_path}")
+                plan = load_download_plan(plan_path)
+                plan = refresh_plan_disk_check(plan, output_dir)
+                files_to_download = plan_to_download_list(plan, output_dir)
             else:
-                print("[INSTALLER PROPS] Pre-scan complete: no installer.properties found in any component")
-            print("=== End pre-scan ===\n")
-
-            # Process platform dependencies
-            process_platform_dependency(
-                "Java", "JAVA", "/SoftwarePackage/Java", "zip",
-                platform_dependencies, self.dsg_api_browser,
-                self._ask_download_again, dialog_parent,
-                output_dir, files_to_download, download_errors,
-                prompt_for_file_selection, config,
-                installer_preferences=installer_preferences
-            )
-            process_platform_dependency(
-                "Tomcat", "TOMCAT", "/SoftwarePackage/Tomcat", "zip",
-                platform_dependencies, self.dsg_api_browser,
-                self._ask_download_again, dialog_parent,
-                output_dir, files_to_download, download_errors,
-                prompt_for_file_selection, config,
-                installer_preferences=installer_preferences
-            )
-            process_platform_dependency(
-                "Jaybird", "JAYBIRD", "/SoftwarePackage/Drivers", "jar",
-                platform_dependencies, self.dsg_api_browser,
-                self._ask_download_again, dialog_parent,
-                output_dir, files_to_download, download_errors,
-                prompt_for_file_selection, config,
-                file_filter=lambda files: [f for f in files if f.get('name', '').endswith('.jar')],
-                installer_preferences=installer_preferences
-            )
+                # Listings fetched during selection are reused to resolve the file sizes
+                browser = CachedListingBrowser(self.dsg_api_browser)
+                files_to_download = self._collect_offline_files(
+                    config, selected_components, dialog_parent, output_dir, download_errors,
+                    dsg_api_browser=browser
+                )
+                file_sizes = resolve_file_sizes(browser, files_to_download)
+                plan = build_download_plan(
+                    files_to_download, file_sizes, output_dir,
+                    selected_components, platform_dependencies
+                )
+                if previous_manifest_path:
+                    print(f"\nBuilding delta package against: {previous_manifest_path}")
+                    plan = apply_previous_manifest(plan, load_package_manifest(previous_manifest_path), output_dir)
+                plan_path = write_download_plan(plan, output_dir)
+                files_to_download = plan_to_download_list(plan, output_dir)
 
-            # Process application components
-            process_component(
-                "POS", "POS", "pos", "CSE-OPOS-CLOUD",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "ONEX-POS", "ONEX-POS", "onex_pos", "CSE-OPOS-ONEX-CLOUD",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="OneX POS Client",
-                installer_preferences=installer_preferences
-            )
-            process_onex_ui_package(
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, files_to_download,
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "WDM", "WDM", "wdm", "CSE-wdm",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "FLOW-SERVICE", "FLOW-SERVICE", "flow_service", "GKR-FLOWSERVICE-CLOUD",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="Flow Service",
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "LPA", "LPA-SERVICE", "lpa_service", "CSE-lps-lpa",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="LPA Service",
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "SH", "STOREHUB-SERVICE", "storehub_service", "CSE-sh-cloud",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="StoreHub Service",
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "RCS", "RCS-SERVICE", "rcs", "GKR-Resource-Cache-Service",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="RCS Service",
-                installer_preferences=installer_preferences
-            )
-            process_component(
-                "MQTT-BROKER", "MQTT-BROKER", "mqtt_broker", "GKR-Store-MQTT-Broker",
-                selected_components, output_dir, config, self.get_component_version,
-                self.dsg_api_browser, prompt_for_file_selection,
-                files_to_download, dialog_parent, self.parent_window,
-                display_name="Store MQTT Broker",
-                installer_preferences=installer_preferences
-            )
+            plan_summary = format_plan_summary(plan)
+            print(f"\n=== Download plan ===\n{plan_summary}\n=== End download plan ===\n")
 
             # If no files to download, return
             if not files_to_download:
+                if plan.get("reused_count") and not dry_run:
+                    # Delta package without changes: only the reuse instructions are shipped
+                    manifest = build_package_manifest(plan, {})
+                    write_package_manifest(manifest, output_dir)
+                    write_artifact_checksums(manifest, output_dir)
+                    write_artifact_index(manifest, output_dir)
+                    write_delta_file(plan, output_dir)
+                    return True, f"No artifacts changed since the previous package.\n\n{plan_summary}"
                 return False, "No files were selected for download"
-            
-            # Create progress dialog
-            parent = dialog_parent or self.parent_window
-            if parent:
-                progress_dialog, progress_bar, files_label, files_frame, file_progress_widgets, _ = create_progress_dialog(parent, len(files_to_download))
-            
+
+            if not plan["disk"]["sufficient"]:
+                return False, (f"Not enough free disk space in {output_dir}.\n\n{plan_summary}\n\n"
+                               f"Plan saved to: {plan_path}")
+
+            if dry_run:
+                return True, f"Dry run complete, nothing was downloaded.\n\n{plan_summary}\n\nPlan saved to: {plan_path}"
+
+            # Progress reporting (a window with a GUI, console lines otherwise)
+            progress = self.prompts.create_download_progress(len(files_to_download), dialog_parent)
+
             # Concurrency limiter to cap simultaneous downloads
             concurrency_limiter = threading.BoundedSemaphore(self.max_download_workers)
 
             # Start download threads
+            download_start_time = time.time()
+            checksums = {}  # remote_path -> SHA-256, filled by the download threads
             download_threads = []
             for remote_path, local_path, file_name, component_type in files_to_download:
                 thread = threading.Thread(
                     target=download_file_thread,
                     args=(remote_path, local_path, file_name, component_type,
                           download_queue, concurrency_limiter, self.dsg_api_browser,
-                          self._get_session(), self.download_chunk_size)
+                          self._get_session(), self.download_chunk_size, checksums)
                 )
                 thread.daemon = True
                 thread.start()
                 download_threads.append(thread)
-            
+
             # Initialize tracking variables
             completed_files = 0
-            file_progress = {}  # Track progress for each file
-            total_bytes = 0
-            downloaded_bytes = 0
-            
-            # Flag to track if dialog is still open
-            dialog_closed = [False]  # Using a list to allow modification in nested functions
-            
-            # Store references to UI elements that need to be accessed later
-            float_windows = [None]  # To store the floating window reference
-            downloads_cancelled = [False]  # To track if downloads are cancelled
-            
-            # Define cancel_downloads function first - make it simpler and more robust
-            def cancel_downloads(*args):
-                # Set the cancelled flag first
-                downloads_cancelled[0] = True
-                
-                # Force the loop to end by setting completed_files
-                nonlocal completed_files
-                completed_files = len(files_to_download)
-                
-                # Clear the download queue
-                while not download_queue.empty():
-                    try:
-                        download_queue.get_nowait()
-                    except:
-                        pass
-                
-                # Destroy the floating window if it exists
-                if float_windows[0] is not None:
-                    try:
-                        float_windows[0].destroy()
-                    except:
-                        pass
-                
-                # Make sure the main progress dialog is destroyed
-                try:
-                    progress_dialog.destroy()
-                except:
-                    pass
-                
-                # Show cancellation message
-                try:
-                    import tkinter.messagebox as messagebox
-                    messagebox.showinfo("Downloads Cancelled", "Download process has been cancelled.")
-                except:
-                    pass
-                
-                return True  # Return True to allow the window to close
-            
-            # Create a function to process the download queue in the main thread
+            file_progress = {}  # file name -> (downloaded, total)
+            for _, _, file_name, component_type in files_to_download:
+                file_progress[file_name] = (0, 0)
+
             def process_download_queue():
-                nonlocal completed_files, downloaded_bytes, total_bytes
-                
-                # Check if downloads were cancelled
-                if downloads_cancelled[0]:
-                    return
-                
-                # Process a limited number of items from the queue to keep UI responsive
+                """Forward queued download events to the progress reporter; True when all files are done"""
+                nonlocal completed_files
+
+                if progress.cancelled:
+                    # Drop pending events and stop polling
+                    while not download_queue.empty():
+                        try:
+                            download_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                    return True
+
+                # Process a limited number of items per call to keep a UI responsive
                 queue_items_processed = 0
                 max_items_per_cycle = 10
-                
+
                 while not download_queue.empty() and queue_items_processed < max_items_per_cycle:
                     try:
                         status, data = download_queue.get_nowait()
                         queue_items_processed += 1
-                        
-                        # Skip updates if dialog was closed
-                        if dialog_closed[0]:
-                            continue
-                        
+
                         if status == "progress":
-                            # Update file progress
                             file_name, component_type, downloaded, total = data
-                            
-                            # Store the progress in the file_progress dictionary
                             file_progress[file_name] = (downloaded, total)
-                            
-                            # Create progress bar for this file if it doesn't exist yet
-                            if file_name not in file_progress_widgets:
-                                file_frame = ctk.CTkFrame(files_frame)
-                                file_frame.pack(fill="x", padx=10, pady=(0, 5))
-                                
-                                file_label = ctk.CTkLabel(file_frame, text=f"{file_name} ({component_type})", anchor="w")
-                                file_label.pack(side="top", fill="x")
-                                
-                                file_progress_bar = ctk.CTkProgressBar(file_frame, width=400)
-                                file_progress_bar.pack(side="top", fill="x", pady=(0, 5))
-                                file_progress_bar.set(0)
-                                
-                                file_progress_widgets[file_name] = (file_frame, file_label, file_progress_bar)
-                            
-                            # Update progress bar for this file
-                            _, _, file_progress_bar = file_progress_widgets[file_name]
-                            if total > 0:
-                                progress_value = downloaded / total
-                                file_progress_bar.set(progress_value)
-                            
-                            # Calculate and update total progress
-                            nonlocal downloaded_bytes, total_bytes
+                            progress.file_progress(file_name, component_type, downloaded, total)
+
                             downloaded_bytes = sum(d for d, _ in file_progress.values())
                             total_bytes = sum(t for _, t in file_progress.values() if t > 0)
-                            
-                            if total_bytes > 0:
-                                # Calculate overall percentage for the label
-                                overall_percentage = downloaded_bytes / total_bytes * 100
-                                
-                                # Update the main progress bar
-                                progress_value = downloaded_bytes / total_bytes
-                                progress_bar.set(progress_value)
-                                
-                                # Update the files label with percentage
-                                files_label.configure(text=f"{completed_files}/{len(files_to_download)} files completed ({overall_percentage:.1f}%)")
-                            
-                            # Force an update of the dialog to ensure changes are visible
-                            progress_dialog.update_idletasks()
-                        
+                            progress.overall_progress(completed_files, downloaded_bytes, total_bytes)
+
                         elif status == "complete":
                             file_name, component_type = data
                             completed_files += 1
                             print(f"File completed: {file_name} (Total: {completed_files}/{len(files_to_download)})")
-                            
-                            # Update file progress widget to show completion
-                            if file_name in file_progress_widgets:
-                                _, file_label, file_progress_bar = file_progress_widgets[file_name]
-                                file_progress_bar.set(1.0)  # Set to 100%
-                                file_label.configure(text=f"{file_name} ({component_type}) - Complete")
-                            
-                            # Update overall progress
-                            files_label.configure(text=f"{completed_files}/{len(files_to_download)} files completed")
-                            progress_bar.set(completed_files / len(files_to_download))
-                            
-                            # Force an update of the dialog to ensure changes are visible
-                            progress_dialog.update_idletasks()
-                        
+                            progress.file_complete(file_name, component_type, completed_files)
+
                         elif status == "error":
                             file_name, component_type, error_message = data
-                            completed_files += 1  # Count errors as completed to allow dialog to close
+                            completed_files += 1  # Count errors as completed to allow the run to finish
                             print(f"File error: {file_name} (Total: {completed_files}/{len(files_to_download)})")
-                            
-                            # Update file progress widget
-                            if file_name in file_progress_widgets:
-                                _, file_label, file_progress_bar = file_progress_widgets[file_name]
-                                file_label.configure(text=f"{file_name} ({component_type}) - Error: {error_message}")
-                            
-                            # Add to download errors
                             download_errors.append(f"Error downloading {file_name} ({component_type}): {error_message}")
-                            
-                            # Force an update of the dialog to ensure changes are visible
-                            progress_dialog.update_idletasks()
+                            progress.file_error(file_name, component_type, error_message, completed_files)
                     except Exception as e:
                         print(f"Error processing download queue: {e}")
-                
-                # Check if all downloads are complete
-                if completed_files >= len(files_to_download):
-                    # All downloads complete, close dialog if it's still open
-                    if not dialog_closed[0]:
-                        dialog_closed[0] = True
-                        try:
-                            progress_dialog.destroy()
-                        except:
-                            pass
-                        
-                        # Show success or error message
-                        if download_errors:
-                            error_message = "\n".join(download_errors)
-                            self._show_error(f"Some files failed to download:\n{error_message}")
-                        else:
-                            self._show_success("All files downloaded successfully")
-                else:
-                    # Schedule the next queue processing
-                    if parent and not downloads_cancelled[0]:
-                        parent.after(100, process_download_queue)
-            
-            # Define dialog close handler
-            def on_dialog_close():
-                # Show confirmation dialog asking if user wants to interrupt the download
-                try:
-                    import tkinter.messagebox as messagebox
-                    if messagebox.askyesno("Interrupt Download", "The download will be interrupted if you close this window. Do you want to continue?"):
-                        # User confirmed they want to cancel the download
-                        cancel_downloads()
-                    else:
-                        # User chose to continue downloading, don't close the dialog
-                        return
-                except Exception as e:
-                    print(f"Error showing confirmation dialog: {e}")
-                    # If there's an error showing the dialog, default to cancelling
-                    cancel_downloads()
-                
-                return True  # Return True to allow the window to close
-            
-            # Store the cancel flag
-            progress_dialog.protocol("WM_DELETE_WINDOW", on_dialog_close)
-            
-            # Calculate total bytes if available
-            for _, _, file_name, component_type in files_to_download:
-                file_progress[file_name] = (0, 0)  # (downloaded, total)
-            
-            # Start processing the download queue in the main thread
-            if parent:
-                parent.after(100, process_download_queue)
-            
-            # Create a monitoring thread to check if all downloads are complete
+
+                return completed_files >= len(files_to_download)
+
+            progress.start(process_download_queue)
+
+            # Create a monitoring thread to finish the package once all downloads are complete
             def monitor_downloads():
-                while completed_files < len(files_to_download) and not downloads_cancelled[0]:
+                while completed_files < len(files_to_download) and not progress.cancelled:
                     time.sleep(0.5)
-                
-                # If we're here, either all downloads are complete or they were cancelled
-                if not downloads_cancelled[0] and not dialog_closed[0]:
-                    # All downloads complete, close dialog
-                    dialog_closed[0] = True
+
+                if progress.cancelled:
+                    return
+
+                # Feed the measured throughput into future plan estimates
+                downloaded_size = sum(
+                    os.path.getsize(local_path)
+                    for _, local_path, _, _ in files_to_download
+                    if os.path.isfile(local_path)
+                )
+                record_download_throughput(output_dir, downloaded_size, time.time() - download_start_time)
+
+                # Write the package manifest (and delta instructions) for complete packages only
+                if not download_errors:
                     try:
-                        parent.after_idle(progress_dialog.destroy)
-                    except:
-                        pass
-                    
-                    # Show success or error message
-                    if download_errors:
-                        error_message = "\n".join(download_errors)
-                        parent.after_idle(lambda: self._show_error(f"Some files failed to download:\n{error_message}"))
-                    else:
-                        parent.after_idle(lambda: self._show_success("All files downloaded successfully"))
-            
+                        manifest = build_package_manifest(plan, checksums)
+                        write_package_manifest(manifest, output_dir)
+                        write_artifact_checksums(manifest, output_dir)
+                        write_artifact_index(manifest, output_dir)
+                        write_delta_file(plan, output_dir)
+                    except Exception as e:
+                        print(f"[DELTA] WARNING: Failed to write package manifest: {e}")
+
+                progress.finish(download_errors, self.prompts)
+
             # Start monitoring thread
             monitor_thread = threading.Thread(target=monitor_downloads)
             monitor_thread.daemon = True
             monitor_thread.start()
-            
+            self._download_monitor = monitor_thread  # Lets scripts wait for the package to finish
+
             # Return immediately, downloads will continue in background
             return True, "Downloads started"
             
@@ -1080,19 +1259,11 @@ class ProjectGenerator:
 
     def _ask_download_again(self, component_type, existing_files, parent=None):
         """Ask the user if they want to download files again when they already exist"""
-        try:
-            from .dialogs import ask_download_again
-        except ImportError:
-            from dialogs.download_dialogs import ask_download_again
-        return ask_download_again(component_type, existing_files, parent or self.parent_window)
+        return self.prompts.ask_download_again(component_type, existing_files, parent)
 
     def _show_info(self, title, message):
-        """Show an info message dialog."""
-        if self.parent_window:
-            import tkinter.messagebox as messagebox
-            messagebox.showinfo(title, message)
-        else:
-            print(f"\n{title}: {message}")
+        """Show an info message (delegates to the prompt policy)"""
+        self.prompts.show_info(title, message)
 
     def _create_default_templates(self, launchers_dir):
         """Create default templates in the source directory"""
@@ -3,7 +3,12 @@ Generator modules for creating installation scripts and templates
 """
 
 from .template_processor import replace_hostname_regex_powershell, replace_hostname_regex_bash
-from .launcher_generator import generate_launcher_templates, create_default_template
+from .launcher_generator import (
+    generate_launcher_templates,
+    create_default_template,
+    prerender_launcher_template,
+    INSTALL_TIME_TOKENS
+)
 from .onboarding_generator import generate_onboarding_script
 from .gk_install_generator import generate_gk_install
 from .helper_file_generator import (
@@ -12,24 +17,82 @@ from .helper_file_generator import (
     create_component_files,
     create_init_json_files,
     modify_json_files,
+    render_onboarding_payloads,
+    get_store_cache_ttl,
     copy_helper_files,
-    generate_environments_json
+    generate_environments_json,
+    write_environment_index
 )
 from .offline_package_helpers import (
     download_file_thread,
-    create_progress_dialog,
     prompt_for_file_selection,
+    default_file_selection,
+    prompt_for_version_selection,
     process_platform_dependency,
     process_component,
     process_onex_ui_package,
     fetch_installer_properties,
-    build_installer_preferences
+    build_installer_preferences,
+    CachedListingBrowser,
+    prefetch_offline_metadata
+)
+from .prompts import ConsolePrompts, ConsoleDownloadProgress
+from .offline_download_plan import (
+    resolve_file_sizes,
+    build_download_plan,
+    refresh_plan_disk_check,
+    write_download_plan,
+    load_download_plan,
+    plan_to_download_list,
+    record_download_throughput,
+    format_plan_summary
+)
+from .offline_package_manifest import (
+    load_package_manifest,
+    apply_previous_manifest,
+    build_package_manifest,
+    write_package_manifest,
+    get_artifact_role,
+    get_artifact_version,
+    build_artifact_index,
+    write_artifact_index,
+    write_delta_file
+)
+from .version_manifest import (
+    build_version_manifest,
+    write_version_manifest,
+    read_version_manifest,
+    remove_version_manifest
+)
+from .download_mirrors import (
+    normalize_mirror_urls,
+    build_mirror_list,
+    build_mirror_manifest,
+    write_mirror_files
+)
+from .store_seed import (
+    parse_seed_address,
+    build_seed_config,
+    write_seed_config,
+    build_artifact_checksums,
+    write_artifact_checksums
+)
+from .download_manifest import (
+    build_download_manifest,
+    read_download_manifest,
+    plan_download_manifest,
+    fetch_download_manifest_entries,
+    save_download_manifest,
+    write_download_manifest,
+    FetchCancelled
 )
 
 __all__ = [
     'replace_hostname_regex_powershell',
     'replace_hostname_regex_bash',
     'generate_launcher_templates',
+    'prerender_launcher_template',
+    'INSTALL_TIME_TOKENS',
     'create_default_template',
     'generate_onboarding_script',
     'generate_gk_install',
@@ -38,14 +101,59 @@ __all__ = [
     'create_component_files',
     'create_init_json_files',
     'modify_json_files',
+    'render_onboarding_payloads',
+    'get_store_cache_ttl',
     'copy_helper_files',
     'generate_environments_json',
+    'write_environment_index',
     'download_file_thread',
-    'create_progress_dialog',
     'prompt_for_file_selection',
+    'default_file_selection',
+    'prompt_for_version_selection',
     'process_platform_dependency',
     'process_component',
     'process_onex_ui_package',
     'fetch_installer_properties',
-    'build_installer_preferences'
+    'build_installer_preferences',
+    'CachedListingBrowser',
+    'prefetch_offline_metadata',
+    'ConsolePrompts',
+    'ConsoleDownloadProgress',
+    'resolve_file_sizes',
+    'build_download_plan',
+    'refresh_plan_disk_check',
+    'write_download_plan',
+    'load_download_plan',
+    'plan_to_download_list',
+    'record_download_throughput',
+    'format_plan_summary',
+    'load_package_manifest',
+    'apply_previous_manifest',
+    'build_package_manifest',
+    'write_package_manifest',
+    'get_artifact_role',
+    'get_artifact_version',
+    'build_artifact_index',
+    'write_artifact_index',
+    'write_delta_file',
+    'build_version_manifest',
+    'write_version_manifest',
+    'read_version_manifest',
+    'remove_version_manifest',
+    'normalize_mirror_urls',
+    'build_mirror_list',
+    'build_mirror_manifest',
+    'write_mirror_files',
+    'parse_seed_address',
+    'build_seed_config',
+    'write_seed_config',
+    'build_artifact_checksums',
+    'write_artifact_checksums',
+    'build_download_manifest',
+    'read_download_manifest',
+    'plan_download_manifest',
+    'fetch_download_manifest_entries',
+    'save_download_manifest',
+    'write_download_manifest',
+    'FetchCancelled'
 ]
@@ -0,0 +1,258 @@
+"""
+Download Manifest
+
+In online mode GKInstall downloads the Launcher of its component. With
+'Verify Launcher Downloads' enabled, the generator fetches the Launcher of each
+selected component once and records its size and SHA-256 in
+'helper/downloads/download_manifest.txt':
+
+    SoftwarePackage/GKR-OPOS-CLOUD/v5.27.0/Launcher.exe|48213504|<sha256>
+
+The path holds system type and version, so an entry of an earlier build with
+the same path is reused instead of fetching the Launcher again.
+
+GKInstall resumes interrupted downloads, retries them with exponential backoff
+and rejects a Launcher (from DSG or a mirror) whose size or checksum does not
+match the manifest.
+"""
+
+import hashlib
+import os
+import requests
+
+try:
+    from gk_install_builder.generators.download_mirrors import get_mirror_paths
+    from gk_install_builder.integrations.version_resolver import generate_api_token
+except ImportError:
+    from generators.download_mirrors import get_mirror_paths
+    from integrations.version_resolver import generate_api_token
+
+
+DOWNLOAD_MANIFEST_DIR = os.path.join("helper", "downloads")
+DOWNLOAD_MANIFEST_FILENAME = "download_manifest.txt"
+CHUNK_SIZE = 1024 * 1024
+REQUEST_TIMEOUT = 60  # seconds
+DEFAULT_VERIFY_COMPONENTS = {"POS": True}
+
+
+class FetchCancelled(Exception):
+    """Raised when a Launcher fetch is cancelled"""
+
+
+def fetch_artifact_checksum(url, bearer_token=None, timeout=REQUEST_TIMEOUT, verify=True,
+                            progress_callback=None, should_stop=None):
+    """
+    Stream a file and compute its size and SHA-256 without storing it.
+
+    Args:
+        verify: Verify the TLS certificate of the server
+        progress_callback: Optional callable (downloaded, total) called per chunk
+        should_stop: Optional callable; the fetch is cancelled once it returns True
+
+    Returns:
+        tuple: (size in bytes, SHA-256 hex digest)
+
+    Raises:
+        requests.RequestException: If the download fails
+        FetchCancelled: If should_stop() returned True
+    """
+    headers = {"Authorization": f"Bearer {bearer_token}"} if bearer_token else {}
+    digest = hashlib.sha256()
+    size = 0
+    with requests.get(url, headers=headers, stream=True, timeout=timeout, verify=verify) as response:
+        response.raise_for_status()
+        total = int(response.headers.get("Content-Length") or 0)
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if should_stop and should_stop():
+                raise FetchCancelled(url)
+            digest.update(chunk)
+            size += len(chunk)
+            if progress_callback:
+                progress_callback(size, total)
+    return size, digest.hexdigest()
+
+
+def build_download_manifest(entries):
+    """
+    Build the content of download_manifest.txt.
+
+    Args:
+        entries: List of (relative path, size, sha256) tuples
+
+    Returns:
+        str: Manifest text
+    """
+    lines = ["# Size and SHA-256 of the files GKInstall downloads (<path>|<size>|<sha256>)"]
+    lines += [f"{path}|{size}|{sha256}" for path, size, sha256 in entries]
+    return "\n".join(lines) + "\n"
+
+
+def read_download_manifest(output_dir):
+    """
+    Read the download manifest of a generated package.
+
+    Returns:
+        dict: relative path -> (size, sha256), empty if there is no manifest
+    """
+    manifest_path = os.path.join(output_dir, DOWNLOAD_MANIFEST_DIR, DOWNLOAD_MANIFEST_FILENAME)
+    entries = {}
+    if not os.path.exists(manifest_path):
+        return entries
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or line.count("|") != 2:
+                continue
+            path, size, sha256 = line.split("|")
+            entries[path] = (int(size), sha256)
+    return entries
+
+
+def remove_download_manifest(output_dir):
+    """Remove a download manifest left over from an earlier build."""
+    manifest_path = os.path.join(output_dir, DOWNLOAD_MANIFEST_DIR, DOWNLOAD_MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+        print(f"[DOWNLOAD MANIFEST] Removed stale {DOWNLOAD_MANIFEST_FILENAME}")
+
+
+def get_verified_launcher_paths(config, pinned_versions=None):
+    """
+    Launchers of the components selected for download verification.
+
+    Returns:
+        list: (component, relative path) tuples
+    """
+    selected = config.get("verify_launcher_components") or DEFAULT_VERIFY_COMPONENTS
+    return [(component, path) for component, path in get_mirror_paths(config, pinned_versions)
+            if selected.get(component)]
+
+
+def plan_download_manifest(output_dir, config, pinned_versions=None):
+    """
+    Split the Launchers to verify into entries of the current manifest and Launchers to fetch.
+
+    Returns:
+        tuple: (reused entries as (path, size, sha256), Launchers to fetch as
+            (component, path)), or None if verification is disabled or not possible
+    """
+    if not config.get("verify_launcher_downloads", False):
+        remove_download_manifest(output_dir)
+        return None
+
+    if config.get("use_default_versions", False) and not pinned_versions:
+        print("[DOWNLOAD MANIFEST] Versions are resolved at install time - pin versions at build time to verify downloads")
+        remove_download_manifest(output_dir)
+        return None
+
+    existing = read_download_manifest(output_dir)
+    reused, to_fetch = [], []
+    for component, path in get_verified_launcher_paths(config, pinned_versions):
+        if path in existing:
+            reused.append((path,) + existing[path])
+            print(f"[DOWNLOAD MANIFEST] {path}: unchanged, reusing recorded checksum")
+        else:
+            to_fetch.append((component, path))
+    return reused, to_fetch
+
+
+def fetch_download_manifest_entries(config, to_fetch, token_provider=None, on_progress=None, on_result=None,
+                                    should_stop=None):
+    """
+    Fetch Launchers one after the other and compute their manifest entries.
+
+    Launchers that cannot be fetched are left out and reported through
+    on_result; GKInstall still resumes and retries their download but cannot
+    verify them.
+
+    Args:
+        config: Configuration dictionary
+        to_fetch: List of (component, relative path) tuples
+        token_provider: Callable (base_url, config) -> bearer token
+        on_progress: Optional callable (component, path, downloaded, total)
+        on_result: Optional callable (component, path, error) called per Launcher;
+            error is None on success
+        should_stop: Optional callable; no further Launchers are fetched once it returns True
+
+    Returns:
+        list: (relative path, size, sha256) tuples
+
+    Raises:
+        FetchCancelled: If should_stop() returned True
+    """
+    base_url = config.get("base_url", "")
+    bearer_token = (token_provider or generate_api_token)(base_url, config)
+    if not bearer_token:
+        print("[DOWNLOAD MANIFEST] WARNING: No access token, downloads are not fetched for verification")
+
+    entries = []
+    for component, path in to_fetch:
+        if should_stop and should_stop():
+            raise FetchCancelled(path)
+        url = f"https://{base_url}/dsg/content/cep/{path}"
+        callback = None
+        if on_progress:
+            callback = lambda downloaded, total, component=component, path=path: on_progress(
+                component, path, downloaded, total)
+        try:
+            size, sha256 = fetch_artifact_checksum(url, bearer_token, progress_callback=callback,
+                                                   should_stop=should_stop)
+        except FetchCancelled:
+            raise
+        except requests.exceptions.SSLError as e:
+            print(f"[DOWNLOAD MANIFEST] WARNING: TLS certificate of {base_url} could not be verified: {e}")
+            if on_result:
+                on_result(component, path, f"TLS certificate of {base_url} could not be verified")
+            continue
+        except Exception as e:
+            print(f"[DOWNLOAD MANIFEST] WARNING: Could not fetch {component} Launcher ({path}): {e}")
+            if on_result:
+                on_result(component, path, e)
+            continue
+        entries.append((path, size, sha256))
+        print(f"[DOWNLOAD MANIFEST] {path}: {size} bytes")
+        if on_result:
+            on_result(component, path, None)
+    return entries
+
+
+def save_download_manifest(output_dir, entries):
+    """
+    Write the manifest, or remove it if there are no entries.
+
+    Returns:
+        str: Path of the manifest, or None if it was removed
+    """
+    if not entries:
+        remove_download_manifest(output_dir)
+        return None
+
+    manifest_path = os.path.join(output_dir, DOWNLOAD_MANIFEST_DIR, DOWNLOAD_MANIFEST_FILENAME)
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    with open(manifest_path, 'w', newline='\n') as f:
+        f.write(build_download_manifest(entries))
+    print(f"[DOWNLOAD MANIFEST] Download manifest written to {manifest_path}")
+    return manifest_path
+
+
+def write_download_manifest(output_dir, config, pinned_versions=None, token_provider=None):
+    """
+    Fetch the selected Launchers and write their size and checksum (headless runs).
+
+    Args:
+        output_dir: Output directory path
+        config: Configuration dictionary
+        pinned_versions: Optional dict component -> version pinned at build time
+        token_provider: Callable (base_url, config) -> bearer token
+
+    Returns:
+        str: Path of the manifest, or None if verification is disabled or not possible
+    """
+    planned = plan_download_manifest(output_dir, config, pinned_versions)
+    if planned is None:
+        return None
+
+    entries, to_fetch = planned
+    if to_fetch:
+        entries = entries + fetch_download_manifest_entries(config, to_fetch, token_provider)
+    return save_download_manifest(output_dir, entries)
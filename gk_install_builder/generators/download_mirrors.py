@@ -0,0 +1,167 @@
+"""
+Download Mirrors
+
+In online mode every workstation downloads its Launcher from DSG. When
+download mirrors are configured (a store server or a regional cache), the
+generator writes them to 'helper/mirrors/mirrors.txt' and GKInstall tries
+each mirror with a short timeout before falling back to DSG.
+
+mirrors.txt (one base URL per line, tried in order):
+
+    #timeout=5
+    http://store-server:8080/gk
+    https://cache.region.example.com/dsg
+
+'helper/mirrors/mirror_manifest.txt' lists the paths a mirror must host,
+relative to its base URL, for the versions configured in the package:
+
+    SoftwarePackage/GKR-OPOS-CLOUD/v5.27.0/Launcher.exe
+"""
+
+import os
+
+try:
+    from gk_install_builder.integrations.version_resolver import CONFIG_SERVICE_SYSTEM_TYPES
+except ImportError:
+    from integrations.version_resolver import CONFIG_SERVICE_SYSTEM_TYPES
+
+
+MIRRORS_DIR = os.path.join("helper", "mirrors")
+MIRRORS_FILENAME = "mirrors.txt"
+MIRROR_MANIFEST_FILENAME = "mirror_manifest.txt"
+DEFAULT_MIRROR_TIMEOUT = 5  # seconds
+
+# Component -> config key of its version
+COMPONENT_VERSION_KEYS = {
+    "POS": "pos_version",
+    "ONEX-POS": "onex_pos_version",
+    "WDM": "wdm_version",
+    "FLOW-SERVICE": "flow_service_version",
+    "LPA-SERVICE": "lpa_service_version",
+    "STOREHUB-SERVICE": "storehub_service_version",
+    "RCS-SERVICE": "rcs_version",
+    "MQTT-BROKER": "mqtt_broker_version",
+}
+
+
+def normalize_mirror_urls(mirrors):
+    """
+    Clean up the configured mirror list.
+
+    Args:
+        mirrors: List of URLs, or a string with one URL per line / comma separated
+
+    Returns:
+        list: Base URLs without trailing slash, https:// added if no scheme, no duplicates
+    """
+    if isinstance(mirrors, str):
+        mirrors = mirrors.replace(",", "\n").splitlines()
+
+    result = []
+    for mirror in mirrors or []:
+        mirror = str(mirror).strip().rstrip("/")
+        if not mirror:
+            continue
+        if "://" not in mirror:
+            mirror = f"https://{mirror}"
+        if mirror not in result:
+            result.append(mirror)
+    return result
+
+
+def build_mirror_list(mirrors, timeout=DEFAULT_MIRROR_TIMEOUT):
+    """
+    Build the content of mirrors.txt.
+
+    Returns:
+        str: File content, or None if no mirror is configured
+    """
+    mirrors = normalize_mirror_urls(mirrors)
+    if not mirrors:
+        return None
+    try:
+        timeout = max(1, int(timeout))
+    except (TypeError, ValueError):
+        timeout = DEFAULT_MIRROR_TIMEOUT
+
+    lines = [
+        "# Download mirrors tried in order before DSG (one base URL per line)",
+        f"#timeout={timeout}",
+    ]
+    return "\n".join(lines + mirrors) + "\n"
+
+
+def get_mirror_paths(config, pinned_versions=None):
+    """
+    Paths a mirror must host for the versions configured in the package.
+
+    Args:
+        config: Configuration dictionary
+        pinned_versions: Optional dict component -> version pinned at build time;
+            these take precedence over the configured versions
+
+    Returns:
+        list: (component, relative path) tuples
+    """
+    platform = config.get("platform", "Windows")
+    launcher_name = "Launcher.run" if platform == "Linux" else "Launcher.exe"
+    default_version = config.get("version", "v1.0.0")
+    pinned_versions = pinned_versions or {}
+
+    paths = []
+    for component, (system_type_key, default_system_type) in CONFIG_SERVICE_SYSTEM_TYPES.items():
+        system_type = config.get(system_type_key) or default_system_type
+        version = (pinned_versions.get(component)
+                   or config.get(COMPONENT_VERSION_KEYS[component])
+                   or default_version)
+        paths.append((component, f"SoftwarePackage/{system_type}/{version}/{launcher_name}"))
+    return paths
+
+
+def build_mirror_manifest(config, pinned_versions=None):
+    """
+    Build the content of mirror_manifest.txt.
+
+    Returns:
+        str: Manifest text
+    """
+    header = [
+        "# Files a download mirror must host, relative to its base URL",
+        f"# base_url={config.get('base_url', '')}",
+        f"# platform={config.get('platform', 'Windows')}",
+    ]
+    if config.get("use_default_versions", False) and not pinned_versions:
+        header.append("# Versions are resolved at install time and may differ - pin versions at build time to keep this list exact")
+    lines = [path for _component, path in get_mirror_paths(config, pinned_versions)]
+    return "\n".join(header + lines) + "\n"
+
+
+def write_mirror_files(output_dir, config, pinned_versions=None):
+    """
+    Write mirrors.txt and mirror_manifest.txt, or remove them if no mirror is configured.
+
+    Returns:
+        str: Path of mirrors.txt, or None if mirrors are not configured
+    """
+    mirrors_dir = os.path.join(output_dir, MIRRORS_DIR)
+    mirror_list = build_mirror_list(
+        config.get("download_mirrors", []),
+        config.get("download_mirror_timeout", DEFAULT_MIRROR_TIMEOUT)
+    )
+
+    if not mirror_list:
+        for filename in (MIRRORS_FILENAME, MIRROR_MANIFEST_FILENAME):
+            path = os.path.join(mirrors_dir, filename)
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"[MIRRORS] Removed stale {filename}")
+        return None
+
+    os.makedirs(mirrors_dir, exist_ok=True)
+    mirrors_path = os.path.join(mirrors_dir, MIRRORS_FILENAME)
+    with open(mirrors_path, 'w', newline='\n') as f:
+        f.write(mirror_list)
+    with open(os.path.join(mirrors_dir, MIRROR_MANIFEST_FILENAME), 'w', newline='\n') as f:
+        f.write(build_mirror_manifest(config, pinned_versions))
+    print(f"[MIRRORS] Download mirrors written to {mirrors_path}")
+    return mirrors_path
@@ -10,9 +10,11 @@ import os
 # Support both package-relative imports (for tests/package use) and direct imports (for running app)
 try:
     from ..utils import setup_firebird_environment_variables, determine_gk_install_paths, write_installation_script
+    from .helper_file_generator import get_store_cache_ttl
 except ImportError:
     from utils.environment_setup import setup_firebird_environment_variables
     from utils.file_operations import determine_gk_install_paths, write_installation_script
+    from generators.helper_file_generator import get_store_cache_ttl
 
 
 # Mapping from GKInstall ComponentType to launcher settings config key
@@ -280,6 +282,7 @@ def generate_gk_install(output_dir, config, detection_manager,
                 ("@RCS_SYSTEM_TYPE@", rcs_system_type),
                 ("@MQTT_BROKER_SYSTEM_TYPE@", mqtt_broker_system_type),
                 ("@TENANT_ID@", tenant_id),
+                ("@STORE_CACHE_TTL_MINUTES@", str(get_store_cache_ttl(config))),
                 # API endpoint replacements (replace new API URLs with configured version)
                 ("/api/iam/cim/rest/v1/onboarding/tokens", api_endpoints["onboarding_api"]),
                 ("/api/config/services/rest/infrastructure/v1/structure/child-nodes/search", api_endpoints["config_structure_search"]),
@@ -330,6 +333,7 @@ def generate_gk_install(output_dir, config, detection_manager,
                 ("@RCS_SYSTEM_TYPE@", rcs_system_type),
                 ("@MQTT_BROKER_SYSTEM_TYPE@", mqtt_broker_system_type),
                 ("@TENANT_ID@", tenant_id),
+                ("@STORE_CACHE_TTL_MINUTES@", str(get_store_cache_ttl(config))),
                 # API endpoint replacements (replace new API URLs with configured version)
                 ("/api/iam/cim/rest/v1/onboarding/tokens", api_endpoints["onboarding_api"]),
                 ("/api/config/services/rest/infrastructure/v1/structure/child-nodes/search", api_endpoints["config_structure_search"]),
@@ -414,7 +418,7 @@ def generate_gk_install(output_dir, config, detection_manager,
                 # 3-group regex: Environment, Store, Workstation
                 $hostnameEnv = $matches[{env_group}]
                 Write-Host "    Extracted environment from hostname: $hostnameEnv"
-                $selectedEnv = $environments | Where-Object {{ $_.alias -eq $hostnameEnv }} | Select-Object -First 1
+                $selectedEnv = Find-EnvironmentByAlias -Environments $environments -Alias $hostnameEnv
                 if ($selectedEnv) {{
                     Write-Host "    ✓ Matched environment: $($selectedEnv.name)"
                     return $selectedEnv
@@ -468,12 +472,7 @@ def generate_gk_install(output_dir, config, detection_manager,
       local hostname_env="${{BASH_REMATCH[{env_group}]}}"
       echo "    Extracted environment from hostname: $hostname_env" >&2
       local selected
-      if [ "$JQ_AVAILABLE" = true ]; then
-        selected=$(echo "$environments" | jq --arg alias "$hostname_env" '.environments[] | select(.alias == $alias)')
-      else
-        # Fallback: use bash to find the environment by alias
-        selected=$(json_select_by_alias "$environments" "$hostname_env")
-      fi
+      selected=$(env_select_by_alias "$environments" "$hostname_env") || selected=""
       if [ -n "$selected" ]; then
         echo "    ✓ Matched environment" >&2
         echo "$selected"
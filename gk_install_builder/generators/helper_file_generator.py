@@ -6,6 +6,7 @@ store initialization scripts, password files, JSON configuration files, etc.
 """
 
 import os
+import re
 import json
 import base64
 import time
@@ -18,6 +19,31 @@ except ImportError:
     from utils.helpers import replace_urls_in_json
 
 
+# Suffix of the onboarding payloads pre-rendered with afterOnboardingProperties
+ONBOARDING_RCS_SUFFIX = ".rcs.json"
+# The only token left in a pre-rendered payload, filled in by onboarding.sh/.ps1
+RCS_URL_TOKEN = "@RCS_URL@"
+# Minutes installations of the same store reuse the store structure, business
+# unit and RCS URL resolved by an earlier installation (0 disables the cache)
+DEFAULT_STORE_CACHE_TTL_MINUTES = 120
+
+
+def get_store_cache_ttl(config):
+    """
+    Get the per-store cache lifetime for the install scripts.
+
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        int: Minutes a cached entry is reused, 0 if caching is disabled
+    """
+    try:
+        return max(0, int(config.get("store_cache_ttl_minutes", DEFAULT_STORE_CACHE_TTL_MINUTES)))
+    except (TypeError, ValueError):
+        return DEFAULT_STORE_CACHE_TTL_MINUTES
+
+
 def generate_store_init_script(output_dir, config, templates_dir):
     """
     Generate store initialization script with platform-specific configuration
@@ -128,6 +154,9 @@ def generate_store_init_script(output_dir, config, templates_dir):
         rcs_skip_url = config.get("rcs_skip_url_config", False)
         template_content = template_content.replace("@RCS_SKIP_URL_CONFIG@", "true" if rcs_skip_url else "false")
 
+        # Add per-store cache lifetime
+        template_content = template_content.replace("@STORE_CACHE_TTL_MINUTES@", str(get_store_cache_ttl(config)))
+
         # Add version replacement
         template_content = template_content.replace("@VERSION@", version)
 
@@ -571,6 +600,45 @@ def modify_json_files(helper_dir, config, replace_urls_in_json_func):
         print(f"  Warning: Error modifying JSON files: {str(e)}")
 
 
+def render_onboarding_payloads(helper_dir):
+    """
+    Pre-render the onboarding payloads used when an RCS URL is passed.
+
+    For every component except RCS itself, '<name>.onboarding.rcs.json' holds
+    the onboarding payload with its afterOnboardingProperties already in place.
+    Only @RCS_URL@ is left, so the onboarding scripts fill in the URL with a
+    single string substitution instead of rewriting the JSON with jq or sed.
+
+    Args:
+        helper_dir: Helper directory containing the onboarding JSON files
+
+    Returns:
+        list: Paths of the rendered payloads
+    """
+    onboarding_dir = os.path.join(helper_dir, "onboarding")
+    if not os.path.isdir(onboarding_dir):
+        return []
+
+    rendered = []
+    for json_file in sorted(os.listdir(onboarding_dir)):
+        if not json_file.endswith(".onboarding.json") or json_file.startswith("rcs-service."):
+            continue
+        try:
+            with open(os.path.join(onboarding_dir, json_file), 'r') as f:
+                data = json.load(f)
+            data["afterOnboardingProperties"] = [{"key": "rcs.url", "value": RCS_URL_TOKEN}]
+
+            rendered_path = os.path.join(onboarding_dir, json_file[:-len(".json")] + ONBOARDING_RCS_SUFFIX)
+            with open(rendered_path, 'w', newline='\n') as f:
+                json.dump(data, f, indent=4)
+            rendered.append(rendered_path)
+        except Exception as e:
+            print(f"  Warning: Failed to pre-render {json_file}: {str(e)}")
+
+    print(f"  Pre-rendered {len(rendered)} onboarding payload(s) with afterOnboardingProperties")
+    return rendered
+
+
 def generate_override_files(helper_dir, config, templates_dir):
     """
     Generate installer override XML files for each component
@@ -703,6 +771,9 @@ def copy_helper_files(output_dir, config, script_dir, helper_structure, launcher
                 # Modify JSON files with the correct URLs and tenant_id
                 modify_json_files(helper_dst, config, replace_urls_in_json)
 
+                # Pre-render the onboarding payloads sent with an RCS URL
+                render_onboarding_payloads(helper_dst)
+
                 # Generate installer override files
                 generate_override_files(helper_dst, config, templates_dir)
 
@@ -764,6 +835,9 @@ def copy_helper_files(output_dir, config, script_dir, helper_structure, launcher
         # Modify JSON files with the correct URLs and tenant_id
         modify_json_files(helper_dst, config, replace_urls_in_json)
 
+        # Pre-render the onboarding payloads sent with an RCS URL
+        render_onboarding_payloads(helper_dst)
+
         # Generate installer override files
         generate_override_files(helper_dst, config, templates_dir)
 
@@ -785,7 +859,7 @@ def generate_environments_json(output_dir, config):
         config: Configuration dictionary containing environments list
 
     Returns:
-        None (writes environments.json file)
+        None (writes environments.json file and the environment index)
     """
     try:
         environments = config.get("environments", [])
@@ -801,6 +875,7 @@ def generate_environments_json(output_dir, config):
             with open(env_json_path, 'w') as f:
                 json.dump({"environments": []}, f, indent=2)
             print(f"Generated empty environments.json at: {env_json_path}")
+            write_environment_index(env_dir, [])
             return
 
         print(f"\nGenerating environments.json with {len(environments)} environment(s)...")
@@ -839,7 +914,95 @@ def generate_environments_json(output_dir, config):
 
         print(f"Generated environments.json at: {env_json_path}")
 
+        write_environment_index(env_dir, processed_envs)
+
     except Exception as e:
         print(f"Warning: Failed to generate environments.json: {str(e)}")
         import traceback
         print(f"Error details: {traceback.format_exc()}")
+
+
+# Fields written to the per-alias index files, in order
+ENVIRONMENT_INDEX_FIELDS = [
+    "alias",
+    "name",
+    "base_url",
+    "tenant_id",
+    "use_default_tenant",
+    "launchpad_oauth2_b64",
+    "eh_launchpad_username",
+    "eh_launchpad_password_b64",
+]
+
+# Aliases that can be used as file names on both platforms
+_INDEX_SAFE_ALIAS = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9._-]*$")
+
+
+def _index_value(value):
+    """Flatten a value to a single line for the index files"""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return str(value).replace("\r", " ").replace("\n", " ")
+
+
+def _psd1_value(value):
+    """Format a value as a PowerShell data file literal"""
+    if isinstance(value, bool):
+        return "$true" if value else "$false"
+    return "'" + _index_value(value).replace("'", "''") + "'"
+
+
+def write_environment_index(env_dir, environments):
+    """
+    Write the precomputed environment index next to environments.json
+
+    GKInstall scripts look environments up here instead of re-parsing
+    environments.json (which needs jq or slow bash parsing on Linux):
+
+    - index/environments.list: one "alias|name|base_url|tenant_id" line per environment
+    - index/<alias>.env: key=value lines for one environment (bash)
+    - index/<alias>.psd1: the same values as a PowerShell data file
+
+    Aliases that are not usable as file names are listed but get no
+    per-alias files; the scripts fall back to environments.json for them.
+
+    Args:
+        env_dir: helper/environments directory
+        environments: Processed environment dictionaries (as in environments.json)
+    """
+    index_dir = os.path.join(env_dir, "index")
+    # Rebuild from scratch so removed environments do not linger
+    if os.path.isdir(index_dir):
+        shutil.rmtree(index_dir)
+    os.makedirs(index_dir, exist_ok=True)
+
+    list_lines = []
+    for env in environments:
+        alias = _index_value(env.get("alias", ""))
+        if not alias:
+            continue
+
+        list_lines.append("|".join(
+            _index_value(env.get(key, "")).replace("|", "/")
+            for key in ("alias", "name", "base_url", "tenant_id")
+        ))
+
+        if not _INDEX_SAFE_ALIAS.match(alias):
+            print(f"  Warning: alias '{alias}' is not indexed (unsupported characters)")
+            continue
+
+        fields = [key for key in ENVIRONMENT_INDEX_FIELDS if key in env]
+        with open(os.path.join(index_dir, f"{alias}.env"), "w", newline="\n") as f:
+            for key in fields:
+                f.write(f"{key}={_index_value(env[key])}\n")
+
+        with open(os.path.join(index_dir, f"{alias}.psd1"), "w", encoding="utf-8") as f:
+            f.write("@{\n")
+            for key in fields:
+                f.write(f"    {key} = {_psd1_value(env[key])}\n")
+            f.write("}\n")
+
+    with open(os.path.join(index_dir, "environments.list"), "w", newline="\n") as f:
+        f.writelines(line + "\n" for line in list_lines)
+
+    print(f"Generated environment index for {len(list_lines)} environment(s) at: {index_dir}")
@@ -6,6 +6,24 @@ with custom settings from the project configuration.
 """
 
 import os
+import re
+
+# Tokens GKInstall fills in per workstation; everything else is resolved at build time
+INSTALL_TIME_TOKENS = (
+    "@INSTALL_DIR@",
+    "@BASE64_TOKEN@",
+    "@OFFLINE_MODE@",
+    "@JRE_VERSION@",
+    "@JRE_PACKAGE@",
+    "@INSTALLER_PACKAGE@",
+    "@UI_PACKAGE@",
+    "@TOMCAT_VERSION@",
+    "@TOMCAT_PACKAGE@",
+    "@SSL_PATH@",
+    "@SSL_PASSWORD@",
+    "@FIREBIRD_SERVER_PATH@",
+    "@FIREBIRD_DRIVER_PATH_LOCAL@",
+)
 
 
 def normalize_firebird_path_for_linux(firebird_server_path):
@@ -87,6 +105,39 @@ def apply_settings_to_template(template_content, settings, filename):
     return '\n'.join(new_lines)
 
 
+def prerender_launcher_template(template_content, filename):
+    """
+    Bring a launcher template into the form GKInstall renders in a single pass
+
+    Every line is a comment or 'key=value', and each install-time token makes
+    up a whole value, so GKInstall looks up one token per line instead of
+    rewriting the whole file once per placeholder. Unknown tokens and tokens
+    embedded in a longer value would not be filled in and are reported.
+
+    Args:
+        template_content: Template content with the build-time values applied
+        filename: The launcher template filename (for logging)
+
+    Returns:
+        Pre-rendered template content
+    """
+    lines = []
+    for line in template_content.replace('\r\n', '\n').split('\n'):
+        line = line.strip()
+        if line and not line.startswith('#') and '=' in line:
+            key, value = line.split('=', 1)
+            key, value = key.strip(), value.strip()
+            for token in re.findall(r'@[A-Z0-9_]+@', value):
+                if token not in INSTALL_TIME_TOKENS:
+                    print(f"Warning: Unknown placeholder {token} for {key} in {filename}")
+                elif token != value:
+                    print(f"Warning: {token} must be the whole value of {key} in {filename}")
+            line = f"{key}={value}"
+        lines.append(line)
+
+    return '\n'.join(lines).strip('\n') + '\n'
+
+
 def generate_launcher_templates(launchers_dir, config, launcher_templates):
     """
     Generate launcher templates with custom settings from config
@@ -161,6 +212,9 @@ def generate_launcher_templates(launchers_dir, config, launcher_templates):
         # Apply settings to the template
         template_content = apply_settings_to_template(template_content, settings, filename)
 
+        # Leave only the install-time tokens, one per value
+        template_content = prerender_launcher_template(template_content, filename)
+
         # Write the template to the output file
         try:
             with open(template_path, 'w') as f:
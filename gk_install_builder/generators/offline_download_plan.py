@@ -0,0 +1,404 @@
+"""
+Offline Package Download Planning
+
+This module builds a download plan for an offline package before anything is
+transferred: every selected file is resolved with its size, duplicates are
+removed, free disk space in the output directory is checked and the download
+duration is estimated from previously measured throughput. The plan is saved
+as JSON so large builds can be reviewed (dry-run) and executed later.
+"""
+
+import os
+import json
+import shutil
+from datetime import datetime
+
+
+DOWNLOAD_PLAN_FILENAME = "offline_download_plan.json"
+THROUGHPUT_HISTORY_FILENAME = ".download_throughput.json"
+PLAN_FORMAT_VERSION = 1
+
+# Used for the estimate until a real download has been measured
+DEFAULT_THROUGHPUT_BPS = 5 * 1024 * 1024  # 5 MiB/s
+# Number of throughput samples kept in the history file
+THROUGHPUT_HISTORY_SIZE = 10
+# Extra free space required on top of the plan size (temp files, extraction)
+DISK_SPACE_SAFETY_MARGIN = 0.05
+
+
+def resolve_file_sizes(dsg_api_browser, files_to_download):
+    """
+    Resolve remote file sizes from the DSG directory listings.
+
+    Each parent directory is listed only once, no matter how many files are
+    selected from it.
+
+    Args:
+        dsg_api_browser: DSGRestBrowser instance (must be connected)
+        files_to_download: List of (remote_path, local_path, file_name, component_type)
+
+    Returns:
+        dict: remote_path -> size in bytes (None when the size is unknown)
+    """
+    sizes = {}
+    listings = {}
+
+    for remote_path, _, _, _ in files_to_download:
+        if remote_path in sizes:
+            continue
+
+        parent_path, name = remote_path.rsplit('/', 1) if '/' in remote_path else ('', remote_path)
+        if parent_path not in listings:
+            try:
+                listings[parent_path] = dsg_api_browser.list_directories(parent_path)
+            except Exception as e:
+                print(f"[DOWNLOAD PLAN] WARNING: Could not list {parent_path}: {e}")
+                listings[parent_path] = []
+
+        size = None
+        for item in listings[parent_path]:
+            if not item.get('is_directory', False) and item.get('name') == name:
+                try:
+                    size = int(item.get('size') or 0) or None
+                except (TypeError, ValueError):
+                    size = None
+                break
+        sizes[remote_path] = size
+
+    return sizes
+
+
+def check_disk_space(output_dir, required_bytes, safety_margin=DISK_SPACE_SAFETY_MARGIN):
+    """
+    Check whether the output directory's file system can hold the download.
+
+    The output directory does not need to exist yet; the nearest existing
+    parent directory is checked instead.
+
+    Args:
+        output_dir: Output directory path
+        required_bytes: Number of bytes that will be written
+        safety_margin: Fraction of required_bytes to keep free on top
+
+    Returns:
+        dict: free_bytes, required_bytes (incl. margin) and sufficient flag.
+              free_bytes is None if the disk usage could not be determined.
+    """
+    probe_dir = os.path.abspath(output_dir)
+    while not os.path.exists(probe_dir):
+        parent = os.path.dirname(probe_dir)
+        if parent == probe_dir:
+            break
+        probe_dir = parent
+
+    required_with_margin = int(required_bytes * (1 + safety_margin))
+
+    try:
+        free_bytes = shutil.disk_usage(probe_dir).free
+    except Exception as e:
+        print(f"[DOWNLOAD PLAN] WARNING: Could not determine free disk space for {probe_dir}: {e}")
+        return {
+            "free_bytes": None,
+            "required_bytes": required_with_margin,
+            "sufficient": True
+        }
+
+    return {
+        "free_bytes": free_bytes,
+        "required_bytes": required_with_margin,
+        "sufficient": free_bytes >= required_with_margin
+    }
+
+
+def load_throughput_history(output_dir):
+    """
+    Load the measured download throughput samples for an output directory.
+
+    Returns:
+        list: Throughput samples in bytes per second (newest last)
+    """
+    history_path = os.path.join(output_dir, THROUGHPUT_HISTORY_FILENAME)
+    try:
+        with open(history_path, 'r') as f:
+            data = json.load(f)
+        return [float(s) for s in data.get("samples", []) if float(s) > 0]
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        print(f"[DOWNLOAD PLAN] WARNING: Could not read throughput history: {e}")
+        return []
+
+
+def record_download_throughput(output_dir, downloaded_bytes, elapsed_seconds):
+    """
+    Append a measured throughput sample to the history of an output directory.
+
+    Args:
+        output_dir: Output directory path
+        downloaded_bytes: Bytes transferred in the measured run
+        elapsed_seconds: Wall-clock duration of the run
+
+    Returns:
+        float: The recorded throughput in bytes per second, or None if skipped
+    """
+    if downloaded_bytes <= 0 or elapsed_seconds <= 0:
+        return None
+
+    throughput = downloaded_bytes / elapsed_seconds
+    samples = load_throughput_history(output_dir)
+    samples.append(throughput)
+    samples = samples[-THROUGHPUT_HISTORY_SIZE:]
+
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        history_path = os.path.join(output_dir, THROUGHPUT_HISTORY_FILENAME)
+        with open(history_path, 'w') as f:
+            json.dump({"samples": samples, "updated": datetime.now().isoformat(timespec="seconds")}, f, indent=4)
+        print(f"[DOWNLOAD PLAN] Recorded download throughput: {format_size(throughput)}/s")
+    except Exception as e:
+        print(f"[DOWNLOAD PLAN] WARNING: Could not save throughput history: {e}")
+
+    return throughput
+
+
+def estimate_throughput(output_dir):
+    """
+    Estimate throughput from the median of recent samples.
+
+    Returns:
+        tuple: (bytes per second, source) where source is 'measured' or 'default'
+    """
+    samples = sorted(load_throughput_history(output_dir))
+    if not samples:
+        return DEFAULT_THROUGHPUT_BPS, "default"
+
+    middle = len(samples) // 2
+    if len(samples) % 2:
+        median = samples[middle]
+    else:
+        median = (samples[middle - 1] + samples[middle]) / 2
+    return median, "measured"
+
+
+def build_download_plan(files_to_download, file_sizes, output_dir,
+                        selected_components=None, platform_dependencies=None):
+    """
+    Build a download plan from the resolved list of files.
+
+    Duplicate remote paths (and different remote files targeting the same
+    local path) are removed, sizes are summed, disk space is checked and the
+    duration is estimated.
+
+    Args:
+        files_to_download: List of (remote_path, local_path, file_name, component_type)
+        file_sizes: dict remote_path -> size in bytes (see resolve_file_sizes)
+        output_dir: Absolute output directory path
+        selected_components: Selected components (recorded for reference)
+        platform_dependencies: Platform dependency flags (recorded for reference)
+
+    Returns:
+        dict: JSON-serializable download plan
+    """
+    files = []
+    seen_remote = set()
+    seen_local = set()
+    duplicates_removed = 0
+
+    for remote_path, local_path, file_name, component_type in files_to_download:
+        local_key = os.path.normcase(os.path.abspath(local_path))
+        if remote_path in seen_remote or local_key in seen_local:
+            print(f"[DOWNLOAD PLAN] Skipping duplicate: {remote_path}")
+            duplicates_removed += 1
+            continue
+        seen_remote.add(remote_path)
+        seen_local.add(local_key)
+
+        files.append({
+            "remote_path": remote_path,
+            "relative_path": os.path.relpath(os.path.abspath(local_path), output_dir),
+            "file_name": file_name,
+            "component_type": component_type,
+            "size": file_sizes.get(remote_path),
+            "action": "download"
+        })
+
+    plan = {
+        "format_version": PLAN_FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "output_dir": output_dir,
+        "selected_components": list(selected_components or []),
+        "platform_dependencies": dict(platform_dependencies or {}),
+        "files": files,
+        "duplicates_removed": duplicates_removed
+    }
+    return update_plan_totals(plan, output_dir)
+
+
+def planned_downloads(plan):
+    """Return the plan entries that have to be downloaded (not reused)."""
+    return [f for f in plan.get("files", []) if f.get("action", "download") == "download"]
+
+
+def update_plan_totals(plan, output_dir):
+    """
+    Recompute sizes, duration estimate and disk check of a plan.
+
+    Only entries that are actually downloaded count towards the totals;
+    entries reused from a previous package (delta packages) are reported
+    separately.
+
+    Returns:
+        dict: The updated plan (modified in place)
+    """
+    downloads = planned_downloads(plan)
+    total_bytes = sum(f.get("size") or 0 for f in downloads)
+    throughput, throughput_source = estimate_throughput(output_dir)
+
+    plan["file_count"] = len(downloads)
+    plan["unknown_sizes"] = sum(1 for f in downloads if f.get("size") is None)
+    plan["total_bytes"] = total_bytes
+    plan["reused_count"] = len(plan.get("files", [])) - len(downloads)
+    plan["reused_bytes"] = sum(f.get("size") or 0 for f in plan.get("files", [])) - total_bytes
+    plan["estimate"] = {
+        "throughput_bps": throughput,
+        "throughput_source": throughput_source,
+        "seconds": int(total_bytes / throughput) if throughput > 0 else None
+    }
+    return refresh_plan_disk_check(plan, output_dir)
+
+
+def refresh_plan_disk_check(plan, output_dir):
+    """
+    (Re-)run the disk space check of a plan against the current state.
+
+    Files that already exist locally are overwritten, so their space is
+    counted as reusable.
+
+    Returns:
+        dict: The updated plan (modified in place)
+    """
+    downloads = planned_downloads(plan)
+    total_bytes = sum(f.get("size") or 0 for f in downloads)
+    reclaimable_bytes = 0
+    for f in downloads:
+        existing = os.path.join(output_dir, f["relative_path"])
+        if os.path.isfile(existing):
+            reclaimable_bytes += os.path.getsize(existing)
+    plan["disk"] = check_disk_space(output_dir, max(total_bytes - reclaimable_bytes, 0))
+    return plan
+
+
+def write_download_plan(plan, output_dir, filename=DOWNLOAD_PLAN_FILENAME):
+    """
+    Save a download plan as JSON in the output directory.
+
+    Returns:
+        str: Path of the written plan file
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    plan_path = os.path.join(output_dir, filename)
+    with open(plan_path, 'w') as f:
+        json.dump(plan, f, indent=4)
+    print(f"[DOWNLOAD PLAN] Plan written to {plan_path}")
+    return plan_path
+
+
+def load_download_plan(plan_path):
+    """
+    Load a saved download plan.
+
+    Raises:
+        ValueError: If the file is not a supported download plan
+    """
+    with open(plan_path, 'r') as f:
+        plan = json.load(f)
+
+    if not isinstance(plan, dict) or "files" not in plan:
+        raise ValueError(f"{plan_path} is not a download plan")
+    if plan.get("format_version", 0) > PLAN_FORMAT_VERSION:
+        raise ValueError(f"Unsupported download plan version: {plan.get('format_version')}")
+
+    return plan
+
+
+def resolve_plan_path(output_dir, relative_path):
+    """
+    Resolve a relative path of a plan entry against output_dir.
+
+    Plans are loaded from disk, so absolute paths, ".." components and
+    paths that resolve (e.g. through a symlink) outside output_dir are
+    rejected.
+
+    Raises:
+        ValueError: If the path is not inside output_dir
+    """
+    normalized = os.path.normpath(relative_path)
+    if (not relative_path or os.path.isabs(relative_path) or os.path.splitdrive(relative_path)[0]
+            or normalized == os.curdir or os.pardir in normalized.split(os.sep)):
+        raise ValueError(f"Unsafe path in download plan: {relative_path!r}")
+
+    local_path = os.path.join(output_dir, normalized)
+    root = os.path.realpath(output_dir)
+    if os.path.commonpath([root, os.path.realpath(local_path)]) != root:
+        raise ValueError(f"Path in download plan is outside the output directory: {relative_path!r}")
+    return local_path
+
+
+def plan_to_download_list(plan, output_dir):
+    """
+    Convert a plan back into the download list used by the executor.
+
+    Local paths are resolved against output_dir so a plan can be executed
+    into a different output directory than the one it was created for.
+    Entries reused from a previous package are skipped.
+
+    Returns:
+        list: (remote_path, local_path, file_name, component_type) tuples
+
+    Raises:
+        ValueError: If an entry points outside output_dir
+    """
+    files_to_download = []
+    for f in planned_downloads(plan):
+        local_path = resolve_plan_path(output_dir, f["relative_path"])
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        files_to_download.append((f["remote_path"], local_path, f["file_name"], f["component_type"]))
+    return files_to_download
+
+
+def format_size(num_bytes):
+    """Format a byte count for display (e.g. '1.5 GB')."""
+    if num_bytes is None:
+        return "unknown"
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def format_plan_summary(plan):
+    """Build a human-readable summary of a download plan."""
+    lines = [f"{plan['file_count']} file(s), {format_size(plan['total_bytes'])} total"]
+    if plan.get("unknown_sizes"):
+        lines.append(f"{plan['unknown_sizes']} file(s) with unknown size")
+    if plan.get("duplicates_removed"):
+        lines.append(f"{plan['duplicates_removed']} duplicate(s) removed")
+    if plan.get("reused_count"):
+        lines.append(f"{plan['reused_count']} file(s) reused from previous package "
+                     f"({format_size(plan['reused_bytes'])} not downloaded)")
+
+    disk = plan.get("disk", {})
+    if disk.get("free_bytes") is not None:
+        lines.append(f"Free disk space: {format_size(disk['free_bytes'])} "
+                     f"(required: {format_size(disk['required_bytes'])})")
+
+    estimate = plan.get("estimate", {})
+    if estimate.get("seconds") is not None:
+        minutes, seconds = divmod(estimate["seconds"], 60)
+        source = "measured" if estimate.get("throughput_source") == "measured" else "assumed"
+        lines.append(f"Estimated duration: {minutes}m {seconds}s at "
+                     f"{format_size(estimate['throughput_bps'])}/s ({source})")
+
+    return "\n".join(lines)
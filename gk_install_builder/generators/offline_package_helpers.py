@@ -8,18 +8,156 @@ method to improve modularity and reduce file size.
 import os
 import time
 import re
+import hashlib
+import threading
 import requests
-import customtkinter as ctk
-import tkinter as tk
-import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from ..utils.version_sorting import VersionIndex
+    from .prompts import ConsolePrompts
+except ImportError:
+    from utils.version_sorting import VersionIndex
+    from generators.prompts import ConsolePrompts
+
+
+# Concurrent DSG metadata requests during the offline package pre-scan
+DEFAULT_PREFETCH_WORKERS = 8
+
+
+class CachedListingBrowser:
+    """
+    Wraps a DSGRestBrowser and memoizes list_directories() per path.
+
+    Listings can be prefetched on an executor; a later list_directories()
+    call for the same path waits for the in-flight request instead of
+    issuing a new one. All other attributes are delegated to the wrapped
+    browser, so the wrapper can be passed wherever a browser is expected.
+    """
+
+    def __init__(self, dsg_api_browser):
+        self._browser = dsg_api_browser
+        self._listings = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(path):
+        return '/' + path.replace('\\', '/').strip('/')
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+    def prefetch(self, executor, path):
+        """
+        Start listing path on the executor unless it is cached or in flight.
+
+        Returns:
+            Future: The listing future; cancelling it while it is still queued
+            drops the prefetch
+        """
+        key = self._cache_key(path)
+        with self._lock:
+            future = self._listings.get(key)
+            if future is None or future.cancelled():
+                future = executor.submit(self._browser.list_directories, path)
+                self._listings[key] = future
+            return future
+
+    def is_cached(self, path):
+        """True if the listing of path has completed successfully."""
+        with self._lock:
+            future = self._listings.get(self._cache_key(path))
+        return future is not None and future.done() and not future.cancelled() and future.exception() is None
+
+    def invalidate(self, path=None):
+        """Drop the cached listing of path, or all listings."""
+        with self._lock:
+            if path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(self._cache_key(path), None)
+
+    def list_directories(self, path="/SoftwarePackage"):
+        key = self._cache_key(path)
+        with self._lock:
+            future = self._listings.get(key)
+            if future is not None and future.cancel():
+                # A prefetch still waiting in its queue: list now instead of waiting behind it
+                future = None
+            owner = future is None
+            if owner:
+                future = Future()
+                # Mark as running so concurrent callers wait instead of cancelling it
+                future.set_running_or_notify_cancel()
+                self._listings[key] = future
+
+        if owner:
+            try:
+                future.set_result(self._browser.list_directories(path))
+            except Exception as e:
+                future.set_exception(e)
+
+        try:
+            return future.result()
+        except Exception:
+            # Do not cache failures, the next call should retry
+            with self._lock:
+                if self._listings.get(key) is future:
+                    del self._listings[key]
+            raise
+
+
+def prefetch_offline_metadata(cached_browser, version_paths, dependency_paths=(),
+                              max_workers=DEFAULT_PREFETCH_WORKERS):
+    """
+    Fetch component listings and installer.properties concurrently.
+
+    Directory listings for all component version directories and platform
+    dependency directories are started in the background and stay cached in
+    cached_browser for the later selection steps. installer.properties of
+    every version directory is fetched in parallel and awaited, because the
+    preferences are needed before the first selection dialog.
+
+    Args:
+        cached_browser: CachedListingBrowser instance
+        version_paths: Component version directories, in priority order
+        dependency_paths: Platform dependency directories to list
+        max_workers: Maximum number of concurrent requests
+
+    Returns:
+        dict: version_path -> parsed properties (only paths with properties, in input order)
+    """
+    version_paths = list(dict.fromkeys(version_paths))
+    if not version_paths and not dependency_paths:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dsg-prefetch")
+    try:
+        property_futures = {
+            path: executor.submit(fetch_installer_properties, cached_browser, path)
+            for path in version_paths
+        }
+        for path in list(version_paths) + list(dependency_paths):
+            cached_browser.prefetch(executor, path)
+
+        all_properties = {}
+        for path, future in property_futures.items():
+            props = future.result()
+            if props:
+                all_properties[path] = props
+        return all_properties
+    finally:
+        # Listings keep running in the background while the user answers dialogs
+        executor.shutdown(wait=False)
 
 
 def fetch_installer_properties(dsg_api_browser, version_path):
     """
     Fetch and parse installer.properties from a component version directory.
 
-    Looks for 'installer.properties' in the given version_path on the DSG API,
-    downloads it, and parses it as a key=value property file.
+    Requests 'installer.properties' in the given version_path directly from the
+    DSG API (a 404 means the file is absent) and parses it as a key=value
+    property file.
 
     Args:
         dsg_api_browser: DSGRestBrowser instance (must be connected)
@@ -29,20 +167,6 @@ def fetch_installer_properties(dsg_api_browser, version_path):
         dict: Parsed key-value pairs from the file. Empty dict if not found or on error.
     """
     try:
-        files = dsg_api_browser.list_directories(version_path)
-
-        props_file = None
-        for f in files:
-            if not f.get('is_directory', False) and f.get('name', '') == 'installer.properties':
-                props_file = f
-                break
-
-        if not props_file:
-            print(f"[INSTALLER PROPS] WARNING: installer.properties not found in {version_path}")
-            return {}
-
-        print(f"[INSTALLER PROPS] Found installer.properties in {version_path}")
-
         file_path = f"{version_path}/installer.properties"
         file_url = dsg_api_browser.get_file_url(file_path)
 
@@ -54,7 +178,15 @@ def fetch_installer_properties(dsg_api_browser, version_path):
                 timeout=(10, 30)
             )
 
-        response = dsg_api_browser._handle_api_request(make_request)
+        try:
+            response = dsg_api_browser._handle_api_request(make_request)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                print(f"[INSTALLER PROPS] WARNING: installer.properties not found in {version_path}")
+                return {}
+            raise
+
+        print(f"[INSTALLER PROPS] Found installer.properties in {version_path}")
         content = response.text
 
         properties = {}
@@ -178,9 +310,31 @@ def build_installer_preferences(all_properties, config):
     return preferences
 
 
+def _get_with_token_refresh(session, file_url, dsg_api_browser):
+    """
+    Start a streaming GET; on 401 refresh the token once and retry.
+
+    Workers hitting 401 together share one refresh through the browser's
+    token manager.
+    """
+    if hasattr(dsg_api_browser, '_sync_token'):
+        dsg_api_browser._sync_token()
+    sent_token = getattr(dsg_api_browser, 'bearer_token', None)
+
+    response = session.get(file_url, headers=dsg_api_browser._get_headers(),
+                           stream=True, verify=False, timeout=(5, 180))
+    if response.status_code == 401 and getattr(dsg_api_browser, 'token_manager', None):
+        response.close()
+        if dsg_api_browser.refresh_token(sent_token):
+            print(f"Retrying download with refreshed token: {file_url}")
+            response = session.get(file_url, headers=dsg_api_browser._get_headers(),
+                                   stream=True, verify=False, timeout=(5, 180))
+    return response
+
+
 def download_file_thread(remote_path, local_path, file_name, component_type,
                          download_queue, concurrency_limiter, dsg_api_browser,
-                         session, download_chunk_size):
+                         session, download_chunk_size, checksums=None):
     """
     Download a file in a separate thread with progress tracking
 
@@ -194,25 +348,18 @@ def download_file_thread(remote_path, local_path, file_name, component_type,
         dsg_api_browser: DSG API browser instance
         session: Requests session instance
         download_chunk_size: Size of chunks to download
+        checksums: Optional dict; receives remote_path -> SHA-256 of the downloaded file
     """
     try:
         with concurrency_limiter:
             # Get the full URL for the file using REST API
             file_url = dsg_api_browser.get_file_url(remote_path)
 
-            # Prepare headers with bearer token if available
-            headers = dsg_api_browser._get_headers()
-
             print(f"Downloading from REST API: {file_url}")
 
             # Use requests session with streaming to track progress
-            with session.get(
-                file_url,
-                headers=headers,
-                stream=True,
-                verify=False,
-                timeout=(5, 180)
-            ) as response:
+            response = _get_with_token_refresh(session, file_url, dsg_api_browser)
+            with response:
                 response.raise_for_status()
 
                 # Get total file size if available
@@ -224,6 +371,7 @@ def download_file_thread(remote_path, local_path, file_name, component_type,
                 # Open local file for writing with larger buffer
                 with open(local_path, 'wb', buffering=download_chunk_size) as f:
                     downloaded = 0
+                    sha256 = hashlib.sha256() if checksums is not None else None
                     last_update_time = time.time()
 
                     # Download in chunks and update progress
@@ -231,6 +379,8 @@ def download_file_thread(remote_path, local_path, file_name, component_type,
                         if chunk:
                             f.write(chunk)
                             downloaded += len(chunk)
+                            if sha256 is not None:
+                                sha256.update(chunk)
 
                             # Update progress every ~100ms to avoid flooding the queue
                             current_time = time.time()
@@ -241,6 +391,9 @@ def download_file_thread(remote_path, local_path, file_name, component_type,
                     # Final progress update
                     download_queue.put(("progress", (file_name, component_type, downloaded, total_size)))
 
+                if sha256 is not None:
+                    checksums[remote_path] = sha256.hexdigest()
+
             # Successfully downloaded
             download_queue.put(("complete", (file_name, component_type)))
     except Exception as e:
@@ -248,93 +401,9 @@ def download_file_thread(remote_path, local_path, file_name, component_type,
         download_queue.put(("error", (file_name, component_type, str(e))))
 
 
-def create_progress_dialog(parent, total_files):
-    """
-    Create a progress dialog for tracking file downloads
-
-    Args:
-        parent: Parent window
-        total_files: Total number of files to download
-
-    Returns:
-        Tuple of (dialog, progress_bar, files_label, files_frame, file_progress_widgets, log_label)
-    """
-    progress_dialog = ctk.CTkToplevel(parent)
-    progress_dialog.title("Downloading Files")
-    progress_dialog.geometry("700x600")  # Increased size to accommodate multiple progress bars
-    progress_dialog.transient(parent)
-
-    # Force initial update
-    progress_dialog.update_idletasks()
-
-    # Linux-specific handling
-    if sys.platform.startswith('linux'):
-        progress_dialog.attributes("-topmost", True)
-        progress_dialog.update()
-
-    # Center the dialog on the parent window
-    x = parent.winfo_x() + (parent.winfo_width() // 2) - (700 // 2)
-    y = parent.winfo_y() + (parent.winfo_height() // 2) - (600 // 2)
-    progress_dialog.geometry(f"+{x}+{y}")
-
-    # Ensure focus and grab
-    progress_dialog.focus_force()
-    progress_dialog.grab_set()
-
-    # Title
-    ctk.CTkLabel(
-        progress_dialog,
-        text="Downloading Files",
-        font=("Helvetica", 16, "bold")
-    ).pack(pady=(20, 10), padx=20)
-
-    # Progress frame
-    progress_frame = ctk.CTkFrame(progress_dialog)
-    progress_frame.pack(fill="both", expand=True, padx=20, pady=10)
-
-    # Overall progress bar
-    ctk.CTkLabel(
-        progress_frame,
-        text="Overall Progress:",
-        font=("Helvetica", 12)
-    ).pack(pady=(10, 5), padx=10)
-
-    progress_bar = ctk.CTkProgressBar(progress_frame, width=650)
-    progress_bar.pack(pady=(0, 10), padx=10)
-    progress_bar.set(0)
-
-    # Files progress label
-    files_label = ctk.CTkLabel(
-        progress_frame,
-        text=f"0/{total_files} files completed",
-        font=("Helvetica", 12)
-    )
-    files_label.pack(pady=(0, 10), padx=10)
-
-    # Create a scrollable frame for individual file progress bars
-    ctk.CTkLabel(
-        progress_frame,
-        text="Individual File Progress:",
-        font=("Helvetica", 12, "bold")
-    ).pack(pady=(10, 5), padx=10, anchor="w")
-
-    files_frame = ctk.CTkScrollableFrame(progress_frame, width=650, height=350)
-    files_frame.pack(fill="both", expand=True, padx=10, pady=10)
-
-    # One more update to ensure everything is displayed
-    progress_dialog.update_idletasks()
-
-    # Dictionary to store progress bars and labels for each file
-    file_progress_widgets = {}
-
-    # We're removing the download log section
-    # Return None for log_label since we're not using it anymore
-    return progress_dialog, progress_bar, files_label, files_frame, file_progress_widgets, None
-
-
 def prompt_for_file_selection(files, component_type, dialog_parent, parent_window,
                                title=None, description=None, file_type=None, config=None,
-                               preferred_files=None):
+                               preferred_files=None, prompts=None):
     """
     Prompt user to select files from a list when multiple files are found
 
@@ -347,6 +416,8 @@ def prompt_for_file_selection(files, component_type, dialog_parent, parent_windo
         description: Custom dialog description (optional)
         file_type: File type filter ("zip" or None)
         config: Configuration dictionary
+        prompts: Prompt policy asked for the choice (defaults to ConsolePrompts,
+            which takes the pre-selected files)
 
     Returns:
         List of selected file dictionaries
@@ -417,74 +488,24 @@ def prompt_for_file_selection(files, component_type, dialog_parent, parent_windo
     if file_type != "zip" and len(other_files) == 1:
         return installable_files
 
-    # Create a dialog to select files
-    # Use the dialog_parent if provided, otherwise use parent_window, or create a new root
-    parent = dialog_parent or parent_window
-    if parent:
-        dialog = ctk.CTkToplevel(parent)
-        dialog.transient(parent)  # Make it transient to the parent
-    else:
-        # Create a temporary root window if no parent is available
-        temp_root = tk.Tk()
-        temp_root.withdraw()  # Hide the temporary root
-        dialog = ctk.CTkToplevel(temp_root)
-
-    dialog.title(title)
-    dialog.geometry("600x500")  # Increased size for better visibility
-
-    # Force initial update for Linux
-    dialog.update_idletasks()
-
-    # Linux-specific handling
-    if sys.platform.startswith('linux'):
-        dialog.attributes("-topmost", True)
-        dialog.update()
-
-    # Focus and grab management
-    dialog.focus_force()
-    dialog.grab_set()
-
-    # Center the dialog on the parent window if available
-    if parent:
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - (600 // 2)
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - (500 // 2)
-        dialog.geometry(f"+{x}+{y}")
-
-    # Title and description
-    ctk.CTkLabel(
-        dialog,
-        text=title,
-        font=("Helvetica", 16, "bold")
-    ).pack(pady=(20, 5), padx=20)
-
-    ctk.CTkLabel(
-        dialog,
-        text=description,
-        font=("Helvetica", 12)
-    ).pack(pady=(0, 20), padx=20)
-
-    # If Launcher.exe exists, show a message that it will be downloaded automatically
-    if launcher_files:
-        # Get platform from config (default to Windows if not specified)
-        platform = config.get("platform", "Windows")
+    default_names = default_file_selection(other_files, component_type, config, preferred_files)
+    prompts = prompts or ConsolePrompts()
+    return prompts.choose_files(title, description, launcher_files, other_files, default_names,
+                                config=config, parent=dialog_parent or parent_window)
 
-        # Use appropriate launcher filename based on platform
-        launcher_filename = 'Launcher.run' if platform == 'Linux' else 'Launcher.exe'
 
-        launcher_label = ctk.CTkLabel(
-            dialog,
-            text=f"Note: {launcher_filename} will be downloaded automatically",
-            font=("Helvetica", 12, "italic"),
-            text_color="gray"
-        )
-        launcher_label.pack(pady=(0, 10), padx=20)
+def default_file_selection(other_files, component_type, config, preferred_files=None):
+    """
+    Names of the files pre-selected in a file selection prompt
 
-    # Create a scrollable frame for the checkboxes
-    scroll_frame = ctk.CTkScrollableFrame(dialog, width=450, height=200)
-    scroll_frame.pack(fill="both", expand=True, padx=20, pady=10)
+    installer.properties preferences win; otherwise the latest file (by version
+    number, then date, then name) or, for Java, the latest file for the
+    configured platform.
 
-    # Update to ensure scroll_frame is properly rendered
-    dialog.update_idletasks()
+    Returns:
+        set: Selected file names
+    """
+    default_names = set()
 
     # Find the latest version (assuming version numbers are in the filenames)
     # This is a simple heuristic - we'll try to find the file with the highest version number
@@ -621,100 +642,10 @@ def prompt_for_file_selection(files, component_type, dialog_parent, parent_windo
         elif file == latest_file:
             default_selected = True
 
-        var = ctk.BooleanVar(value=default_selected)
-        selected_vars[file['name']] = var
-        checkbox = ctk.CTkCheckBox(
-            scroll_frame,
-            text=file['name'],
-            variable=var,
-            checkbox_width=20,
-            checkbox_height=20
-        )
-        checkbox.pack(anchor="w", pady=5, padx=10)
-
-    # Add select all / deselect all buttons
-    buttons_frame = ctk.CTkFrame(dialog)
-    buttons_frame.pack(fill="x", pady=(0, 10), padx=20)
-
-    def select_all():
-        for var in selected_vars.values():
-            var.set(True)
-
-    def deselect_all():
-        for var in selected_vars.values():
-            var.set(False)
-
-    ctk.CTkButton(
-        buttons_frame,
-        text="Select All",
-        command=select_all,
-        width=100,
-        height=25,
-        fg_color="#555555",
-        hover_color="#333333"
-    ).pack(side="left", padx=5)
-
-    ctk.CTkButton(
-        buttons_frame,
-        text="Deselect All",
-        command=deselect_all,
-        width=100,
-        height=25,
-        fg_color="#555555",
-        hover_color="#333333"
-    ).pack(side="left", padx=5)
-
-    # Result variable
-    result = []
-
-    # OK button handler
-    def on_ok():
-        nonlocal result
-        # Always include Launcher.exe files
-        result = launcher_files.copy()
-        # Add selected non-Launcher files
-        result.extend([file for file in other_files if selected_vars[file['name']].get()])
-        dialog.destroy()
-        if not parent:
-            temp_root.destroy()  # Clean up the temporary root if we created one
-
-    # Cancel button handler
-    def on_cancel():
-        nonlocal result
-        # Always include Launcher.exe files even on cancel
-        result = launcher_files.copy()
-        dialog.destroy()
-        if not parent:
-            temp_root.destroy()  # Clean up the temporary root if we created one
-
-    # Buttons
-    button_frame = ctk.CTkFrame(dialog)
-    button_frame.pack(fill="x", pady=20, padx=20)
-
-    ctk.CTkButton(
-        button_frame,
-        text="Cancel",
-        command=on_cancel,
-        width=100,
-        fg_color="#555555",
-        hover_color="#333333"
-    ).pack(side="left", padx=10)
-
-    ctk.CTkButton(
-        button_frame,
-        text="Download Selected",
-        command=on_ok,
-        width=150
-    ).pack(side="right", padx=10)
-
-    # Wait for the dialog to close
-    if parent:
-        parent.wait_window(dialog)
-    else:
-        # If we don't have a parent window, use a different approach
-        dialog.wait_window()
+        if default_selected:
+            default_names.add(file['name'])
 
-    return result
+    return default_names
 
 
 def process_platform_dependency(dep_name, dep_key, api_path, file_extension,
@@ -722,7 +653,7 @@ def process_platform_dependency(dep_name, dep_key, api_path, file_extension,
                                 ask_download_again_callback, dialog_parent,
                                 output_dir, files_to_download, download_errors,
                                 prompt_for_file_selection_callback, config,
-                                file_filter=None, installer_preferences=None):
+                                file_filter=None, installer_preferences=None, prompts=None):
     """
     Process a platform dependency download (Java, Tomcat, Jaybird)
 
@@ -742,6 +673,7 @@ def process_platform_dependency(dep_name, dep_key, api_path, file_extension,
         config: Configuration dictionary
         file_filter: Optional filter function for files
         installer_preferences: Preferences from installer.properties (optional)
+        prompts: Prompt policy for the version directory choice (optional)
     """
     if not platform_dependencies.get(dep_key, False):
         return
@@ -810,10 +742,11 @@ def process_platform_dependency(dep_name, dep_key, api_path, file_extension,
             if not selected_version:
                 # Fall back to user selection (existing behavior)
                 print(f"No direct {file_extension} files found, prompting user to select version directory...")
-                selected_version = _prompt_for_version_selection(
+                selected_version = prompt_for_version_selection(
                     version_dirs, dep_name, dialog_parent,
                     f"Select {dep_name} Version",
-                    f"Please select which {dep_name} version to download:"
+                    f"Please select which {dep_name} version to download:",
+                    prompts=prompts
                 )
 
             if not selected_version:
@@ -854,76 +787,33 @@ def process_platform_dependency(dep_name, dep_key, api_path, file_extension,
         download_errors.append(f"Failed to access {dep_name} directory: {str(e)}")
 
 
-def _prompt_for_version_selection(version_dirs, dep_name, dialog_parent, title, description):
+def sort_version_dirs(version_dirs):
     """
-    Prompt user to select a version directory
+    Sort version directory entries newest first by version number.
 
-    Returns:
-        Selected version name (string) or None if cancelled
+    Names that are not versions follow in descending name order.
     """
-    import tkinter as tk
-
-    # Sort versions (try natural version sorting)
-    sorted_versions = sorted(version_dirs, key=lambda x: x.get('name', ''), reverse=True)
-
-    selected_version = [None]  # Use list to allow modification in nested function
-
-    # Create dialog
-    parent = dialog_parent
-    if parent:
-        dialog = ctk.CTkToplevel(parent)
-        dialog.transient(parent)
-    else:
-        temp_root = tk.Tk()
-        temp_root.withdraw()
-        dialog = ctk.CTkToplevel(temp_root)
-
-    dialog.title(title)
-    dialog.geometry("400x400")
-    dialog.grab_set()
-
-    # Center dialog
-    if parent:
-        x = parent.winfo_x() + (parent.winfo_width() // 2) - 200
-        y = parent.winfo_y() + (parent.winfo_height() // 2) - 200
-        dialog.geometry(f"+{x}+{y}")
-
-    # Title
-    ctk.CTkLabel(dialog, text=title, font=("Helvetica", 16, "bold")).pack(pady=(20, 5))
-    ctk.CTkLabel(dialog, text=description, font=("Helvetica", 12)).pack(pady=(0, 10))
-
-    # Version list
-    list_frame = ctk.CTkScrollableFrame(dialog, width=350, height=250)
-    list_frame.pack(fill="both", expand=True, padx=20, pady=10)
+    by_name = {}
+    for entry in version_dirs:
+        by_name.setdefault(entry.get('name', ''), []).append(entry)
 
-    version_var = tk.StringVar()
+    index = VersionIndex(list(by_name))
+    invalid = set(index.invalid)
+    ordered_names = [name for name in index.sorted() if name not in invalid]
+    ordered_names += sorted(invalid, reverse=True)
+    return [entry for name in ordered_names for entry in by_name[name]]
 
-    for ver in sorted_versions:
-        ver_name = ver.get('name', '')
-        rb = ctk.CTkRadioButton(list_frame, text=ver_name, variable=version_var, value=ver_name)
-        rb.pack(anchor="w", pady=2)
 
-    # Select first version by default
-    if sorted_versions:
-        version_var.set(sorted_versions[0].get('name', ''))
-
-    def on_ok():
-        selected_version[0] = version_var.get()
-        dialog.destroy()
-
-    def on_cancel():
-        dialog.destroy()
-
-    # Buttons
-    btn_frame = ctk.CTkFrame(dialog)
-    btn_frame.pack(fill="x", padx=20, pady=10)
-
-    ctk.CTkButton(btn_frame, text="OK", command=on_ok, width=100).pack(side="left", padx=5)
-    ctk.CTkButton(btn_frame, text="Cancel", command=on_cancel, width=100).pack(side="right", padx=5)
-
-    dialog.wait_window()
+def prompt_for_version_selection(version_dirs, dep_name, dialog_parent, title, description, prompts=None):
+    """
+    Prompt user to select a version directory (newest first)
 
-    return selected_version[0]
+    Returns:
+        Selected version name (string) or None if cancelled
+    """
+    version_names = [entry.get('name', '') for entry in sort_version_dirs(version_dirs)]
+    prompts = prompts or ConsolePrompts()
+    return prompts.choose_version(version_names, title, description, parent=dialog_parent)
 
 
 def process_component(component_name, component_key, config_key, default_system_type,
@@ -0,0 +1,296 @@
+"""
+Offline Package Manifest and Delta Packages
+
+Every completed offline package gets a manifest listing its artifacts with
+size and SHA-256. When a manifest of a previously shipped package is given,
+the download plan is reduced to new or changed artifacts (a delta package)
+and an 'offline_delta.txt' file tells GKInstall which artifacts to reuse from
+the existing local offline directories and which obsolete ones to remove.
+
+Every manifest entry also records the role of the artifact (launcher, jre,
+tomcat, jaybird, installer, ui) and its version. 'offline_artifacts.txt'
+holds the same information in a flat format, so GKInstall reads the exact
+artifacts instead of scanning the directories and guessing versions from the
+file names:
+
+    jre|Java/Java_zulujre-linux-x64-17.0.9.zip|17.0.9|48213504|<sha256>
+"""
+
+import os
+import re
+import json
+from datetime import datetime
+
+try:
+    from .offline_download_plan import update_plan_totals
+except ImportError:
+    from generators.offline_download_plan import update_plan_totals
+
+
+PACKAGE_MANIFEST_FILENAME = "offline_package_manifest.json"
+DELTA_FILENAME = "offline_delta.txt"
+ARTIFACT_INDEX_FILENAME = "offline_artifacts.txt"
+MANIFEST_FORMAT_VERSION = 1
+
+# Platform dependency (see process_platform_dependency) -> artifact role
+DEPENDENCY_ROLES = {
+    "Java": "jre",
+    "Tomcat": "tomcat",
+    "Jaybird": "jaybird",
+}
+
+
+def _manifest_path(relative_path):
+    """Store relative paths with forward slashes so both scripts can read them."""
+    return relative_path.replace("\\", "/")
+
+
+def get_artifact_role(entry):
+    """
+    Determine what an artifact of the download plan is used for.
+
+    Returns:
+        str: launcher, jre, tomcat, jaybird, installer, ui or other
+    """
+    if entry.get("component_type") in DEPENDENCY_ROLES:
+        return DEPENDENCY_ROLES[entry["component_type"]]
+
+    file_name = os.path.basename(_manifest_path(entry["relative_path"]))
+    if file_name.startswith("Launcher."):
+        return "launcher"
+    if file_name.startswith("onex-ui-") and file_name.endswith(".zip"):
+        return "ui"
+    if file_name.endswith(".jar"):
+        return "installer"
+    return "other"
+
+
+def _package_version(name, prefix):
+    """Version from a file name without extension, e.g. tomcat-9.0.73 -> 9.0.73"""
+    for pattern in (rf"^{prefix}-(\d+(?:\.\d+)*)$", rf"^{prefix}-(\d+(?:\.\d+)*)-"):
+        match = re.search(pattern, name)
+        if match:
+            return match.group(1)
+    match = re.search(rf"^{prefix}[_-](\d+)[_.](\d+)[_.](\d+)", name)
+    if match:
+        return ".".join(match.groups())
+    match = re.search(rf"^{prefix}(\d+(?:\.\d+)*)$", name) or re.search(r"(\d+(?:\.\d+)*)", name)
+    if match:
+        return match.group(1)
+    return name[len(prefix) + 1:] if name.startswith(f"{prefix}-") else name
+
+
+def get_artifact_version(role, file_name):
+    """
+    Extract the version the Launcher expects for a JRE or Tomcat package.
+
+    Uses the same rules GKInstall applied to the file names at install time,
+    so packages built with and without the artifact index get the same values.
+
+    Returns:
+        str: Version, or "" for roles without a version
+    """
+    name = os.path.splitext(file_name)[0]
+    if role == "tomcat":
+        return _package_version(name, "tomcat")
+    if role != "jre":
+        return ""
+
+    for pattern in (r"Java_zulujre.*[-_](\d+\.\d+\.\d+)", r"x64-(\d+\.\d+\.\d+)", r"x86-(\d+\.\d+\.\d+)"):
+        match = re.search(pattern, name)
+        if match:
+            return match.group(1)
+
+    version = _package_version(name, "jre")
+    full_version = re.search(r"(\d+\.\d+\.\d+)", name)
+    if version.isdigit() and full_version:
+        # A bare number like "64" is not a JRE version
+        return full_version.group(1)
+    return version
+
+
+def load_package_manifest(manifest_path):
+    """
+    Load the manifest of a previously built offline package.
+
+    Raises:
+        ValueError: If the file is not a supported package manifest
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    if not isinstance(manifest, dict) or "files" not in manifest:
+        raise ValueError(f"{manifest_path} is not an offline package manifest")
+    if manifest.get("format_version", 0) > MANIFEST_FORMAT_VERSION:
+        raise ValueError(f"Unsupported package manifest version: {manifest.get('format_version')}")
+
+    return manifest
+
+
+def apply_previous_manifest(plan, previous_manifest, output_dir):
+    """
+    Turn a download plan into a delta plan against a previous package.
+
+    An artifact is reused when the previous package contains the same remote
+    file at the same relative path with the same size. Artifacts of the
+    previous package that are no longer part of the plan are listed for
+    removal so stale installers are not picked up by GKInstall - but only for
+    components that are part of both packages. Artifacts of components the
+    new package does not contain are left alone, as the delta may have been
+    built with a different component selection.
+
+    Args:
+        plan: Download plan (see build_download_plan)
+        previous_manifest: Manifest dict of the previously shipped package
+        output_dir: Output directory path
+
+    Returns:
+        dict: The updated plan (modified in place)
+    """
+    previous_files = {
+        _manifest_path(f["relative_path"]): f for f in previous_manifest.get("files", [])
+    }
+
+    planned_paths = set()
+    planned_components = set()
+    for entry in plan.get("files", []):
+        relative_path = _manifest_path(entry["relative_path"])
+        planned_paths.add(relative_path)
+        planned_components.add(entry.get("component_type"))
+        previous = previous_files.get(relative_path)
+
+        if (previous and entry.get("size") is not None
+                and previous.get("remote_path") == entry["remote_path"]
+                and previous.get("size") == entry["size"]):
+            entry["action"] = "reuse"
+            entry["sha256"] = previous.get("sha256")
+            print(f"[DELTA] Reusing unchanged artifact: {relative_path}")
+        else:
+            entry["action"] = "download"
+
+    plan["delta"] = {
+        "previous_created": previous_manifest.get("created"),
+        "removed": sorted(
+            path for path, previous in previous_files.items()
+            if path not in planned_paths and previous.get("component_type") in planned_components
+        )
+    }
+    for path in plan["delta"]["removed"]:
+        print(f"[DELTA] Artifact no longer in package: {path}")
+
+    return update_plan_totals(plan, output_dir)
+
+
+def build_package_manifest(plan, checksums):
+    """
+    Build the manifest of a completed offline package.
+
+    Args:
+        plan: Executed download plan
+        checksums: dict remote_path -> SHA-256 hex digest of downloaded files
+
+    Returns:
+        dict: JSON-serializable package manifest
+    """
+    files = []
+    for entry in plan.get("files", []):
+        sha256 = entry.get("sha256") if entry.get("action") == "reuse" else checksums.get(entry["remote_path"])
+        role = get_artifact_role(entry)
+        files.append({
+            "relative_path": _manifest_path(entry["relative_path"]),
+            "remote_path": entry["remote_path"],
+            "component_type": entry["component_type"],
+            "role": role,
+            "version": get_artifact_version(role, os.path.basename(_manifest_path(entry["relative_path"]))),
+            "size": entry.get("size"),
+            "sha256": sha256,
+            "reused": entry.get("action") == "reuse"
+        })
+
+    manifest = {
+        "format_version": MANIFEST_FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "files": files
+    }
+    if plan.get("delta"):
+        manifest["delta_of"] = plan["delta"].get("previous_created")
+    return manifest
+
+
+def write_package_manifest(manifest, output_dir):
+    """
+    Save the package manifest in the output directory.
+
+    Returns:
+        str: Path of the written manifest
+    """
+    manifest_path = os.path.join(output_dir, PACKAGE_MANIFEST_FILENAME)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    print(f"[DELTA] Package manifest written to {manifest_path}")
+    return manifest_path
+
+
+def build_artifact_index(manifest):
+    """
+    Build the content of offline_artifacts.txt.
+
+    Returns:
+        str: One '<role>|<relative path>|<version>|<size>|<sha256>' line per artifact
+    """
+    lines = ["# Offline artifacts: <role>|<relative path>|<version>|<size>|<sha256>"]
+    for entry in manifest.get("files", []):
+        role = entry.get("role") or get_artifact_role(entry)
+        lines.append("|".join([
+            role,
+            entry["relative_path"],
+            entry.get("version") or "",
+            str(entry.get("size") or ""),
+            entry.get("sha256") or ""
+        ]))
+    return "\n".join(lines) + "\n"
+
+
+def write_artifact_index(manifest, output_dir):
+    """
+    Save the artifact index read by GKInstall next to the package manifest.
+
+    Returns:
+        str: Path of the written file
+    """
+    index_path = os.path.join(output_dir, ARTIFACT_INDEX_FILENAME)
+    with open(index_path, 'w', newline='\n') as f:
+        f.write(build_artifact_index(manifest))
+    print(f"[DELTA] Artifact index written to {index_path}")
+    return index_path
+
+
+def write_delta_file(plan, output_dir):
+    """
+    Write (or remove) the delta instructions read by GKInstall.
+
+    Each line is 'reuse|<relative path>|<size>' or 'remove|<relative path>'.
+    For full packages a stale delta file from an earlier build is removed.
+
+    Returns:
+        str: Path of the delta file, or None for full packages
+    """
+    delta_path = os.path.join(output_dir, DELTA_FILENAME)
+
+    if not plan.get("delta"):
+        if os.path.exists(delta_path):
+            os.remove(delta_path)
+            print(f"[DELTA] Removed stale {DELTA_FILENAME} from full package")
+        return None
+
+    lines = [f"# Delta offline package (previous package: {plan['delta'].get('previous_created') or 'unknown'})"]
+    for entry in plan.get("files", []):
+        if entry.get("action") == "reuse":
+            lines.append(f"reuse|{_manifest_path(entry['relative_path'])}|{entry.get('size') or ''}")
+    for path in plan["delta"].get("removed", []):
+        lines.append(f"remove|{path}")
+
+    with open(delta_path, 'w', newline='\n') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"[DELTA] Delta instructions written to {delta_path}")
+    return delta_path
@@ -0,0 +1,115 @@
+"""
+Prompt policies for project generation and offline package downloads
+
+The generator core never talks to Tk directly. Everything that needs the
+user (messages, file/version choices, re-download confirmations, download
+progress) goes through a prompts object. ConsolePrompts is the headless
+policy used by scripts, services and tests: it prints messages and answers
+every question with the pre-selected default. The GUI passes TkPrompts
+(gk_install_builder.dialogs.generator_prompts), which shows dialogs instead.
+"""
+
+import threading
+import time
+
+
+class ConsoleDownloadProgress:
+    """
+    Download progress for headless runs.
+
+    The generator hands start() a poll function that drains the download
+    queue; here it is called from a background thread until it reports that
+    all files are done.
+    """
+
+    poll_interval = 0.1
+
+    def __init__(self, total_files):
+        self.total_files = total_files
+        self.cancelled = False
+
+    def start(self, poll):
+        """Call poll() periodically until it returns True."""
+        def run():
+            while not poll():
+                time.sleep(self.poll_interval)
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def file_progress(self, file_name, component_type, downloaded, total):
+        """Progress of one file (bytes downloaded / total bytes)."""
+
+    def overall_progress(self, completed_files, downloaded_bytes, total_bytes):
+        """Overall progress across all files."""
+
+    def file_complete(self, file_name, component_type, completed_files):
+        print(f"[DOWNLOAD] {completed_files}/{self.total_files} {file_name} ({component_type}) complete")
+
+    def file_error(self, file_name, component_type, error_message, completed_files):
+        print(f"[DOWNLOAD] {completed_files}/{self.total_files} {file_name} ({component_type}) failed: {error_message}")
+
+    def finish(self, download_errors, prompts):
+        """Report the end of all downloads through prompts (called from a worker thread)."""
+        if download_errors:
+            prompts.show_error("Some files failed to download:\n" + "\n".join(download_errors))
+        else:
+            prompts.show_success("All files downloaded successfully")
+
+
+class ConsolePrompts:
+    """
+    Non-interactive prompt policy: print messages, take every default.
+    """
+
+    def show_error(self, message):
+        print(f"\nError: {message}")
+
+    def show_success(self, message):
+        print(f"\n{message}")
+
+    def show_info(self, title, message):
+        print(f"\n{title}: {message}")
+
+    def show_generation_summary(self, tracker):
+        print(f"\nGeneration complete: {tracker.get_total_file_count()} files generated")
+        for note in tracker.get_notes():
+            print(f"  - {note}")
+
+    def ask_download_again(self, component_type, existing_files, parent=None):
+        """Existing files are kept (not downloaded again)."""
+        print(f"Keeping {len(existing_files)} existing {component_type} file(s)")
+        return False
+
+    def ask_download_dependencies_only(self, component_type, parent=None, error_message=None):
+        return False
+
+    def choose_files(self, title, description, launcher_files, other_files, default_names,
+                     config=None, parent=None):
+        """
+        Pick the installers to download.
+
+        Args:
+            launcher_files: Files that are always downloaded (Launcher.exe / .run)
+            other_files: Files the user can choose from
+            default_names: Names of the pre-selected files in other_files
+
+        Returns:
+            list: Selected file dictionaries (launcher files first)
+        """
+        return launcher_files + [file for file in other_files if file['name'] in default_names]
+
+    def choose_version(self, version_names, title, description, parent=None):
+        """
+        Pick a version directory.
+
+        Args:
+            version_names: Directory names, newest first
+
+        Returns:
+            str: Selected name, or None to skip
+        """
+        return version_names[0] if version_names else None
+
+    def create_download_progress(self, total_files, parent=None):
+        return ConsoleDownloadProgress(total_files)
@@ -0,0 +1,147 @@
+"""
+Store-LAN Seeding
+
+Copying the full offline package to every workstation of a store transfers
+the same artifacts N times. When a store seed address is configured, the
+generator writes 'helper/seed/seed.txt' and GKInstall uses it as follows:
+
+- On the seed (the workstation whose hostname or IP matches the address, or
+  any workstation started with --seed / -Seed) a successful installation
+  publishes the verified offline artifacts and serves them over HTTP on its
+  store LAN address for a limited time.
+- On the other workstations, when the component's offline package is missing,
+  GKInstall pulls it from the seed and verifies every file against the
+  'offline_package.sha256' shipped with the package before installing offline.
+  Without that list nothing is pulled. If the seed is not reachable, the
+  regular download from DSG is used.
+
+seed.txt:
+
+    host=store-server
+    port=8765
+    timeout=5
+    serve_minutes=60
+
+'offline_package.sha256' is written next to the package manifest in
+sha256sum format, so both scripts can verify artifacts without parsing JSON.
+"""
+
+import os
+
+SEED_DIR = os.path.join("helper", "seed")
+SEED_CONFIG_FILENAME = "seed.txt"
+ARTIFACT_CHECKSUMS_FILENAME = "offline_package.sha256"
+DEFAULT_SEED_PORT = 8765
+DEFAULT_SEED_TIMEOUT = 5  # seconds
+DEFAULT_SEED_SERVE_MINUTES = 60
+
+
+def _positive_int(value, default):
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_seed_address(address, default_port=DEFAULT_SEED_PORT):
+    """
+    Split the configured seed address into host and port.
+
+    Args:
+        address: 'host', 'host:port' or 'http://host:port/'
+        default_port: Port used when the address has none
+
+    Returns:
+        tuple: (host, port), or None if no seed is configured
+    """
+    address = str(address or "").strip()
+    if "://" in address:
+        address = address.split("://", 1)[1]
+    address = address.split("/", 1)[0]
+    if not address:
+        return None
+
+    host, separator, port = address.rpartition(":")
+    if separator and host and port.isdigit():
+        return host, int(port)
+    return address, _positive_int(default_port, DEFAULT_SEED_PORT)
+
+
+def build_seed_config(config):
+    """
+    Build the content of seed.txt.
+
+    Returns:
+        str: File content, or None if no seed is configured
+    """
+    seed = parse_seed_address(
+        config.get("store_seed_address", ""),
+        config.get("store_seed_port", DEFAULT_SEED_PORT)
+    )
+    if not seed:
+        return None
+
+    host, port = seed
+    lines = [
+        "# Store-LAN seed serving the offline artifacts to the other workstations",
+        f"host={host}",
+        f"port={port}",
+        f"timeout={_positive_int(config.get('store_seed_timeout'), DEFAULT_SEED_TIMEOUT)}",
+        f"serve_minutes={_positive_int(config.get('store_seed_serve_minutes'), DEFAULT_SEED_SERVE_MINUTES)}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_seed_config(output_dir, config):
+    """
+    Write seed.txt, or remove it if no seed is configured.
+
+    Returns:
+        str: Path of seed.txt, or None if seeding is not configured
+    """
+    seed_path = os.path.join(output_dir, SEED_DIR, SEED_CONFIG_FILENAME)
+    seed_config = build_seed_config(config)
+
+    if not seed_config:
+        if os.path.exists(seed_path):
+            os.remove(seed_path)
+            print(f"[SEED] Removed stale {SEED_CONFIG_FILENAME}")
+        return None
+
+    os.makedirs(os.path.dirname(seed_path), exist_ok=True)
+    with open(seed_path, 'w', newline='\n') as f:
+        f.write(seed_config)
+    print(f"[SEED] Store seed configuration written to {seed_path}")
+    return seed_path
+
+
+def build_artifact_checksums(manifest):
+    """
+    Build the sha256sum-style checksum list of an offline package.
+
+    Args:
+        manifest: Package manifest (see build_package_manifest)
+
+    Returns:
+        str: One '<sha256>  <relative path>' line per artifact with a known checksum
+    """
+    # Manifest paths already use forward slashes
+    lines = []
+    for entry in manifest.get("files", []):
+        if entry.get("sha256"):
+            lines.append(f"{entry['sha256']}  {entry['relative_path']}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def write_artifact_checksums(manifest, output_dir):
+    """
+    Save the checksum list next to the package manifest.
+
+    Returns:
+        str: Path of the written file
+    """
+    checksums_path = os.path.join(output_dir, ARTIFACT_CHECKSUMS_FILENAME)
+    with open(checksums_path, 'w', newline='\n') as f:
+        f.write(build_artifact_checksums(manifest))
+    print(f"[SEED] Artifact checksums written to {checksums_path}")
+    return checksums_path
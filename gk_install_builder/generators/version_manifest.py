@@ -0,0 +1,114 @@
+"""
+Build-Time Version Pinning
+
+When version pinning is enabled, the component versions are resolved once
+while the package is generated and written to
+'helper/versions/pinned_versions.properties'. GKInstall reads this manifest
+first and only calls the version APIs when it is missing, fails its SHA-256
+check, was resolved for another tenant/base URL, or lacks the component.
+
+File format (one 'KEY=value' line per component; metadata lines start with '#'):
+
+    #resolved_at=2026-01-01T10:00:00
+    #version_source=FP
+    #base_url=test.cse.cloud4retail.co
+    #tenant_id=001
+    #sha256=<digest of the component lines>
+    POS=v5.27.0
+"""
+
+import os
+import hashlib
+from datetime import datetime
+
+
+PINNED_VERSIONS_DIR = os.path.join("helper", "versions")
+PINNED_VERSIONS_FILENAME = "pinned_versions.properties"
+
+
+def compute_versions_digest(version_lines):
+    """SHA-256 over the component lines, each terminated by a newline."""
+    text = "".join(f"{line}\n" for line in version_lines)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def build_version_manifest(versions, config, version_source):
+    """
+    Build the content of the pinned versions manifest.
+
+    Args:
+        versions: dict component -> {"value", "source"} from the version resolver
+        config: Configuration dictionary
+        version_source: "FP" or "CONFIG"
+
+    Returns:
+        str: Manifest text, or None if no component version was resolved
+    """
+    version_lines = [
+        f"{component}={data['value']}"
+        for component, data in versions.items()
+        if data.get("value")
+    ]
+    if not version_lines:
+        return None
+
+    header = [
+        "# Component versions pinned at build time - do not edit, GKInstall verifies the digest",
+        f"#resolved_at={datetime.now().isoformat(timespec='seconds')}",
+        f"#version_source={version_source}",
+        f"#base_url={config.get('base_url', '')}",
+        f"#tenant_id={config.get('tenant_id', '001')}",
+        f"#sha256={compute_versions_digest(version_lines)}",
+    ]
+    sources = [
+        f"# {component}: {data.get('source')}"
+        for component, data in versions.items()
+        if data.get("value")
+    ]
+    return "\n".join(header + sources + version_lines) + "\n"
+
+
+def write_version_manifest(output_dir, manifest_text):
+    """
+    Write the pinned versions manifest into the package.
+
+    Returns:
+        str: Path of the written manifest
+    """
+    versions_dir = os.path.join(output_dir, PINNED_VERSIONS_DIR)
+    os.makedirs(versions_dir, exist_ok=True)
+    manifest_path = os.path.join(versions_dir, PINNED_VERSIONS_FILENAME)
+    with open(manifest_path, 'w', newline='\n') as f:
+        f.write(manifest_text)
+    print(f"[VERSION PIN] Pinned versions written to {manifest_path}")
+    return manifest_path
+
+
+def read_version_manifest(output_dir):
+    """
+    Read the component versions of a manifest written by this build.
+
+    Returns:
+        dict: component -> version (empty if there is no manifest)
+    """
+    manifest_path = os.path.join(output_dir, PINNED_VERSIONS_DIR, PINNED_VERSIONS_FILENAME)
+    versions = {}
+    if not os.path.exists(manifest_path):
+        return versions
+    with open(manifest_path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                component, version = line.split("=", 1)
+                versions[component] = version
+    return versions
+
+
+def remove_version_manifest(output_dir):
+    """Remove a manifest left over from an earlier build with pinning enabled."""
+    manifest_path = os.path.join(output_dir, PINNED_VERSIONS_DIR, PINNED_VERSIONS_FILENAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+        print(f"[VERSION PIN] Removed stale {PINNED_VERSIONS_FILENAME}")
+        return True
+    return False
@@ -1,16 +1,12 @@
 """
 API Integration Client for Store-Install-Builder
-Handles OAuth token generation and API testing for version management
+Handles API testing for version management (resolution via version_resolver)
 """
 
 import customtkinter as ctk
 from tkinter import messagebox
-import requests
-import base64
-import urllib.parse
-import json
 
-from gk_install_builder.utils.version_sorting import get_latest_version, sort_versions
+from gk_install_builder.integrations.version_resolver import get_version_service
 
 
 class APIClient:
@@ -26,6 +22,7 @@ class APIClient:
         """
         self.root = parent_window
         self.config_manager = config_manager
+        self.version_service = get_version_service()
 
     def test_default_versions_api(self):
         """Test the API to fetch default versions - shows modal to choose method"""
@@ -59,14 +56,14 @@ class APIClient:
         """Show modal dialog to choose between API methods"""
         dialog = ctk.CTkToplevel(self.root)
         dialog.title("Choose API Method")
-        dialog.geometry("500x250")
+        dialog.geometry("500x290")
         dialog.transient(self.root)
 
         # Center the dialog
         dialog.update_idletasks()
         x = (dialog.winfo_screenwidth() // 2) - (250)
-        y = (dialog.winfo_screenheight() // 2) - (125)
-        dialog.geometry(f"500x250+{x}+{y}")
+        y = (dialog.winfo_screenheight() // 2) - (145)
+        dialog.geometry(f"500x290+{x}+{y}")
 
         # Title label
         title_label = ctk.CTkLabel(dialog, text="Select API Method", font=("Arial", 16, "bold"))
@@ -82,7 +79,10 @@ class APIClient:
 
         # Buttons frame
         buttons_frame = ctk.CTkFrame(dialog)
-        buttons_frame.pack(pady=20, padx=20, fill="both", expand=True)
+        buttons_frame.pack(pady=(20, 10), padx=20, fill="both", expand=True)
+
+        # Cached results are reused unless a refresh is requested
+        refresh_var = ctk.BooleanVar(value=False)
 
         # Function Pack API button
         fp_button = ctk.CTkButton(
@@ -90,7 +90,7 @@ class APIClient:
             text="Old Way (Function Pack)\n\nUses Employee Hub Function Pack API\nto fetch versions from FP/FPD scope",
             width=220,
             height=80,
-            command=lambda: [dialog.destroy(), self._test_function_pack_api(base_url)]
+            command=lambda: [dialog.destroy(), self._test_function_pack_api(base_url, refresh_var.get())]
         )
         fp_button.pack(side="left", padx=10)
 
@@ -100,301 +100,98 @@ class APIClient:
             text="New Way (Config-Service)\n\nUses Config-Service API\nto fetch versions by system name",
             width=220,
             height=80,
-            command=lambda: [dialog.destroy(), self._test_config_service_api(base_url)]
+            command=lambda: [dialog.destroy(), self._test_config_service_api(base_url, refresh_var.get())]
         )
         cs_button.pack(side="right", padx=10)
 
+        refresh_checkbox = ctk.CTkCheckBox(
+            dialog,
+            text="Refresh (ignore cached versions)",
+            variable=refresh_var
+        )
+        refresh_checkbox.pack(pady=(0, 15))
+
         # Make dialog modal
         dialog.grab_set()
         dialog.focus_force()
 
-    def _test_function_pack_api(self, base_url):
-        """Test the Employee Hub Function Pack API to fetch default versions"""
+    def _show_loading_dialog(self, title, text):
+        """Show a modal loading dialog and return (dialog, label)"""
+        loading_dialog = ctk.CTkToplevel(self.root)
+        loading_dialog.title(title)
+        loading_dialog.geometry("500x300")
+        loading_dialog.transient(self.root)
+
+        # Center the dialog
+        loading_dialog.update_idletasks()
+        x = (loading_dialog.winfo_screenwidth() // 2) - (250)
+        y = (loading_dialog.winfo_screenheight() // 2) - (150)
+        loading_dialog.geometry(f"500x300+{x}+{y}")
+
+        loading_label = ctk.CTkLabel(loading_dialog, text=text, wraplength=450)
+        loading_label.pack(expand=True, padx=20, pady=20)
+
+        # Update the dialog and ensure it's visible before grabbing
+        loading_dialog.update()
+        loading_dialog.deiconify()
+
+        # Try to grab focus with error handling for Linux compatibility
         try:
-            # Show loading message
-            print("[TEST API] Creating loading dialog...")
-            loading_dialog = ctk.CTkToplevel(self.root)
-            loading_dialog.title("Testing Function Pack API")
-            loading_dialog.geometry("500x300")
-            loading_dialog.transient(self.root)
-
-            # Center the dialog
-            loading_dialog.update_idletasks()
-            x = (loading_dialog.winfo_screenwidth() // 2) - (500 // 2)
-            y = (loading_dialog.winfo_screenheight() // 2) - (300 // 2)
-            loading_dialog.geometry(f"500x300+{x}+{y}")
-
-            loading_label = ctk.CTkLabel(loading_dialog, text="Testing Employee Hub Function Pack API...\nGenerating authentication token...\nPlease wait...", wraplength=450)
-            loading_label.pack(expand=True, padx=20, pady=20)
-
-            # Add a progress info label
-            progress_label = ctk.CTkLabel(loading_dialog, text="Step 1 of 3: Authenticating...", text_color="gray")
-            progress_label.pack(padx=20, pady=10)
-
-            # Update the dialog and ensure it's visible before grabbing
-            loading_dialog.update()
-            loading_dialog.deiconify()  # Ensure window is visible
-
-            # Try to grab focus with error handling for Linux compatibility
-            try:
-                loading_dialog.grab_set()
-            except Exception as e:
-                print(f"[TEST API] Warning: Could not grab window focus: {e}")
-                # Continue without grab - dialog will still work
-
-            # Try to generate token using credentials from config
-            print("[TEST API] Step 1 of 3: Generating authentication token...")
-            bearer_token = self._generate_api_token(base_url, loading_label, loading_dialog)
-
-            if not bearer_token:
-                print("[TEST API] ERROR: Failed to generate bearer token!")
-                loading_dialog.destroy()
-                messagebox.showerror("Authentication Failed",
-                    "Could not generate authentication token.\n\n"
-                    "Please ensure all Security Configuration details are filled in first and that you can reach the Employee Hub itself.\n\n"
-                    "1. Basic Auth Password (launchpad_oauth2)\n"
-                    "2. Form Password (eh_launchpad_password)\n"
-                    "3. Base URL is correct\n"
-                    "4. Network connectivity\n\n"
-                    "Go to the Security Configuration tab and complete all required fields.")
-                return
+            loading_dialog.grab_set()
+        except Exception as e:
+            print(f"[TEST API] Warning: Could not grab window focus: {e}")
 
-            # Update loading message
-            loading_label.configure(text="Testing Employee Hub Function Pack API...\nFetching component versions (FP scope)...\nPlease wait...")
-            loading_dialog.update()
-
-            # Prepare headers for API requests
-            headers = {
-                "authorization": f"Bearer {bearer_token}",
-                "gk-tenant-id": self.config_manager.config.get("tenant_id", "001"),
-                "Referer": f"https://{base_url}/employee-hub/app/index.html"
-            }
-            print(f"[TEST API] Headers prepared (token length: {len(bearer_token)})")
-            print(f"[TEST API] Authorization: Bearer {bearer_token[:50]}...")  # Log truncated for security
-            print(f"[TEST API] Referer: {headers['Referer']}")
-
-            # Initialize versions tracking
-            versions = {
-                "POS": {"value": None, "source": None},
-                "ONEX-POS": {"value": None, "source": None},
-                "WDM": {"value": None, "source": None},
-                "FLOW-SERVICE": {"value": None, "source": None},
-                "LPA-SERVICE": {"value": None, "source": None},
-                "STOREHUB-SERVICE": {"value": None, "source": None},
-                "RCS-SERVICE": {"value": None, "source": None},
-                "MQTT-BROKER": {"value": None, "source": None}
-            }
-
-            # Get API version from config (default to "new" for 5.27+)
-            api_version = self.config_manager.config.get("api_version", "new")
-            print(f"[TEST API] Using API version: {api_version}")
-
-            # Step 1: Try FP scope first (modified/customized versions)
-            # URL patterns based on API version
-            if api_version == "legacy":
-                # Legacy API (5.25 and older) - no /api prefix
-                fp_urls = [
-                    f"https://{base_url}/employee-hub-service/services/rest/v1/properties?scope=FP&referenceId=platform"
-                ]
-            else:
-                # New API (5.27+) - with /api prefix, fallback to legacy
-                fp_urls = [
-                    f"https://{base_url}/api/employee-hub-service/services/rest/v1/properties?scope=FP&referenceId=platform",
-                    f"https://{base_url}/employee-hub-service/services/rest/v1/properties?scope=FP&referenceId=platform"
-            ]
-
-            print(f"[TEST API] Step 2 of 3: Fetching FP scope...")
-            fp_response = None
-            fp_success = False
-
-            for i, fp_api_url in enumerate(fp_urls):
-                print(f"[TEST API] Trying FP URL pattern {i+1}/{len(fp_urls)}: {fp_api_url}")
-
-                try:
-                    print(f"[TEST API] Making FP scope request...")
-                    print(f"[TEST API] Request method: GET")
-                    if i == 0:  # Only print headers on first attempt to avoid spam
-                        print(f"[TEST API] Request headers:")
-                        for key, value in headers.items():
-                            if key == "authorization":
-                                print(f"[TEST API]   {key}: Bearer {value.replace('Bearer ', '')[:50]}...")
-                            else:
-                                print(f"[TEST API]   {key}: {value}")
-
-                    fp_response = requests.get(fp_api_url, headers=headers, timeout=30, verify=False)
-                    print(f"[TEST API] FP response status code: {fp_response.status_code}")
-
-                    if fp_response.status_code == 200:
-                        print(f"[TEST API] ✅ FP URL pattern {i+1} worked!")
-                        print(f"[TEST API] FP response headers: {dict(fp_response.headers)}")
-                        print(f"[TEST API] FP response length: {len(fp_response.text)} bytes")
-                        fp_success = True
-                        break
-                    else:
-                        print(f"[TEST API] ❌ FP URL pattern {i+1} returned {fp_response.status_code}")
-                        if i == len(fp_urls) - 1:  # Last attempt, show response
-                            print(f"[TEST API] Response text: {fp_response.text[:500]}")
-                        continue
-
-                except Exception as e:
-                    print(f"[TEST API] ❌ FP URL pattern {i+1} failed: {e}")
-                    if i == len(fp_urls) - 1:  # Last attempt failed
-                        print(f"[TEST API] All FP URL patterns failed")
-                    continue
-
-            if fp_success:
-                try:
-                    print(f"[TEST API] Full response body:")
-                    print(f"[TEST API] {fp_response.text}")
-                    print(f"[TEST API] " + "-"*80)
-
-                    fp_data = fp_response.json()
-                    print(f"[TEST API] FP response parsed successfully (items: {len(fp_data) if isinstance(fp_data, list) else 'N/A'})")
-                    print(f"[TEST API] FP response type: {type(fp_data)}")
-                    print(f"[TEST API] Raw FP data (first 500 chars): {str(fp_data)[:500]}")
-
-                    # Parse FP scope results
-                    if isinstance(fp_data, list):
-                        for idx, property_item in enumerate(fp_data):
-                            prop_id = property_item.get("propertyId", "")
-                            value = property_item.get("value", "")
-                            print(f"[TEST API]   Item {idx}: propertyId='{prop_id}', value='{value}'")
-
-                            # POS: try Update_Version first, fallback to Version
-                            if prop_id in ["POSClient_Update_Version", "POSClient_Version"] and value:
-                                if versions["POS"]["value"] is None or prop_id == "POSClient_Update_Version":
-                                    versions["POS"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched POS ({prop_id}): {value}")
-                            # OneX POS: try OneX_Version
-                            elif prop_id in ["OneX_Version", "OneX_Update_Version"] and value:
-                                if versions["ONEX-POS"]["value"] is None or prop_id == "OneX_Version":
-                                    versions["ONEX-POS"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched OneX POS ({prop_id}): {value}")
-                            # WDM: try Version first, fallback to Update_Version
-                            elif prop_id in ["WDM_Version", "WDM_Update_Version"] and value:
-                                if versions["WDM"]["value"] is None or prop_id == "WDM_Version":
-                                    versions["WDM"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched WDM ({prop_id}): {value}")
-                            # FlowService: try Version first, fallback to Update_Version
-                            elif prop_id in ["FlowService_Version", "FlowService_Update_Version"] and value:
-                                if versions["FLOW-SERVICE"]["value"] is None or prop_id == "FlowService_Version":
-                                    versions["FLOW-SERVICE"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched FlowService ({prop_id}): {value}")
-                            # LPA: try Version first, fallback to Update_Version
-                            elif prop_id in ["LPA_Version", "LPA_Update_Version"] and value:
-                                if versions["LPA-SERVICE"]["value"] is None or prop_id == "LPA_Version":
-                                    versions["LPA-SERVICE"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched LPA ({prop_id}): {value}")
-                            # StoreHub: try Update_Version first, fallback to Version
-                            elif prop_id in ["SH_Update_Version", "StoreHub_Version"] and value:
-                                if versions["STOREHUB-SERVICE"]["value"] is None or prop_id == "SH_Update_Version":
-                                    versions["STOREHUB-SERVICE"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched StoreHub ({prop_id}): {value}")
-                            # RCS: try Version first, fallback to Update_Version
-                            elif prop_id in ["RCS_Version", "RCS_Update_Version"] and value:
-                                if versions["RCS-SERVICE"]["value"] is None or prop_id == "RCS_Version":
-                                    versions["RCS-SERVICE"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched RCS ({prop_id}): {value}")
-                            # Store MQTT Broker: try Version first, fallback to Update_Version
-                            elif prop_id in ["StoreMQTTBroker_Version", "StoreMQTTBroker_Update_Version"] and value:
-                                if versions["MQTT-BROKER"]["value"] is None or prop_id == "StoreMQTTBroker_Version":
-                                    versions["MQTT-BROKER"] = {"value": value, "source": "FP (Modified)"}
-                                    print(f"[TEST API]     -> Matched MQTT Broker ({prop_id}): {value}")
-                    else:
-                        print(f"[TEST API] ERROR: FP response is not a list, it's a {type(fp_data)}")
-                except Exception as json_err:
-                    print(f"[TEST API] ERROR parsing FP JSON: {json_err}")
-                    print(f"[TEST API] Response text: {fp_response.text[:500]}")
-
-            # Step 2: For components not found in FP, try FPD scope (default versions)
-            missing_components = [comp for comp, data in versions.items() if data["value"] is None]
-
-            if missing_components:
-                loading_label.configure(text="Testing Employee Hub Function Pack API...\nFetching missing components (FPD scope)...\nPlease wait...")
-                loading_dialog.update()
-
-                # URL patterns for FPD based on API version
-                if api_version == "legacy":
-                    # Legacy API (5.25 and older) - no /api prefix
-                    fpd_urls = [
-                        f"https://{base_url}/employee-hub-service/services/rest/v1/properties?scope=FPD&referenceId=platform"
-                    ]
-                else:
-                    # New API (5.27+) - with /api prefix, fallback to legacy
-                    fpd_urls = [
-                        f"https://{base_url}/api/employee-hub-service/services/rest/v1/properties?scope=FPD&referenceId=platform",
-                        f"https://{base_url}/employee-hub-service/services/rest/v1/properties?scope=FPD&referenceId=platform"
-                    ]
-
-                fpd_response = None
-                fpd_success = False
-
-                for i, fpd_api_url in enumerate(fpd_urls):
-                    print(f"[TEST API] Trying FPD URL pattern {i+1}/{len(fpd_urls)}: {fpd_api_url}")
-
-                    try:
-                        fpd_response = requests.get(fpd_api_url, headers=headers, timeout=30, verify=False)
-                        print(f"[TEST API] FPD response status code: {fpd_response.status_code}")
-
-                        if fpd_response.status_code == 200:
-                            print(f"[TEST API] ✅ FPD URL pattern {i+1} worked!")
-                            fpd_success = True
-                            break
-                        else:
-                            print(f"[TEST API] ❌ FPD URL pattern {i+1} returned {fpd_response.status_code}")
-                            continue
-                    except Exception as e:
-                        print(f"[TEST API] ❌ FPD URL pattern {i+1} failed: {e}")
-                        continue
-
-                if fpd_success:
-                    try:
-                        fpd_data = fpd_response.json()
-
-                        # Parse FPD scope results for missing components only
-                        for property_item in fpd_data:
-                            prop_id = property_item.get("propertyId", "")
-                            value = property_item.get("value", "")
-
-                            # POS: try Update_Version first, fallback to Version
-                            if prop_id in ["POSClient_Update_Version", "POSClient_Version"] and value and versions["POS"]["value"] is None:
-                                versions["POS"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched POS ({prop_id}): {value}")
-                            # OneX POS: try OneX_Version
-                            elif prop_id in ["OneX_Version", "OneX_Update_Version"] and value and versions["ONEX-POS"]["value"] is None:
-                                versions["ONEX-POS"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched OneX POS ({prop_id}): {value}")
-                            # WDM: try Version first, fallback to Update_Version
-                            elif prop_id in ["WDM_Version", "WDM_Update_Version"] and value and versions["WDM"]["value"] is None:
-                                versions["WDM"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched WDM ({prop_id}): {value}")
-                            # FlowService: try Version first, fallback to Update_Version
-                            elif prop_id in ["FlowService_Version", "FlowService_Update_Version"] and value and versions["FLOW-SERVICE"]["value"] is None:
-                                versions["FLOW-SERVICE"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched FlowService ({prop_id}): {value}")
-                            # LPA: try Version first, fallback to Update_Version
-                            elif prop_id in ["LPA_Version", "LPA_Update_Version"] and value and versions["LPA-SERVICE"]["value"] is None:
-                                versions["LPA-SERVICE"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched LPA ({prop_id}): {value}")
-                            # StoreHub: try Update_Version first, fallback to Version
-                            elif prop_id in ["SH_Update_Version", "StoreHub_Version"] and value and versions["STOREHUB-SERVICE"]["value"] is None:
-                                versions["STOREHUB-SERVICE"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched StoreHub ({prop_id}): {value}")
-                            # RCS: try Version first, fallback to Update_Version
-                            elif prop_id in ["RCS_Version", "RCS_Update_Version"] and value and versions["RCS-SERVICE"]["value"] is None:
-                                versions["RCS-SERVICE"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched RCS ({prop_id}): {value}")
-                            # Store MQTT Broker: try Version first, fallback to Update_Version
-                            elif prop_id in ["StoreMQTTBroker_Version", "StoreMQTTBroker_Update_Version"] and value and versions["MQTT-BROKER"]["value"] is None:
-                                versions["MQTT-BROKER"] = {"value": value, "source": "FPD (Default)"}
-                                print(f"[TEST API]     -> Matched MQTT Broker ({prop_id}): {value}")
-                    except Exception as e:
-                        print(f"Warning: FPD scope request failed: {e}")
+        return loading_dialog, loading_label
 
+    def _resolve_versions(self, source, title, refresh):
+        """
+        Resolve versions through the shared resolution service with a loading dialog.
+
+        Returns:
+            tuple: (versions or None if authentication failed, cache age in seconds or None)
+        """
+        config = self.config_manager.config
+        cache_age = None if refresh else self.version_service.cached_age(config, source)
+
+        loading_dialog, _ = self._show_loading_dialog(
+            title,
+            f"{title}...\nAuthenticating and fetching all component versions...\nPlease wait..."
+        )
+        try:
+            versions = self.version_service.resolve(config, source=source, refresh=refresh)
+        finally:
             loading_dialog.destroy()
+        return versions, cache_age
+
+    def _show_authentication_error(self):
+        """Explain what is needed to generate an API token"""
+        messagebox.showerror("Authentication Failed",
+            "Could not generate authentication token.\n\n"
+            "Please ensure all Security Configuration details are filled in first and that you can reach the Employee Hub itself.\n\n"
+            "1. Basic Auth Password (launchpad_oauth2)\n"
+            "2. Form Password (eh_launchpad_password)\n"
+            "3. Base URL is correct\n"
+            "4. Network connectivity\n\n"
+            "Go to the Security Configuration tab and complete all required fields.")
+
+    def _format_cache_note(self, cache_age):
+        """Describe whether the shown versions came from the cache"""
+        if cache_age is None:
+            return "\n🔄 Fetched live from the API"
+        return f"\n🗄️ Cached result ({int(cache_age)}s old) - tick 'Refresh' to fetch again"
+
+    def _test_function_pack_api(self, base_url, refresh=False):
+        """Test the Employee Hub Function Pack API to fetch default versions"""
+        try:
+            print(f"[TEST API] Resolving FP/FPD versions for {base_url} (refresh: {refresh})")
+            versions, cache_age = self._resolve_versions("FP", "Testing Function Pack API", refresh)
+
+            if versions is None:
+                print("[TEST API] ERROR: Failed to generate bearer token!")
+                self._show_authentication_error()
+                return
 
             # Show results with status and source for each component
-            print(f"[TEST API] Test complete. Processing results...")
             result_text = "✅ API Test Successful!\n\nComponent Version Status:\n\n"
 
             found_count = 0
@@ -407,268 +204,36 @@ class APIClient:
                     result_text += f"❌ {component}: Not Found\n"
                     print(f"[TEST API] ❌ {component}: Not Found")
 
+            api_version = self.config_manager.config.get("api_version", "new")
             result_text += f"\n📊 Summary: {found_count}/{len(versions)} components found"
             api_version_label = "Legacy (5.25)" if api_version == "legacy" else "New (5.27+)"
             result_text += f"\n🔍 API: Function Pack ({api_version_label})"
             result_text += f"\n📋 Strategy: FP scope first, FPD for missing"
+            result_text += self._format_cache_note(cache_age)
 
             if found_count == 0:
                 result_text += "\n\n⚠️ No component versions found in either FP or FPD scope"
 
-            print(f"[TEST API] " + "="*80)
             print(f"[TEST API] SUMMARY: {found_count}/{len(versions)} components found")
-            print(f"[TEST API] " + "="*80)
             messagebox.showinfo("API Test Results", result_text)
 
-        except requests.exceptions.RequestException as e:
-            if 'loading_dialog' in locals():
-                loading_dialog.destroy()
-            messagebox.showerror("API Test Failed",
-                f"Network error: {str(e)}\n\n"
-                f"Please check your network connection and ensure all Security Configuration details are filled in first.")
         except Exception as e:
-            if 'loading_dialog' in locals():
-                loading_dialog.destroy()
             messagebox.showerror("API Test Failed",
                 f"Error: {str(e)}\n\n"
                 f"Please ensure all Security Configuration details are filled in first.")
 
-    def _generate_api_token(self, base_url, loading_label, loading_dialog):
-        """Generate API token using credentials from config"""
-        try:
-            # Update loading message
-            loading_label.configure(text="Generating authentication token...\nUsing credentials from configuration...")
-            loading_dialog.update()
-
-            # Get the correct credentials from config
-            # Note: These come from the Security Configuration section
-            basic_auth_password = self.config_manager.config.get("launchpad_oauth2", "")  # Basic Auth password (for launchpad:password)
-            form_username = self.config_manager.config.get("eh_launchpad_username", "")  # Form username (e.g., gk01ag)
-            form_password = self.config_manager.config.get("eh_launchpad_password", "")  # Form password (e.g., gk12345)
-
-            print(f"[TOKEN GEN] basic_auth_password present: {bool(basic_auth_password)} (length: {len(basic_auth_password) if basic_auth_password else 0})")
-            print(f"[TOKEN GEN] form_username present: {bool(form_username)} (length: {len(form_username) if form_username else 0})")
-            print(f"[TOKEN GEN] form_password present: {bool(form_password)} (length: {len(form_password) if form_password else 0})")
-            print(f"[TOKEN GEN] Config keys: {list(self.config_manager.config.keys())}")
-
-            if not basic_auth_password or not form_username or not form_password:
-                print(f"[TOKEN GEN] ERROR: Missing credentials!")
-                print(f"[TOKEN GEN]   launchpad_oauth2: {bool(basic_auth_password)}")
-                print(f"[TOKEN GEN]   eh_launchpad_username: {bool(form_username)}")
-                print(f"[TOKEN GEN]   eh_launchpad_password: {bool(form_password)}")
-                return None
-
-            # Handle both base64 encoded and plain text passwords
-            try:
-                # Try to decode as base64 first
-                basic_auth_password_decoded = base64.b64decode(basic_auth_password).decode('utf-8')
-                print(f"[TOKEN GEN] Successfully decoded basic_auth_password from base64")
-            except Exception as e:
-                # If decoding fails, assume it's already plain text
-                print(f"[TOKEN GEN] basic_auth_password appears to be plain text (decode error: {e})")
-                basic_auth_password_decoded = basic_auth_password
-
-            try:
-                # Try to decode form_password
-                form_password_decoded = base64.b64decode(form_password).decode('utf-8')
-                print(f"[TOKEN GEN] Successfully decoded form_password from base64")
-            except Exception as e:
-                print(f"[TOKEN GEN] form_password appears to be plain text (decode error: {e})")
-                form_password_decoded = form_password
-
-            # Create Basic Auth header (username is always "launchpad")
-            username = "launchpad"
-            auth_string = f"{username}:{basic_auth_password_decoded}"
-            auth_b64 = base64.b64encode(auth_string.encode('ascii')).decode('ascii')
-            print(f"[TOKEN GEN] Basic Auth header created (first 20 chars): {auth_b64[:20]}...")
-
-            # Prepare form data for OAuth token request
-            form_data_dict = {
-                'username': form_username,
-                'password': form_password_decoded,
-                'grant_type': 'password'
-            }
-
-            # URL encode form data
-            encoded_pairs = []
-            for key, value in form_data_dict.items():
-                encoded_key = urllib.parse.quote_plus(str(key))
-                encoded_value = urllib.parse.quote_plus(str(value))
-                encoded_pairs.append(f"{encoded_key}={encoded_value}")
-
-            form_data = '&'.join(encoded_pairs)
-            print(f"[TOKEN GEN] Form data keys: {list(form_data_dict.keys())}")
-            print(f"[TOKEN GEN] Form data (encoded): {form_data[:100]}...")
-
-            # Make OAuth token request
-            tenant_id = self.config_manager.config.get("tenant_id", "001")
-            token_url = f"https://{base_url}/auth-service/tenants/{tenant_id}/oauth/token"
-            print(f"[TOKEN GEN] Token URL: {token_url}")
-            print(f"[TOKEN GEN] Auth header: Basic {auth_b64[:50]}...")
-
-            headers = {
-                'Authorization': f'Basic {auth_b64}',
-                'Content-Type': 'application/x-www-form-urlencoded'
-            }
-
-            # Update loading message
-            loading_label.configure(text="Requesting OAuth token...\nPlease wait...")
-            loading_dialog.update()
-
-            print(f"[TOKEN GEN] Sending POST request...")
-            response = requests.post(token_url, headers=headers, data=form_data, timeout=30, verify=False)
-
-            print(f"[TOKEN GEN] Token response status: {response.status_code}")
-            print(f"[TOKEN GEN] Token response text: {response.text[:500]}")
-            print(f"[TOKEN GEN] Token response headers: {dict(response.headers)}")
-
-            if response.status_code == 200:
-                try:
-                    token_data = response.json()
-                    access_token = token_data.get('access_token')
-                    if access_token:
-                        print(f"[TOKEN GEN] ✅ Token generated successfully (length: {len(access_token)})")
-                        return access_token
-                    else:
-                        print(f"[TOKEN GEN] ERROR: No access_token in response")
-                except Exception as e:
-                    print(f"[TOKEN GEN] ERROR parsing token response: {e}")
-                    pass
-            else:
-                print(f"[TOKEN GEN] ERROR: Non-200 status code: {response.status_code}")
-
-            print(f"[TOKEN GEN] Returning None - token generation failed")
-            return None
-
-        except Exception as e:
-            print(f"[TOKEN GEN] EXCEPTION in _generate_api_token: {e}")
-            import traceback
-            print(f"[TOKEN GEN] Traceback: {traceback.format_exc()}")
-            return None
-
-    def _test_config_service_api(self, base_url):
+    def _test_config_service_api(self, base_url, refresh=False):
         """Test the Config-Service API to fetch versions by system name"""
         try:
-            # Show loading message
-            print("[CONFIG API] Creating loading dialog...")
-            loading_dialog = ctk.CTkToplevel(self.root)
-            loading_dialog.title("Testing Config-Service API")
-            loading_dialog.geometry("500x300")
-            loading_dialog.transient(self.root)
-
-            # Center the dialog
-            loading_dialog.update_idletasks()
-            x = (loading_dialog.winfo_screenwidth() // 2) - (250)
-            y = (loading_dialog.winfo_screenheight() // 2) - (150)
-            loading_dialog.geometry(f"500x300+{x}+{y}")
-
-            loading_label = ctk.CTkLabel(loading_dialog, text="Testing Config-Service API...\nGenerating authentication token...\nPlease wait...", wraplength=450)
-            loading_label.pack(expand=True, padx=20, pady=20)
-
-            # Update the dialog and ensure it's visible
-            loading_dialog.update()
-            loading_dialog.deiconify()
-
-            # Try to grab focus
-            try:
-                loading_dialog.grab_set()
-            except Exception as e:
-                print(f"[CONFIG API] Warning: Could not grab window focus: {e}")
-
-            # Generate token
-            print("[CONFIG API] Step 1: Generating authentication token...")
-            bearer_token = self._generate_api_token(base_url, loading_label, loading_dialog)
-
-            if not bearer_token:
+            print(f"[CONFIG API] Resolving Config-Service versions for {base_url} (refresh: {refresh})")
+            versions, cache_age = self._resolve_versions("CONFIG", "Testing Config-Service API", refresh)
+
+            if versions is None:
                 print("[CONFIG API] ERROR: Failed to generate bearer token!")
-                loading_dialog.destroy()
-                messagebox.showerror("Authentication Failed",
-                    "Could not generate authentication token.\n\n"
-                    "Please ensure all Security Configuration details are filled in first.")
+                self._show_authentication_error()
                 return
 
-            # Update loading message
-            loading_label.configure(text="Testing Config-Service API...\nFetching versions for all components...\nPlease wait...")
-            loading_dialog.update()
-
-            # Prepare headers
-            headers = {
-                "authorization": f"Bearer {bearer_token}",
-                "content-type": "application/json"
-            }
-            print(f"[CONFIG API] Headers prepared (token length: {len(bearer_token)})")
-
-            # Get system types from config
-            system_types = {
-                "POS": self.config_manager.config.get("pos_system_type", "GKR-OPOS-CLOUD"),
-                "ONEX-POS": self.config_manager.config.get("onex_pos_system_type", "GKR-OPOS-ONEX-CLOUD"),
-                "WDM": self.config_manager.config.get("wdm_system_type", "CSE-wdm"),
-                "FLOW-SERVICE": self.config_manager.config.get("flow_service_system_type", "GKR-FLOWSERVICE-CLOUD"),
-                "LPA-SERVICE": self.config_manager.config.get("lpa_service_system_type", "CSE-lps-lpa"),
-                "STOREHUB-SERVICE": self.config_manager.config.get("storehub_service_system_type", "CSE-sh-cloud"),
-                "RCS-SERVICE": self.config_manager.config.get("rcs_system_type", "GKR-Resource-Cache-Service"),
-                "MQTT-BROKER": self.config_manager.config.get("mqtt_broker_system_type", "GKR-Store-MQTT-Broker")
-            }
-
-            print(f"[CONFIG API] System types: {system_types}")
-
-            # Initialize versions tracking
-            versions = {}
-
-            # Get API version from config (default to "new" for 5.27+)
-            api_version = self.config_manager.config.get("api_version", "new")
-            print(f"[CONFIG API] Using API version: {api_version}")
-
-            # API URL based on version
-            if api_version == "legacy":
-                # Legacy API (5.25 and older)
-                api_url = f"https://{base_url}/config-service/services/rest/infrastructure/v1/versions/search"
-            else:
-                # New API (5.27+)
-                api_url = f"https://{base_url}/api/config/services/rest/infrastructure/v1/versions/search"
-            print(f"[CONFIG API] API URL: {api_url}")
-
-            # Fetch versions for each component
-            for component, system_name in system_types.items():
-                print(f"[CONFIG API] Fetching versions for {component} (systemName: {system_name})...")
-
-                payload = {"systemName": system_name}
-
-                try:
-                    response = requests.post(api_url, headers=headers, json=payload, timeout=30, verify=False)
-                    print(f"[CONFIG API] {component} response status: {response.status_code}")
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        version_list = data.get("versionNameList", [])
-
-                        if version_list:
-                            # Sort versions and get the latest (highest) version
-                            sorted_versions = sort_versions(version_list, descending=True)
-                            latest_version = get_latest_version(version_list)
-
-                            if latest_version:
-                                versions[component] = {"value": latest_version, "source": "Config-Service", "all_versions": sorted_versions}
-                                print(f"[CONFIG API] ✅ {component}: {latest_version} (available: {len(version_list)} versions, sorted)")
-                            else:
-                                # Fallback to first in sorted list if get_latest_version returns None
-                                versions[component] = {"value": sorted_versions[0], "source": "Config-Service", "all_versions": sorted_versions}
-                                print(f"[CONFIG API] ✅ {component}: {sorted_versions[0]} (available: {len(version_list)} versions, fallback)")
-                        else:
-                            versions[component] = {"value": None, "source": None, "all_versions": []}
-                            print(f"[CONFIG API] ❌ {component}: No versions found")
-                    else:
-                        print(f"[CONFIG API] ❌ {component} returned status {response.status_code}: {response.text[:200]}")
-                        versions[component] = {"value": None, "source": None, "all_versions": []}
-
-                except Exception as e:
-                    print(f"[CONFIG API] ❌ {component} request failed: {e}")
-                    versions[component] = {"value": None, "source": None, "all_versions": []}
-
-            loading_dialog.destroy()
-
             # Show results
-            print(f"[CONFIG API] Test complete. Processing results...")
             result_text = "✅ Config-Service API Test Successful!\n\nComponent Version Status:\n\n"
 
             found_count = 0
@@ -684,27 +249,19 @@ class APIClient:
                     result_text += f"❌ {component}: Not Found\n\n"
                     print(f"[CONFIG API] ❌ {component}: Not Found")
 
+            api_version = self.config_manager.config.get("api_version", "new")
             result_text += f"📊 Summary: {found_count}/{len(versions)} components found"
             api_version_label = "Legacy (5.25)" if api_version == "legacy" else "New (5.27+)"
             result_text += f"\n🔍 API: Config-Service ({api_version_label})"
+            result_text += self._format_cache_note(cache_age)
 
             if found_count == 0:
                 result_text += "\n\n⚠️ No component versions found"
 
-            print(f"[CONFIG API] " + "="*80)
             print(f"[CONFIG API] SUMMARY: {found_count}/{len(versions)} components found")
-            print(f"[CONFIG API] " + "="*80)
             messagebox.showinfo("Config-Service API Test Results", result_text)
 
-        except requests.exceptions.RequestException as e:
-            if 'loading_dialog' in locals():
-                loading_dialog.destroy()
-            messagebox.showerror("API Test Failed",
-                f"Network error: {str(e)}\n\n"
-                f"Please check your network connection.")
         except Exception as e:
-            if 'loading_dialog' in locals():
-                loading_dialog.destroy()
             messagebox.showerror("API Test Failed",
                 f"Error: {str(e)}\n\n"
                 f"Please ensure all configuration details are correct.")
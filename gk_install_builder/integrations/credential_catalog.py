@@ -0,0 +1,161 @@
+"""Credential Catalog for Store-Install-Builder
+
+Indexes a Pleasant Password Server folder tree once so that folder and
+credential lookups no longer walk the whole tree per rule. Credential
+names are normalized (upper case, '_' -> '-') so the dash and underscore
+naming formats share one index entry; folder names match exactly.
+
+The catalog accepts both folder formats returned by the API:
+'folders/{id}' (Name/Children/Credentials) and 'folders' (name/items).
+"""
+
+from bisect import bisect_left
+
+
+def normalize_credential_name(name):
+    """Normalize a credential name for lookups ('test_ba_password' -> 'TEST-BA-PASSWORD')."""
+    return (name or "").strip().upper().replace("_", "-")
+
+
+def _field(item, *keys, default=None):
+    for key in keys:
+        if key in item:
+            return item[key]
+    return default
+
+
+class CredentialCatalog:
+    """Name and path indexes over the folders and credentials of a folder tree."""
+
+    def __init__(self, folder_structure):
+        self.source = folder_structure
+        self.root_name = ""
+        self._folders_by_name = {}
+        self._folders_by_path = {}
+        self._credentials_by_name = {}
+        self._credentials_by_fragment = {}
+        self._credentials = []
+        if isinstance(folder_structure, dict):
+            self.root_name = _field(folder_structure, "Name", "name", default="") or ""
+            self._index_folder(folder_structure, "")
+        elif isinstance(folder_structure, list):
+            for item in folder_structure:
+                if isinstance(item, dict):
+                    self._index_folder(item, "")
+        self._sorted_paths = sorted(self._folders_by_path)
+
+    def _index_folder(self, folder, parent_path):
+        # Iterative depth-first walk in the same pre-order as the former recursive searches
+        stack = [(folder, parent_path)]
+        while stack:
+            current, path = stack.pop()
+            name = _field(current, "Name", "name", default="") or ""
+            current_path = f"{path}/{name}" if path else name
+
+            self._folders_by_name.setdefault(name, []).append(current)
+            self._folders_by_path.setdefault(current_path, current)
+
+            for cred in _field(current, "Credentials", "credentials", default=None) or []:
+                self._index_credential(cred, current_path)
+
+            children = _field(current, "Children", "items", default=None) or []
+            for child in reversed(children):
+                if isinstance(child, dict):
+                    stack.append((child, current_path))
+
+    def _index_credential(self, cred, path):
+        normalized = normalize_credential_name(_field(cred, "Name", "name", default=""))
+        record = (path, cred)
+        self._credentials.append(record)
+        self._credentials_by_name.setdefault(normalized, []).append(record)
+
+        # Every run of consecutive name tokens, so 'contains BA-PASSWORD' is a dict lookup
+        tokens = [token for token in normalized.split("-") if token]
+        fragments = set()
+        for start in range(len(tokens)):
+            for end in range(start + 1, len(tokens) + 1):
+                fragments.add("-".join(tokens[start:end]))
+        for fragment in fragments:
+            self._credentials_by_fragment.setdefault(fragment, []).append(record)
+
+    @property
+    def folder_count(self):
+        return sum(len(folders) for folders in self._folders_by_name.values())
+
+    @property
+    def credential_count(self):
+        return len(self._credentials)
+
+    def find_folders(self, name):
+        """All folders with exactly the given name, in tree order."""
+        return list(self._folders_by_name.get(name, []))
+
+    def find_folder(self, name):
+        """First folder with exactly the given name, or None."""
+        folders = self._folders_by_name.get(name)
+        return folders[0] if folders else None
+
+    def folder_at(self, path):
+        """Folder at a '/'-separated path from the root (e.g. 'TEST/APP'), or None."""
+        return self._folders_by_path.get(path)
+
+    def paths_with_prefix(self, prefix):
+        """Folder paths starting with prefix, in sorted order."""
+        start = bisect_left(self._sorted_paths, prefix)
+        paths = []
+        for path in self._sorted_paths[start:]:
+            if not path.startswith(prefix):
+                break
+            paths.append(path)
+        return paths
+
+    def credentials_named(self, name):
+        """(path, credential) pairs whose name equals name in either naming format."""
+        return list(self._credentials_by_name.get(normalize_credential_name(name), []))
+
+    def credentials_containing(self, fragment):
+        """(path, credential) pairs whose name contains the '-'/'_' separated fragment."""
+        return list(self._credentials_by_fragment.get(normalize_credential_name(fragment), []))
+
+    def all_credentials(self):
+        """All (path, credential) pairs in tree order."""
+        return list(self._credentials)
+
+    def find_best_credential(self, env_name, target_suffix, fragments=(), rare_names=()):
+        """
+        Apply the credential lookup rules in priority order.
+
+        1. '<env>-<target_suffix>' in a folder whose path contains 'APP'
+        2. '<env>-<target_suffix>' anywhere
+        3. Names containing one of the fragments (in the given order)
+        4. Names equal to one of the rare names
+
+        Both naming formats (dashes and underscores) match every rule. Within
+        a rule the first credential in tree order wins.
+
+        Returns:
+            tuple: (credential, path, reason) or (None, None, None)
+        """
+        if env_name:
+            target_name = f"{env_name}-{target_suffix}"
+            exact = self.credentials_named(target_name)
+            for path, cred in exact:
+                if "APP" in path:
+                    return cred, path, f"Exact match for {target_name} in APP subfolder"
+            if exact:
+                path, cred = exact[0]
+                return cred, path, f"Exact match for {target_name}"
+
+        for fragment in fragments:
+            matches = self.credentials_containing(fragment)
+            if matches:
+                path, cred = matches[0]
+                return cred, path, f"Contains {fragment}: {_field(cred, 'Name', 'name', default='')}"
+
+        for rare_name in rare_names:
+            matches = self.credentials_named(rare_name)
+            if matches:
+                path, cred = matches[0]
+                return cred, path, f"Rare format: {rare_name}"
+
+        return None, None, None
@@ -0,0 +1,132 @@
+"""Bulk KeePass Credential Resolution for Store-Install-Builder
+
+Resolves the Launchpad OAuth2 (Basic Auth) password of every configured
+environment in one pass over a single authenticated Pleasant session. Each
+project and environment folder is fetched once, even when several
+environments share it, and folders and passwords are fetched concurrently.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from gk_install_builder.integrations.keepass_handler import KeePassHandler
+except ImportError:
+    from integrations.keepass_handler import KeePassHandler
+
+
+KEEPASS_SERVER_URL = "https://keeserver.gk.gk-software.com/api/v5/rest/"
+# Folder containing one subfolder per project (AZR-CSE, ...)
+PROJECTS_FOLDER_ID = "87300a24-9741-4d24-8a5c-a8b04e0b7049"
+DEFAULT_CREDENTIAL_WORKERS = 8
+
+
+def detect_keepass_project(base_url):
+    """
+    Derive the KeePass project folder and environment from a base URL.
+
+    'test.cse.cloud4retail.co' -> ('AZR-CSE', 'TEST')
+
+    Returns:
+        tuple: (project_name, environment)
+    """
+    project_name = "AZR-CSE"
+    environment = "TEST"
+    if base_url and "." in base_url:
+        parts = base_url.split(".")
+        if parts[0]:
+            environment = parts[0].upper()
+        if len(parts) >= 2 and parts[1]:
+            project_name = f"AZR-{parts[1].upper()}"
+    return project_name, environment
+
+
+def _map_unique(executor, func, keys):
+    """Run func once per distinct key concurrently; exceptions are returned as values."""
+    def call(key):
+        try:
+            return func(key)
+        except Exception as e:
+            return e
+    unique_keys = list(dict.fromkeys(keys))
+    return dict(zip(unique_keys, executor.map(call, unique_keys)))
+
+
+def resolve_environment_credentials(client, environments, max_workers=DEFAULT_CREDENTIAL_WORKERS):
+    """
+    Resolve the Launchpad OAuth2 password of every environment.
+
+    Args:
+        client: Authenticated PleasantPasswordClient
+        environments: List of environment dicts (base_url, alias, ...)
+        max_workers: Concurrent KeePass requests
+
+    Returns:
+        list: One dict per environment, in input order, with 'index', 'alias',
+        'project', 'environment', 'resolved', 'password' and 'reason'
+    """
+    handler = KeePassHandler(None, None)
+    targets = [detect_keepass_project(env.get("base_url", "")) for env in environments]
+    results = [
+        {"index": index, "alias": env.get("alias", ""), "project": project, "environment": env_name,
+         "resolved": False, "password": None, "reason": None}
+        for index, (env, (project, env_name)) in enumerate(zip(environments, targets))
+    ]
+    if not environments:
+        return results
+
+    projects_folder = client.get_folder_cached(PROJECTS_FOLDER_ID, recurse_level=1)
+    project_ids = {project: handler.find_folder_id_by_name(projects_folder, project)
+                   for project, _ in targets}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        project_folders = _map_unique(
+            executor, lambda project: client.get_folder_cached(project_ids[project], recurse_level=2),
+            [project for project, _ in targets if project_ids[project]]
+        )
+
+        env_ids = {}
+        for (project, env_name) in set(targets):
+            folder = project_folders.get(project)
+            if isinstance(folder, dict):
+                for subfolder in handler.get_subfolders(folder):
+                    if subfolder.get('name') == env_name:
+                        env_ids[(project, env_name)] = subfolder.get('id')
+                        break
+
+        env_folders = _map_unique(
+            executor, lambda target: client.get_folder_cached(env_ids[target], recurse_level=2),
+            [target for target in targets if target in env_ids]
+        )
+        entries = {
+            target: handler.find_basic_auth_password_entry(folder)
+            for target, folder in env_folders.items() if isinstance(folder, dict)
+        }
+        passwords = _map_unique(
+            executor, client.get_entry_password,
+            [entry['Id'] for entry in entries.values() if isinstance(entry, dict) and 'Id' in entry]
+        )
+
+    for result, target in zip(results, targets):
+        project, env_name = target
+        entry = entries.get(target)
+        password = passwords.get(entry['Id']) if isinstance(entry, dict) and 'Id' in entry else None
+
+        if not project_ids.get(project):
+            result["reason"] = f"Project folder {project} not found"
+        elif isinstance(project_folders.get(project), Exception):
+            result["reason"] = f"Could not load {project}: {project_folders[project]}"
+        elif target not in env_ids:
+            result["reason"] = f"Environment {env_name} not found in {project}"
+        elif isinstance(env_folders.get(target), Exception):
+            result["reason"] = f"Could not load {project}/{env_name}: {env_folders[target]}"
+        elif not isinstance(entry, dict):
+            result["reason"] = f"No Basic Auth password entry in {project}/{env_name}"
+        elif isinstance(password, Exception) or not password:
+            result["reason"] = f"Could not read password of {entry.get('Name', entry['Id'])}: {password}"
+        else:
+            result["resolved"] = True
+            result["password"] = password
+
+    resolved = sum(1 for result in results if result["resolved"])
+    print(f"[KEEPASS] Resolved credentials for {resolved}/{len(results)} environments")
+    return results
@@ -6,8 +6,10 @@ This module manages KeePass integration for retrieving credentials from Pleasant
 from tkinter import messagebox
 try:
     from gk_install_builder.pleasant_password_client import PleasantPasswordClient
+    from gk_install_builder.integrations.credential_catalog import CredentialCatalog
 except ImportError:
     from pleasant_password_client import PleasantPasswordClient
+    from integrations.credential_catalog import CredentialCatalog
 
 
 class KeePassHandler:
@@ -18,6 +20,7 @@ class KeePassHandler:
     keepass_credentials = {}
     keepass_username = None
     keepass_password = None
+    keepass_catalogs = {}  # folder ID -> CredentialCatalog for the current session
 
     def __init__(self, parent_window, config_manager):
         """Initialize the KeePass Handler
@@ -108,184 +111,72 @@ class KeePassHandler:
         )
         keepass_dialog.open()
 
-    def find_basic_auth_password_entry(self, folder_structure):
-        """Find Basic Auth password entry in KeePass folder structure
+    @classmethod
+    def get_catalog(cls, folder_structure):
+        """Return the credential catalog of a folder structure, built once per session
+
+        Catalogs are cached by folder ID until the KeePass credentials are
+        cleared; a newly fetched structure for the same folder replaces the
+        cached catalog.
 
         Args:
             folder_structure: The KeePass folder structure dictionary
 
         Returns:
-            The credential entry dictionary if found, None otherwise
+            CredentialCatalog for the structure
         """
-        print("\nSearching for Basic Auth password entry...")
-        env_name = None
-
-        # Try to extract environment name from folder structure
-        if isinstance(folder_structure, dict):
-            folder_name = folder_structure.get('Name', '')
-            if folder_name:
-                env_name = folder_name
-                print(f"Current environment: {env_name}")
-
-        # Create a list to store all found credentials for debugging
-        all_credentials = []
-        found_entries = []
-        target_entry = None
-
-        def search_recursively(structure, path=""):
-            """Recursively search for credentials in the folder structure"""
-            nonlocal target_entry
-
-            if not isinstance(structure, dict):
-                return None
-
-            # Check credentials in current folder
-            credentials = structure.get('Credentials', [])
-            folder_name = structure.get('Name', '')
-            current_path = f"{path}/{folder_name}" if path else folder_name
-
-            print(f"Checking folder: {current_path} - Found {len(credentials)} credentials")
-
-            # Look for credentials in this folder
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                cred_id = cred.get('Id', '')
-                all_credentials.append({
-                    'path': current_path,
-                    'name': cred_name,
-                    'id': cred_id
-                })
-
-                # Dynamically build the target credential names based on environment
-                if env_name:
-                    # Support both naming formats: dashes and underscores
-                    target_cred_name_dash = f"{env_name}-LAUNCHPAD-OAUTH-BA-PASSWORD"
-                    target_cred_name_underscore = f"{env_name}_LAUNCHPAD_OAUTH_BA_PASSWORD"
-
-                    # First priority: exact match for dash format in APP subfolder
-                    if cred_name == target_cred_name_dash and "APP" in current_path:
-                        print(f"FOUND TARGET ENTRY (dash format): {target_cred_name_dash} in {current_path}")
-                        target_entry = cred
-                        return cred
-
-                    # First priority: exact match for underscore format in APP subfolder
-                    if cred_name == target_cred_name_underscore and "APP" in current_path:
-                        print(f"FOUND TARGET ENTRY (underscore format): {target_cred_name_underscore} in {current_path}")
-                        target_entry = cred
-                        return cred
-
-                    # Second priority: exact match for dash format anywhere
-                    if cred_name == target_cred_name_dash:
-                        print(f"FOUND EXACT MATCH (dash format): {target_cred_name_dash} in {current_path}")
-                        found_entries.append({
-                            'priority': 1,
-                            'entry': cred,
-                            'path': current_path,
-                            'reason': f'Exact match for {target_cred_name_dash} (dash format)'
-                        })
-
-                    # Second priority: exact match for underscore format anywhere
-                    if cred_name == target_cred_name_underscore:
-                        print(f"FOUND EXACT MATCH (underscore format): {target_cred_name_underscore} in {current_path}")
-                        found_entries.append({
-                            'priority': 1,
-                            'entry': cred,
-                            'path': current_path,
-                            'reason': f'Exact match for {target_cred_name_underscore} (underscore format)'
-                        })
-
-            # Third priority: entries with LAUNCHPAD-OAUTH-BA-PASSWORD (dash format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'LAUNCHPAD-OAUTH-BA-PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains LAUNCHPAD-OAUTH-BA-PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 2,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains LAUNCHPAD-OAUTH-BA-PASSWORD: {cred_name} (dash format)'
-                    })
-
-            # Third priority: entries with LAUNCHPAD_OAUTH_BA_PASSWORD (underscore format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'LAUNCHPAD_OAUTH_BA_PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains LAUNCHPAD_OAUTH_BA_PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 2,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains LAUNCHPAD_OAUTH_BA_PASSWORD: {cred_name} (underscore format)'
-                    })
-
-            # Fourth priority: entries with BA-PASSWORD (dash format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'BA-PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains BA-PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 3,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains BA-PASSWORD: {cred_name} (dash format)'
-                    })
-
-            # Fourth priority: entries with BA_PASSWORD (underscore format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'BA_PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains BA_PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 3,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains BA_PASSWORD: {cred_name} (underscore format)'
-                    })
-
-            # Fifth priority: entries with rare format LAUNCHPAD_OAUTH
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if cred_name == 'LAUNCHPAD_OAUTH':
-                    print(f"FOUND MATCH: Rare format LAUNCHPAD_OAUTH in {current_path}")
-                    found_entries.append({
-                        'priority': 4,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Rare format: LAUNCHPAD_OAUTH'
-                    })
-
-            # Check children folders
-            children = structure.get('Children', [])
-            for child in children:
-                result = search_recursively(child, current_path)
-                if result:
-                    return result
+        folder_id = folder_structure.get('Id') if isinstance(folder_structure, dict) else None
+        catalog = cls.keepass_catalogs.get(folder_id) if folder_id else None
+        if catalog is None or catalog.source is not folder_structure:
+            catalog = CredentialCatalog(folder_structure)
+            if folder_id:
+                cls.keepass_catalogs[folder_id] = catalog
+        return catalog
 
-            return None
+    def _find_password_entry(self, folder_structure, label, target_suffix, fragments, rare_names=()):
+        """Find a password entry using the catalog lookup rules
 
-        # Start recursive search
-        result = search_recursively(folder_structure)
+        Args:
+            folder_structure: The KeePass folder structure dictionary
+            label: Name of the password for log messages
+            target_suffix: Credential name after the environment, e.g. 'LAUNCHPAD-OAUTH-BA-PASSWORD'
+            fragments: Fallback name fragments in priority order
+            rare_names: Exact names tried last
 
-        # If we found the target entry, return it
-        if target_entry:
-            return target_entry
+        Returns:
+            The credential entry dictionary if found, None otherwise
+        """
+        print(f"\nSearching for {label} password entry...")
+        catalog = self.get_catalog(folder_structure)
+        env_name = catalog.root_name or None
+        if env_name:
+            print(f"Current environment: {env_name}")
+        print(f"Indexed {catalog.folder_count} folders with {catalog.credential_count} credentials")
+
+        entry, path, reason = catalog.find_best_credential(env_name, target_suffix, fragments, rare_names)
+        if entry is not None:
+            print(f"Using {reason} in {path}")
+            return entry
+
+        print("\nAll credentials found during search:")
+        for path, cred in catalog.all_credentials():
+            print(f"  - {path}: {cred.get('Name', '')} (ID: {cred.get('Id', '')})")
+        return None
 
-        # If no exact match found but we have other matches, use the highest priority one
-        if not result and found_entries:
-            # Sort by priority (lowest number = highest priority)
-            found_entries.sort(key=lambda x: x['priority'])
-            best_match = found_entries[0]
-            print(f"\nNo exact match for {env_name}-LAUNCHPAD-OAUTH-BA-PASSWORD or {env_name}_LAUNCHPAD_OAUTH_BA_PASSWORD found in APP subfolder.")
-            print(f"Using best match: {best_match['reason']} in {best_match['path']}")
-            return best_match['entry']
+    def find_basic_auth_password_entry(self, folder_structure):
+        """Find Basic Auth password entry in KeePass folder structure
 
-        # If no result found, print all credentials for debugging
-        if not result and not found_entries:
-            print("\nAll credentials found during search:")
-            for cred in all_credentials:
-                print(f"  - {cred['path']}: {cred['name']} (ID: {cred['id']})")
+        Args:
+            folder_structure: The KeePass folder structure dictionary
 
-        return result
+        Returns:
+            The credential entry dictionary if found, None otherwise
+        """
+        return self._find_password_entry(
+            folder_structure, "Basic Auth", "LAUNCHPAD-OAUTH-BA-PASSWORD",
+            fragments=("LAUNCHPAD-OAUTH-BA-PASSWORD", "BA-PASSWORD"),
+            rare_names=("LAUNCHPAD_OAUTH",)
+        )
 
     def find_webdav_admin_password_entry(self, folder_structure):
         """Find Webdav Admin password entry in KeePass folder structure
@@ -296,163 +187,10 @@ class KeePassHandler:
         Returns:
             The credential entry dictionary if found, None otherwise
         """
-        print("\nSearching for Webdav Admin password entry...")
-        env_name = None
-
-        # Try to extract environment name from folder structure
-        if isinstance(folder_structure, dict):
-            folder_name = folder_structure.get('Name', '')
-            if folder_name:
-                env_name = folder_name
-                print(f"Current environment: {env_name}")
-
-        # Create a list to store all found credentials for debugging
-        all_credentials = []
-        found_entries = []
-        target_entry = None
-
-        def search_recursively(structure, path=""):
-            """Recursively search for credentials in the folder structure"""
-            nonlocal target_entry
-
-            if not isinstance(structure, dict):
-                return None
-
-            # Check credentials in current folder
-            credentials = structure.get('Credentials', [])
-            folder_name = structure.get('Name', '')
-            current_path = f"{path}/{folder_name}" if path else folder_name
-
-            print(f"Checking folder: {current_path} - Found {len(credentials)} credentials")
-
-            # Look for credentials in this folder
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                cred_id = cred.get('Id', '')
-                all_credentials.append({
-                    'path': current_path,
-                    'name': cred_name,
-                    'id': cred_id
-                })
-
-                # Dynamically build the target credential names based on environment
-                if env_name:
-                    # Support both naming formats: dashes and underscores
-                    target_cred_name_dash = f"{env_name}-DSG-WEBDAV-ADMIN-PASSWORD"
-                    target_cred_name_underscore = f"{env_name}_DSG_WEBDAV_ADMIN_PASSWORD"
-
-                    # First priority: exact match for dash format in APP subfolder
-                    if cred_name == target_cred_name_dash and "APP" in current_path:
-                        print(f"FOUND TARGET ENTRY (dash format): {target_cred_name_dash} in {current_path}")
-                        target_entry = cred
-                        return cred
-
-                    # First priority: exact match for underscore format in APP subfolder
-                    if cred_name == target_cred_name_underscore and "APP" in current_path:
-                        print(f"FOUND TARGET ENTRY (underscore format): {target_cred_name_underscore} in {current_path}")
-                        target_entry = cred
-                        return cred
-
-                    # Second priority: exact match for dash format anywhere
-                    if cred_name == target_cred_name_dash:
-                        print(f"FOUND EXACT MATCH (dash format): {target_cred_name_dash} in {current_path}")
-                        found_entries.append({
-                            'priority': 1,
-                            'entry': cred,
-                            'path': current_path,
-                            'reason': f'Exact match for {target_cred_name_dash} (dash format)'
-                        })
-
-                    # Second priority: exact match for underscore format anywhere
-                    if cred_name == target_cred_name_underscore:
-                        print(f"FOUND EXACT MATCH (underscore format): {target_cred_name_underscore} in {current_path}")
-                        found_entries.append({
-                            'priority': 1,
-                            'entry': cred,
-                            'path': current_path,
-                            'reason': f'Exact match for {target_cred_name_underscore} (underscore format)'
-                        })
-
-            # Third priority: entries with DSG-WEBDAV-ADMIN-PASSWORD (dash format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'DSG-WEBDAV-ADMIN-PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains DSG-WEBDAV-ADMIN-PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 2,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains DSG-WEBDAV-ADMIN-PASSWORD: {cred_name} (dash format)'
-                    })
-
-            # Third priority: entries with DSG_WEBDAV_ADMIN_PASSWORD (underscore format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'DSG_WEBDAV_ADMIN_PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains DSG_WEBDAV_ADMIN_PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 2,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains DSG_WEBDAV_ADMIN_PASSWORD: {cred_name} (underscore format)'
-                    })
-
-            # Fourth priority: entries with WEBDAV-ADMIN-PASSWORD (dash format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'WEBDAV-ADMIN-PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains WEBDAV-ADMIN-PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 3,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains WEBDAV-ADMIN-PASSWORD: {cred_name} (dash format)'
-                    })
-
-            # Fourth priority: entries with WEBDAV_ADMIN_PASSWORD (underscore format)
-            for cred in credentials:
-                cred_name = cred.get('Name', '')
-                if 'WEBDAV_ADMIN_PASSWORD' in cred_name:
-                    print(f"FOUND MATCH: Contains WEBDAV_ADMIN_PASSWORD: {cred_name} in {current_path}")
-                    found_entries.append({
-                        'priority': 3,
-                        'entry': cred,
-                        'path': current_path,
-                        'reason': f'Contains WEBDAV_ADMIN_PASSWORD: {cred_name} (underscore format)'
-                    })
-
-            # Check children folders
-            children = structure.get('Children', [])
-            for child in children:
-                result = search_recursively(child, current_path)
-                if result:
-                    return result
-
-            return None
-
-        # Start recursive search
-        result = search_recursively(folder_structure)
-
-        # If we found the target entry, return it
-        if target_entry:
-            return target_entry
-
-        # If no exact match found but we have other matches, use the highest priority one
-        if not result and found_entries:
-            # Sort by priority (lowest number = highest priority)
-            found_entries.sort(key=lambda x: x['priority'])
-            best_match = found_entries[0]
-            print(f"\nNo exact match for {env_name}-DSG-WEBDAV-ADMIN-PASSWORD or {env_name}_DSG_WEBDAV_ADMIN_PASSWORD found in APP subfolder.")
-            print(f"Using best match: {best_match['reason']} in {best_match['path']}")
-            return best_match['entry']
-
-        # If no result found, print all credentials for debugging
-        if not result and not found_entries:
-            print("\nAll credentials found during search:")
-            for cred in all_credentials:
-                print(f"  - {cred['path']}: {cred['name']} (ID: {cred['id']})")
-
-        return result
+        return self._find_password_entry(
+            folder_structure, "Webdav Admin", "DSG-WEBDAV-ADMIN-PASSWORD",
+            fragments=("DSG-WEBDAV-ADMIN-PASSWORD", "WEBDAV-ADMIN-PASSWORD")
+        )
 
     def find_folder_id_by_name(self, folder_structure, search_name):
         """Find folder ID by name in the folder structure
@@ -464,19 +202,8 @@ class KeePassHandler:
         Returns:
             The folder ID if found, None otherwise
         """
-        if isinstance(folder_structure, dict):
-            if folder_structure.get('Name') == search_name:
-                return folder_structure.get('Id')
-
-            children = folder_structure.get('Children', [])
-            for child in children:
-                if child.get('Name') == search_name:
-                    return child.get('Id')
-
-                result = self.find_folder_id_by_name(child, search_name)
-                if result:
-                    return result
-        return None
+        folder = self.get_catalog(folder_structure).find_folder(search_name)
+        return folder.get('Id') if folder else None
 
     def get_subfolders(self, folder_structure):
         """Get subfolders from the folder structure
@@ -548,6 +275,7 @@ class KeePassHandler:
         KeePassHandler.keepass_client = None
         KeePassHandler.keepass_username = None
         KeePassHandler.keepass_password = None
+        KeePassHandler.keepass_catalogs.clear()
 
         # Update instance variables
         self.keepass_client = None
@@ -0,0 +1,233 @@
+"""
+OAuth Token Manager for Store-Install-Builder
+
+One TokenManager exists per base URL, tenant and credential set. It caches
+the access token together with its expiry (from 'expires_in'), refreshes it
+before it expires and coalesces concurrent refreshes - e.g. several download
+threads hitting a 401 at the same moment - into a single token request whose
+result every waiting caller shares.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+import urllib.parse
+
+import requests
+
+
+DEFAULT_TOKEN_LIFETIME = 300  # seconds, used when the response has no expires_in
+TOKEN_REFRESH_MARGIN = 60  # refresh this many seconds before expiry
+TOKEN_REFRESH_MARGIN_RATIO = 0.25  # but never earlier than this share of a short lifetime
+TOKEN_REQUEST_TIMEOUT = 30
+
+
+def _decode_if_base64(value):
+    """Credentials may be stored base64 encoded or as plain text."""
+    try:
+        return base64.b64decode(value).decode('utf-8')
+    except Exception:
+        return value
+
+
+def request_oauth_token(base_url, tenant_id, basic_auth_password, form_username, form_password,
+                        timeout=TOKEN_REQUEST_TIMEOUT):
+    """
+    Request an access token from the auth-service (password grant).
+
+    Args:
+        base_url: Base URL without scheme
+        tenant_id: Tenant ID
+        basic_auth_password: Password of the 'launchpad' OAuth client (plain or base64)
+        form_username: Employee Hub username
+        form_password: Employee Hub password (plain or base64)
+
+    Returns:
+        tuple: (access_token, expires_in) or (None, None) on failure
+    """
+    auth_string = f"launchpad:{_decode_if_base64(basic_auth_password)}"
+    auth_b64 = base64.b64encode(auth_string.encode('ascii')).decode('ascii')
+    form_data = urllib.parse.urlencode({
+        'username': form_username,
+        'password': _decode_if_base64(form_password),
+        'grant_type': 'password'
+    })
+
+    token_url = f"https://{base_url}/auth-service/tenants/{tenant_id}/oauth/token"
+    headers = {
+        'Authorization': f'Basic {auth_b64}',
+        'Content-Type': 'application/x-www-form-urlencoded'
+    }
+
+    try:
+        print(f"[TOKEN] Requesting OAuth token from: {token_url}")
+        response = requests.post(token_url, headers=headers, data=form_data, timeout=timeout, verify=False)
+        if response.status_code == 200:
+            token_data = response.json()
+            access_token = token_data.get('access_token')
+            if access_token:
+                return access_token, token_data.get('expires_in')
+            print("[TOKEN] No access_token in token response")
+        else:
+            print(f"[TOKEN] Token request returned {response.status_code}: {response.text[:200]}")
+    except Exception as e:
+        print(f"[TOKEN] Token request failed: {e}")
+    return None, None
+
+
+class TokenManager:
+    """Caches and refreshes the access token of one tenant and credential set."""
+
+    def __init__(self, base_url, tenant_id, basic_auth_password, form_username, form_password,
+                 refresh_margin=TOKEN_REFRESH_MARGIN, token_requester=None):
+        self.base_url = base_url
+        self.tenant_id = tenant_id
+        self._credentials = (basic_auth_password, form_username, form_password)
+        self.refresh_margin = refresh_margin
+        self._token_requester = token_requester or request_oauth_token
+
+        self._token = None
+        self._refresh_at = 0
+        self._refreshing = False
+        self._refresh_count = 0  # completed refreshes, waiters wait for this to change
+        self._refresh_result = None  # token of the last refresh, None if it failed
+        self._condition = threading.Condition()
+        self._listeners = []
+
+    @property
+    def has_credentials(self):
+        return all(self._credentials)
+
+    def current_token(self):
+        """The cached token (possibly expired) without triggering a refresh."""
+        with self._condition:
+            return self._token
+
+    def _is_fresh(self):
+        return self._token is not None and time.monotonic() < self._refresh_at
+
+    def _set_expiry(self, expires_in):
+        """Schedule the proactive refresh of a token valid for expires_in seconds."""
+        try:
+            lifetime = float(expires_in or DEFAULT_TOKEN_LIFETIME)
+        except (TypeError, ValueError):
+            lifetime = DEFAULT_TOKEN_LIFETIME
+        # A margin as long as a short lifetime would refresh on every call
+        margin = min(self.refresh_margin, lifetime * TOKEN_REFRESH_MARGIN_RATIO)
+        self._refresh_at = time.monotonic() + lifetime - margin
+        return lifetime
+
+    def get_token(self):
+        """
+        Return a valid access token, refreshing it if it is missing or about to expire.
+
+        Returns:
+            str: Access token, or None if no token could be obtained
+        """
+        with self._condition:
+            if self._is_fresh():
+                return self._token
+            stale_token = self._token
+        return self.refresh(stale_token)
+
+    def refresh(self, stale_token=None):
+        """
+        Replace the given stale token (e.g. after a 401) with a new one.
+
+        Concurrent callers share one in-flight request and its result, so a
+        failed refresh returns None to all of them. If another caller has
+        already replaced `stale_token`, its token is returned without a new
+        request.
+
+        Returns:
+            str: New access token, or None if the refresh failed
+        """
+        with self._condition:
+            if self._token is not None and self._token != stale_token and self._is_fresh():
+                return self._token
+            if self._refreshing:
+                refresh_count = self._refresh_count
+                while self._refresh_count == refresh_count:
+                    self._condition.wait()
+                return self._refresh_result
+            self._refreshing = True
+
+        token, expires_in = None, None
+        try:
+            if self.has_credentials:
+                token, expires_in = self._token_requester(self.base_url, self.tenant_id, *self._credentials)
+            else:
+                print("[TOKEN] Missing credentials for token generation")
+        finally:
+            with self._condition:
+                if token:
+                    self._token = token
+                    lifetime = self._set_expiry(expires_in)
+                    print(f"[TOKEN] Token refreshed for tenant {self.tenant_id} (valid {int(lifetime)}s)")
+                self._refresh_result = token or None
+                self._refresh_count += 1
+                self._refreshing = False
+                self._condition.notify_all()
+                listeners = list(self._listeners)
+
+        if token:
+            for listener in listeners:
+                try:
+                    listener(token)
+                except Exception as e:
+                    print(f"[TOKEN] Token listener failed: {e}")
+        return token
+
+    def set_token(self, token, expires_in=None):
+        """Adopt a token obtained elsewhere (e.g. pasted by the user)."""
+        with self._condition:
+            self._token = token
+            self._set_expiry(expires_in)
+
+    def invalidate(self):
+        """Forget the cached token so the next get_token() requests a new one."""
+        with self._condition:
+            self._token = None
+            self._refresh_at = 0
+
+    def add_listener(self, callback):
+        """Call callback(token) after every successful refresh (from the refreshing thread)."""
+        with self._condition:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._condition:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+
+_managers = {}
+_managers_lock = threading.Lock()
+
+
+def get_token_manager(base_url, config):
+    """
+    Return the shared TokenManager for the base URL, tenant and credentials in config.
+
+    Args:
+        base_url: Base URL without scheme
+        config: Configuration dictionary (Security Configuration credentials)
+    """
+    tenant_id = config.get("tenant_id", "001")
+    credentials = (
+        config.get("launchpad_oauth2", ""),
+        config.get("eh_launchpad_username", ""),
+        config.get("eh_launchpad_password", "")
+    )
+    # Key on a digest so the registry does not keep plain credentials as dict keys
+    credential_digest = hashlib.sha256("\0".join(credentials).encode("utf-8")).hexdigest()
+    key = (base_url, tenant_id, credential_digest)
+
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = TokenManager(base_url, tenant_id, *credentials)
+            _managers[key] = manager
+        return manager
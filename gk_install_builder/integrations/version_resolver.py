@@ -0,0 +1,346 @@
+"""
+Component Version Resolver for Store-Install-Builder
+
+Resolves the default component versions without any UI from the Function
+Pack API (FP first, FPD fallback) or the Config-Service API. All requests of
+one resolution run concurrently, and results are cached per tenant and scope
+by a shared VersionResolutionService used by both the GUI "Test API" dialogs
+and the generator (build-time version pinning).
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    from gk_install_builder.utils.version_sorting import VersionIndex
+    from gk_install_builder.integrations.token_manager import get_token_manager
+except ImportError:
+    from utils.version_sorting import VersionIndex
+    from integrations.token_manager import get_token_manager
+
+
+# Component -> (preferred propertyId, fallback propertyId) in FP/FPD scope
+COMPONENT_PROPERTY_IDS = {
+    "POS": ("POSClient_Update_Version", "POSClient_Version"),
+    "ONEX-POS": ("OneX_Version", "OneX_Update_Version"),
+    "WDM": ("WDM_Version", "WDM_Update_Version"),
+    "FLOW-SERVICE": ("FlowService_Version", "FlowService_Update_Version"),
+    "LPA-SERVICE": ("LPA_Version", "LPA_Update_Version"),
+    "STOREHUB-SERVICE": ("SH_Update_Version", "StoreHub_Version"),
+    "RCS-SERVICE": ("RCS_Version", "RCS_Update_Version"),
+    "MQTT-BROKER": ("StoreMQTTBroker_Version", "StoreMQTTBroker_Update_Version"),
+}
+
+# Component -> (config key, default systemName) for the Config-Service API
+CONFIG_SERVICE_SYSTEM_TYPES = {
+    "POS": ("pos_system_type", "GKR-OPOS-CLOUD"),
+    "ONEX-POS": ("onex_pos_system_type", "GKR-OPOS-ONEX-CLOUD"),
+    "WDM": ("wdm_system_type", "CSE-wdm"),
+    "FLOW-SERVICE": ("flow_service_system_type", "GKR-FLOWSERVICE-CLOUD"),
+    "LPA-SERVICE": ("lpa_service_system_type", "CSE-lps-lpa"),
+    "STOREHUB-SERVICE": ("storehub_service_system_type", "CSE-sh-cloud"),
+    "RCS-SERVICE": ("rcs_system_type", "GKR-Resource-Cache-Service"),
+    "MQTT-BROKER": ("mqtt_broker_system_type", "GKR-Store-MQTT-Broker"),
+}
+
+# Single-pass lookup: propertyId -> (component, rank); rank 0 is preferred
+PROPERTY_COMPONENTS = {
+    prop_id: (component, rank)
+    for component, prop_ids in COMPONENT_PROPERTY_IDS.items()
+    for rank, prop_id in enumerate(prop_ids)
+}
+
+REQUEST_TIMEOUT = 30
+DEFAULT_VERSION_CACHE_TTL = 300  # seconds
+DEFAULT_RESOLVE_WORKERS = 8
+
+
+def normalize_version_source(version_source):
+    """Map the UI value 'CONFIG-SERVICE' to the 'CONFIG' used by the scripts."""
+    return "CONFIG" if version_source in ("CONFIG", "CONFIG-SERVICE") else "FP"
+
+
+def generate_api_token(base_url, config):
+    """
+    Return an access token from the shared token manager of this tenant.
+
+    Args:
+        base_url: Employee Hub base URL (without scheme)
+        config: Configuration dictionary
+
+    Returns:
+        str: Access token, or None if the credentials are missing or rejected
+    """
+    return get_token_manager(base_url, config).get_token()
+
+
+def parse_function_pack_properties(properties, versions, source):
+    """
+    Fill missing component versions from an FP or FPD properties response.
+
+    Walks the response once and maps each propertyId through
+    PROPERTY_COMPONENTS. The preferred propertyId of a component wins over its
+    fallback; components that already have a value (e.g. from FP scope) are
+    left untouched.
+
+    Args:
+        properties: Parsed JSON list of {"propertyId", "value"} items
+        versions: dict component -> {"value", "source"} (modified in place)
+        source: Source label stored with every match
+    """
+    if not isinstance(properties, list):
+        return versions
+
+    matched_ranks = {}
+    for item in properties:
+        match = PROPERTY_COMPONENTS.get(item.get("propertyId", ""))
+        value = item.get("value", "")
+        if not match or not value:
+            continue
+
+        component, rank = match
+        if component in matched_ranks:
+            if rank >= matched_ranks[component]:
+                continue
+        elif versions.get(component, {}).get("value"):
+            continue
+
+        versions[component] = {"value": value, "source": source}
+        matched_ranks[component] = rank
+
+    return versions
+
+
+def _function_pack_urls(base_url, scope, api_version):
+    """URL patterns for a properties scope; the new API falls back to the legacy path."""
+    legacy_url = f"https://{base_url}/employee-hub-service/services/rest/v1/properties?scope={scope}&referenceId=platform"
+    if api_version == "legacy":
+        return [legacy_url]
+    return [
+        f"https://{base_url}/api/employee-hub-service/services/rest/v1/properties?scope={scope}&referenceId=platform",
+        legacy_url
+    ]
+
+
+def _fetch_properties(urls, headers):
+    """Return the JSON body of the first URL answering 200, or None."""
+    for url in urls:
+        try:
+            response = requests.get(url, headers=headers, timeout=REQUEST_TIMEOUT, verify=False)
+            if response.status_code == 200:
+                return response.json()
+            print(f"[VERSION RESOLVER] {url} returned {response.status_code}")
+        except Exception as e:
+            print(f"[VERSION RESOLVER] {url} failed: {e}")
+    return None
+
+
+def fetch_function_pack_versions(base_url, bearer_token, tenant_id="001", api_version="new"):
+    """
+    Resolve component versions from the Function Pack API (FP first, FPD fallback).
+
+    Both scopes are requested concurrently; FPD values only fill components
+    that FP does not define.
+
+    Returns:
+        dict: component -> {"value", "source"}; value is None when not found
+    """
+    versions = {component: {"value": None, "source": None} for component in COMPONENT_PROPERTY_IDS}
+    headers = {
+        "authorization": f"Bearer {bearer_token}",
+        "gk-tenant-id": tenant_id,
+        "Referer": f"https://{base_url}/employee-hub/app/index.html"
+    }
+
+    scopes = (("FP", "FP (Modified)"), ("FPD", "FPD (Default)"))
+    with ThreadPoolExecutor(max_workers=len(scopes)) as executor:
+        futures = [
+            (executor.submit(_fetch_properties, _function_pack_urls(base_url, scope, api_version), headers), source)
+            for scope, source in scopes
+        ]
+        for future, source in futures:
+            properties = future.result()
+            if properties is not None:
+                parse_function_pack_properties(properties, versions, source)
+
+    return versions
+
+
+def get_config_service_system_types(config):
+    """Return component -> systemName for the Config-Service API."""
+    return {
+        component: config.get(key, default)
+        for component, (key, default) in CONFIG_SERVICE_SYSTEM_TYPES.items()
+    }
+
+
+def _fetch_config_service_version(api_url, headers, component, system_name):
+    """Resolve the highest available version of one component."""
+    result = {"value": None, "source": None, "all_versions": []}
+    try:
+        response = requests.post(api_url, headers=headers, json={"systemName": system_name},
+                                 timeout=REQUEST_TIMEOUT, verify=False)
+        if response.status_code != 200:
+            print(f"[VERSION RESOLVER] {component} returned {response.status_code}")
+            return result
+        version_list = response.json().get("versionNameList", [])
+        if version_list:
+            # Parse the list once for both the ordering and the latest version
+            index = VersionIndex(version_list)
+            sorted_versions = index.sorted()
+            result = {
+                "value": index.latest() or sorted_versions[0],
+                "source": "Config-Service",
+                "all_versions": sorted_versions
+            }
+    except Exception as e:
+        print(f"[VERSION RESOLVER] {component} request failed: {e}")
+    return result
+
+
+def fetch_config_service_versions(base_url, bearer_token, system_types, api_version="new",
+                                  max_workers=DEFAULT_RESOLVE_WORKERS):
+    """
+    Resolve the highest available version per component from the Config-Service API.
+
+    One request per component, all issued concurrently.
+
+    Returns:
+        dict: component -> {"value", "source", "all_versions"} in system_types order
+    """
+    if api_version == "legacy":
+        api_url = f"https://{base_url}/config-service/services/rest/infrastructure/v1/versions/search"
+    else:
+        api_url = f"https://{base_url}/api/config/services/rest/infrastructure/v1/versions/search"
+
+    headers = {
+        "authorization": f"Bearer {bearer_token}",
+        "content-type": "application/json"
+    }
+
+    if not system_types:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(system_types))) as executor:
+        futures = {
+            component: executor.submit(_fetch_config_service_version, api_url, headers, component, system_name)
+            for component, system_name in system_types.items()
+        }
+        return {component: future.result() for component, future in futures.items()}
+
+
+class VersionResolutionService:
+    """
+    Resolves component versions and caches them per tenant and scope.
+
+    Cache entries are keyed by base URL, tenant, API version and scope (FP or
+    the Config-Service system names) and expire after `ttl` seconds. Concurrent
+    resolutions of the same key share one set of HTTP requests.
+    """
+
+    def __init__(self, ttl=DEFAULT_VERSION_CACHE_TTL, token_provider=None):
+        self.ttl = ttl
+        self.token_provider = token_provider or generate_api_token
+        self._cache = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+
+    def _cache_key(self, config, source):
+        key = (config.get("base_url", ""), config.get("tenant_id", "001"),
+               config.get("api_version", "new"), source)
+        if source == "CONFIG":
+            key += (tuple(sorted(get_config_service_system_types(config).items())),)
+        return key
+
+    def _get_fresh(self, key):
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry["resolved_at"] < self.ttl:
+            return entry
+        return None
+
+    def cached_age(self, config, source=None):
+        """Seconds since the cached result was resolved, or None if not cached."""
+        source = normalize_version_source(source or config.get("default_version_source", "FP"))
+        with self._lock:
+            entry = self._get_fresh(self._cache_key(config, source))
+        return time.monotonic() - entry["resolved_at"] if entry else None
+
+    def resolve(self, config, source=None, refresh=False):
+        """
+        Resolve all component versions, using the cache unless refresh is set.
+
+        Args:
+            config: Configuration dictionary
+            source: "FP" or "CONFIG"/"CONFIG-SERVICE" (default: default_version_source)
+            refresh: Ignore and replace a cached result
+
+        Returns:
+            dict: component -> {"value", "source", ...}, or None if no token
+            could be obtained
+        """
+        source = normalize_version_source(source or config.get("default_version_source", "FP"))
+        key = self._cache_key(config, source)
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = None if refresh else self._get_fresh(key)
+            if entry:
+                print(f"[VERSION RESOLVER] Using cached {source} versions for tenant {key[1]}")
+                return entry["versions"]
+
+            base_url = config.get("base_url", "")
+            bearer_token = self.token_provider(base_url, config)
+            if not bearer_token:
+                return None
+
+            if source == "CONFIG":
+                versions = fetch_config_service_versions(base_url, bearer_token, get_config_service_system_types(config),
+                                                         config.get("api_version", "new"))
+            else:
+                versions = fetch_function_pack_versions(base_url, bearer_token, config.get("tenant_id", "001"),
+                                                        config.get("api_version", "new"))
+
+            with self._lock:
+                self._cache[key] = {"versions": versions, "resolved_at": time.monotonic()}
+            return versions
+
+    def invalidate(self, base_url=None, tenant_id=None):
+        """Drop cached results, optionally only those of one base URL and/or tenant."""
+        with self._lock:
+            for key in list(self._cache):
+                if (base_url is None or key[0] == base_url) and (tenant_id is None or key[1] == tenant_id):
+                    del self._cache[key]
+
+
+_shared_service = None
+_shared_service_lock = threading.Lock()
+
+
+def get_version_service():
+    """Return the process-wide VersionResolutionService."""
+    global _shared_service
+    with _shared_service_lock:
+        if _shared_service is None:
+            _shared_service = VersionResolutionService()
+        return _shared_service
+
+
+def resolve_component_versions(config, refresh=False):
+    """
+    Resolve all component versions with the configured version source.
+
+    Args:
+        config: Configuration dictionary
+        refresh: Bypass cached results of the shared resolution service
+
+    Returns:
+        dict: component -> {"value", "source", ...}, or None if no token
+        could be obtained
+    """
+    return get_version_service().resolve(config, refresh=refresh)
@@ -1,12 +1,17 @@
 """Reusable KeePass authentication dialog for retrieving passwords from KeeServer"""
 
+import threading
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import messagebox
 try:
     from gk_install_builder.pleasant_password_client import PleasantPasswordClient
+    from gk_install_builder.integrations.credential_resolver import (
+        KEEPASS_SERVER_URL, PROJECTS_FOLDER_ID, detect_keepass_project
+    )
 except ImportError:
     from pleasant_password_client import PleasantPasswordClient
+    from integrations.credential_resolver import KEEPASS_SERVER_URL, PROJECTS_FOLDER_ID, detect_keepass_project
 
 
 class KeePassDialog:
@@ -150,252 +155,240 @@ class KeePassDialog:
         )
         get_password_btn.pack(pady=5)
         
+        def run_in_ui(func, *args):
+            """Run func on the Tk thread; ignored once the dialog has been closed"""
+            try:
+                dialog.after(0, lambda: func(*args))
+            except (tk.TclError, RuntimeError):
+                pass
+
+        def find_env_folder(environment):
+            """Return the subfolder entry of an environment in the selected project"""
+            if not hasattr(dialog, 'folder_contents'):
+                return None
+            for folder in KeePassHandler(None, None).get_subfolders(dialog.folder_contents):
+                if isinstance(folder, dict) and folder.get('name') == environment:
+                    return folder
+            return None
+
+        def prefetch_environment(environment):
+            """Load the environment's credentials in the background so Get Password is instant"""
+            env_folder = find_env_folder(environment)
+            client = getattr(dialog, 'client', None)
+            if env_folder and client:
+                client.load_folder_async(env_folder['id'], lambda folder, error: None, recurse_level=2)
+
+        env_combo.configure(command=prefetch_environment)
+
+        def show_environments(project_name, folder_contents, preferred_env):
+            """Fill the environment dropdown from a project folder"""
+            subfolders = KeePassHandler(None, None).get_subfolders(folder_contents)
+            env_values = [folder['name'] for folder in subfolders] if (subfolders and isinstance(subfolders[0], dict)) else subfolders
+            filtered_env_values = [env for env in env_values if not env.startswith("INFRA-")]
+
+            env_combo.configure(values=filtered_env_values, state="normal")
+            if preferred_env in filtered_env_values:
+                env_var.set(preferred_env)
+            elif filtered_env_values:
+                env_var.set(filtered_env_values[0])
+
+            dialog.folder_contents = folder_contents
+            dialog.selected_project = project_name
+            get_password_btn.configure(state="normal")
+            prefetch_environment(env_var.get())
+            return filtered_env_values
+
         def connect_to_keepass():
             """Connect to KeePass and auto-detect environment"""
-            try:
-                status_var.set("Connecting to KeePass server...")
-                dialog.update_idletasks()
-                
-                # Validate inputs
-                if not username_var.get().strip():
-                    status_var.set("Error: Username cannot be empty")
-                    return
-                
-                if not password_var.get().strip():
-                    status_var.set("Error: Password cannot be empty")
+            status_var.set("Connecting to KeePass server...")
+
+            # Validate inputs
+            if not username_var.get().strip():
+                status_var.set("Error: Username cannot be empty")
+                return
+
+            if not password_var.get().strip():
+                status_var.set("Error: Password cannot be empty")
+                return
+
+            # Get base URL
+            base_url = self.base_url_callback()
+            if not base_url:
+                status_var.set("Error: Please enter Base URL first")
+                return
+
+            project_name, detected_env = detect_keepass_project(base_url)
+            username = username_var.get()
+            password = password_var.get()
+            remember = remember_var.get()
+            connect_btn.configure(state="disabled")
+
+            def worker():
+                try:
+                    # Reuse the session of an earlier dialog until its token expires
+                    client = KeePassHandler.keepass_client
+                    reused = (client is not None and
+                              KeePassHandler.keepass_username == username and
+                              KeePassHandler.keepass_password == password and
+                              client.is_token_valid())
+                    if not reused:
+                        run_in_ui(status_var.set, "Authenticating...")
+                        client = PleasantPasswordClient(
+                            base_url=KEEPASS_SERVER_URL,
+                            username=username,
+                            password=password
+                        )
+
+                    # Only the project level and the selected project are loaded
+                    run_in_ui(status_var.set, "Connected to KeePass! Auto-detecting environment...")
+                    projects_folder = client.get_folder_cached(PROJECTS_FOLDER_ID, recurse_level=1)
+                    folder_id = KeePassHandler(None, None).find_folder_id_by_name(projects_folder, project_name)
+                    folder_contents = client.get_folder_cached(folder_id, recurse_level=2) if folder_id else None
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    run_in_ui(on_connect_failed, e)
                     return
-                
-                # Get base URL
-                base_url = self.base_url_callback()
-                if not base_url:
-                    status_var.set("Error: Please enter Base URL first")
+                run_in_ui(on_connected, client, reused, remember, username, password,
+                          project_name, detected_env, folder_id, folder_contents)
+
+            threading.Thread(target=worker, daemon=True).start()
+
+        def on_connect_failed(error):
+            connect_btn.configure(state="normal")
+            status_var.set(f"Error: {str(error)}")
+
+        def on_connected(client, reused, remember, username, password,
+                         project_name, detected_env, folder_id, folder_contents):
+            connect_btn.configure(state="normal")
+            if reused:
+                print("[KEEPASS] Reusing authenticated KeePass session")
+
+            # Save credentials if remember is checked
+            if remember:
+                KeePassHandler.keepass_client = client
+                KeePassHandler.keepass_username = username
+                KeePassHandler.keepass_password = password
+
+            # Store client
+            dialog.client = client
+            detect_projects_btn.configure(state="normal")
+
+            if not folder_id:
+                status_var.set(f"Folder '{project_name}' not found! Click 'Detect Projects' to choose manually.")
+                return
+
+            show_environments(project_name, folder_contents, detected_env)
+            status_var.set(f"Environment Autodetected - {project_name} - {env_var.get()}")
+
+        def detect_projects():
+            """Show project selection dialog; projects fill in once the project level has loaded"""
+            client = dialog.client
+            projects = []
+
+            # Create project selection dialog
+            proj_dialog = ctk.CTkToplevel(dialog)
+            proj_dialog.title("Select Project")
+            proj_dialog.geometry("400x600")
+            proj_dialog.transient(dialog)
+
+            proj_dialog.update_idletasks()
+            proj_dialog.deiconify()
+            proj_dialog.wait_visibility()
+            proj_dialog.lift()
+            proj_dialog.focus_force()
+
+            # Center
+            x = dialog.winfo_x() + (dialog.winfo_width() // 2) - 200
+            y = dialog.winfo_y() + (dialog.winfo_height() // 2) - 300
+            proj_dialog.geometry(f"+{x}+{y}")
+            proj_dialog.grab_set()
+
+            proj_dialog.protocol("WM_DELETE_WINDOW", proj_dialog.destroy)
+
+            # Label
+            ctk.CTkLabel(proj_dialog, text="Available Projects:", font=("Helvetica", 14, "bold")).pack(padx=20, pady=(10, 5))
+
+            # Filter
+            filter_frame = ctk.CTkFrame(proj_dialog)
+            filter_frame.pack(fill="x", padx=20, pady=5)
+
+            ctk.CTkLabel(filter_frame, text="Filter:").pack(side="left", padx=(0, 5))
+            filter_var = tk.StringVar()
+            filter_entry = ctk.CTkEntry(filter_frame, textvariable=filter_var)
+            filter_entry.pack(side="left", fill="x", expand=True)
+
+            azr_only_var = tk.BooleanVar(value=True)
+            azr_checkbox = ctk.CTkCheckBox(filter_frame, text="AZR only", variable=azr_only_var, command=lambda: update_list())
+            azr_checkbox.pack(side="left", padx=5)
+
+            # Projects frame
+            proj_frame = ctk.CTkScrollableFrame(proj_dialog, height=300)
+            proj_frame.pack(fill="both", expand=True, padx=20, pady=10)
+            loading_label = ctk.CTkLabel(proj_frame, text="Loading projects...")
+            loading_label.pack(pady=10)
+
+            def update_list(*args):
+                if not projects:
                     return
-                
-                # Auto-detect project and environment
-                project_name = "AZR-CSE"
-                detected_env = "TEST"
-                
-                if "." in base_url:
-                    parts = base_url.split(".")
-                    if parts[0]:
-                        detected_env = parts[0].upper()
-                    if len(parts) >= 2 and parts[1]:
-                        detected_project = parts[1].upper()
-                        project_name = f"AZR-{detected_project}"
-                
-                status_var.set("Authenticating...")
-                dialog.update_idletasks()
-                
-                # Create client
-                client = PleasantPasswordClient(
-                    base_url="https://keeserver.gk.gk-software.com/api/v5/rest/",
-                    username=username_var.get(),
-                    password=password_var.get()
-                )
-                
-                status_var.set("Authentication successful! Saving settings...")
-                dialog.update_idletasks()
+                for widget in proj_frame.winfo_children():
+                    widget.destroy()
 
-                # Save credentials if remember is checked
-                if remember_var.get():
-                    KeePassHandler.keepass_client = client
-                    KeePassHandler.keepass_username = username_var.get()
-                    KeePassHandler.keepass_password = password_var.get()
-                
-                # Store client
-                dialog.client = client
-                
-                status_var.set("Connected to KeePass! Auto-detecting environment...")
-                dialog.update_idletasks()
-                
-                # Auto-detect and enable buttons
-                detect_projects_btn.configure(state="normal")
-                
-                status_var.set("Loading...")
-                dialog.update_idletasks()
-                
-                # Get project folder
-                projects_folder_id = "87300a24-9741-4d24-8a5c-a8b04e0b7049"
-                folder_structure = client.get_folder(projects_folder_id)
-                
-                # Find project
-                # Create temporary instance for helper methods
-                temp_handler = KeePassHandler(None, None)
-                folder_id = temp_handler.find_folder_id_by_name(folder_structure, project_name)
-                
-                if not folder_id:
-                    status_var.set(f"Folder '{project_name}' not found! Click 'Detect Projects' to choose manually.")
+                filter_text = filter_var.get().lower()
+                azr_only = azr_only_var.get()
+
+                for project in projects:
+                    pname = project['name']
+                    if (filter_text in pname.lower()) and (not azr_only or pname.startswith("AZR-")):
+                        btn = ctk.CTkButton(proj_frame, text=pname, command=lambda p=project: select_proj(p))
+                        btn.pack(fill="x", pady=2)
+
+            def on_projects_loaded(folder_structure, error):
+                if not proj_dialog.winfo_exists():
                     return
-                
-                # Get environments
-                status_var.set("Processing...")
-                dialog.update_idletasks()
-                
-                folder_contents = client.get_folder_by_id(folder_id, recurse_level=2)
-                subfolders = temp_handler.get_subfolders(folder_contents)
-                
-                # Update environment dropdown
-                env_values = [folder['name'] for folder in subfolders] if (subfolders and isinstance(subfolders[0], dict)) else subfolders
-                filtered_env_values = [env for env in env_values if not env.startswith("INFRA-")]
-                
-                env_combo.configure(values=filtered_env_values)
-                
-                # Check if detected environment exists
-                detected_env_exists = detected_env in filtered_env_values
-                
-                if filtered_env_values:
-                    if detected_env_exists:
-                        env_var.set(detected_env)
-                    else:
-                        env_var.set(filtered_env_values[0])
-                
-                # Store data
-                dialog.folder_contents = folder_contents
-                dialog.selected_project = project_name
-                dialog.folder_structure = folder_structure
-                
-                # Update status
-                status_var.set(f"Environment Autodetected - {project_name} - {env_var.get()}")
-                
-                # Enable controls
-                env_combo.configure(state="normal")
-                get_password_btn.configure(state="normal")
-            
-            except Exception as e:
-                status_var.set(f"Error: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
-        def detect_projects():
-            """Show project selection dialog"""
-            try:
-                client = dialog.client
-                status_var.set("Retrieving project list from KeePass...")
-                dialog.update_idletasks()
-                
-                # Get projects
-                projects_folder_id = "87300a24-9741-4d24-8a5c-a8b04e0b7049"
-                folder_structure = client.get_folder(projects_folder_id)
-                
-                status_var.set("Processing project folders...")
-                dialog.update_idletasks()
-                
-                # Get direct children
-                children = folder_structure.get('Children', [])
-                projects = []
-                for child in children:
-                    projects.append({
-                        'name': child.get('Name'),
-                        'id': child.get('Id')
-                    })
-                projects = sorted(projects, key=lambda x: x['name'])
-                
+                if error:
+                    loading_label.configure(text=f"Error: {str(error)}")
+                    status_var.set(f"Error: {str(error)}")
+                    return
+
+                children = folder_structure.get('Children', []) if isinstance(folder_structure, dict) else []
+                projects.extend(sorted(
+                    ({'name': child.get('Name'), 'id': child.get('Id')} for child in children),
+                    key=lambda x: x['name']
+                ))
                 if not projects:
+                    loading_label.configure(text="No projects found!")
                     status_var.set("No projects found!")
                     return
-                
-                status_var.set(f"Found {len(projects)} projects. Preparing list...")
-                dialog.update_idletasks()
-                
-                # Create project selection dialog
-                proj_dialog = ctk.CTkToplevel(dialog)
-                proj_dialog.title("Select Project")
-                proj_dialog.geometry("400x600")
-                proj_dialog.transient(dialog)
-                
-                proj_dialog.update_idletasks()
-                proj_dialog.deiconify()
-                proj_dialog.wait_visibility()
-                proj_dialog.lift()
-                proj_dialog.focus_force()
-                
-                # Center
-                x = dialog.winfo_x() + (dialog.winfo_width() // 2) - 200
-                y = dialog.winfo_y() + (dialog.winfo_height() // 2) - 300
-                proj_dialog.geometry(f"+{x}+{y}")
-                proj_dialog.grab_set()
-                
-                proj_dialog.protocol("WM_DELETE_WINDOW", proj_dialog.destroy)
-                
-                # Label
-                ctk.CTkLabel(proj_dialog, text="Available Projects:", font=("Helvetica", 14, "bold")).pack(padx=20, pady=(10, 5))
-                
-                # Filter
-                filter_frame = ctk.CTkFrame(proj_dialog)
-                filter_frame.pack(fill="x", padx=20, pady=5)
-                
-                ctk.CTkLabel(filter_frame, text="Filter:").pack(side="left", padx=(0, 5))
-                filter_var = tk.StringVar()
-                filter_entry = ctk.CTkEntry(filter_frame, textvariable=filter_var)
-                filter_entry.pack(side="left", fill="x", expand=True)
-                
-                azr_only_var = tk.BooleanVar(value=True)
-                azr_checkbox = ctk.CTkCheckBox(filter_frame, text="AZR only", variable=azr_only_var, command=lambda: update_list())
-                azr_checkbox.pack(side="left", padx=5)
-                
-                # Projects frame
-                proj_frame = ctk.CTkScrollableFrame(proj_dialog, height=300)
-                proj_frame.pack(fill="both", expand=True, padx=20, pady=10)
-                
-                def update_list(*args):
-                    for widget in proj_frame.winfo_children():
-                        widget.destroy()
-                    
-                    filter_text = filter_var.get().lower()
-                    azr_only = azr_only_var.get()
-                    
-                    for project in projects:
-                        pname = project['name']
-                        if (filter_text in pname.lower()) and (not azr_only or pname.startswith("AZR-")):
-                            btn = ctk.CTkButton(proj_frame, text=pname, command=lambda p=project: select_proj(p))
-                            btn.pack(fill="x", pady=2)
-                
-                def select_proj(project):
-                    status_var.set(f"Loading {project['name']}...")
-                    dialog.update_idletasks()
-                    
-                    try:
-                        folder_contents = client.get_folder_by_id(project['id'], recurse_level=2)
-
-                        # Create temporary instance for helper methods
-                        temp_handler = KeePassHandler(None, None)
-                        subfolders = temp_handler.get_subfolders(folder_contents)
-                        
-                        env_values = [f['name'] for f in subfolders] if (subfolders and isinstance(subfolders[0], dict)) else subfolders
-                        filtered = [e for e in env_values if not e.startswith("INFRA-")]
-                        
-                        env_combo.configure(values=filtered, state="normal")
-                        
-                        # Auto-select environment
-                        base_url = self.base_url_callback()
-                        detected = "TEST"
-                        if base_url and "." in base_url:
-                            parts = base_url.split(".")
-                            if parts[0]:
-                                detected = parts[0].upper()
-                        
-                        if detected in filtered:
-                            env_var.set(detected)
-                        elif filtered:
-                            env_var.set(filtered[0])
-                        
-                        dialog.folder_contents = folder_contents
-                        dialog.selected_project = project['name']
-                        
-                        get_password_btn.configure(state="normal")
-                        proj_dialog.destroy()
-                        status_var.set(f"Selected: {project['name']} ({len(filtered)} envs)")
-                    except Exception as e:
-                        status_var.set(f"Error: {str(e)}")
-                
-                filter_var.trace_add("write", update_list)
+
+                status_var.set(f"Found {len(projects)} projects.")
                 update_list()
-                
-            except Exception as e:
-                status_var.set(f"Error: {str(e)}")
-                import traceback
-                traceback.print_exc()
-        
+
+            def select_proj(project):
+                status_var.set(f"Loading {project['name']}...")
+                proj_dialog.destroy()
+                client.load_folder_async(
+                    project['id'],
+                    lambda folder, error: run_in_ui(on_project_loaded, project, folder, error),
+                    recurse_level=2
+                )
+
+            def on_project_loaded(project, folder_contents, error):
+                if error:
+                    status_var.set(f"Error: {str(error)}")
+                    return
+                _, detected_env = detect_keepass_project(self.base_url_callback())
+                filtered = show_environments(project['name'], folder_contents, detected_env)
+                status_var.set(f"Selected: {project['name']} ({len(filtered)} envs)")
+
+            filter_var.trace_add("write", update_list)
+            status_var.set("Retrieving project list from KeePass...")
+            client.load_folder_async(
+                PROJECTS_FOLDER_ID,
+                lambda folder, error: run_in_ui(on_projects_loaded, folder, error),
+                recurse_level=1
+            )
+
         def get_password():
             """Get password from selected project/environment"""
             try:
@@ -403,54 +396,34 @@ class KeePassDialog:
                 if not base_url:
                     status_var.set("Error: Please enter Base URL")
                     return
-                
-                # Auto-detect project
-                project_name = "AZR-CSE"
-                if "." in base_url:
-                    parts = base_url.split(".")
-                    if len(parts) >= 2 and parts[1]:
-                        detected_project = parts[1].upper()
-                        project_name = f"AZR-{detected_project}"
-                
+
                 environment = env_var.get()
-                
+
                 status_var.set("Retrieving password...")
                 dialog.update_idletasks()
-                
+
                 self.target_entry.delete(0, 'end')
-                
+
                 client = dialog.client
-                
-                if hasattr(dialog, 'folder_contents'):
-                    folder_contents = dialog.folder_contents
-
-                    # Create temporary instance for helper methods
-                    temp_handler = KeePassHandler(None, None)
-
-                    # Find environment
-                    env_folder = None
-                    for folder in temp_handler.get_subfolders(folder_contents):
-                        if isinstance(folder, dict) and folder.get('name') == environment:
-                            env_folder = folder
-                            break
-
-                    if env_folder:
-                        env_id = env_folder['id'] if isinstance(env_folder, dict) else env_folder
-                        env_structure = client.get_folder_by_id(env_id, recurse_level=2)
-
-                        entry = temp_handler.find_basic_auth_password_entry(env_structure)
-                        
-                        if entry and isinstance(entry, dict) and 'Id' in entry:
-                            password_url = f"credentials/{entry['Id']}/password"
-                            password = client._make_request('GET', password_url)
-                            
-                            self.target_entry.insert(0, password)
-                            status_var.set(f"Success! Password retrieved for {environment}")
-                            dialog.after(1500, on_dialog_close)
-                            return
-                
+                env_folder = find_env_folder(environment)
+
+                if env_folder:
+                    # Usually already loaded in the background when the environment was selected
+                    env_structure = client.get_folder_cached(env_folder['id'], recurse_level=2)
+
+                    entry = KeePassHandler(None, None).find_basic_auth_password_entry(env_structure)
+
+                    if entry and isinstance(entry, dict) and 'Id' in entry:
+                        password_url = f"credentials/{entry['Id']}/password"
+                        password = client._make_request('GET', password_url)
+
+                        self.target_entry.insert(0, password)
+                        status_var.set(f"Success! Password retrieved for {environment}")
+                        dialog.after(1500, on_dialog_close)
+                        return
+
                 status_var.set("Error: Could not retrieve password")
-            
+
             except Exception as e:
                 status_var.set(f"Error: {str(e)}")
                 import traceback
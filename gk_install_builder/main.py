@@ -1,52 +1,40 @@
+import time
+_imports_started = time.perf_counter()
+
 import customtkinter as ctk
 import os
 import tkinter.ttk as ttk
 import tkinter as tk
 from tkinter import messagebox
 import sys
-import requests
-import json
+from functools import cached_property
 
 # Support both package imports (for PyInstaller) and direct imports (for dev)
+# Only what the first frame needs is imported here; the generator, dialogs and
+# integrations (and with them requests) are imported on first use via lazy_import
 try:
+    from gk_install_builder.utils.startup_timing import lazy_import, mark_first_frame, record, timed
     from gk_install_builder.config import ConfigManager
-    from gk_install_builder.generator import ProjectGenerator
     from gk_install_builder.detection import DetectionManager
-    from gk_install_builder.environment_manager import EnvironmentManager
-    from gk_install_builder.pleasant_password_client import PleasantPasswordClient
     from gk_install_builder.ui.helpers import bind_mousewheel_to_frame
     from gk_install_builder.utils.tooltips import create_tooltip
     from gk_install_builder.utils.ui_colors import get_theme_colors
-    from gk_install_builder.dialogs.about import AboutDialog
-    from gk_install_builder.dialogs.launcher_settings import LauncherSettingsEditor
-    from gk_install_builder.dialogs.offline_package import OfflinePackageCreator
-    from gk_install_builder.dialogs.detection_settings import DetectionSettingsDialog
     from gk_install_builder.features.auto_fill import AutoFillManager
     from gk_install_builder.features.platform_handler import PlatformHandler
     from gk_install_builder.features.version_manager import VersionManager
-    from gk_install_builder.features.certificate_manager import CertificateManager
-    from gk_install_builder.integrations.api_client import APIClient
-    from gk_install_builder.integrations.keepass_handler import KeePassHandler
 except ImportError:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from utils.startup_timing import lazy_import, mark_first_frame, record, timed
     from config import ConfigManager
-    from generator import ProjectGenerator
     from detection import DetectionManager
-    from environment_manager import EnvironmentManager
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from pleasant_password_client import PleasantPasswordClient
     from ui.helpers import bind_mousewheel_to_frame
     from utils.tooltips import create_tooltip
     from utils.ui_colors import get_theme_colors
-    from gk_install_builder.dialogs.about import AboutDialog
-    from gk_install_builder.dialogs.launcher_settings import LauncherSettingsEditor
-    from gk_install_builder.dialogs.offline_package import OfflinePackageCreator
-    from gk_install_builder.dialogs.detection_settings import DetectionSettingsDialog
     from gk_install_builder.features.auto_fill import AutoFillManager
     from gk_install_builder.features.platform_handler import PlatformHandler
     from gk_install_builder.features.version_manager import VersionManager
-    from gk_install_builder.features.certificate_manager import CertificateManager
-    from gk_install_builder.integrations.api_client import APIClient
-    from gk_install_builder.integrations.keepass_handler import KeePassHandler
+
+record("import", "gk_install_builder.main (eager imports)", time.perf_counter() - _imports_started)
 
 class GKInstallBuilder:
     def __init__(self, root=None):
@@ -70,9 +58,6 @@ class GKInstallBuilder:
         # Ensure auth_service_ba_user is always set to "launchpad"
         self.config_manager.config["auth_service_ba_user"] = "launchpad"
         
-        # Initialize project generator
-        self.project_generator = ProjectGenerator(self.root)
-        
         # Initialize the detection manager for file detection
         self.detection_manager = DetectionManager()
         
@@ -114,21 +99,15 @@ class GKInstallBuilder:
         # Store section frames for progressive disclosure
         self.section_frames = {}
 
-        # Create launcher settings editor
-        self.launcher_editor = LauncherSettingsEditor(self.root, self.config_manager, self.project_generator)
-
-        # Create environment manager
-        self.environment_manager = EnvironmentManager(self.root, self.config_manager, self)
-
-        # Initialize refactored feature modules
+        # Initialize refactored feature modules; the project generator, launcher
+        # editor, environment manager, API client, KeePass handler and certificate
+        # manager are created on first use (see the cached properties below)
         self.auto_fill_manager = AutoFillManager(self.config_manager)
         self.platform_handler = PlatformHandler(self.config_manager)
-        self.api_client = APIClient(self.root, self.config_manager)
-        self.keepass_handler = KeePassHandler(self.root, self.config_manager)
-        self.certificate_manager = CertificateManager(self.root, self.config_manager, self)
 
         # Create the GUI
-        self.create_gui()
+        with timed("create_gui"):
+            self.create_gui()
 
         # Auto-fill based on URL if available
         base_url = self.config_manager.config.get("base_url", "")
@@ -145,6 +124,56 @@ class GKInstallBuilder:
         # On first run, ensure base install dir matches selected platform
         if self.is_first_run:
             self.on_platform_changed()
+
+        # Report time to first frame once the main loop has drawn the window
+        self.root.after(0, mark_first_frame)
+
+    @cached_property
+    def project_generator(self):
+        """Project generator (imports the generator and requests on first use)"""
+        ProjectGenerator = lazy_import("gk_install_builder.generator", "ProjectGenerator")
+        with timed("ProjectGenerator"):
+            return ProjectGenerator(self.root)
+
+    @cached_property
+    def launcher_editor(self):
+        """Launcher settings editor, created when first opened"""
+        LauncherSettingsEditor = lazy_import("gk_install_builder.dialogs.launcher_settings", "LauncherSettingsEditor")
+        with timed("LauncherSettingsEditor"):
+            return LauncherSettingsEditor(self.root, self.config_manager, self.project_generator)
+
+    @cached_property
+    def environment_manager(self):
+        """Environment manager, created when first opened"""
+        EnvironmentManager = lazy_import("gk_install_builder.environment_manager", "EnvironmentManager")
+        with timed("EnvironmentManager"):
+            return EnvironmentManager(self.root, self.config_manager, self)
+
+    @cached_property
+    def api_client(self):
+        """API client, created when an API test is first requested"""
+        APIClient = lazy_import("gk_install_builder.integrations.api_client", "APIClient")
+        with timed("APIClient"):
+            return APIClient(self.root, self.config_manager)
+
+    @cached_property
+    def keepass_handler(self):
+        """KeePass handler, created when a KeePass button is first used"""
+        KeePassHandler = lazy_import("gk_install_builder.integrations.keepass_handler", "KeePassHandler")
+        with timed("KeePassHandler"):
+            handler = KeePassHandler(self.root, self.config_manager)
+        handler.set_password_entries(
+            basic_auth_entry=getattr(self, 'basic_auth_password_entry', None),
+            webdav_admin_entry=getattr(self, 'webdav_admin_password_entry', None)
+        )
+        return handler
+
+    @cached_property
+    def certificate_manager(self):
+        """Certificate manager, created with the Security Configuration section"""
+        CertificateManager = lazy_import("gk_install_builder.features.certificate_manager", "CertificateManager")
+        with timed("CertificateManager"):
+            return CertificateManager(self.root, self.config_manager, self)
     
     def create_gui(self):
         # Create main container with scrollbar
@@ -152,7 +181,8 @@ class GKInstallBuilder:
         self.main_frame.pack(padx=20, pady=20, fill="both", expand=True)
 
         # Initialize version manager now that main_frame exists
-        self.version_manager = VersionManager(self.root, self.config_manager, self.api_client, self.main_frame)
+        # The API client is passed as a factory so it is only created when the API is tested
+        self.version_manager = VersionManager(self.root, self.config_manager, lambda: self.api_client, self.main_frame)
 
         # Apply mousewheel binding for Linux scrolling
         bind_mousewheel_to_frame(self.main_frame)
@@ -313,7 +343,7 @@ class GKInstallBuilder:
             text="Legacy (5.25)",
             variable=self.api_version_var,
             value="legacy",
-            command=lambda: self.config_manager.schedule_save()
+            command=lambda: self.config_manager.schedule_save("api_version")
         )
         legacy_api_radio.pack(side="left", padx=10)
 
@@ -322,7 +352,7 @@ class GKInstallBuilder:
             text="New (5.27+)",
             variable=self.api_version_var,
             value="new",
-            command=lambda: self.config_manager.schedule_save()
+            command=lambda: self.config_manager.schedule_save("api_version")
         )
         new_api_radio.pack(side="left", padx=10)
 
@@ -607,7 +637,10 @@ class GKInstallBuilder:
                 "StoreHub Service System Type",
                 "RCS System Type",
                 "MQTT Broker System Type",
-                "Firebird Server Path"
+                "Firebird Server Path",
+                "Download Mirrors",
+                "Store Seed Address",
+                "Store Cache TTL Minutes"
             ]
 
             # Field tooltips for this section
@@ -623,6 +656,9 @@ class GKInstallBuilder:
                 "MQTT Broker System Type": "Type of Store MQTT Broker (e.g., 'GKR-Store-MQTT-Broker').",
                 "WDM System Type": "Type of Wall Device Manager (e.g., 'CSE-wdm')",
                 "Firebird Server Path": "Path to the Firebird server (e.g., '/opt/firebird')",
+                "Download Mirrors": "Optional comma-separated mirror base URLs tried in order before DSG\n(e.g., 'http://store-server:8080/gk, https://cache.example.com/dsg').\nThe files each mirror must host are listed in helper/mirrors/mirror_manifest.txt.",
+                "Store Seed Address": "Optional hostname or IP (host[:port]) of the workstation that serves the offline\nartifacts to the other workstations of the store after its own installation\n(e.g., 'store-pos-01:8765'). Leave empty to disable Store-LAN seeding.",
+                "Store Cache TTL Minutes": "Minutes the installations of a store reuse the store structure, business unit and\nRCS URL resolved by an earlier installation of the same store (default 120).\nThe cache is kept in helper/init/store_cache. Set to 0 to always query the config-service.",
             }
             # Create fields
             for field in fields:
@@ -653,7 +689,10 @@ class GKInstallBuilder:
                 
                 # Set default value
                 if config_key in self.config_manager.config:
-                    entry.insert(0, self.config_manager.config[config_key])
+                    value = self.config_manager.config[config_key]
+                    if isinstance(value, list):
+                        value = ", ".join(value)
+                    entry.insert(0, value)
                 
                 # Register entry with config manager
                 self.config_manager.register_entry(config_key, entry)
@@ -900,8 +939,9 @@ class GKInstallBuilder:
             # Add KeePass button only for specific fields
             if field == "Launchpad OAuth2":
                 self.basic_auth_password_entry = entry  # Store reference to this entry
-                # Set password entry in keepass_handler
-                self.keepass_handler.set_password_entries(basic_auth_entry=entry)
+                # Passed to keepass_handler when it is created (or now if it already exists)
+                if 'keepass_handler' in self.__dict__:
+                    self.keepass_handler.set_password_entries(basic_auth_entry=entry)
                 ctk.CTkButton(
                     field_frame,
                     text="🔑",  # Key icon
@@ -910,8 +950,9 @@ class GKInstallBuilder:
                 ).pack(side="left", padx=5)
             elif field == "Webdav Admin":
                 self.webdav_admin_password_entry = entry  # Store reference to this entry
-                # Set password entry in keepass_handler
-                self.keepass_handler.set_password_entries(webdav_admin_entry=entry)
+                # Passed to keepass_handler when it is created (or now if it already exists)
+                if 'keepass_handler' in self.__dict__:
+                    self.keepass_handler.set_password_entries(webdav_admin_entry=entry)
                 ctk.CTkButton(
                     field_frame,
                     text="🔑",  # Key icon
@@ -1182,6 +1223,7 @@ class GKInstallBuilder:
     
     def show_author_info(self):
         """Display author information in a dialog (delegates to AboutDialog)"""
+        AboutDialog = lazy_import("gk_install_builder.dialogs.about", "AboutDialog")
         about_dialog = AboutDialog(self.root)
         about_dialog.show()
 
@@ -1194,6 +1236,9 @@ class GKInstallBuilder:
         try:
             # Update config from entries
             self.config_manager.update_config_from_entries()
+
+            # Write changes still waiting in the background saver
+            self.config_manager.flush_pending_save()
             
             # Clean up entries
             for entry in list(self.config_manager.entries):
@@ -1257,6 +1302,7 @@ class GKInstallBuilder:
                 self.offline_creator = None
 
         # Create new offline package creator
+        OfflinePackageCreator = lazy_import("gk_install_builder.dialogs.offline_package", "OfflinePackageCreator")
         self.offline_creator = OfflinePackageCreator(
             self.root,
             self.config_manager,
@@ -1266,6 +1312,7 @@ class GKInstallBuilder:
 
     def open_detection_settings(self):
         """Open the Detection Settings dialog (delegates to DetectionSettingsDialog)"""
+        DetectionSettingsDialog = lazy_import("gk_install_builder.dialogs.detection_settings", "DetectionSettingsDialog")
         dialog = DetectionSettingsDialog(
             self.root,
             self.config_manager,
@@ -1494,7 +1541,7 @@ class GKInstallBuilder:
     def on_installer_overrides_changed(self):
         """Handler for when installer overrides checkbox is changed"""
         self.config_manager.config["installer_overrides_enabled"] = self.installer_overrides_var.get()
-        self.config_manager.schedule_save()
+        self.config_manager.schedule_save("installer_overrides_enabled")
 
     def on_override_properties_changed(self):
         """Handler for when override property checkboxes are changed"""
@@ -1502,12 +1549,12 @@ class GKInstallBuilder:
             "check-alive": self.override_check_alive_var.get(),
             "start-application": self.override_start_app_var.get(),
         }
-        self.config_manager.schedule_save()
+        self.config_manager.schedule_save("installer_overrides_properties")
 
     def on_remove_overrides_changed(self):
         """Handler for when remove overrides after install checkbox is changed"""
         self.config_manager.config["remove_overrides_after_install"] = self.remove_overrides_var.get()
-        self.config_manager.schedule_save()
+        self.config_manager.schedule_save("remove_overrides_after_install")
 
     def open_overrides_settings(self):
         """Open dialog to configure per-component installer overrides"""
@@ -1583,7 +1630,7 @@ class GKInstallBuilder:
         def save_and_close():
             result = {k: v.get() for k, v in comp_vars.items()}
             self.config_manager.config["installer_overrides_components"] = result
-            self.config_manager.schedule_save()
+            self.config_manager.schedule_save("installer_overrides_components")
             dialog.destroy()
 
         ctk.CTkButton(action_frame, text="Save", width=100, command=save_and_close).pack(side="left", padx=5)
@@ -1611,7 +1658,8 @@ class GKInstallBuilder:
         self.root.mainloop()
 
 def main():
-    app = GKInstallBuilder()
+    with timed("GKInstallBuilder"):
+        app = GKInstallBuilder()
     app.run()
 
 if __name__ == "__main__":
@@ -1,8 +1,22 @@
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import json
+import threading
+import time
+from concurrent.futures import Future
 from urllib.parse import urljoin
 
+try:
+    from gk_install_builder.integrations.credential_catalog import CredentialCatalog
+except ImportError:
+    from integrations.credential_catalog import CredentialCatalog
+
+# Lifetime assumed when the token response has no expires_in, and the
+# margin before expiry at which a session is no longer reused
+DEFAULT_TOKEN_LIFETIME = 3600
+TOKEN_REFRESH_MARGIN = 60
+
+
 class PleasantPasswordClient:
     def __init__(self, base_url: str, username: str, password: str):
         """
@@ -15,6 +29,11 @@ class PleasantPasswordClient:
         """
         self.base_url = base_url.rstrip('/') + '/'
         self.server_url = self.base_url.split('/api/')[0]  # Extract server base URL
+        self.username = username
+        self.token_expires_at = 0
+        self._folder_catalog = None
+        self._folder_cache = {}  # (folder_id, recurse_level) -> Future
+        self._folder_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -44,6 +63,8 @@ class PleasantPasswordClient:
             # Extract token from response
             token_data = response.json()
             access_token = token_data['access_token']
+            expires_in = token_data.get('expires_in') or DEFAULT_TOKEN_LIFETIME
+            self.token_expires_at = time.monotonic() + float(expires_in)
             
             # Update session headers with bearer token
             self.session.headers.update({
@@ -59,6 +80,10 @@ class PleasantPasswordClient:
                     print(f"Two-factor authentication required (Provider: {otp_provider})")
             raise
 
+    def is_token_valid(self) -> bool:
+        """True while the session token is not about to expire, so the client can be reused"""
+        return time.monotonic() < self.token_expires_at - TOKEN_REFRESH_MARGIN
+
     def _make_request(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """Make HTTP request to the API"""
         url = urljoin(self.base_url, endpoint)
@@ -148,6 +173,60 @@ class PleasantPasswordClient:
         """
         return self._make_request('GET', f'folders/{folder_id}?recurseLevel={recurse_level}')
 
+    def get_folder_cached(self, folder_id: str, recurse_level: int = 1, refresh: bool = False):
+        """
+        Get a folder level like get_folder_by_id, cached for the lifetime of the client
+        Args:
+            folder_id: GUID of the folder
+            recurse_level: How deep to recurse the folder tree (default: 1)
+            refresh: Ignore a cached result and fetch the folder again
+        Concurrent calls for the same folder and level share one request.
+        """
+        key = (folder_id, recurse_level)
+        with self._folder_lock:
+            future = None if refresh else self._folder_cache.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._folder_cache[key] = future
+
+        if is_owner:
+            try:
+                future.set_result(self.get_folder_by_id(folder_id, recurse_level=recurse_level))
+            except Exception as e:
+                # Do not cache failures; the next call retries
+                with self._folder_lock:
+                    if self._folder_cache.get(key) is future:
+                        del self._folder_cache[key]
+                future.set_exception(e)
+        return future.result()
+
+    def load_folder_async(self, folder_id: str, callback: Callable, recurse_level: int = 1):
+        """
+        Load a folder level in a background thread
+        Args:
+            folder_id: GUID of the folder
+            callback: Called as callback(folder, error) from the background thread
+            recurse_level: How deep to recurse the folder tree (default: 1)
+        """
+        def worker():
+            try:
+                folder = self.get_folder_cached(folder_id, recurse_level)
+            except Exception as e:
+                callback(None, e)
+                return
+            callback(folder, None)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        return thread
+
+    def clear_folder_cache(self):
+        """Forget cached folder levels and the indexed folder tree"""
+        with self._folder_lock:
+            self._folder_cache.clear()
+        self._folder_catalog = None
+
     # User Access endpoints
     def get_user_access(self):
         """Get user access information"""
@@ -158,23 +237,14 @@ class PleasantPasswordClient:
         """Get server information"""
         return self._make_request('GET', 'serverinfo')
 
-    def find_folder_by_name(self, folder_name: str):
+    def find_folder_by_name(self, folder_name: str, refresh: bool = False):
         """
         Find a folder by its name and return its details
         Args:
             folder_name: Name of the folder to find (e.g., 'AZR-CSE')
+            refresh: Reload the folder tree instead of using the indexed one
         """
-        folders = self.get_folders()
-        
-        def search_folder(items):
-            """Recursively search through folder structure"""
-            for item in items:
-                if item.get('name') == folder_name:
-                    return item
-                if 'items' in item:
-                    result = search_folder(item['items'])
-                    if result:
-                        return result
-            return None
-        
-        return search_folder(folders) 
\ No newline at end of file
+        # The folder tree is fetched and indexed once per client session
+        if self._folder_catalog is None or refresh:
+            self._folder_catalog = CredentialCatalog(self.get_folders())
+        return self._folder_catalog.find_folder(folder_name)
@@ -0,0 +1,148 @@
+"""
+Virtualized list view for Store-Install-Builder
+
+Shows a long list in a tkinter Listbox by keeping only the rows that fit in
+the widget. The scrollbar, mouse wheel and arrow keys move a window over the
+full row range, and rows are produced on demand by a callback, so a folder
+with thousands of entries renders as fast as one with twenty.
+"""
+import sys
+import tkinter.font as tkfont
+
+
+class VirtualListbox:
+    """
+    Drives a Listbox and Scrollbar as a window over `count` virtual rows.
+
+    Args:
+        listbox: tk.Listbox used for the visible rows
+        scrollbar: tk.Scrollbar next to the listbox
+    """
+
+    def __init__(self, listbox, scrollbar):
+        self.listbox = listbox
+        self.scrollbar = scrollbar
+        self._count = 0
+        self._row_func = None
+        self._top = 0
+        self._selected = None
+
+        scrollbar.config(command=self._on_scrollbar)
+        listbox.config(yscrollcommand="")
+
+        listbox.bind("<Configure>", lambda event: self.refresh())
+        listbox.bind("<<ListboxSelect>>", self._on_select)
+        if sys.platform.startswith('linux'):
+            listbox.bind("<Button-4>", lambda event: self._scroll_by(-3))
+            listbox.bind("<Button-5>", lambda event: self._scroll_by(3))
+        else:
+            listbox.bind("<MouseWheel>", self._on_mousewheel)
+        listbox.bind("<Up>", lambda event: self._move_selection(-1))
+        listbox.bind("<Down>", lambda event: self._move_selection(1))
+        listbox.bind("<Prior>", lambda event: self._move_selection(-self.visible_rows()))
+        listbox.bind("<Next>", lambda event: self._move_selection(self.visible_rows()))
+        listbox.bind("<Home>", lambda event: self._move_selection(-self._count))
+        listbox.bind("<End>", lambda event: self._move_selection(self._count))
+
+    def set_rows(self, count, row_func):
+        """
+        Show a new row range from the top.
+
+        Args:
+            count: Number of virtual rows
+            row_func: row_func(index) -> (text, foreground color or None)
+        """
+        self._count = count
+        self._row_func = row_func
+        self._top = 0
+        self._selected = None
+        self.refresh()
+
+    def visible_rows(self):
+        """Number of rows that fit in the listbox."""
+        height = self.listbox.winfo_height()
+        if height <= 1:
+            # Not mapped yet - fall back to the configured height in lines
+            return max(1, int(self.listbox.cget("height")))
+        bbox = self.listbox.bbox(0)
+        if bbox:
+            row_height = bbox[3] + 1
+        else:
+            row_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+        return max(1, height // max(1, row_height))
+
+    def refresh(self):
+        """Render the rows of the current window."""
+        rows = self.visible_rows()
+        self._top = max(0, min(self._top, self._count - rows))
+        end = min(self._top + rows, self._count)
+
+        self.listbox.delete(0, 'end')
+        for position, index in enumerate(range(self._top, end)):
+            text, color = self._row_func(index)
+            self.listbox.insert('end', text)
+            if color:
+                self.listbox.itemconfig(position, fg=color)
+
+        if self._selected is not None and self._top <= self._selected < end:
+            self.listbox.selection_set(self._selected - self._top)
+            self.listbox.activate(self._selected - self._top)
+
+        if self._count:
+            self.scrollbar.set(self._top / self._count, end / self._count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def index_at(self, y):
+        """Virtual row index at a y coordinate of the listbox, or None."""
+        if not self._count:
+            return None
+        index = self._top + self.listbox.nearest(y)
+        return index if index < self._count else None
+
+    def selected_index(self):
+        """Virtual index of the selected row, or None."""
+        return self._selected
+
+    def select(self, index):
+        """Select a virtual row and scroll it into view."""
+        if index is None or not self._count:
+            return
+        self._selected = max(0, min(index, self._count - 1))
+        rows = self.visible_rows()
+        if self._selected < self._top:
+            self._top = self._selected
+        elif self._selected >= self._top + rows:
+            self._top = self._selected - rows + 1
+        self.refresh()
+
+    def _on_select(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self._selected = self._top + selection[0]
+
+    def _move_selection(self, delta):
+        current = self._selected if self._selected is not None else self._top - (1 if delta > 0 else 0)
+        self.select(current + delta)
+        return "break"
+
+    def _scroll_by(self, rows):
+        self._top += rows
+        self.refresh()
+        return "break"
+
+    def _on_mousewheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        if sys.platform == 'darwin':
+            step *= max(1, abs(event.delta))
+        else:
+            step *= max(1, abs(event.delta) // 120) * 3
+        return self._scroll_by(step)
+
+    def _on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self._top = int(float(args[0]) * self._count)
+        elif action == "scroll":
+            amount = int(args[0])
+            self._top += amount * (self.visible_rows() if args[1] == "pages" else 1)
+        self.refresh()
@@ -2,7 +2,7 @@
 Utility modules for GK Install Builder
 """
 
-from .file_operations import create_directory_structure, copy_certificate, write_installation_script, determine_gk_install_paths
+from .file_operations import create_directory_structure, copy_certificate, write_installation_script, determine_gk_install_paths, write_file_atomically
 from .helpers import replace_urls_in_json, create_helper_structure
 from .environment_setup import setup_firebird_environment_variables
 from .version import get_component_version
@@ -12,6 +12,7 @@ __all__ = [
     'copy_certificate',
     'write_installation_script',
     'determine_gk_install_paths',
+    'write_file_atomically',
     'replace_urls_in_json',
     'create_helper_structure',
     'setup_firebird_environment_variables',
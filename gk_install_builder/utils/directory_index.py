@@ -0,0 +1,72 @@
+"""
+In-memory index of a directory listing for fast, incremental filtering.
+
+The DSG file browser keeps one DirectoryIndex per shown folder. Names are
+lower-cased once; filters are answered from memory without another API call.
+A filter is a case-insensitive substring, or a glob pattern if it contains
+'*', '?' or '['. When a substring filter is typed further (the new filter
+contains the previous one), only the previous matches are scanned again.
+"""
+
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional
+
+GLOB_CHARACTERS = set('*?[')
+
+
+def is_glob_pattern(pattern: str) -> bool:
+    """True if the filter should be treated as a glob pattern."""
+    return any(char in GLOB_CHARACTERS for char in pattern)
+
+
+class DirectoryIndex:
+    """
+    Items of one directory with pre-computed lower-case names.
+
+    Args:
+        items: Listing items (dicts with at least 'name'), already in display order
+
+    Examples:
+        >>> index = DirectoryIndex([{"name": "Launcher.exe"}, {"name": "pos-5.27.0.jar"}])
+        >>> index.filter("jar")
+        [1]
+        >>> index.filter("*.EXE")
+        [0]
+    """
+
+    def __init__(self, items: List[Dict]):
+        self.items = list(items)
+        self._names = [item.get('name', '').lower() for item in self.items]
+        self._last_filter = ''
+        self._last_matches = list(range(len(self.items)))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def filter(self, pattern: Optional[str]) -> List[int]:
+        """
+        Indices of the items whose name matches pattern, in display order.
+
+        An empty pattern matches everything.
+        """
+        pattern = (pattern or '').strip().lower()
+        if not pattern:
+            matches = list(range(len(self.items)))
+        elif is_glob_pattern(pattern):
+            matches = [i for i, name in enumerate(self._names) if fnmatchcase(name, pattern)]
+        else:
+            # Narrowing a substring filter can only drop matches, so rescan the previous ones
+            previous = self._last_filter
+            if previous and not is_glob_pattern(previous) and previous in pattern:
+                candidates = self._last_matches
+            else:
+                candidates = range(len(self.items))
+            matches = [i for i in candidates if pattern in self._names[i]]
+
+        self._last_filter = pattern
+        self._last_matches = matches
+        return matches
+
+    def filter_items(self, pattern: Optional[str]) -> List[Dict]:
+        """Items whose name matches pattern, in display order."""
+        return [self.items[i] for i in self.filter(pattern)]
@@ -7,6 +7,7 @@ from generator.py to improve modularity and testability.
 
 import os
 import shutil
+import tempfile
 
 
 def create_directory_structure(output_dir, helper_structure):
@@ -126,3 +127,35 @@ def determine_gk_install_paths(platform, output_dir, script_dir):
     output_path = os.path.join(output_dir, output_filename)
 
     return template_path, output_path, template_filename, output_filename
+
+
+def write_file_atomically(path, content, encoding="utf-8"):
+    """
+    Write a text file so that readers only ever see the old or the new content
+
+    The content is written to a temporary file in the same directory, flushed
+    and fsynced, then renamed over the target with os.replace().
+
+    Args:
+        path: Target file path
+        content: Text to write
+        encoding: Text encoding (default utf-8)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory,
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
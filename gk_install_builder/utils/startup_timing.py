@@ -0,0 +1,108 @@
+"""
+Startup timing for GK Install Builder
+
+Records how long module imports and component construction take so the time
+to the first frame can be tracked. Heavy modules (requests, the generator,
+dialogs and integrations) are loaded through lazy_import() on first use.
+
+Set GK_STARTUP_TIMING=1 to print a per-module report once the main window
+has drawn its first frame, and a line for every module loaded later.
+"""
+
+import importlib
+import os
+import time
+from contextlib import contextmanager
+
+STARTUP_TIMING_ENV = "GK_STARTUP_TIMING"
+
+# Reference point for "time to first frame" - this module is imported first by main
+_STARTED_AT = time.perf_counter()
+
+# (kind, name, seconds) in the order they were recorded
+_records = []
+_first_frame_at = None
+
+
+def is_enabled():
+    """True if startup timing output was requested via GK_STARTUP_TIMING."""
+    return os.environ.get(STARTUP_TIMING_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def record(kind, name, seconds):
+    """
+    Record the cost of one import or construction.
+
+    After the first frame has been reported, the entry is also printed
+    (if enabled), so lazily loaded modules show up as they are used.
+    """
+    _records.append((kind, name, seconds))
+    if _first_frame_at is not None and is_enabled():
+        print(f"[STARTUP] {kind} {name}: {seconds * 1000:.1f} ms (on first use)")
+
+
+@contextmanager
+def timed(name, kind="init"):
+    """Context manager recording the time spent in its body under name."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, name, time.perf_counter() - started)
+
+
+def lazy_import(module_name, attr=None):
+    """
+    Import a module (and optionally one attribute of it) on first use.
+
+    Follows the package/dev import convention: 'gk_install_builder.x.y' falls
+    back to 'x.y' when the package is not importable.
+
+    Args:
+        module_name: Fully qualified module name
+        attr: Attribute to return instead of the module
+
+    Returns:
+        The module, or the requested attribute of it
+    """
+    started = time.perf_counter()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        prefix = "gk_install_builder."
+        if not module_name.startswith(prefix):
+            raise
+        module = importlib.import_module(module_name[len(prefix):])
+    # Only the first import costs anything; repeated lookups are dictionary hits
+    elapsed = time.perf_counter() - started
+    if elapsed >= 0.001:
+        record("import", module_name, elapsed)
+    return getattr(module, attr) if attr else module
+
+
+def get_records():
+    """Recorded (kind, name, seconds) entries, most expensive first."""
+    return sorted(_records, key=lambda entry: entry[2], reverse=True)
+
+
+def mark_first_frame():
+    """
+    Record that the main window has drawn its first frame.
+
+    Returns:
+        float: Seconds from startup to the first frame
+    """
+    global _first_frame_at
+    if _first_frame_at is None:
+        _first_frame_at = time.perf_counter()
+        if is_enabled():
+            print_report()
+    return _first_frame_at - _STARTED_AT
+
+
+def print_report():
+    """Print the time to first frame and the cost of each recorded step."""
+    if _first_frame_at is not None:
+        print(f"[STARTUP] First frame after {(_first_frame_at - _STARTED_AT) * 1000:.1f} ms")
+    for kind, name, seconds in get_records():
+        print(f"[STARTUP]   {kind:<6} {name:<55} {seconds * 1000:8.1f} ms")
@@ -9,14 +9,22 @@ Supports various version formats:
 - Pre-release tags: v5.25.0-RC1, v5.25.0-beta, v5.25.0-SNAPSHOT
 - Build metadata: v5.27.0+build123
 - Incomplete versions: v5.27, 5.27 (missing patch)
+
+Parsed versions are memoized, and VersionIndex parses a list once to answer
+repeated latest/range/prefix queries on large version lists.
 """
 
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from typing import List, Optional, Tuple
 from packaging.version import Version, InvalidVersion
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Distinct version strings kept parsed; tenants publish at most a few thousand
+PARSE_CACHE_SIZE = 8192
+
 
 def normalize_version_string(version_str: str) -> str:
     """
@@ -87,16 +95,20 @@ def parse_version_safe(version_str: str) -> Tuple[Optional[Version], str]:
         >>> original
         "v5.27.0"
     """
+    return (_parse_version_cached(version_str), version_str)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_version_cached(version_str: str) -> Optional[Version]:
+    """Parse a version string once; Version objects are immutable and safe to share."""
     try:
-        normalized = normalize_version_string(version_str)
-        version_obj = Version(normalized)
-        return (version_obj, version_str)
+        return Version(normalize_version_string(version_str))
     except InvalidVersion as e:
         logger.warning(f"Invalid version format '{version_str}': {e}")
-        return (None, version_str)
+        return None
     except Exception as e:
         logger.error(f"Unexpected error parsing version '{version_str}': {e}")
-        return (None, version_str)
+        return None
 
 
 def sort_versions(version_list: List[str], descending: bool = True) -> List[str]:
@@ -165,20 +177,17 @@ def get_latest_version(version_list: List[str]) -> Optional[str]:
         logger.warning("Empty version list provided to get_latest_version")
         return None
 
-    sorted_versions = sort_versions(version_list, descending=True)
+    # Single pass instead of a full sort; the first of equal versions wins like in sort_versions
+    latest, latest_parsed = None, None
+    for version_str in version_list:
+        parsed, _ = parse_version_safe(version_str)
+        if parsed is not None and (latest_parsed is None or parsed > latest_parsed):
+            latest, latest_parsed = version_str, parsed
 
-    if not sorted_versions:
+    if latest is None:
         logger.warning("No valid versions found in list")
         return None
 
-    latest = sorted_versions[0]
-
-    # Verify the latest version is actually valid (not from the invalid group)
-    parsed, _ = parse_version_safe(latest)
-    if parsed is None:
-        logger.warning(f"Latest version '{latest}' could not be parsed as valid version")
-        return None
-
     logger.debug(f"Latest version identified: {latest}")
     return latest
 
@@ -248,6 +257,103 @@ def is_prerelease(version_str: str) -> bool:
     return parsed.is_prerelease or parsed.is_devrelease
 
 
+class VersionIndex:
+    """
+    A version list parsed once and kept in version order.
+
+    Use it when the same list is queried several times (latest, latest
+    stable, ranges, prefixes) instead of calling sort_versions() and
+    get_latest_version() separately. Original strings are preserved; invalid
+    versions are kept apart and only returned by sorted().
+
+    Examples:
+        >>> index = VersionIndex(["v5.26.1", "v5.27.0-RC1", "v5.26.0", "invalid"])
+        >>> index.latest()
+        "v5.27.0-RC1"
+        >>> index.latest_stable()
+        "v5.26.1"
+        >>> index.with_prefix("5.26")
+        ["v5.26.1", "v5.26.0"]
+    """
+
+    def __init__(self, version_list: List[str]):
+        parsed_versions = [parse_version_safe(v) for v in (version_list or [])]
+        # Stable sorts in both directions so equal versions keep their input order like sort_versions()
+        valid_versions = [(v, orig) for v, orig in parsed_versions if v is not None]
+        self._ascending = sorted(valid_versions, key=lambda x: x[0])
+        self._descending = sorted(valid_versions, key=lambda x: x[0], reverse=True)
+        self._keys = [v for v, _ in self._ascending]
+        self._invalid = [orig for v, orig in parsed_versions if v is None]
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._invalid)
+
+    @property
+    def invalid(self) -> List[str]:
+        """Entries that could not be parsed, in input order."""
+        return list(self._invalid)
+
+    def sorted(self, descending: bool = True) -> List[str]:
+        """Same result as sort_versions(version_list, descending)."""
+        entries = self._descending if descending else self._ascending
+        return [orig for _, orig in entries] + self._invalid
+
+    def latest(self) -> Optional[str]:
+        """Highest valid version, or None if there is none."""
+        return self._descending[0][1] if self._descending else None
+
+    def latest_stable(self) -> Optional[str]:
+        """Highest version that is not a pre-release (RC, beta, SNAPSHOT, ...)."""
+        for parsed, orig in self._descending:
+            if not (parsed.is_prerelease or parsed.is_devrelease):
+                return orig
+        return None
+
+    def _slice(self, start: int, end: int, descending: bool) -> List[str]:
+        versions = [orig for _, orig in self._ascending[start:end]]
+        return versions[::-1] if descending else versions
+
+    def in_range(self, minimum: Optional[str] = None, maximum: Optional[str] = None,
+                 descending: bool = True) -> List[str]:
+        """
+        Versions between minimum and maximum (both inclusive, either may be None).
+
+        Returns an empty list if a bound is not a valid version.
+        """
+        start, end = 0, len(self._keys)
+        if minimum is not None:
+            lower, _ = parse_version_safe(minimum)
+            if lower is None:
+                return []
+            start = bisect_left(self._keys, lower)
+        if maximum is not None:
+            upper, _ = parse_version_safe(maximum)
+            if upper is None:
+                return []
+            end = bisect_right(self._keys, upper)
+        return self._slice(start, max(start, end), descending)
+
+    def with_prefix(self, prefix: str, descending: bool = True) -> List[str]:
+        """
+        Versions whose release starts with the given components, e.g. "5.27" or "v5".
+
+        Pre-releases of matching versions are included.
+        """
+        release = prefix.strip()
+        if release.lower().startswith('v'):
+            release = release[1:]
+        try:
+            parts = [int(part) for part in release.rstrip('.').split('.')]
+        except ValueError:
+            return []
+        # Every X.Y.Z version (including its .devN/pre-releases) lies in [X.Y.dev0, X.(Y+1).dev0)
+        lower = Version(".".join(map(str, parts)) + ".dev0")
+        upper = Version(".".join(map(str, parts[:-1] + [parts[-1] + 1])) + ".dev0")
+        start = bisect_left(self._keys, lower)
+        end = bisect_left(self._keys, upper)
+        return self._slice(start, end, descending)
+
+
 # Example usage and testing
 if __name__ == "__main__":
     # Configure logging for standalone testing
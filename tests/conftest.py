@@ -4,12 +4,16 @@ Pytest configuration and fixtures for Store-Install-Builder tests
 import pytest
 import sys
 import os
+import shutil
+import subprocess
 from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 
 # Add the gk_install_builder package to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+TEMPLATES_DIR = Path(__file__).parent.parent / "gk_install_builder" / "templates"
+
 
 @pytest.fixture
 def mock_config_manager():
@@ -365,6 +369,48 @@ INSTALL_DIR="@BASE_INSTALL_DIR@"
     return template_dir
 
 
+# ============================================================================
+# Script Template Fixtures
+# ============================================================================
+
+@pytest.fixture
+def templates_dir():
+    """Provide the directory of the real script templates"""
+    return str(TEMPLATES_DIR)
+
+
+@pytest.fixture
+def read_template():
+    """Provide a function returning the content of a script template by name"""
+    def read(name):
+        return (TEMPLATES_DIR / name).read_text(encoding="utf-8")
+    return read
+
+
+@pytest.fixture
+def run_powershell():
+    """
+    Provide a function running a PowerShell script with pwsh.
+
+    The script is written to cwd, so $PSScriptRoot is the working directory
+    like for the generated scripts. Tests using it are skipped where
+    PowerShell is not installed.
+    """
+    pwsh = shutil.which("pwsh") or shutil.which("powershell")
+    if not pwsh:
+        pytest.skip("requires PowerShell")
+
+    def run(script, cwd, timeout=60, env=None):
+        script_path = Path(cwd) / "test_script.ps1"
+        script_path.write_text(script, encoding="utf-8")
+        return subprocess.run(
+            [pwsh, "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Bypass",
+             "-File", str(script_path)],
+            capture_output=True, text=True, timeout=timeout, cwd=cwd, env=env
+        )
+    return run
+
+
 @pytest.fixture(autouse=True, scope="function")
 def mock_detection_import():
     """
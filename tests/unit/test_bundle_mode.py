@@ -0,0 +1,192 @@
+"""
+Unit tests for bundle mode in the GKInstall templates.
+
+--ComponentTypes / -ComponentTypes runs the script once per component and
+hands the environment, Store ID and version API responses of the first run
+on to the following ones.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+
+
+def _block(content, start_marker, end_marker, include_end=False):
+    start = content.index(start_marker)
+    end = content.index(end_marker, start)
+    return content[start:end + len(end_marker) if include_end else end]
+
+
+def _run_env():
+    return {k: v for k, v in os.environ.items() if k != "GK_BUNDLE_DIR"}
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashBundleDriver:
+    """Run argument parsing, bundle section and shared sections of GKInstall.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        self.prefix = content[:content.index("\n# Validate ComponentType")]
+        self.environment = _block(content, "# Multi-environment selection (skip in update mode)\n",
+                                  '\nelse\n  echo "Update mode detected') + "\nfi\n"
+        self.store_id = _block(content, "# Bundle mode: use the Store ID detected for the first component",
+                               "\n# Preserve CLI values")
+        self.store_id_set = _block(content, 'if [ "$isUpdate" = false ]; then\n  bundle_set "store_id"', "fi\n",
+                                   include_end=True)
+        self.cleanup = _block(content, "cleanup_installation() {", "\n# Stop on first error")
+
+    def _run(self, tmp_path, args):
+        script = tmp_path / "GKInstall.sh"
+        script.write_text(
+            self.prefix
+            + '\nisUpdate=false\n'
+            'load_environments() { echo "[]"; }\n'
+            # Without -e the first component picks its environment interactively
+            'select_environment() { echo "${2:-PICKED-$COMPONENT_TYPE}"; }\n'
+            'apply_environment_config() { :; }\n'
+            'env_field() { echo "$1"; }\n'
+            + self.environment
+            + self.store_id
+            + '\necho "RUN $COMPONENT_TYPE args=${script_args[*]} env=$env_alias_name store=${storeId:-none}"\n'
+            'storeNumber="1234"\n'
+            + self.store_id_set
+            + 'bundle_fetch "fp_properties.json" "propertyId" echo "propertyId fetched by $COMPONENT_TYPE"; echo\n'
+            'bundle_fetch "fpd_properties.json" "propertyId" echo "error for $COMPONENT_TYPE"; echo\n'
+            '[ "$COMPONENT_TYPE" != "WDM" ]\n'
+        )
+        (tmp_path / "helper" / "tokens").mkdir(parents=True, exist_ok=True)
+        return subprocess.run(
+            ["bash", str(script)] + args, capture_output=True, text=True,
+            timeout=30, cwd=tmp_path, env=_run_env()
+        )
+
+    def test_runs_each_component_once(self, tmp_path):
+        result = self._run(tmp_path, ["--ComponentTypes", "POS, RCS,POS", "-y"])
+        assert result.returncode == 0, result.stdout + result.stderr
+        runs = [line for line in result.stdout.splitlines() if line.startswith("RUN ")]
+        assert runs == [
+            "RUN POS args=-y --ComponentType POS env=PICKED-POS store=none",
+            "RUN RCS args=-y --ComponentType RCS env=PICKED-POS store=1234",
+        ]
+        assert "All components installed: POS RCS" in result.stdout
+
+    def test_environment_option_passed_on(self, tmp_path):
+        result = self._run(tmp_path, ["-e", "DEV", "--ComponentTypes", "POS,RCS"])
+        runs = [line for line in result.stdout.splitlines() if line.startswith("RUN ")]
+        assert runs == [
+            "RUN POS args=-e DEV --ComponentType POS env=DEV store=none",
+            "RUN RCS args=-e DEV --ComponentType RCS env=DEV store=1234",
+        ]
+
+    def test_request_shared_between_runs(self, tmp_path):
+        result = self._run(tmp_path, ["--ComponentTypes", "POS,RCS"])
+        assert result.stdout.count("fetched by POS") == 2
+        assert "fetched by RCS" not in result.stdout
+
+    def test_error_response_not_shared(self, tmp_path):
+        result = self._run(tmp_path, ["--ComponentTypes", "POS,RCS"])
+        assert "error for POS" in result.stdout
+        assert "error for RCS" in result.stdout
+
+    def test_failure_reported_and_state_removed(self, tmp_path):
+        (tmp_path / "helper" / "tokens").mkdir(parents=True)
+        (tmp_path / "helper" / "tokens" / "token_cache.txt").write_text("x")
+        result = self._run(tmp_path, ["--ComponentTypes", "WDM,POS"])
+        assert result.returncode == 1
+        assert "BUNDLE: WDM failed" in result.stdout
+        assert "BUNDLE: POS installed" in result.stdout
+        assert "Failed components: WDM" in result.stdout
+        assert not (tmp_path / "helper" / "bundle").exists()
+        assert not (tmp_path / "helper" / "tokens" / "token_cache.txt").exists()
+
+    def test_single_run_without_bundle(self, tmp_path):
+        result = self._run(tmp_path, ["--ComponentType", "POS", "--storeId", "77"])
+        assert result.returncode == 0
+        assert "RUN POS args=--ComponentType POS --storeId 77 env=PICKED-POS store=77" in result.stdout
+        assert "BUNDLE" not in result.stdout
+
+    def test_cleanup_keeps_token_cache_in_bundle(self, tmp_path):
+        tokens = tmp_path / "helper" / "tokens"
+        tokens.mkdir(parents=True)
+        (tokens / "access_token.txt").write_text("tok")
+        (tokens / "token_cache.txt").write_text("tok")
+
+        result = subprocess.run(
+            ["bash", "-c", f'log_file="none.log"\n{self.cleanup}\ncleanup_installation done'],
+            capture_output=True, text=True, timeout=30, cwd=tmp_path,
+            env=dict(_run_env(), GK_BUNDLE_DIR=str(tmp_path / "helper" / "bundle"))
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert not (tokens / "access_token.txt").exists()
+        assert (tokens / "token_cache.txt").exists()
+
+
+class TestPowerShellBundleDriver:
+    """Run parameters, bundle section and shared sections of GKInstall.ps1"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        self.prefix = content[:content.index("# Create a unique log filename")].replace(
+            "@USE_DEFAULT_VERSIONS@", "$false")
+        self.ctrl_c = _block(content, "# Handle CTRL+C (SIGINT)", "\n# Set TLS 1.2")
+        self.environment = _block(content, "        # Bundle mode: use the environment selected for the first component\n",
+                                  "        } else {\n            Write-Host \"No environment selected") + "        }\n"
+        self.store_id = _block(content, "# Bundle mode: use the Store ID detected for the first component",
+                               "\n# Initialize variables for Store Number")
+        self.store_id_set = _block(content, "if (-not $isUpdate) {\n    Set-BundleValue \"store_id\"", "}\n",
+                                   include_end=True)
+        self.run_powershell = run_powershell
+
+    def _run(self, tmp_path, args):
+        stand_in = (
+            self.prefix
+            + self.ctrl_c
+            + "\n$isUpdate = $false\n"
+            "function Select-Environment { param($EnvAlias, $EnvName)\n"
+            "    $alias = if ($EnvAlias) { $EnvAlias } else { \"PICKED-$ComponentType\" }\n"
+            "    return [pscustomobject]@{ alias = $alias }\n"
+            "}\n"
+            "function Apply-EnvironmentConfig { param($Environment, $BaseUrlVar) }\n"
+            + self.environment
+            + self.store_id
+            + '\nWrite-Host "RUN $ComponentType env=$($selectedEnv.alias) store=$(if ($storeId) { $storeId } else { \'none\' })"\n'
+            '$storeNumber = "1234"\n'
+            + self.store_id_set
+            + "if ($ComponentType -eq 'WDM') { exit 1 }\n"
+            "exit 0\n"
+        )
+        (tmp_path / "GKInstall.ps1").write_text(stand_in)
+        (tmp_path / "helper" / "tokens").mkdir(parents=True, exist_ok=True)
+        return self.run_powershell(f"& '{tmp_path / 'GKInstall.ps1'}' {args}\nexit $LASTEXITCODE\n",
+                                   cwd=tmp_path, env=_run_env())
+
+    def test_runs_each_component_once(self, tmp_path):
+        result = self._run(tmp_path, "-ComponentTypes POS,RCS,POS -y")
+        assert result.returncode == 0, result.stdout + result.stderr
+        runs = [line for line in result.stdout.splitlines() if line.startswith("RUN ")]
+        assert runs == [
+            "RUN POS env=PICKED-POS store=none",
+            "RUN RCS env=PICKED-POS store=1234",
+        ]
+        # The second run in the same session registers no second CTRL+C handler
+        assert "Console_CancelKeyPress" not in result.stdout + result.stderr
+        assert "All components installed: POS, RCS" in result.stdout
+
+    def test_failure_reported_and_state_removed(self, tmp_path):
+        (tmp_path / "helper" / "tokens").mkdir(parents=True)
+        (tmp_path / "helper" / "tokens" / "token_cache.txt").write_text("x")
+        result = self._run(tmp_path, "-ComponentTypes WDM,POS")
+        assert result.returncode == 1
+        assert "BUNDLE: WDM failed" in result.stdout
+        assert "BUNDLE: POS installed" in result.stdout
+        assert not (tmp_path / "helper" / "bundle").exists()
+        assert not (tmp_path / "helper" / "tokens" / "token_cache.txt").exists()
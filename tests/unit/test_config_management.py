@@ -210,3 +210,123 @@ class TestConfigManagement:
         assert config["installer_overrides_components"]["MQTT-BROKER"] is True
         assert config["mqtt_broker_version"] == "v1.0.0"
         assert "mqtt_broker_system_type" in config
+
+
+class TestConfigWriteBehind:
+    """Test the write-behind config saver"""
+
+    def _make_manager(self, tmp_path, monkeypatch):
+        from gk_install_builder import config as config_module
+        monkeypatch.setattr(config_module, "SAVE_DELAY", 0.05)
+        monkeypatch.chdir(tmp_path)
+        cm = config_module.ConfigManager()
+        return cm
+
+    def _wait_until(self, predicate, timeout=2.0):
+        import time
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not predicate():
+            time.sleep(0.01)
+        # Give the saver a moment to do anything it should not
+        time.sleep(0.1)
+
+    def test_save_writes_atomically(self, tmp_path, monkeypatch):
+        """Config is written via a temp file that is renamed over the target"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        cm.config["project_name"] = "Atomic"
+
+        with patch("gk_install_builder.utils.file_operations.os.replace",
+                   wraps=__import__("os").replace) as replace:
+            assert cm.save_config_silent() is True
+
+        replace.assert_called_once()
+        assert json.loads((tmp_path / "gk_install_config.json").read_text())["project_name"] == "Atomic"
+        # No temp files left behind
+        assert [p.name for p in tmp_path.iterdir()] == ["gk_install_config.json"]
+
+    def test_unchanged_config_is_not_rewritten(self, tmp_path, monkeypatch):
+        """Saving an unchanged config skips the write"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        cm.save_config_silent()
+
+        with patch("gk_install_builder.config.write_file_atomically") as write:
+            assert cm.save_config_silent() is True
+            cm.schedule_save("project_name")
+            self._wait_until(lambda: cm._save_due is None)
+
+        write.assert_not_called()
+
+    def test_burst_of_changes_is_written_once(self, tmp_path, monkeypatch):
+        """Rapid changes to registered entries are coalesced into one write"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        entry = Mock(spec=["get", "bind"])
+        cm.register_entry("project_name", entry)
+        other = Mock(spec=["get", "bind"])
+        other.get.return_value = "unchanged"
+        cm.register_entry("tenant_id", other)
+
+        with patch("gk_install_builder.config.write_file_atomically") as write:
+            for text in ("A", "AB", "ABC"):
+                entry.get.return_value = text
+                cm._on_entry_change("project_name")
+            self._wait_until(lambda: write.called)
+
+        write.assert_called_once()
+        assert json.loads(write.call_args[0][1])["project_name"] == "ABC"
+        # Only the changed entry was read
+        other.get.assert_not_called()
+
+    def test_flush_pending_save(self, tmp_path, monkeypatch):
+        """Pending scheduled changes can be written synchronously"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        from gk_install_builder import config as config_module
+        monkeypatch.setattr(config_module, "SAVE_DELAY", 60)
+
+        cm.config["tenant_id"] = "042"
+        cm.schedule_save("tenant_id")
+        assert cm.flush_pending_save() is True
+
+        assert json.loads((tmp_path / "gk_install_config.json").read_text())["tenant_id"] == "042"
+        assert cm._dirty_keys == set()
+
+    def test_saver_writes_snapshot_taken_on_schedule(self, tmp_path, monkeypatch):
+        """The saver thread never serializes the live config"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        cm.config["project_name"] = "Scheduled"
+        cm.schedule_save("project_name")
+        # Changed later on the Tk thread without scheduling a save
+        cm.config["project_name"] = "Unsaved"
+        cm.config["environments"].append({"alias": "half-done"})
+
+        with patch("gk_install_builder.config.write_file_atomically") as write:
+            self._wait_until(lambda: write.called)
+
+        written = json.loads(write.call_args[0][1])
+        assert written["project_name"] == "Scheduled"
+        assert written["environments"] == []
+
+    def test_older_snapshot_does_not_overwrite_newer(self, tmp_path, monkeypatch):
+        """A snapshot written late is dropped if a newer one is already on disk"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        cm.config["project_name"] = "Old"
+        old = cm._snapshot()
+        cm.config["project_name"] = "New"
+        assert cm._write_config() is True
+
+        assert cm._write_snapshot(old) is False
+        assert json.loads((tmp_path / "gk_install_config.json").read_text())["project_name"] == "New"
+
+    def test_status_updates_from_saver_thread_use_after(self, tmp_path, monkeypatch):
+        """Status label updates from the saver thread are queued on the Tk thread"""
+        cm = self._make_manager(tmp_path, monkeypatch)
+        label = MagicMock()
+        cm.set_save_status_label(label)
+
+        cm.config["project_name"] = "Threaded"
+        cm.schedule_save("project_name")
+        label.configure.assert_called_with(text="Changes pending...", text_color="orange")
+        label.configure.reset_mock()
+        self._wait_until(lambda: label.after.call_count >= 2)
+
+        label.configure.assert_not_called()
+        assert label.after.call_count >= 2
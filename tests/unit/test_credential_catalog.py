@@ -0,0 +1,117 @@
+"""
+Unit tests for the KeePass credential catalog.
+
+Tests the name and path indexes and the credential lookup rules used by
+KeePassHandler and PleasantPasswordClient.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from gk_install_builder.integrations.credential_catalog import CredentialCatalog, normalize_credential_name
+from gk_install_builder.integrations.keepass_handler import KeePassHandler
+from gk_install_builder.pleasant_password_client import PleasantPasswordClient
+
+
+def _cred(name, cred_id=None):
+    return {"Name": name, "Id": cred_id or name}
+
+
+def _env_structure():
+    return {
+        "Name": "TEST", "Id": "env-test",
+        "Credentials": [_cred("OTHER-BA-PASSWORD")],
+        "Children": [
+            {"Name": "INFRA", "Id": "infra", "Credentials": [_cred("TEST-LAUNCHPAD-OAUTH-BA-PASSWORD", "infra-ba")],
+             "Children": []},
+            {"Name": "APP", "Id": "app", "Credentials": [
+                _cred("TEST_LAUNCHPAD_OAUTH_BA_PASSWORD", "app-ba"),
+                _cred("TEST-DSG-WEBDAV-ADMIN-PASSWORD", "app-webdav"),
+            ], "Children": []},
+        ]
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_catalogs():
+    KeePassHandler.keepass_catalogs.clear()
+    yield
+    KeePassHandler.keepass_catalogs.clear()
+
+
+class TestCredentialCatalog:
+    """Tests for the catalog indexes."""
+
+    def test_normalize(self):
+        assert normalize_credential_name(" test_ba_password ") == "TEST-BA-PASSWORD"
+
+    def test_name_and_path_indexes(self):
+        catalog = CredentialCatalog(_env_structure())
+
+        assert catalog.root_name == "TEST"
+        assert catalog.folder_at("TEST/APP")["Id"] == "app"
+        assert catalog.paths_with_prefix("TEST/") == ["TEST/APP", "TEST/INFRA"]
+        assert [c["Id"] for _, c in catalog.credentials_named("test-launchpad-oauth-ba-password")] == ["infra-ba", "app-ba"]
+        assert [c["Id"] for _, c in catalog.credentials_containing("BA_PASSWORD")] == ["OTHER-BA-PASSWORD", "infra-ba", "app-ba"]
+        assert catalog.credential_count == 4
+
+    def test_app_folder_wins_over_tree_order(self):
+        cred, path, _ = CredentialCatalog(_env_structure()).find_best_credential(
+            "TEST", "LAUNCHPAD-OAUTH-BA-PASSWORD", ("BA-PASSWORD",))
+        assert cred["Id"] == "app-ba"
+        assert path == "TEST/APP"
+
+    def test_fragment_and_rare_fallbacks(self):
+        structure = {"Name": "PROD", "Credentials": [_cred("LAUNCHPAD_OAUTH")], "Children": []}
+        catalog = CredentialCatalog(structure)
+        assert catalog.find_best_credential("PROD", "LAUNCHPAD-OAUTH-BA-PASSWORD", ("BA-PASSWORD",))[0] is None
+        assert catalog.find_best_credential("PROD", "X", (), ("LAUNCHPAD_OAUTH",))[0]["Name"] == "LAUNCHPAD_OAUTH"
+
+    def test_list_folder_format(self):
+        catalog = CredentialCatalog([{"name": "Root", "items": [{"name": "AZR-CSE", "id": 7, "items": []}]}])
+        assert catalog.find_folder("AZR-CSE")["id"] == 7
+
+    def test_folder_names_match_exactly(self):
+        catalog = CredentialCatalog([{"name": "Root", "items": [{"name": "AZR-CSE", "id": 7, "items": []}]}])
+        assert catalog.find_folder("azr-cse") is None
+        assert catalog.find_folder("AZR_CSE") is None
+        assert catalog.find_folders("AZR-CSE") == [{"name": "AZR-CSE", "id": 7, "items": []}]
+
+
+class TestKeePassHandlerLookups:
+    """Tests for KeePassHandler lookups through the catalog."""
+
+    def test_basic_auth_and_webdav_entries(self):
+        handler = KeePassHandler(None, None)
+        structure = _env_structure()
+
+        assert handler.find_basic_auth_password_entry(structure)["Id"] == "app-ba"
+        assert handler.find_webdav_admin_password_entry(structure)["Id"] == "app-webdav"
+        assert handler.find_folder_id_by_name(structure, "INFRA") == "infra"
+
+    def test_catalog_built_once_per_structure(self):
+        structure = _env_structure()
+        with patch("gk_install_builder.integrations.keepass_handler.CredentialCatalog",
+                   wraps=CredentialCatalog) as catalog_class:
+            handler = KeePassHandler(None, None)
+            handler.find_basic_auth_password_entry(structure)
+            handler.find_webdav_admin_password_entry(structure)
+        assert catalog_class.call_count == 1
+        assert KeePassHandler.keepass_catalogs["env-test"].source is structure
+
+    def test_not_found(self):
+        structure = {"Name": "TEST", "Id": "t", "Credentials": [_cred("UNRELATED")], "Children": []}
+        assert KeePassHandler(None, None).find_webdav_admin_password_entry(structure) is None
+
+
+class TestPleasantFolderLookup:
+    """Tests for PleasantPasswordClient.find_folder_by_name()."""
+
+    def test_folder_tree_indexed_once(self):
+        client = PleasantPasswordClient.__new__(PleasantPasswordClient)
+        client._folder_catalog = None
+        client.get_folders = MagicMock(return_value=[{"name": "Root", "items": [{"name": "AZR-CSE", "id": 1}]}])
+
+        assert client.find_folder_by_name("AZR-CSE")["id"] == 1
+        assert client.find_folder_by_name("missing") is None
+        assert client.find_folder_by_name("azr_cse") is None
+        client.get_folders.assert_called_once()
@@ -0,0 +1,94 @@
+"""
+Unit tests for bulk KeePass credential resolution across environments.
+"""
+
+import pytest
+from unittest.mock import MagicMock
+from gk_install_builder.integrations.credential_resolver import (
+    PROJECTS_FOLDER_ID,
+    detect_keepass_project,
+    resolve_environment_credentials,
+)
+from gk_install_builder.integrations.keepass_handler import KeePassHandler
+from gk_install_builder.config import ConfigManager
+
+
+FOLDERS = {
+    PROJECTS_FOLDER_ID: {"Name": "Projects", "Id": PROJECTS_FOLDER_ID, "Children": [
+        {"Name": "AZR-CSE", "Id": "cse"}, {"Name": "AZR-ABC", "Id": "abc"}]},
+    "cse": {"Name": "AZR-CSE", "Id": "cse", "Children": [
+        {"Name": "TEST", "Id": "cse-test"}, {"Name": "PROD", "Id": "cse-prod"}]},
+    "abc": {"Name": "AZR-ABC", "Id": "abc", "Children": [{"Name": "DEV", "Id": "abc-dev"}]},
+    "cse-test": {"Name": "TEST", "Id": "cse-test", "Children": [
+        {"Name": "APP", "Id": "t-app", "Credentials": [{"Name": "TEST-LAUNCHPAD-OAUTH-BA-PASSWORD", "Id": "e1"}]}]},
+    "cse-prod": {"Name": "PROD", "Id": "cse-prod", "Children": []},
+}
+
+
+def _client():
+    client = MagicMock()
+    client.get_folder_cached.side_effect = lambda folder_id, recurse_level=1: FOLDERS[folder_id]
+    client.get_entry_password.side_effect = lambda entry_id: f"secret-{entry_id}"
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_catalogs():
+    KeePassHandler.keepass_catalogs.clear()
+    yield
+    KeePassHandler.keepass_catalogs.clear()
+
+
+class TestDetectKeePassProject:
+
+    def test_from_base_url(self):
+        assert detect_keepass_project("test.cse.cloud4retail.co") == ("AZR-CSE", "TEST")
+        assert detect_keepass_project("") == ("AZR-CSE", "TEST")
+
+
+class TestResolveEnvironmentCredentials:
+    """Tests for resolve_environment_credentials()."""
+
+    def test_resolved_and_missing(self):
+        environments = [
+            {"alias": "T1", "base_url": "test.cse.cloud4retail.co"},
+            {"alias": "T2", "base_url": "test.cse.cloud4retail.co"},
+            {"alias": "P", "base_url": "prod.cse.cloud4retail.co"},
+            {"alias": "Q", "base_url": "qa.cse.cloud4retail.co"},
+            {"alias": "X", "base_url": "dev.xyz.cloud4retail.co"},
+        ]
+        client = _client()
+
+        results = resolve_environment_credentials(client, environments)
+
+        assert [r["resolved"] for r in results] == [True, True, False, False, False]
+        assert results[0]["password"] == "secret-e1"
+        assert "No Basic Auth password entry" in results[2]["reason"]
+        assert "Environment QA not found" in results[3]["reason"]
+        assert "Project folder AZR-XYZ not found" in results[4]["reason"]
+
+        # Shared folders and entries are fetched once
+        fetched = [call.args[0] for call in client.get_folder_cached.call_args_list]
+        assert fetched.count("cse-test") == 1
+        client.get_entry_password.assert_called_once_with("e1")
+
+    def test_password_failure_is_reported(self):
+        client = _client()
+        client.get_entry_password.side_effect = RuntimeError("denied")
+
+        result = resolve_environment_credentials(client, [{"alias": "T", "base_url": "test.cse.x"}])[0]
+
+        assert not result["resolved"]
+        assert "denied" in result["reason"]
+
+
+class TestUpdateEnvironmentFields:
+
+    def test_saves_once(self):
+        manager = ConfigManager.__new__(ConfigManager)
+        manager.config = {"environments": [{"alias": "A"}, {"alias": "B"}]}
+        manager.save_config_silent = MagicMock()
+
+        assert manager.update_environment_fields({0: {"launchpad_oauth2": "x"}, 1: {"launchpad_oauth2": "y"}, 5: {}})
+        assert manager.config["environments"][1]["launchpad_oauth2"] == "y"
+        manager.save_config_silent.assert_called_once()
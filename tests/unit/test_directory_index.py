@@ -0,0 +1,46 @@
+"""
+Unit tests for the in-memory directory index used by the DSG file browser.
+"""
+
+from gk_install_builder.utils.directory_index import DirectoryIndex, is_glob_pattern
+
+
+ITEMS = [
+    {"name": "Launcher", "is_directory": True},
+    {"name": "POS-5.27.0", "is_directory": True},
+    {"name": "Launcher.exe", "is_directory": False},
+    {"name": "pos-5.27.0.jar", "is_directory": False},
+    {"name": "readme.txt", "is_directory": False},
+]
+
+
+class TestDirectoryIndex:
+    """Tests for DirectoryIndex.filter()."""
+
+    def test_empty_filter_matches_all(self):
+        index = DirectoryIndex(ITEMS)
+        assert index.filter("") == [0, 1, 2, 3, 4]
+        assert index.filter(None) == [0, 1, 2, 3, 4]
+        assert len(index) == 5
+
+    def test_substring_is_case_insensitive(self):
+        index = DirectoryIndex(ITEMS)
+        assert index.filter("pos") == [1, 3]
+        assert index.filter(" LAUNCHER ") == [0, 2]
+
+    def test_glob(self):
+        index = DirectoryIndex(ITEMS)
+        assert is_glob_pattern("*.jar") and not is_glob_pattern("jar")
+        assert index.filter("*.JAR") == [3]
+        assert index.filter("pos-?.*") == [1, 3]
+        assert [item["name"] for item in index.filter_items("*.exe")] == ["Launcher.exe"]
+
+    def test_narrowing_rescans_previous_matches_only(self):
+        index = DirectoryIndex(ITEMS)
+        index.filter("pos")
+        # Corrupt an excluded name: a narrowing filter must not look at it again
+        index._names[4] = "pos-5.27.0 copy"
+        assert index.filter("pos-5") == [1, 3]
+
+        # Widening (backspace) scans the full listing again
+        assert index.filter("pos") == [1, 3, 4]
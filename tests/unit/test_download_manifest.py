@@ -0,0 +1,422 @@
+"""
+Unit tests for verified Launcher downloads.
+
+Tests the download manifest written by the generator and the resumable,
+verified download routines of the GKInstall templates.
+"""
+
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+import requests
+from gk_install_builder import generator as generator_module
+from gk_install_builder.generators import download_manifest
+from gk_install_builder.generators.download_manifest import (
+    build_download_manifest,
+    read_download_manifest,
+    plan_download_manifest,
+    write_download_manifest,
+    fetch_artifact_checksum,
+    fetch_download_manifest_entries,
+    FetchCancelled,
+    DOWNLOAD_MANIFEST_DIR,
+    DOWNLOAD_MANIFEST_FILENAME,
+)
+
+def _write_manifest(root, relative_path, data):
+    manifest_dir = root / "helper" / "downloads"
+    manifest_dir.mkdir(parents=True, exist_ok=True)
+    (manifest_dir / "download_manifest.txt").write_text(build_download_manifest([
+        (relative_path, len(data), hashlib.sha256(data).hexdigest())
+    ]))
+
+
+def _write_token(root, token):
+    (root / "helper" / "tokens").mkdir(parents=True, exist_ok=True)
+    (root / "helper" / "tokens" / "access_token.txt").write_text(token)
+
+
+class _FakeResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.headers = {"Content-Length": str(sum(len(chunk) for chunk in chunks))}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        return iter(self.chunks)
+
+
+class TestDownloadManifest:
+    """Tests for building, reading and writing the download manifest."""
+
+    def test_roundtrip(self, tmp_path):
+        manifest_dir = tmp_path / DOWNLOAD_MANIFEST_DIR
+        manifest_dir.mkdir(parents=True)
+        (manifest_dir / DOWNLOAD_MANIFEST_FILENAME).write_text(
+            build_download_manifest([("SoftwarePackage/CSE/v1/Launcher.run", 12, "ab" * 32)])
+        )
+        assert read_download_manifest(str(tmp_path)) == {
+            "SoftwarePackage/CSE/v1/Launcher.run": (12, "ab" * 32)
+        }
+
+    def test_fetch_checksum(self, monkeypatch):
+        calls = []
+
+        def fake_get(url, **kwargs):
+            calls.append((url, kwargs["headers"], kwargs["verify"]))
+            return _FakeResponse([b"laun", b"cher"])
+
+        monkeypatch.setattr(download_manifest.requests, "get", fake_get)
+        progress = []
+        size, sha256 = fetch_artifact_checksum("https://host/file", "tok",
+                                               progress_callback=lambda *p: progress.append(p))
+        assert size == 8
+        assert sha256 == hashlib.sha256(b"launcher").hexdigest()
+        # TLS verification stays on
+        assert calls == [("https://host/file", {"Authorization": "Bearer tok"}, True)]
+        assert progress == [(4, 8), (8, 8)]
+
+    CONFIG = {"verify_launcher_downloads": True, "base_url": "host", "platform": "Linux",
+              "version": "v5.27.0", "pos_system_type": "GKR-OPOS-CLOUD",
+              "verify_launcher_components": {"POS": True, "WDM": True, "RCS-SERVICE": True}}
+
+    def test_write_manifest(self, tmp_path, monkeypatch):
+        fetched = []
+
+        def fake_fetch(url, bearer_token, progress_callback=None, should_stop=None):
+            fetched.append(url)
+            if "CSE-wdm" in url:
+                raise OSError("not found")
+            return 5, "cd" * 32
+
+        monkeypatch.setattr(download_manifest, "fetch_artifact_checksum", fake_fetch)
+
+        path = write_download_manifest(str(tmp_path), self.CONFIG, token_provider=lambda *_: "tok")
+
+        entries = read_download_manifest(str(tmp_path))
+        assert path is not None
+        assert entries["SoftwarePackage/GKR-OPOS-CLOUD/v5.27.0/Launcher.run"] == (5, "cd" * 32)
+        # Only the selected components are fetched; failures are left out
+        assert len(fetched) == 3
+        assert len(entries) == 2
+
+    def test_fetch_cancelled(self, monkeypatch):
+        fetched = []
+
+        def fake_fetch(url, bearer_token, progress_callback=None, should_stop=None):
+            fetched.append(url)
+            return 5, "cd" * 32
+
+        monkeypatch.setattr(download_manifest, "fetch_artifact_checksum", fake_fetch)
+        to_fetch = [("POS", "a/Launcher.run"), ("WDM", "b/Launcher.run")]
+
+        with pytest.raises(FetchCancelled):
+            fetch_download_manifest_entries(self.CONFIG, to_fetch, token_provider=lambda *_: "tok",
+                                            should_stop=lambda: len(fetched) == 1)
+        assert len(fetched) == 1
+
+    def test_cancel_stops_running_fetch(self, monkeypatch):
+        monkeypatch.setattr(download_manifest.requests, "get",
+                            lambda url, **kwargs: _FakeResponse([b"a", b"b", b"c"]))
+        progress = []
+
+        with pytest.raises(FetchCancelled):
+            fetch_artifact_checksum("https://host/file", "tok",
+                                    progress_callback=lambda *p: progress.append(p),
+                                    should_stop=lambda: len(progress) == 1)
+        assert progress == [(1, 3)]
+
+    def test_tls_failure_reported(self, monkeypatch):
+        def fake_fetch(url, bearer_token, progress_callback=None, should_stop=None):
+            raise requests.exceptions.SSLError("certificate verify failed")
+
+        monkeypatch.setattr(download_manifest, "fetch_artifact_checksum", fake_fetch)
+        results = []
+
+        entries = fetch_download_manifest_entries(self.CONFIG, [("POS", "a/Launcher.run")],
+                                                  token_provider=lambda *_: "tok",
+                                                  on_result=lambda *r: results.append(r))
+        assert entries == []
+        assert results == [("POS", "a/Launcher.run", "TLS certificate of host could not be verified")]
+
+    def test_unchanged_entries_reused(self, tmp_path, monkeypatch):
+        manifest_dir = tmp_path / DOWNLOAD_MANIFEST_DIR
+        manifest_dir.mkdir(parents=True)
+        (manifest_dir / DOWNLOAD_MANIFEST_FILENAME).write_text(build_download_manifest([
+            ("SoftwarePackage/GKR-OPOS-CLOUD/v5.27.0/Launcher.run", 7, "ab" * 32),
+            ("SoftwarePackage/CSE-wdm/v5.26.0/Launcher.run", 9, "ef" * 32),
+        ]))
+
+        reused, to_fetch = plan_download_manifest(str(tmp_path), self.CONFIG)
+
+        assert reused == [("SoftwarePackage/GKR-OPOS-CLOUD/v5.27.0/Launcher.run", 7, "ab" * 32)]
+        # A changed version is fetched again
+        assert [component for component, _ in to_fetch] == ["WDM", "RCS-SERVICE"]
+
+    def test_default_selection(self, tmp_path):
+        config = {key: value for key, value in self.CONFIG.items() if key != "verify_launcher_components"}
+        _reused, to_fetch = plan_download_manifest(str(tmp_path), config)
+        assert [component for component, _ in to_fetch] == ["POS"]
+
+    def test_unpinned_default_versions_skipped(self, tmp_path):
+        config = {"verify_launcher_downloads": True, "use_default_versions": True}
+        assert write_download_manifest(str(tmp_path), config, token_provider=lambda *_: "tok") is None
+
+    def test_disabled_removes_stale_manifest(self, tmp_path):
+        manifest_dir = tmp_path / DOWNLOAD_MANIFEST_DIR
+        manifest_dir.mkdir(parents=True)
+        (manifest_dir / DOWNLOAD_MANIFEST_FILENAME).write_text("x|1|y\n")
+        assert write_download_manifest(str(tmp_path), {}) is None
+        assert not (manifest_dir / DOWNLOAD_MANIFEST_FILENAME).exists()
+
+
+class _FakeTracker:
+    def __init__(self):
+        self.files = []
+        self.notes = []
+
+    def add_file(self, name, category):
+        self.files.append(name)
+
+    def add_note(self, note):
+        self.notes.append(note)
+
+
+class TestGeneratorDownloadManifest:
+    """Tests for the fetch worker of the generator."""
+
+    CONFIG = TestDownloadManifest.CONFIG
+
+    def test_file_tracked_after_save(self, tmp_path, monkeypatch):
+        from gk_install_builder.generator import ProjectGenerator
+        monkeypatch.setattr(generator_module, "fetch_download_manifest_entries",
+                            lambda config, to_fetch, **kwargs: [(path, 5, "cd" * 32) for _, path in to_fetch])
+        tracker = _FakeTracker()
+        done = []
+
+        worker = ProjectGenerator()._generate_download_manifest(str(tmp_path), self.CONFIG, tracker,
+                                                                lambda: done.append(True))
+        worker.join()
+
+        assert done == [True]
+        assert tracker.files == ["downloads/download_manifest.txt"]
+        assert len(read_download_manifest(str(tmp_path))) == 3
+
+    def test_cancelled_fetch_not_tracked(self, tmp_path, monkeypatch):
+        from gk_install_builder.generator import ProjectGenerator
+
+        def cancelled(config, to_fetch, **kwargs):
+            raise FetchCancelled(to_fetch[0][1])
+
+        monkeypatch.setattr(generator_module, "fetch_download_manifest_entries", cancelled)
+        tracker = _FakeTracker()
+
+        worker = ProjectGenerator()._generate_download_manifest(str(tmp_path), self.CONFIG, tracker)
+        worker.join()
+
+        assert tracker.files == []
+        assert read_download_manifest(str(tmp_path)) == {}
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not all(shutil.which(tool) for tool in ("bash", "curl", "sha256sum")),
+    reason="requires bash, curl and sha256sum"
+)
+class TestBashResumableDownload:
+    """Run resumable_download() from GKInstall.sh against file:// URLs"""
+
+    RELATIVE_PATH = "SoftwarePackage/CSE/v1/Launcher.run"
+    DATA = b"0123456789" * 1000
+
+    @pytest.fixture(autouse=True)
+    def _functions(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        functions = []
+        for marker in ("verify_download() {", "resumable_download() {"):
+            start = content.index(marker)
+            functions.append(content[start:content.index("\n}\n", start) + 3])
+        self.functions = "\n".join(functions)
+        start = content.index("# Download or use local Launcher\n")
+        self.launcher = content[start:content.index("# Start the installation", start)]
+
+    def _run(self, tmp_path, manifest_data=None):
+        (tmp_path / "download.sh").write_text(self.functions)
+        if manifest_data is not None:
+            _write_manifest(tmp_path, self.RELATIVE_PATH, manifest_data)
+
+        script = (
+            'sleep() { echo "SLEEP $1"; }\n'
+            f'script_dir="{tmp_path}"\n'
+            f'source "{tmp_path / "download.sh"}"\n'
+            f'resumable_download "file://{tmp_path}/remote/Launcher.run" "Launcher.run" "{self.RELATIVE_PATH}"\n'
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=60, cwd=tmp_path)
+
+    def _run_launcher_section(self, tmp_path):
+        """Run the Launcher download of GKInstall.sh with DSG served from tmp_path/remote"""
+        (tmp_path / "download.sh").write_text(self.functions)
+        script = (
+            'sleep() { :; }\n'
+            'mirror_download() { return 1; }\n'
+            # Serve https://dsg.example.com/dsg/content/cep/<path> from remote/ and log the token
+            'curl() {\n'
+            '  local arg args=()\n'
+            '  for arg in "$@"; do\n'
+            '    case "$arg" in\n'
+            '      https://dsg.example.com/dsg/content/cep/*) args+=("file://$PWD/remote/${arg##*/}") ;;\n'
+            '      Authorization:*) echo "$arg" >> headers.txt; args+=("$arg") ;;\n'
+            '      *) args+=("$arg") ;;\n'
+            '    esac\n'
+            '  done\n'
+            '  command curl "${args[@]}"\n'
+            '}\n'
+            f'script_dir="{tmp_path}"\n'
+            f'source "{tmp_path / "download.sh"}"\n'
+            'offline_mode=false\nbase_url="dsg.example.com"\nsystemType="CSE"\ncomponent_version="v1"\n'
+            + self.launcher
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=60, cwd=tmp_path)
+
+    def _remote(self, tmp_path, data):
+        (tmp_path / "remote").mkdir()
+        (tmp_path / "remote" / "Launcher.run").write_bytes(data)
+
+    def test_resumes_partial_file(self, tmp_path):
+        self._remote(tmp_path, self.DATA)
+        (tmp_path / "Launcher.run.part").write_bytes(self.DATA[:4000])
+
+        result = self._run(tmp_path, manifest_data=self.DATA)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Resuming download at 4000 bytes" in result.stdout
+        assert "Verified Launcher.run" in result.stdout
+        assert (tmp_path / "Launcher.run").read_bytes() == self.DATA
+        assert not (tmp_path / "Launcher.run.part").exists()
+
+    def test_checksum_mismatch_rejected(self, tmp_path):
+        self._remote(tmp_path, self.DATA)
+
+        result = self._run(tmp_path, manifest_data=self.DATA[::-1])
+
+        assert result.returncode == 1
+        assert "SHA-256 mismatch" in result.stdout
+        # Backoff doubles the delay between the five attempts
+        assert [line for line in result.stdout.splitlines() if line.startswith("SLEEP")] == [
+            "SLEEP 2", "SLEEP 4", "SLEEP 8", "SLEEP 16"
+        ]
+        assert not (tmp_path / "Launcher.run").exists()
+        assert not (tmp_path / "Launcher.run.part").exists()
+
+    def test_without_manifest(self, tmp_path):
+        self._remote(tmp_path, self.DATA)
+        result = self._run(tmp_path)
+        assert result.returncode == 0
+        assert (tmp_path / "Launcher.run").read_bytes() == self.DATA
+
+    def test_missing_file_fails(self, tmp_path):
+        result = self._run(tmp_path)
+        assert result.returncode == 1
+        assert "Download failed after 5 attempts" in result.stdout
+
+    def test_launcher_download_resumes_with_token(self, tmp_path):
+        self._remote(tmp_path, self.DATA)
+        _write_manifest(tmp_path, "SoftwarePackage/CSE/v1/Launcher.run", self.DATA)
+        _write_token(tmp_path, "dsg-token\n")
+        (tmp_path / "Launcher.run.part").write_bytes(self.DATA[:4000])
+
+        result = self._run_launcher_section(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Resuming download at 4000 bytes" in result.stdout
+        assert "Successfully downloaded Launcher.run" in result.stdout
+        assert (tmp_path / "headers.txt").read_text() == "Authorization: Bearer dsg-token\n"
+        assert (tmp_path / "Launcher.run").read_bytes() == self.DATA
+        assert os.access(tmp_path / "Launcher.run", os.X_OK)
+
+    def test_launcher_download_failure_exits(self, tmp_path):
+        self._remote(tmp_path, self.DATA)
+        _write_manifest(tmp_path, "SoftwarePackage/CSE/v1/Launcher.run", self.DATA[::-1])
+
+        result = self._run_launcher_section(tmp_path)
+
+        assert result.returncode == 1
+        assert "Error downloading Launcher.run" in result.stdout
+        assert not (tmp_path / "Launcher.run").exists()
+
+
+class TestPowerShellResumableDownload:
+    """Run the Launcher download of GKInstall.ps1 through Invoke-ResumableDownload"""
+
+    DATA = b"0123456789" * 1000
+
+    @pytest.fixture(autouse=True)
+    def _section(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        start = content.index("# Function to look up a file in helper\\downloads\\download_manifest.txt")
+        functions = content[start:content.index("# ======", start)]
+        start = content.index("# Download or use local Launcher\n")
+        self.script = (
+            "function Invoke-MirrorDownload { param($RelativePath, $OutFile) return $false }\n"
+            "function Stop-TranscriptSafely { }\n"
+            "function Start-Sleep { param($Seconds) Write-Host \"SLEEP $Seconds\" }\n"
+            # curl.exe stand-in: log the arguments and append remote.bin past the partial file
+            "function curl.exe {\n"
+            "    Add-Content -Path (Join-Path $PSScriptRoot 'curl_args.txt') -Value ($args -join ' ')\n"
+            "    $out = $args[[array]::IndexOf($args, '-o') + 1]\n"
+            "    $data = [System.IO.File]::ReadAllBytes((Join-Path $PSScriptRoot 'remote.bin'))\n"
+            "    $offset = if (Test-Path $out) { (Get-Item $out).Length } else { 0 }\n"
+            "    $stream = New-Object System.IO.FileStream($out, [System.IO.FileMode]::Append)\n"
+            "    $stream.Write($data, $offset, $data.Length - $offset)\n"
+            "    $stream.Close()\n"
+            "    $global:LASTEXITCODE = 0\n"
+            "}\n"
+            + functions
+            + '$offline_mode = $false\n$base_url = "dsg.example.com"\n$systemType = "CSE"\n$component_version = "v1"\n'
+            + content[start:content.index("# Start the installation", start)]
+        )
+        self.run_powershell = run_powershell
+
+    def _run(self, tmp_path, manifest_data):
+        (tmp_path / "remote.bin").write_bytes(self.DATA)
+        _write_manifest(tmp_path, "SoftwarePackage/CSE/v1/Launcher.exe", manifest_data)
+        _write_token(tmp_path, "dsg-token")
+        return self.run_powershell(self.script, cwd=tmp_path)
+
+    def test_resumes_with_token(self, tmp_path):
+        (tmp_path / "Launcher.exe.part").write_bytes(self.DATA[:4000])
+
+        result = self._run(tmp_path, self.DATA)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Resuming download at 4000 bytes" in result.stdout
+        assert "Verified Launcher.exe" in result.stdout
+        curl_args = (tmp_path / "curl_args.txt").read_text()
+        assert "-C - -o" in curl_args
+        assert "Authorization: Bearer dsg-token" in curl_args
+        assert "https://dsg.example.com/dsg/content/cep/SoftwarePackage/CSE/v1/Launcher.exe" in curl_args
+        assert (tmp_path / "Launcher.exe").read_bytes() == self.DATA
+        assert not (tmp_path / "Launcher.exe.part").exists()
+
+    def test_checksum_mismatch_exits(self, tmp_path):
+        result = self._run(tmp_path, self.DATA[::-1])
+
+        assert result.returncode == 1
+        assert "SHA-256 mismatch" in result.stdout
+        assert [line for line in result.stdout.splitlines() if line.startswith("SLEEP")] == [
+            "SLEEP 2", "SLEEP 4", "SLEEP 8", "SLEEP 16"
+        ]
+        assert "Error downloading Launcher.exe" in result.stdout
+        assert not (tmp_path / "Launcher.exe").exists()
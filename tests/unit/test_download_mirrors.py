@@ -0,0 +1,275 @@
+"""
+Unit tests for download mirrors.
+
+Tests the mirror list and mirror manifest written by the generator and the
+mirror-first Launcher download in the GKInstall templates.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import pytest
+from gk_install_builder.generators.download_mirrors import (
+    normalize_mirror_urls,
+    build_mirror_list,
+    build_mirror_manifest,
+    write_mirror_files,
+    MIRRORS_DIR,
+    MIRRORS_FILENAME,
+    MIRROR_MANIFEST_FILENAME,
+)
+from gk_install_builder.generators.version_manifest import PINNED_VERSIONS_DIR, PINNED_VERSIONS_FILENAME
+from gk_install_builder.generator import ProjectGenerator
+
+RELATIVE_PATH = "SoftwarePackage/CSE/v1/Launcher.run"
+
+
+def _functions(content, markers):
+    functions = []
+    for marker in markers:
+        start = content.index(marker)
+        functions.append(content[start:content.index("\n}\n", start) + 3])
+    return "\n".join(functions)
+
+
+def _write_mirrors(root, mirrors):
+    mirrors_dir = root / "helper" / "mirrors"
+    mirrors_dir.mkdir(parents=True, exist_ok=True)
+    (mirrors_dir / MIRRORS_FILENAME).write_text("#timeout=2\n" + "\n".join(mirrors) + "\n")
+
+
+def _host(root, relative_path, data):
+    hosted = root / relative_path
+    hosted.parent.mkdir(parents=True, exist_ok=True)
+    hosted.write_text(data)
+
+
+@pytest.fixture
+def http_mirror(tmp_path):
+    """Serve tmp_path/http_mirror over HTTP (PowerShell does not fetch file:// URLs)"""
+    root = tmp_path / "http_mirror"
+    root.mkdir()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SimpleHTTPRequestHandler, directory=str(root)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield root, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestMirrorList:
+    """Tests for normalize_mirror_urls() and build_mirror_list()."""
+
+    def test_normalize_string(self):
+        mirrors = "http://store-server:8080/gk/, cache.example.com\nhttp://store-server:8080/gk"
+        assert normalize_mirror_urls(mirrors) == [
+            "http://store-server:8080/gk",
+            "https://cache.example.com",
+        ]
+
+    def test_normalize_list(self):
+        assert normalize_mirror_urls(["", " https://a/ "]) == ["https://a"]
+        assert normalize_mirror_urls(None) == []
+
+    def test_list_content(self):
+        lines = build_mirror_list("http://a, http://b", timeout="3").splitlines()
+        assert "#timeout=3" in lines
+        assert lines[-2:] == ["http://a", "http://b"]
+
+    def test_invalid_timeout_uses_default(self):
+        assert "#timeout=5" in build_mirror_list("http://a", timeout="soon").splitlines()
+
+    def test_no_mirrors(self):
+        assert build_mirror_list("  ,  ") is None
+
+
+class TestMirrorManifest:
+    """Tests for build_mirror_manifest()."""
+
+    def _config(self, **overrides):
+        config = {"base_url": "test.example.com", "platform": "Linux", "version": "v5.27.0",
+                  "pos_system_type": "GKR-OPOS-CLOUD", "pos_version": "v5.27.1", "wdm_system_type": ""}
+        config.update(overrides)
+        return config
+
+    def test_paths_for_configured_versions(self):
+        lines = build_mirror_manifest(self._config()).splitlines()
+        assert "SoftwarePackage/GKR-OPOS-CLOUD/v5.27.1/Launcher.run" in lines
+        # Empty system type falls back to the default, missing version to the main version
+        assert "SoftwarePackage/CSE-wdm/v5.27.0/Launcher.run" in lines
+        assert len([line for line in lines if line.startswith("SoftwarePackage/")]) == 8
+
+    def test_windows_launcher(self):
+        assert "/Launcher.exe" in build_mirror_manifest(self._config(platform="Windows"))
+
+    def test_pinned_versions_take_precedence(self):
+        text = build_mirror_manifest(self._config(use_default_versions=True), {"POS": "v5.29.0"})
+        assert "SoftwarePackage/GKR-OPOS-CLOUD/v5.29.0/Launcher.run" in text
+        assert "resolved at install time" not in text
+
+    def test_unpinned_default_versions_flagged(self):
+        assert "resolved at install time" in build_mirror_manifest(self._config(use_default_versions=True))
+
+
+class TestGeneratorMirrors:
+    """Tests for write_mirror_files() and ProjectGenerator._generate_mirror_files()."""
+
+    def test_writes_files(self, tmp_path):
+        path = write_mirror_files(str(tmp_path), {"download_mirrors": "http://a", "platform": "Linux"})
+        assert path == os.path.join(str(tmp_path), MIRRORS_DIR, MIRRORS_FILENAME)
+        assert (tmp_path / MIRRORS_DIR / MIRROR_MANIFEST_FILENAME).exists()
+
+    def test_disabled_removes_stale_files(self, tmp_path):
+        mirrors_dir = tmp_path / MIRRORS_DIR
+        mirrors_dir.mkdir(parents=True)
+        (mirrors_dir / MIRRORS_FILENAME).write_text("http://old\n")
+        (mirrors_dir / MIRROR_MANIFEST_FILENAME).write_text("x\n")
+
+        assert write_mirror_files(str(tmp_path), {"download_mirrors": ""}) is None
+        assert not (mirrors_dir / MIRRORS_FILENAME).exists()
+        assert not (mirrors_dir / MIRROR_MANIFEST_FILENAME).exists()
+
+    def test_generator_uses_pinned_versions(self, tmp_path):
+        pinned = tmp_path / PINNED_VERSIONS_DIR / PINNED_VERSIONS_FILENAME
+        pinned.parent.mkdir(parents=True)
+        pinned.write_text("#tenant_id=001\nPOS=v5.30.0\n")
+        config = {"download_mirrors": "http://a", "platform": "Windows", "pos_system_type": "GKR-OPOS-CLOUD"}
+
+        ProjectGenerator()._generate_mirror_files(str(tmp_path), config)
+
+        manifest = (tmp_path / MIRRORS_DIR / MIRROR_MANIFEST_FILENAME).read_text()
+        assert "SoftwarePackage/GKR-OPOS-CLOUD/v5.30.0/Launcher.exe" in manifest
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash") or not shutil.which("curl"),
+    reason="requires bash and curl"
+)
+class TestBashMirrorDownload:
+    """Run mirror_download() from GKInstall.sh against file:// mirrors"""
+
+    @pytest.fixture(autouse=True)
+    def _functions(self, read_template):
+        self.functions = _functions(read_template("GKInstall.sh.template"), (
+            "# Function to download a package file from the first download mirror", "verify_download() {"
+        ))
+
+    def _run(self, tmp_path, mirrors):
+        (tmp_path / "mirror.sh").write_text(self.functions)
+        _write_mirrors(tmp_path, mirrors)
+
+        script = (
+            f'script_dir="{tmp_path}"\n'
+            f'source "{tmp_path / "mirror.sh"}"\n'
+            f'mirror_download "{RELATIVE_PATH}" "Launcher.run"\n'
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=30, cwd=tmp_path)
+
+    def test_falls_through_to_mirror_with_file(self, tmp_path):
+        _host(tmp_path / "mirror2", RELATIVE_PATH, "launcher")
+
+        result = self._run(tmp_path, [f"file://{tmp_path}/mirror1", f"file://{tmp_path}/mirror2"])
+
+        assert result.returncode == 0
+        assert "Mirror file://" in result.stdout and "mirror1 unavailable" in result.stdout
+        assert (tmp_path / "Launcher.run").read_text() == "launcher"
+        assert not (tmp_path / "Launcher.run.part").exists()
+
+    def test_no_mirror_has_file(self, tmp_path):
+        result = self._run(tmp_path, [f"file://{tmp_path}/missing"])
+        assert result.returncode == 1
+        assert not (tmp_path / "Launcher.run").exists()
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash") or not shutil.which("curl"),
+    reason="requires bash and curl"
+)
+class TestBashLauncherDownload:
+    """Run the Launcher download section of GKInstall.sh with DSG stubbed out"""
+
+    @pytest.fixture(autouse=True)
+    def _section(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        start = content.index("# Download or use local Launcher\n")
+        self.section = _functions(content, (
+            "# Function to download a package file from the first download mirror", "verify_download() {"
+        )) + content[start:content.index("# Start the installation", start)]
+
+    def _run(self, tmp_path, mirrors):
+        _write_mirrors(tmp_path, mirrors)
+        script = (
+            f'script_dir="{tmp_path}"\n'
+            'resumable_download() { echo "DSG $1"; return 1; }\n'
+            'offline_mode=false\nbase_url="dsg.example.com"\nsystemType="CSE"\ncomponent_version="v1"\n'
+            + self.section
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=30, cwd=tmp_path)
+
+    def test_mirror_tried_before_dsg(self, tmp_path):
+        _host(tmp_path / "mirror", RELATIVE_PATH, "launcher")
+
+        result = self._run(tmp_path, [f"file://{tmp_path}/mirror"])
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Successfully downloaded Launcher.run from mirror" in result.stdout
+        assert "DSG " not in result.stdout
+        assert os.access(tmp_path / "Launcher.run", os.X_OK)
+
+    def test_dsg_is_the_fallback(self, tmp_path):
+        result = self._run(tmp_path, [f"file://{tmp_path}/missing"])
+
+        assert result.returncode == 1
+        assert f"DSG https://dsg.example.com/dsg/content/cep/{RELATIVE_PATH}" in result.stdout
+
+
+class TestPowerShellMirrorDownload:
+    """Run Invoke-MirrorDownload and the Launcher download section of GKInstall.ps1"""
+
+    RELATIVE_PATH = "SoftwarePackage/CSE/v1/Launcher.exe"
+
+    @pytest.fixture(autouse=True)
+    def _section(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        start = content.index("# Function to download a package file from the first download mirror")
+        functions = content[start:content.index("# Function to download a file, resuming a partial download", start)]
+        start = content.index("# Download or use local Launcher\n")
+        self.script = (
+            functions
+            + 'function Invoke-ResumableDownload { param($Url, $OutFile, $RelativePath, $BearerToken)\n'
+            '    Write-Host "DSG $Url"\n    return $false\n}\n'
+            "function Stop-TranscriptSafely { }\n"
+            '$offline_mode = $false\n$base_url = "dsg.example.com"\n$systemType = "CSE"\n$component_version = "v1"\n'
+            + content[start:content.index("# Start the installation", start)]
+        )
+        self.run_powershell = run_powershell
+
+    def test_falls_through_to_mirror_with_file(self, tmp_path, http_mirror):
+        mirror_root, mirror_url = http_mirror
+        _host(mirror_root, self.RELATIVE_PATH, "launcher")
+        _write_mirrors(tmp_path, [f"{mirror_url}/missing", mirror_url])
+
+        result = self.run_powershell(self.script, cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "/missing unavailable" in result.stdout
+        assert "Successfully downloaded Launcher.exe from mirror" in result.stdout
+        assert "DSG " not in result.stdout
+        assert (tmp_path / "Launcher.exe").read_text() == "launcher"
+        assert not (tmp_path / "Launcher.exe.part").exists()
+
+    def test_dsg_is_the_fallback(self, tmp_path, http_mirror):
+        _mirror_root, mirror_url = http_mirror
+        _write_mirrors(tmp_path, [mirror_url])
+
+        result = self.run_powershell(self.script, cwd=tmp_path)
+
+        assert result.returncode == 1
+        assert f"DSG https://dsg.example.com/dsg/content/cep/{self.RELATIVE_PATH}" in result.stdout
+        assert not (tmp_path / "Launcher.exe").exists()
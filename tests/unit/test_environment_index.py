@@ -0,0 +1,63 @@
+"""
+Unit tests for environment selection from the precomputed environment index.
+
+GKInstall.ps1 resolves an alias from helper/environments/index/<alias>.psd1
+and only parses environments.json when the index has no entry for it.
+"""
+
+import json
+import pytest
+from gk_install_builder.generators.helper_file_generator import write_environment_index
+
+
+ENVIRONMENTS = [
+    {"alias": "DEV", "name": "Development", "base_url": "dev.example.com", "tenant_id": "001"},
+    {"alias": "QA", "name": "Quality", "base_url": "qa.example.com", "tenant_id": "002"},
+]
+
+
+def _block(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+class TestPowerShellEnvironmentSelection:
+    """Run the environment functions of GKInstall.ps1 against a generated index"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        self.functions = _block(content, "# Function to load environments from environments.json\n",
+                                "# Function to apply environment configuration").replace(
+            "@FILE_DETECTION_ENABLED@", "False")
+        self.run_powershell = run_powershell
+
+    def _run(self, tmp_path, alias, environments_json, indexed):
+        env_dir = tmp_path / "helper" / "environments"
+        env_dir.mkdir(parents=True)
+        (env_dir / "environments.json").write_text(environments_json)
+        write_environment_index(str(env_dir), indexed)
+        return self.run_powershell(
+            self.functions
+            + f"\n$selected = Select-Environment -EnvAlias '{alias}'\n"
+            'Write-Host "SELECTED $($selected.alias) $($selected.base_url)"\n',
+            cwd=tmp_path
+        )
+
+    def test_alias_resolved_without_parsing_environments_json(self, tmp_path):
+        # A broken environments.json shows that only the index was read
+        result = self._run(tmp_path, "DEV", "{ not json", ENVIRONMENTS)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Found 2 configured environment(s)" in result.stdout
+        assert "SELECTED DEV dev.example.com" in result.stdout
+        assert "Failed to load environments.json" not in result.stdout
+
+    def test_index_miss_falls_back_to_environments_json(self, tmp_path):
+        result = self._run(tmp_path, "QA", json.dumps({"environments": ENVIRONMENTS}), ENVIRONMENTS[:1])
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "SELECTED QA qa.example.com" in result.stdout
+
+    def test_unknown_alias_exits(self, tmp_path):
+        result = self._run(tmp_path, "PROD", json.dumps({"environments": ENVIRONMENTS}), ENVIRONMENTS)
+        assert result.returncode == 1
+        assert "Environment 'PROD' not found!" in result.stdout
@@ -12,7 +12,7 @@ import pytest
 REPO_ROOT = Path(__file__).resolve().parents[2]
 PS1_TEMPLATE = REPO_ROOT / "gk_install_builder" / "templates" / "GKInstall.ps1.template"
 SH_TEMPLATE = REPO_ROOT / "gk_install_builder" / "templates" / "GKInstall.sh.template"
-API_CLIENT = REPO_ROOT / "gk_install_builder" / "integrations" / "api_client.py"
+VERSION_RESOLVER = REPO_ROOT / "gk_install_builder" / "integrations" / "version_resolver.py"
 
 
 COMPONENT_PROPERTIES = {
@@ -56,16 +56,10 @@ DISPATCH_SITES = [
         'Found $COMPONENT_TYPE version in FPD scope',
     ),
     (
-        "Py FP",
-        API_CLIENT,
-        "# Step 1: Try FP scope first",
-        "# Step 2: For components not found in FP, try FPD scope",
-    ),
-    (
-        "Py FPD",
-        API_CLIENT,
-        "# Step 2: For components not found in FP, try FPD scope",
-        "loading_dialog.destroy()",
+        "Py FP/FPD",
+        VERSION_RESOLVER,
+        "COMPONENT_PROPERTY_IDS = {",
+        "}",
     ),
 ]
 
@@ -101,20 +95,20 @@ def test_dispatch_site_handles_component(
 
 
 def test_mqtt_broker_in_versions_init():
-    """MQTT-BROKER must appear in the versions init dict in api_client.py."""
-    source = API_CLIENT.read_text(encoding="utf-8")
-    assert '"MQTT-BROKER": {"value": None, "source": None}' in source
+    """MQTT-BROKER must be part of every FP/FPD resolution result."""
+    from gk_install_builder.integrations.version_resolver import COMPONENT_PROPERTY_IDS
+    assert "MQTT-BROKER" in COMPONENT_PROPERTY_IDS
 
 
 def test_mqtt_broker_property_ids_dispatched():
-    """Both FP and FPD property IDs for MQTT Broker must appear in api_client.py."""
-    source = API_CLIENT.read_text(encoding="utf-8")
-    assert "StoreMQTTBroker_Version" in source
-    assert "StoreMQTTBroker_Update_Version" in source
+    """Both FP and FPD property IDs for MQTT Broker must map to MQTT-BROKER."""
+    from gk_install_builder.integrations.version_resolver import PROPERTY_COMPONENTS
+    assert PROPERTY_COMPONENTS["StoreMQTTBroker_Version"][0] == "MQTT-BROKER"
+    assert PROPERTY_COMPONENTS["StoreMQTTBroker_Update_Version"][0] == "MQTT-BROKER"
 
 
 def test_mqtt_broker_in_config_service_system_types():
     """MQTT-BROKER must be present in the Config-Service system_types dict."""
-    source = API_CLIENT.read_text(encoding="utf-8")
-    assert "mqtt_broker_system_type" in source
-    assert "GKR-Store-MQTT-Broker" in source
+    from gk_install_builder.integrations.version_resolver import get_config_service_system_types
+    assert get_config_service_system_types({})["MQTT-BROKER"] == "GKR-Store-MQTT-Broker"
+    assert get_config_service_system_types({"mqtt_broker_system_type": "X"})["MQTT-BROKER"] == "X"
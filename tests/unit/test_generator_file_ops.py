@@ -178,6 +178,74 @@ class TestHelperFileOperations:
         assert len(data["environments"]) == 1
         assert data["environments"][0]["alias"] == "DEV"
 
+    def test_environment_index_created(self, tmp_path):
+        """Test that the flat environment index is written next to environments.json"""
+        from gk_install_builder.generator import ProjectGenerator
+        generator = ProjectGenerator()
+
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        config = create_config(
+            platform="Linux",
+            output_dir=str(output_dir),
+            environments=[
+                {
+                    "alias": "DEV",
+                    "name": "Dev | Store's",
+                    "base_url": "dev.example.com",
+                    "tenant_id": "002",
+                    "launchpad_oauth2": "testpass",
+                },
+                {
+                    "alias": "bad/alias",
+                    "name": "Bad",
+                    "base_url": "bad.example.com",
+                },
+            ]
+        )
+
+        generator._generate_environments_json(str(output_dir), config)
+
+        index_dir = output_dir / "helper" / "environments" / "index"
+        assert (index_dir / "environments.list").read_text().splitlines() == [
+            "DEV|Dev / Store's|dev.example.com|002",
+            "bad/alias|Bad|bad.example.com|001",
+        ]
+
+        env_lines = (index_dir / "DEV.env").read_text().splitlines()
+        assert env_lines[:4] == ["alias=DEV", "name=Dev | Store's", "base_url=dev.example.com", "tenant_id=002"]
+        assert "launchpad_oauth2_b64=dGVzdHBhc3M=" in env_lines
+
+        psd1 = (index_dir / "DEV.psd1").read_text()
+        assert "name = 'Dev | Store''s'" in psd1
+        assert "use_default_tenant = $false" in psd1
+
+        # Aliases that are not valid file names are listed but not indexed
+        assert sorted(p.name for p in index_dir.iterdir()) == ["DEV.env", "DEV.psd1", "environments.list"]
+
+    def test_environment_index_removes_stale_entries(self, tmp_path):
+        """Test that regenerating the index drops removed environments"""
+        from gk_install_builder.generator import ProjectGenerator
+        generator = ProjectGenerator()
+
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        config = create_config(
+            platform="Linux",
+            output_dir=str(output_dir),
+            environments=[{"alias": "DEV", "name": "Dev", "base_url": "dev.example.com"}]
+        )
+        generator._generate_environments_json(str(output_dir), config)
+
+        config["environments"] = []
+        generator._generate_environments_json(str(output_dir), config)
+
+        index_dir = output_dir / "helper" / "environments" / "index"
+        assert [p.name for p in index_dir.iterdir()] == ["environments.list"]
+        assert (index_dir / "environments.list").read_text() == ""
+
 
 class TestTokenFileGeneration:
     """Test generation of token files"""
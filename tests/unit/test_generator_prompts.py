@@ -0,0 +1,110 @@
+"""
+Unit tests for the Tk-free generator core and its prompt policies.
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock, patch
+from gk_install_builder.generator import ProjectGenerator
+from gk_install_builder.generators.prompts import ConsolePrompts, ConsoleDownloadProgress
+from gk_install_builder.generators.offline_package_helpers import (
+    prompt_for_file_selection,
+    prompt_for_version_selection,
+)
+
+
+def _file(name, is_directory=False):
+    return {"name": name, "is_directory": is_directory}
+
+
+FILES = [_file("Launcher.exe"), _file("pos-5.26.1.jar"), _file("pos-5.27.0.jar"), _file("sub", True)]
+
+
+class TestHeadlessImport:
+
+    def test_generator_import_does_not_load_tk(self):
+        code = (
+            "import sys, gk_install_builder.generator; "
+            "print(sorted(m for m in ('tkinter', 'customtkinter') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+
+    def test_default_prompts(self):
+        assert isinstance(ProjectGenerator().prompts, ConsolePrompts)
+        prompts = MagicMock()
+        generator = ProjectGenerator(prompts=prompts)
+        generator._show_error("boom")
+        generator._ask_download_again("Java", ["a.zip"])
+        prompts.show_error.assert_called_once_with("boom")
+        prompts.ask_download_again.assert_called_once_with("Java", ["a.zip"], None)
+
+
+class TestSelectionPrompts:
+    """Tests for prompt_for_file_selection() and prompt_for_version_selection()."""
+
+    def test_console_takes_launcher_and_latest(self):
+        selected = prompt_for_file_selection(FILES, "POS", None, None, config={"platform": "Windows"})
+        assert [f["name"] for f in selected] == ["Launcher.exe", "pos-5.27.0.jar"]
+
+    def test_policy_receives_choice(self):
+        prompts = MagicMock()
+        prompts.choose_files.return_value = ["picked"]
+        parent = object()
+
+        result = prompt_for_file_selection(FILES, "POS", None, parent, config={},
+                                           preferred_files=["pos-5.26.1.jar"], prompts=prompts)
+
+        assert result == ["picked"]
+        title, description, launcher, other, defaults = prompts.choose_files.call_args.args
+        assert [f["name"] for f in launcher] == ["Launcher.exe"]
+        assert defaults == {"pos-5.26.1.jar"}
+        assert prompts.choose_files.call_args.kwargs["parent"] is parent
+
+    def test_single_installer_not_prompted(self):
+        prompts = MagicMock()
+        files = [_file("Launcher.exe"), _file("wdm.jar")]
+        assert prompt_for_file_selection(files, "WDM", None, None, config={}, prompts=prompts) == files
+        prompts.choose_files.assert_not_called()
+
+    def test_version_defaults_to_newest(self):
+        dirs = [_file("11.0.18", True), _file("17.0.9", True), _file("latest", True)]
+        assert prompt_for_version_selection(dirs, "Java", None, "t", "d") == "17.0.9"
+
+
+class TestHeadlessDownloads:
+
+    def test_prepare_offline_package_without_gui(self, tmp_path):
+        prompts = ConsolePrompts()
+        prompts.show_success = MagicMock()
+        prompts.show_error = MagicMock()
+        generator = ProjectGenerator(prompts=prompts)
+        generator.dsg_api_browser = MagicMock()
+        files = [("/SoftwarePackage/CSE-wdm/v1/wdm.jar", str(tmp_path / "WDM" / "wdm.jar"), "wdm.jar", "WDM")]
+
+        def fake_download(remote_path, local_path, file_name, component_type, download_queue, *args):
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            with open(local_path, "wb") as f:
+                f.write(b"x" * 10)
+            download_queue.put(("progress", (file_name, component_type, 10, 10)))
+            download_queue.put(("complete", (file_name, component_type)))
+
+        with patch.object(generator, "_collect_offline_files", return_value=files), \
+                patch("gk_install_builder.generator.resolve_file_sizes", return_value={files[0][0]: 10}), \
+                patch("gk_install_builder.generator.download_file_thread", side_effect=fake_download):
+            success, message = generator.prepare_offline_package({"output_dir": str(tmp_path)}, ["WDM"])
+            generator._download_monitor.join(timeout=10)
+
+        assert success, message
+        prompts.show_success.assert_called_once_with("All files downloaded successfully")
+        prompts.show_error.assert_not_called()
+        assert os.path.exists(tmp_path / "offline_package_manifest.json")
+
+    def test_console_progress_polls_until_done(self):
+        calls = []
+        progress = ConsoleDownloadProgress(2)
+        progress.poll_interval = 0
+        progress.start(lambda: calls.append(1) or len(calls) >= 3).join(timeout=5)
+        assert len(calls) == 3
@@ -0,0 +1,117 @@
+"""
+Unit tests for the installer log monitor in the GKInstall templates.
+
+The monitor follows installer.log by file position instead of re-reading the
+whole log on every check, and stops as soon as a completion marker is written.
+"""
+
+import shutil
+import subprocess
+import sys
+import pytest
+
+
+def _monitor_section(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    end = content.index(end_marker, start) + len(end_marker)
+    return content[start:end]
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash") or not shutil.which("tail"),
+    reason="requires bash and tail"
+)
+class TestBashMonitorBehaviour:
+    """Run the monitor section of GKInstall.sh against a fake launcher"""
+
+    @pytest.fixture(autouse=True)
+    def _monitor(self, read_template):
+        self.monitor = _monitor_section(
+            read_template("GKInstall.sh.template"), "# Check installation logs\nmax_wait_time=", "exec 3<&-"
+        )
+
+    def _run_monitor(self, tmp_path, writer):
+        (tmp_path / "monitor.sh").write_text(self.monitor)
+
+        log_path = tmp_path / "installer.log"
+        script = f"""
+set -e
+installer_log_path="{log_path}"
+offline_mode=true
+( {writer} ) &
+launcher_pid=$!
+source "{tmp_path / 'monitor.sh'}"
+echo "STATUS=$completion_status"
+kill $launcher_pid 2>/dev/null || true
+"""
+        result = subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, timeout=60, cwd=tmp_path
+        )
+        return result.stdout
+
+    def test_marker_detected_while_launcher_runs(self, tmp_path):
+        output = self._run_monitor(
+            tmp_path,
+            "printf 'one\\n' > installer.log; sleep 1; "
+            "printf 'two\\nInstallation fini' >> installer.log; sleep 1; "
+            "printf 'shed\\n' >> installer.log; sleep 30"
+        )
+        assert "LOG: one" in output
+        assert "LOG: two" in output
+        # The partially written line is printed once, complete
+        assert output.count("LOG: Installation finished") == 1
+        assert "STATUS=finished" in output
+        assert "Launcher process has exited" not in output
+
+    def test_launcher_exit_without_marker(self, tmp_path):
+        output = self._run_monitor(tmp_path, "printf 'a\\nlast line' > installer.log")
+        assert "LOG: a" in output
+        assert "LOG: last line" in output
+        assert "STATUS=launcher_exited" in output
+
+
+class TestPowerShellMonitorBehaviour:
+    """Run the monitor section of GKInstall.ps1 against a fake launcher"""
+
+    @pytest.fixture(autouse=True)
+    def _monitor(self, read_template, run_powershell):
+        self.monitor = _monitor_section(
+            read_template("GKInstall.ps1.template"), "# Check installation logs\n$maxWaitTime", "\nClose-InstallerLog\n"
+        )
+        self.run_powershell = run_powershell
+
+    def _run_monitor(self, tmp_path, writer):
+        log_path = tmp_path / "installer.log"
+        (tmp_path / "writer.ps1").write_text(writer.replace("installer.log", f'"{log_path}"'))
+        script = (
+            f'$installerLogPath = "{log_path}"\n'
+            "$offline = [switch]$true\n"
+            "$pwshPath = (Get-Process -Id $PID).Path\n"
+            f'$launcherProcess = Start-Process -FilePath $pwshPath -ArgumentList @("-NoProfile", "-File", "{tmp_path / 'writer.ps1'}") -PassThru\n'
+            + self.monitor
+            + 'Write-Host "STATUS=$completionStatus"\n'
+            "if (-not $launcherProcess.HasExited) { $launcherProcess.Kill() }\n"
+        )
+        return self.run_powershell(script, cwd=tmp_path).stdout
+
+    def test_marker_detected_while_launcher_runs(self, tmp_path):
+        output = self._run_monitor(tmp_path, (
+            'Set-Content -Path installer.log -Value "one`n" -NoNewline\n'
+            "Start-Sleep -Seconds 1\n"
+            'Add-Content -Path installer.log -Value "two`nInstallation fini" -NoNewline\n'
+            "Start-Sleep -Seconds 1\n"
+            'Add-Content -Path installer.log -Value "shed`n" -NoNewline\n'
+            "Start-Sleep -Seconds 30\n"
+        ))
+        assert "LOG: one" in output
+        assert "LOG: two" in output
+        # The partially written line is printed once, complete
+        assert output.count("LOG: Installation finished") == 1
+        assert "STATUS=finished" in output
+        assert "Launcher process has exited" not in output
+
+    def test_launcher_exit_without_marker(self, tmp_path):
+        output = self._run_monitor(tmp_path, 'Set-Content -Path installer.log -Value "a`nlast line" -NoNewline\n')
+        assert "LOG: a" in output
+        assert "LOG: last line" in output
+        assert "STATUS=launcher_exited" in output
@@ -4,11 +4,16 @@ Unit tests for installer.properties support in offline package creation.
 Tests fetching, parsing, preferences building, and pre-selection logic.
 """
 
+import threading
 import pytest
+import requests
 from unittest.mock import MagicMock, patch
+from concurrent.futures import Future
 from gk_install_builder.generators.offline_package_helpers import (
     fetch_installer_properties,
     build_installer_preferences,
+    CachedListingBrowser,
+    prefetch_offline_metadata,
 )
 
 
@@ -60,27 +65,24 @@ class TestFetchInstallerProperties:
         assert result["onex_ui_windows"] == "GKR-OPOS-ONEX-CLOUD/v5.29.0/onex-ui-5.29.0-windows.zip"
 
     def test_not_found(self):
-        """Test returns empty dict when installer.properties is not in listing."""
-        file_list = [
-            {"name": "Launcher.exe", "is_directory": False},
-            {"name": "some-installer.jar", "is_directory": False},
-        ]
-        browser = self._make_mock_browser(file_list)
+        """Test returns empty dict when the direct GET answers 404."""
+        browser = self._make_mock_browser([])
+        not_found = MagicMock(status_code=404)
+        browser._handle_api_request.side_effect = requests.exceptions.HTTPError(response=not_found)
 
         result = fetch_installer_properties(browser, "/SoftwarePackage/TEST/v1.0.0")
 
         assert result == {}
 
-    def test_directory_with_same_name_ignored(self):
-        """Test that a directory named installer.properties is ignored."""
-        file_list = [
-            {"name": "installer.properties", "is_directory": True},
-        ]
-        browser = self._make_mock_browser(file_list)
+    def test_fetched_without_listing(self):
+        """Test that the file is requested directly instead of listing the directory first."""
+        browser = self._make_mock_browser([], SAMPLE_PROPERTIES_CONTENT)
 
         result = fetch_installer_properties(browser, "/SoftwarePackage/TEST/v1.0.0")
 
-        assert result == {}
+        assert result["java_version"] == "17.0.16"
+        browser.list_directories.assert_not_called()
+        browser.get_file_url.assert_called_once_with("/SoftwarePackage/TEST/v1.0.0/installer.properties")
 
     def test_network_error(self):
         """Test graceful handling of network errors during fetch."""
@@ -150,10 +152,11 @@ installer_path=test.jar
 
         assert result["java_version"] == "17.0.16"
 
-    def test_list_directories_error(self):
-        """Test graceful handling when list_directories raises an exception."""
-        browser = MagicMock()
-        browser.list_directories.side_effect = Exception("API error")
+    def test_http_error_other_than_404(self):
+        """Test graceful handling of server errors (not treated as a 404)."""
+        browser = self._make_mock_browser([])
+        server_error = MagicMock(status_code=500)
+        browser._handle_api_request.side_effect = requests.exceptions.HTTPError(response=server_error)
 
         result = fetch_installer_properties(browser, "/SoftwarePackage/TEST/v1.0.0")
 
@@ -362,3 +365,101 @@ class TestBuildInstallerPreferences:
         assert result["tomcat_path"] is None
         assert result["jaybird_file"] is None
         assert result["jaybird_path"] is None
+
+
+class TestCachedListingBrowser:
+    """Tests for CachedListingBrowser."""
+
+    def test_listing_is_cached(self):
+        browser = MagicMock()
+        browser.list_directories.return_value = [{"name": "a.jar", "is_directory": False}]
+        cached = CachedListingBrowser(browser)
+
+        first = cached.list_directories("/SoftwarePackage/TEST/v1.0.0")
+        second = cached.list_directories("SoftwarePackage/TEST/v1.0.0/")
+
+        assert first == second
+        browser.list_directories.assert_called_once()
+
+    def test_errors_are_not_cached(self):
+        browser = MagicMock()
+        browser.list_directories.side_effect = [Exception("API error"), []]
+        cached = CachedListingBrowser(browser)
+
+        with pytest.raises(Exception):
+            cached.list_directories("/SoftwarePackage/TEST")
+        assert cached.list_directories("/SoftwarePackage/TEST") == []
+
+    def test_other_attributes_are_delegated(self):
+        browser = MagicMock()
+        browser.get_file_url.return_value = "https://example.com/file"
+        cached = CachedListingBrowser(browser)
+
+        assert cached.get_file_url("/x") == "https://example.com/file"
+
+    def test_queued_prefetch_is_taken_over(self):
+        browser = MagicMock()
+        browser.list_directories.return_value = []
+        cached = CachedListingBrowser(browser)
+        executor = MagicMock()
+        queued = Future()
+        executor.submit.return_value = queued
+
+        assert cached.prefetch(executor, "/SoftwarePackage/A") is queued
+        cached.list_directories("/SoftwarePackage/A")
+
+        assert queued.cancelled()
+        browser.list_directories.assert_called_once_with("/SoftwarePackage/A")
+
+    def test_cancelled_prefetch_is_resubmitted_and_invalidate(self):
+        browser = MagicMock()
+        browser.list_directories.return_value = []
+        cached = CachedListingBrowser(browser)
+        executor = MagicMock()
+        executor.submit.side_effect = lambda *args: Future()
+
+        cached.prefetch(executor, "/SoftwarePackage/A").cancel()
+        assert not cached.prefetch(executor, "/SoftwarePackage/A").cancelled()
+
+        cached.list_directories("/SoftwarePackage/B")
+        assert cached.is_cached("/SoftwarePackage/B")
+        cached.invalidate("/SoftwarePackage/B")
+        assert not cached.is_cached("/SoftwarePackage/B")
+
+
+class TestPrefetchOfflineMetadata:
+    """Tests for prefetch_offline_metadata()."""
+
+    def test_properties_and_listings_fetched_concurrently(self):
+        paths = ["/SoftwarePackage/A/v1", "/SoftwarePackage/B/v1", "/SoftwarePackage/C/v1"]
+        barrier = threading.Barrier(len(paths), timeout=5)
+
+        browser = MagicMock()
+        browser.list_directories.return_value = []
+        browser.get_file_url.side_effect = lambda path: path
+
+        def handle_request(make_request):
+            # Only passes if all property requests are in flight at the same time
+            barrier.wait()
+            response = MagicMock()
+            response.text = "java_version=17.0.16"
+            return response
+        browser._handle_api_request.side_effect = handle_request
+
+        cached = CachedListingBrowser(browser)
+        result = prefetch_offline_metadata(cached, paths, ["/SoftwarePackage/Java"])
+
+        assert list(result.keys()) == paths
+        # Listings were prefetched and are served from the cache afterwards
+        for path in paths + ["/SoftwarePackage/Java"]:
+            cached.list_directories(path)
+        assert browser.list_directories.call_count == len(paths) + 1
+
+    def test_components_without_properties_are_skipped(self):
+        browser = MagicMock()
+        browser.list_directories.return_value = []
+        browser._handle_api_request.side_effect = requests.exceptions.HTTPError(response=MagicMock(status_code=404))
+
+        result = prefetch_offline_metadata(CachedListingBrowser(browser), ["/SoftwarePackage/A/v1"])
+
+        assert result == {}
@@ -0,0 +1,201 @@
+"""
+Unit tests for offline package download planning.
+
+Tests size resolution, deduplication, disk space checks, throughput
+estimates and saving/loading plans.
+"""
+
+import os
+import json
+import pytest
+from collections import namedtuple
+from unittest.mock import MagicMock, patch
+from gk_install_builder.generators.offline_download_plan import (
+    resolve_file_sizes,
+    check_disk_space,
+    record_download_throughput,
+    estimate_throughput,
+    build_download_plan,
+    refresh_plan_disk_check,
+    write_download_plan,
+    load_download_plan,
+    plan_to_download_list,
+    format_plan_summary,
+    DEFAULT_THROUGHPUT_BPS,
+    DOWNLOAD_PLAN_FILENAME,
+)
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+
+def _files(output_dir):
+    return [
+        ("/SoftwarePackage/Java/zulujre-17.zip", os.path.join(output_dir, "Java", "zulujre-17.zip"), "zulujre-17.zip", "Java"),
+        ("/SoftwarePackage/CSE-wdm/v5.27.0/Launcher.exe", os.path.join(output_dir, "offline_package_WDM", "Launcher.exe"), "WDM Launcher.exe", "WDM"),
+        ("/SoftwarePackage/CSE-wdm/v5.27.0/wdm-installer.jar", os.path.join(output_dir, "offline_package_WDM", "wdm-installer.jar"), "wdm-installer.jar", "WDM"),
+    ]
+
+
+class TestResolveFileSizes:
+    """Tests for resolve_file_sizes()."""
+
+    def test_sizes_from_listing(self, tmp_path):
+        browser = MagicMock()
+        browser.list_directories.side_effect = lambda path: {
+            "/SoftwarePackage/Java": [{"name": "zulujre-17.zip", "is_directory": False, "size": 1000}],
+            "/SoftwarePackage/CSE-wdm/v5.27.0": [
+                {"name": "Launcher.exe", "is_directory": False, "size": 200},
+                {"name": "wdm-installer.jar", "is_directory": False, "size": 300},
+            ],
+        }[path]
+
+        sizes = resolve_file_sizes(browser, _files(str(tmp_path)))
+
+        assert sizes["/SoftwarePackage/Java/zulujre-17.zip"] == 1000
+        assert sizes["/SoftwarePackage/CSE-wdm/v5.27.0/wdm-installer.jar"] == 300
+        # Each parent directory is listed only once
+        assert browser.list_directories.call_count == 2
+
+    def test_unknown_size_and_listing_error(self, tmp_path):
+        browser = MagicMock()
+        browser.list_directories.side_effect = Exception("timeout")
+
+        sizes = resolve_file_sizes(browser, _files(str(tmp_path)))
+
+        assert all(size is None for size in sizes.values())
+
+
+class TestCheckDiskSpace:
+    """Tests for check_disk_space()."""
+
+    def test_sufficient(self, tmp_path):
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10_000)):
+            result = check_disk_space(str(tmp_path), 1000)
+        assert result["sufficient"] is True
+        assert result["free_bytes"] == 10_000
+
+    def test_insufficient_includes_margin(self, tmp_path):
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 1020)):
+            result = check_disk_space(str(tmp_path), 1000, safety_margin=0.05)
+        assert result["required_bytes"] == 1050
+        assert result["sufficient"] is False
+
+    def test_missing_output_dir_uses_existing_parent(self, tmp_path):
+        missing = tmp_path / "not" / "created" / "yet"
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 5000)) as usage:
+            check_disk_space(str(missing), 100)
+        usage.assert_called_once_with(str(tmp_path))
+
+
+class TestThroughput:
+    """Tests for throughput history and estimates."""
+
+    def test_default_without_history(self, tmp_path):
+        assert estimate_throughput(str(tmp_path)) == (DEFAULT_THROUGHPUT_BPS, "default")
+
+    def test_median_of_recorded_samples(self, tmp_path):
+        record_download_throughput(str(tmp_path), 100, 1)
+        record_download_throughput(str(tmp_path), 300, 1)
+        record_download_throughput(str(tmp_path), 1000, 1)
+
+        assert estimate_throughput(str(tmp_path)) == (300, "measured")
+
+    def test_ignores_empty_runs(self, tmp_path):
+        assert record_download_throughput(str(tmp_path), 0, 5) is None
+        assert estimate_throughput(str(tmp_path))[1] == "default"
+
+
+class TestBuildDownloadPlan:
+    """Tests for build_download_plan()."""
+
+    def test_totals_and_deduplication(self, tmp_path):
+        output_dir = str(tmp_path)
+        files = _files(output_dir)
+        files.append(files[0])  # Same remote file selected twice
+        sizes = {files[0][0]: 1000, files[1][0]: 200, files[2][0]: None}
+
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10**9)):
+            plan = build_download_plan(files, sizes, output_dir, ["WDM"], {"JAVA": True})
+
+        assert plan["file_count"] == 3
+        assert plan["duplicates_removed"] == 1
+        assert plan["total_bytes"] == 1200
+        assert plan["unknown_sizes"] == 1
+        assert plan["disk"]["sufficient"] is True
+        assert plan["estimate"]["throughput_source"] == "default"
+        assert plan["files"][0]["relative_path"] == os.path.join("Java", "zulujre-17.zip")
+
+    def test_existing_files_are_reusable_space(self, tmp_path):
+        output_dir = str(tmp_path)
+        files = _files(output_dir)[:1]
+        os.makedirs(os.path.dirname(files[0][1]))
+        with open(files[0][1], "wb") as f:
+            f.write(b"x" * 400)
+
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10**9)):
+            plan = build_download_plan(files, {files[0][0]: 1000}, output_dir)
+
+        assert plan["disk"]["required_bytes"] == int(600 * 1.05)
+
+
+class TestPlanPersistence:
+    """Tests for saving, loading and executing plans."""
+
+    def test_round_trip_to_other_output_dir(self, tmp_path):
+        source_dir = str(tmp_path / "source")
+        target_dir = str(tmp_path / "target")
+        files = _files(source_dir)
+
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10**9)):
+            plan = build_download_plan(files, {f[0]: 10 for f in files}, source_dir)
+        plan_path = write_download_plan(plan, source_dir)
+
+        assert os.path.basename(plan_path) == DOWNLOAD_PLAN_FILENAME
+        loaded = load_download_plan(plan_path)
+        download_list = plan_to_download_list(loaded, target_dir)
+
+        assert [d[0] for d in download_list] == [f[0] for f in files]
+        assert download_list[1][1] == os.path.join(target_dir, "offline_package_WDM", "Launcher.exe")
+        assert os.path.isdir(os.path.join(target_dir, "Java"))
+
+    @pytest.mark.parametrize("relative_path", [
+        "../outside.zip",
+        "Java/../../outside.zip",
+        os.path.abspath("/tmp/outside.zip"),
+        "",
+    ])
+    def test_unsafe_paths_rejected(self, tmp_path, relative_path):
+        plan = {"files": [{"remote_path": "/SoftwarePackage/x.zip", "relative_path": relative_path,
+                           "file_name": "x.zip", "component_type": "Java"}]}
+        with pytest.raises(ValueError):
+            plan_to_download_list(plan, str(tmp_path / "target"))
+        assert not (tmp_path / "outside.zip").exists()
+
+    def test_symlink_outside_rejected(self, tmp_path):
+        target_dir = tmp_path / "target"
+        target_dir.mkdir()
+        (tmp_path / "elsewhere").mkdir()
+        os.symlink(tmp_path / "elsewhere", target_dir / "Java")
+        plan = {"files": [{"remote_path": "/SoftwarePackage/x.zip", "relative_path": "Java/x.zip",
+                           "file_name": "x.zip", "component_type": "Java"}]}
+        with pytest.raises(ValueError):
+            plan_to_download_list(plan, str(target_dir))
+
+    def test_refresh_disk_check(self, tmp_path):
+        plan = {"files": [{"relative_path": "a.zip", "size": 5000}]}
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 100)):
+            refresh_plan_disk_check(plan, str(tmp_path))
+        assert plan["disk"]["sufficient"] is False
+
+    def test_load_rejects_non_plan(self, tmp_path):
+        path = tmp_path / "other.json"
+        path.write_text(json.dumps({"environments": []}))
+        with pytest.raises(ValueError):
+            load_download_plan(str(path))
+
+    def test_summary(self, tmp_path):
+        with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10**9)):
+            plan = build_download_plan(_files(str(tmp_path))[:1], {"/SoftwarePackage/Java/zulujre-17.zip": 3 * 1024**3}, str(tmp_path))
+        summary = format_plan_summary(plan)
+        assert "1 file(s), 3.0 GB total" in summary
+        assert "Estimated duration" in summary
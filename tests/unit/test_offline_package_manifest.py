@@ -0,0 +1,425 @@
+"""
+Unit tests for offline package manifests and delta packages.
+
+Tests reuse detection against a previous manifest, manifest contents and the
+delta instructions and artifact index consumed by GKInstall.
+"""
+
+import os
+import json
+import shutil
+import subprocess
+import sys
+import pytest
+from collections import namedtuple
+from unittest.mock import patch
+from gk_install_builder.generators.offline_download_plan import (
+    build_download_plan,
+    plan_to_download_list,
+)
+from gk_install_builder.generators.offline_package_manifest import (
+    load_package_manifest,
+    apply_previous_manifest,
+    build_package_manifest,
+    write_package_manifest,
+    get_artifact_role,
+    get_artifact_version,
+    build_artifact_index,
+    write_artifact_index,
+    write_delta_file,
+    PACKAGE_MANIFEST_FILENAME,
+    DELTA_FILENAME,
+    ARTIFACT_INDEX_FILENAME,
+)
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+JAVA = "/SoftwarePackage/Java/zulujre-17.zip"
+OLD_JAR = "/SoftwarePackage/CSE-wdm/v5.26.0/wdm-5.26.0-installer.jar"
+NEW_JAR = "/SoftwarePackage/CSE-wdm/v5.27.0/wdm-5.27.0-installer.jar"
+
+
+def _block(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+def _delta_package(root, previous):
+    """Write a delta package to root that reuses Java/jre.zip from previous"""
+    (previous / "Java").mkdir(parents=True)
+    (previous / "Java" / "jre.zip").write_bytes(b"java")
+    (root / "offline_package_WDM").mkdir(parents=True)
+    (root / "offline_package_WDM" / "wdm-5.26.0-installer.jar").write_bytes(b"old")
+    (root / DELTA_FILENAME).write_text(
+        "# delta\n"
+        "reuse|Java/jre.zip|4\n"
+        "remove|offline_package_WDM/wdm-5.26.0-installer.jar|\n"
+    )
+
+
+def _previous_manifest():
+    return {
+        "format_version": 1,
+        "created": "2026-01-01T10:00:00",
+        "files": [
+            {"relative_path": "Java/zulujre-17.zip", "remote_path": JAVA,
+             "component_type": "Java", "size": 1000, "sha256": "aaa"},
+            {"relative_path": "offline_package_WDM/wdm-5.26.0-installer.jar", "remote_path": OLD_JAR,
+             "component_type": "WDM", "size": 300, "sha256": "bbb"},
+        ]
+    }
+
+
+def _plan(output_dir, java_size=1000):
+    files = [
+        (JAVA, os.path.join(output_dir, "Java", "zulujre-17.zip"), "zulujre-17.zip", "Java"),
+        (NEW_JAR, os.path.join(output_dir, "offline_package_WDM", "wdm-5.27.0-installer.jar"), "wdm-5.27.0-installer.jar", "WDM"),
+    ]
+    with patch("shutil.disk_usage", return_value=DiskUsage(0, 0, 10**9)):
+        return build_download_plan(files, {JAVA: java_size, NEW_JAR: 320}, output_dir)
+
+
+class TestApplyPreviousManifest:
+    """Tests for apply_previous_manifest()."""
+
+    def test_unchanged_artifacts_are_reused(self, tmp_path):
+        output_dir = str(tmp_path)
+        plan = apply_previous_manifest(_plan(output_dir), _previous_manifest(), output_dir)
+
+        actions = {f["remote_path"]: f["action"] for f in plan["files"]}
+        assert actions == {JAVA: "reuse", NEW_JAR: "download"}
+        assert plan["file_count"] == 1
+        assert plan["total_bytes"] == 320
+        assert plan["reused_bytes"] == 1000
+        assert plan["delta"]["removed"] == ["offline_package_WDM/wdm-5.26.0-installer.jar"]
+
+        download_list = plan_to_download_list(plan, output_dir)
+        assert [d[0] for d in download_list] == [NEW_JAR]
+
+    def test_changed_size_is_downloaded(self, tmp_path):
+        output_dir = str(tmp_path)
+        plan = apply_previous_manifest(_plan(output_dir, java_size=1200), _previous_manifest(), output_dir)
+
+        assert all(f["action"] == "download" for f in plan["files"])
+        assert plan["reused_count"] == 0
+
+    def test_other_components_are_not_removed(self, tmp_path):
+        output_dir = str(tmp_path)
+        previous = _previous_manifest()
+        previous["files"].append(
+            {"relative_path": "offline_package_POS/Launcher.run", "remote_path": "/SoftwarePackage/POS/Launcher.run",
+             "component_type": "POS", "size": 50, "sha256": "ddd"}
+        )
+
+        plan = apply_previous_manifest(_plan(output_dir), previous, output_dir)
+
+        # POS is not part of this delta, so its artifacts stay in place
+        assert plan["delta"]["removed"] == ["offline_package_WDM/wdm-5.26.0-installer.jar"]
+
+
+class TestPackageManifest:
+    """Tests for manifest and delta file output."""
+
+    def test_manifest_round_trip(self, tmp_path):
+        output_dir = str(tmp_path)
+        plan = apply_previous_manifest(_plan(output_dir), _previous_manifest(), output_dir)
+
+        manifest = build_package_manifest(plan, {NEW_JAR: "ccc"})
+        path = write_package_manifest(manifest, output_dir)
+        loaded = load_package_manifest(path)
+
+        assert os.path.basename(path) == PACKAGE_MANIFEST_FILENAME
+        assert loaded["delta_of"] == "2026-01-01T10:00:00"
+        by_path = {f["relative_path"]: f for f in loaded["files"]}
+        assert by_path["Java/zulujre-17.zip"]["sha256"] == "aaa"
+        assert by_path["Java/zulujre-17.zip"]["reused"] is True
+        assert by_path["offline_package_WDM/wdm-5.27.0-installer.jar"]["sha256"] == "ccc"
+
+    def test_delta_file_lines(self, tmp_path):
+        output_dir = str(tmp_path)
+        plan = apply_previous_manifest(_plan(output_dir), _previous_manifest(), output_dir)
+
+        delta_path = write_delta_file(plan, output_dir)
+        with open(delta_path) as f:
+            lines = f.read().splitlines()
+
+        assert lines[0].startswith("#")
+        assert "reuse|Java/zulujre-17.zip|1000" in lines
+        assert "remove|offline_package_WDM/wdm-5.26.0-installer.jar" in lines
+
+    def test_full_package_removes_stale_delta_file(self, tmp_path):
+        output_dir = str(tmp_path)
+        (tmp_path / DELTA_FILENAME).write_text("reuse|Java/old.zip|1\n")
+
+        assert write_delta_file(_plan(output_dir), output_dir) is None
+        assert not (tmp_path / DELTA_FILENAME).exists()
+
+    def test_load_rejects_non_manifest(self, tmp_path):
+        path = tmp_path / "other.json"
+        path.write_text(json.dumps({"versions": {}}))
+        with pytest.raises(ValueError):
+            load_package_manifest(str(path))
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashDeltaPackage:
+    """Run option parsing and the offline_delta.txt section of GKInstall.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        self.script = (
+            content[:content.index("\n# Validate ComponentType")]
+            + "\noffline_mode=$offline\n"
+            + _block(content, "# Delta offline package: reuse unchanged artifacts", "\n# Update offline mode checks")
+            + 'echo "DELTA DONE"\n'
+        )
+
+    def _run(self, root, args):
+        (root / "GKInstall.sh").write_text(self.script)
+        return subprocess.run(["bash", str(root / "GKInstall.sh"), "--offline"] + args,
+                              capture_output=True, text=True, timeout=30, cwd=root)
+
+    def test_reuses_from_previous_package(self, tmp_path):
+        previous = tmp_path / "previous"
+        package = tmp_path / "package"
+        _delta_package(package, previous)
+
+        result = self._run(package, ["--offlineReuseDir", str(previous)])
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "DELTA DONE" in result.stdout
+        assert (package / "Java" / "jre.zip").read_bytes() == b"java"
+        assert not (package / "offline_package_WDM" / "wdm-5.26.0-installer.jar").exists()
+
+    def test_missing_reused_artifact_fails(self, tmp_path):
+        _delta_package(tmp_path / "package", tmp_path / "previous")
+
+        result = self._run(tmp_path / "package", [])
+
+        assert result.returncode == 1
+        assert "Error: Reused artifact not found: Java/jre.zip" in result.stdout
+
+    def test_reused_artifact_size_checked(self, tmp_path):
+        previous = tmp_path / "previous"
+        _delta_package(tmp_path / "package", previous)
+        (previous / "Java" / "jre.zip").write_bytes(b"changed")
+
+        result = self._run(tmp_path / "package", ["--offlineReuseDir", str(previous)])
+
+        assert result.returncode == 1
+        assert "does not match the expected size (4 bytes)" in result.stdout
+
+
+class TestPowerShellDeltaPackage:
+    """Run the parameters and the offline_delta.txt section of GKInstall.ps1"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        self.script = (
+            content[:content.index("\n)\n") + 3]
+            + "function Stop-TranscriptSafely { }\n"
+            + "$offline_mode = $offline.IsPresent\n"
+            + _block(content, "# Delta offline package: reuse unchanged artifacts", "\n# Update offline mode checks")
+            + 'Write-Host "DELTA DONE"\n'
+        )
+        self.run_powershell = run_powershell
+
+    def _run(self, root, args):
+        (root / "GKInstall.ps1").write_text(self.script)
+        return self.run_powershell(f"& '{root / 'GKInstall.ps1'}' -offline {args}\nexit $LASTEXITCODE\n", cwd=root)
+
+    def test_reuses_from_previous_package(self, tmp_path):
+        previous = tmp_path / "previous"
+        package = tmp_path / "package"
+        _delta_package(package, previous)
+
+        result = self._run(package, f"-OfflineReuseDir '{previous}'")
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "DELTA DONE" in result.stdout
+        assert (package / "Java" / "jre.zip").read_bytes() == b"java"
+        assert not (package / "offline_package_WDM" / "wdm-5.26.0-installer.jar").exists()
+
+    def test_missing_reused_artifact_fails(self, tmp_path):
+        _delta_package(tmp_path / "package", tmp_path / "previous")
+
+        result = self._run(tmp_path / "package", "")
+
+        assert result.returncode == 1
+        assert "Error: Reused artifact not found" in result.stdout
+
+
+class TestArtifactIndex:
+    """Tests for artifact roles, versions and offline_artifacts.txt."""
+
+    @pytest.mark.parametrize("relative_path, component_type, role", [
+        ("Java/zulujre-17.zip", "Java", "jre"),
+        ("Tomcat/apache-tomcat-9.0.73.zip", "Tomcat", "tomcat"),
+        ("Jaybird/jaybird-5.0.2.jar", "Jaybird", "jaybird"),
+        ("offline_package_POS/Launcher.exe", "POS", "launcher"),
+        ("offline_package_POS/pos-5.27.0-installer.jar", "POS", "installer"),
+        ("offline_package_POS/onex-ui-5.27.0.zip", "POS", "ui"),
+        ("offline_package_POS/readme.txt", "POS", "other"),
+    ])
+    def test_role(self, relative_path, component_type, role):
+        assert get_artifact_role({"relative_path": relative_path, "component_type": component_type}) == role
+
+    @pytest.mark.parametrize("role, file_name, version", [
+        ("jre", "Java_zulujre-linux-x64-17.0.9.zip", "17.0.9"),
+        ("jre", "jre-11.0.18.zip", "11.0.18"),
+        ("tomcat", "apache-tomcat-9.0.73.zip", "9.0.73"),
+        ("tomcat", "tomcat-9.0.73-win.zip", "9.0.73"),
+        ("launcher", "Launcher.exe", ""),
+    ])
+    def test_version(self, role, file_name, version):
+        assert get_artifact_version(role, file_name) == version
+
+    def test_index_lines(self, tmp_path):
+        output_dir = str(tmp_path)
+        plan = apply_previous_manifest(_plan(output_dir), _previous_manifest(), output_dir)
+        manifest = build_package_manifest(plan, {NEW_JAR: "ccc"})
+
+        path = write_artifact_index(manifest, output_dir)
+        lines = (tmp_path / ARTIFACT_INDEX_FILENAME).read_text().splitlines()
+
+        assert path == os.path.join(output_dir, ARTIFACT_INDEX_FILENAME)
+        assert lines[0].startswith("#")
+        assert "installer|offline_package_WDM/wdm-5.27.0-installer.jar||320|ccc" in lines
+        assert any(line.startswith("jre|Java/zulujre-17.zip|") for line in lines)
+
+    def test_index_of_older_manifest(self):
+        # Manifests written before roles were recorded still produce an index
+        text = build_artifact_index(_previous_manifest())
+        assert "jre|Java/zulujre-17.zip||1000|aaa" in text.splitlines()
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashArtifactDetection:
+    """Run the offline artifact detection of GKInstall.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        self.detection = _block(read_template("GKInstall.sh.template"), "  # Locate the artifacts of this component",
+                                '  for file in "${required_files[@]}"; do')
+
+    def _run(self, root, component_type="WDM"):
+        script = (
+            'get_jre_version() { echo "guessed"; }\n'
+            'get_tomcat_version() { echo "guessed"; }\n'
+            f'COMPONENT_TYPE="{component_type}"\n'
+            f'package_dir="offline_package_{component_type}"\n'
+            + self.detection
+            + 'echo "JRE=$jre_file@$jre_version TOMCAT=$tomcat_file@$tomcat_version JAR=$installer_jar"\n'
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=30, cwd=root)
+
+    def _package(self, root):
+        files = {
+            "Java/zulujre-17.zip": b"java",
+            "Tomcat/apache-tomcat-9.0.73.zip": b"tomcat",
+            "offline_package_WDM/wdm-5.27.0-installer.jar": b"wdm",
+        }
+        for path, data in files.items():
+            (root / path).parent.mkdir(parents=True, exist_ok=True)
+            (root / path).write_bytes(data)
+        return files
+
+    def test_reads_index(self, tmp_path):
+        self._package(tmp_path)
+        (tmp_path / "Java" / "decoy.zip").write_bytes(b"x")
+        (tmp_path / ARTIFACT_INDEX_FILENAME).write_text(
+            "# index\r\n"
+            "jre|Java/zulujre-17.zip|17.0.9|4|\r\n"
+            "tomcat|Tomcat/apache-tomcat-9.0.73.zip|9.0.73|6|\r\n"
+            "installer|offline_package_WDM/wdm-5.27.0-installer.jar||3|\r\n"
+            "installer|offline_package_POS/pos-5.27.0-installer.jar||3|\r\n"
+        )
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert ("JRE=Java/zulujre-17.zip@17.0.9 TOMCAT=Tomcat/apache-tomcat-9.0.73.zip@9.0.73 "
+                "JAR=offline_package_WDM/wdm-5.27.0-installer.jar") in result.stdout
+
+    def test_size_mismatch_fails(self, tmp_path):
+        self._package(tmp_path)
+        (tmp_path / ARTIFACT_INDEX_FILENAME).write_text("jre|Java/zulujre-17.zip|17.0.9|400|\n")
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 1
+        assert "does not match the expected size (400 bytes)" in result.stdout
+
+    def test_scans_without_index(self, tmp_path):
+        self._package(tmp_path)
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "JRE=Java/zulujre-17.zip@guessed TOMCAT=Tomcat/apache-tomcat-9.0.73.zip@guessed" in result.stdout
+
+    def test_missing_tomcat_fails_for_wdm_only(self, tmp_path):
+        self._package(tmp_path)
+        shutil.rmtree(tmp_path / "Tomcat")
+
+        assert self._run(tmp_path).returncode == 1
+        assert self._run(tmp_path, component_type="POS").returncode == 0
+
+
+class TestPowerShellArtifactDetection:
+    """Run the offline artifact detection of GKInstall.ps1"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        self.detection = _block(read_template("GKInstall.ps1.template"), "    # Locate the artifacts of this component",
+                                "    # Initialize required files with Launcher.exe")
+        self.run_powershell = run_powershell
+
+    def _run(self, root, component_type="WDM"):
+        script = (
+            "function Stop-TranscriptSafely { }\n"
+            f'$ComponentType = "{component_type}"\n'
+            f'$package_dir = "offline_package_{component_type}"\n'
+            + self.detection
+            + 'Write-Host "JRE=$($jre_files[0].Name)@$jre_version TOMCAT=$($tomcat_files[0].Name)@$tomcat_version '
+            'JAR=$($jar_files[0].Name)"\n'
+        )
+        return self.run_powershell(script, cwd=root)
+
+    def test_reads_index(self, tmp_path):
+        for path in ("Java/zulujre-17.zip", "Java/decoy.zip", "Tomcat/apache-tomcat-9.0.73.zip",
+                     "offline_package_WDM/wdm-5.27.0-installer.jar"):
+            (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / path).write_bytes(b"data")
+        (tmp_path / ARTIFACT_INDEX_FILENAME).write_text(
+            "# index\n"
+            "jre|Java/zulujre-17.zip|17.0.9|4|\n"
+            "tomcat|Tomcat/apache-tomcat-9.0.73.zip|9.0.73|4|\n"
+            "installer|offline_package_WDM/wdm-5.27.0-installer.jar||4|\n"
+            "installer|offline_package_POS/pos-5.27.0-installer.jar||4|\n"
+        )
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert ("JRE=zulujre-17.zip@17.0.9 TOMCAT=apache-tomcat-9.0.73.zip@9.0.73 "
+                "JAR=wdm-5.27.0-installer.jar") in result.stdout
+
+    def test_size_mismatch_fails(self, tmp_path):
+        (tmp_path / "Java").mkdir()
+        (tmp_path / "Java" / "zulujre-17.zip").write_bytes(b"data")
+        (tmp_path / ARTIFACT_INDEX_FILENAME).write_text("jre|Java/zulujre-17.zip|17.0.9|400|\n")
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 1
+        assert "does not match the expected size (400 bytes)" in result.stdout
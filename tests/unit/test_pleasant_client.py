@@ -0,0 +1,73 @@
+"""
+Unit tests for PleasantPasswordClient session reuse and lazy folder loading.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from gk_install_builder.pleasant_password_client import PleasantPasswordClient, TOKEN_REFRESH_MARGIN
+
+
+def _client(expires_in=3600):
+    response = MagicMock()
+    response.json.return_value = {"access_token": "abc", "expires_in": expires_in}
+    with patch("requests.post", return_value=response):
+        return PleasantPasswordClient("https://kee.example.com/api/v5/rest/", "user", "pw")
+
+
+class TestPleasantSession:
+    """Tests for token expiry tracking."""
+
+    def test_token_valid_until_expiry(self):
+        client = _client()
+        assert client.is_token_valid()
+        assert client.session.headers["Authorization"] == "Bearer abc"
+
+    def test_token_about_to_expire_is_not_reused(self):
+        assert not _client(expires_in=TOKEN_REFRESH_MARGIN - 1).is_token_valid()
+
+
+class TestFolderCache:
+    """Tests for get_folder_cached() and load_folder_async()."""
+
+    def test_folder_level_fetched_once(self):
+        client = _client()
+        client.get_folder_by_id = MagicMock(return_value={"Id": "f"})
+
+        assert client.get_folder_cached("f") is client.get_folder_cached("f")
+        client.get_folder_cached("f", recurse_level=2)
+        assert client.get_folder_by_id.call_count == 2
+
+    def test_concurrent_calls_share_request(self):
+        client = _client()
+        calls = []
+
+        def slow_fetch(folder_id, recurse_level=1):
+            calls.append(folder_id)
+            time.sleep(0.05)
+            return {"Id": folder_id}
+
+        client.get_folder_by_id = slow_fetch
+        threads = [threading.Thread(target=client.get_folder_cached, args=("f",)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert calls == ["f"]
+
+    def test_failure_not_cached(self):
+        client = _client()
+        client.get_folder_by_id = MagicMock(side_effect=[RuntimeError("down"), {"Id": "f"}])
+
+        with pytest.raises(RuntimeError):
+            client.get_folder_cached("f")
+        assert client.get_folder_cached("f") == {"Id": "f"}
+
+    def test_load_folder_async_reports_result(self):
+        client = _client()
+        client.get_folder_by_id = MagicMock(return_value={"Id": "f"})
+        callback = MagicMock()
+
+        client.load_folder_async("f", callback).join()
+        callback.assert_called_once_with({"Id": "f"}, None)
@@ -0,0 +1,284 @@
+"""
+Unit tests for build-time pre-rendering.
+
+Tests the onboarding payloads and launcher templates pre-rendered by the
+generator and the single-pass substitution of the GKInstall templates.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from gk_install_builder.gen_config import LAUNCHER_TEMPLATES
+from gk_install_builder.generators.helper_file_generator import (
+    render_onboarding_payloads,
+    RCS_URL_TOKEN,
+)
+from gk_install_builder.generators.launcher_generator import (
+    generate_launcher_templates,
+    prerender_launcher_template,
+)
+
+RCS_URL = 'http://10.0.0.5:8080/rcs?name="store"'
+
+
+def _block(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+def _onboarding_helper(root):
+    """Write the onboarding payloads and let the generator pre-render them"""
+    onboarding_dir = root / "helper" / "onboarding"
+    onboarding_dir.mkdir(parents=True)
+    for name in ("pos", "rcs-service"):
+        (onboarding_dir / f"{name}.onboarding.json").write_text(
+            json.dumps({"restrictions": {"tenantId": "001", "clientType": name}})
+        )
+    render_onboarding_payloads(str(root / "helper"))
+    return onboarding_dir
+
+
+class TestOnboardingPayloads:
+    """Tests for render_onboarding_payloads()."""
+
+    def _helper(self, tmp_path):
+        onboarding_dir = tmp_path / "onboarding"
+        onboarding_dir.mkdir()
+        for name in ("pos", "wdm", "rcs-service"):
+            (onboarding_dir / f"{name}.onboarding.json").write_text(
+                json.dumps({"restrictions": {"tenantId": "001", "clientType": name}})
+            )
+        return onboarding_dir
+
+    def test_renders_non_rcs_components(self, tmp_path):
+        onboarding_dir = self._helper(tmp_path)
+
+        rendered = render_onboarding_payloads(str(tmp_path))
+
+        assert sorted(os.path.basename(p) for p in rendered) == [
+            "pos.onboarding.rcs.json", "wdm.onboarding.rcs.json"
+        ]
+        data = json.loads((onboarding_dir / "pos.onboarding.rcs.json").read_text())
+        assert data["restrictions"]["clientType"] == "pos"
+        assert data["afterOnboardingProperties"] == [{"key": "rcs.url", "value": RCS_URL_TOKEN}]
+        # The original payload is sent when no RCS URL is passed
+        assert "afterOnboardingProperties" not in (onboarding_dir / "pos.onboarding.json").read_text()
+
+    def test_rerun_does_not_render_rendered_payloads(self, tmp_path):
+        self._helper(tmp_path)
+        render_onboarding_payloads(str(tmp_path))
+        assert len(render_onboarding_payloads(str(tmp_path))) == 2
+
+    def test_missing_directory(self, tmp_path):
+        assert render_onboarding_payloads(str(tmp_path)) == []
+
+
+class TestLauncherTemplates:
+    """Tests for prerender_launcher_template()."""
+
+    def test_normalizes_lines(self):
+        content = "# POS\r\ninstalldir = @INSTALL_DIR@ \r\n\r\nkeepFiles=0"
+        assert prerender_launcher_template(content, "launcher.pos.template") == (
+            "# POS\ninstalldir=@INSTALL_DIR@\n\nkeepFiles=0\n"
+        )
+
+    def test_reports_tokens_not_filled_in(self, capsys):
+        prerender_launcher_template("installdir=@INSTALL_DIR@/pos\nfoo=@FOO@\n", "launcher.pos.template")
+        out = capsys.readouterr().out
+        assert "@INSTALL_DIR@ must be the whole value of installdir" in out
+        assert "Unknown placeholder @FOO@" in out
+
+    def test_generated_templates_only_have_whole_value_tokens(self, tmp_path, capsys):
+        generate_launcher_templates(str(tmp_path), {"firebird_server_path": "/opt/firebird"}, LAUNCHER_TEMPLATES)
+        assert "Warning" not in capsys.readouterr().out
+        content = (tmp_path / "launcher.storehub-service.template").read_text()
+        assert "firebirdServerPath=/opt/firebird\n" in content
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashOnboardingBody:
+    """Build the onboarding request body with onboarding.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        self.section = _block(read_template("onboarding.sh.template"),
+                              "# Determine JSON file based on ComponentType", "# Make the onboarding API call")
+
+    def _run(self, tmp_path, component_type, rcs_url):
+        onboarding_dir = _onboarding_helper(tmp_path)
+        script = (
+            f'onboarding_path="{onboarding_dir}"\n'
+            f'COMPONENT_TYPE="{component_type}"\n'
+            f"rcs_url='{rcs_url}'\n"
+            + self.section
+            + 'printf "%s" "$body" > body.json\n'
+        )
+        result = subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                                timeout=30, cwd=tmp_path)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result.stdout, json.loads((tmp_path / "body.json").read_text())
+
+    def test_prerendered_body(self, tmp_path):
+        out, body = self._run(tmp_path, "POS", RCS_URL)
+        assert f"Injected afterOnboardingProperties rcs.url={RCS_URL}\n" in out
+        assert body["restrictions"]["clientType"] == "pos"
+        assert body["afterOnboardingProperties"] == [{"key": "rcs.url", "value": RCS_URL}]
+
+    def test_without_rcs_url(self, tmp_path):
+        _out, body = self._run(tmp_path, "POS", "")
+        assert "afterOnboardingProperties" not in body
+
+    def test_rcs_service_not_injected(self, tmp_path):
+        _out, body = self._run(tmp_path, "RCS-SERVICE", RCS_URL)
+        assert body == {"restrictions": {"tenantId": "001", "clientType": "rcs-service"}}
+
+
+class TestPowerShellOnboardingBody:
+    """Build the onboarding request body with onboarding.ps1"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        self.section = _block(read_template("onboarding.ps1.template"),
+                              "    # Determine JSON file based on ComponentType", "    try {\n        Log-ApiCall")
+        self.run_powershell = run_powershell
+
+    def _run(self, tmp_path, component_type, rcs_url):
+        onboarding_dir = _onboarding_helper(tmp_path)
+        rcs_url = rcs_url.replace("'", "''")
+        script = (
+            f"$onboardingPath = '{onboarding_dir}'\n"
+            f"$ComponentType = '{component_type}'\n"
+            f"$rcsUrl = '{rcs_url}'\n"
+            + self.section
+            + "Set-Content -Path 'body.json' -Value $body -NoNewline\n"
+        )
+        result = self.run_powershell(script, cwd=tmp_path)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return json.loads((tmp_path / "body.json").read_text())
+
+    def test_prerendered_body(self, tmp_path):
+        body = self._run(tmp_path, "POS", RCS_URL)
+        assert body["restrictions"]["clientType"] == "pos"
+        assert body["afterOnboardingProperties"] == [{"key": "rcs.url", "value": RCS_URL}]
+
+    def test_rcs_service_not_injected(self, tmp_path):
+        body = self._run(tmp_path, "RCS-SERVICE", RCS_URL)
+        assert "afterOnboardingProperties" not in body
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashLauncherProperties:
+    """Write launcher.properties with the GKInstall.sh single-pass loop"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        self.section = _block(read_template("GKInstall.sh.template"), "# Values of the install-time tokens.",
+                              'echo "Launcher properties file created successfully.')
+
+    def _run(self, tmp_path, component_type, template, variables):
+        (tmp_path / "launcher.template").write_text(template)
+        script = (
+            f'COMPONENT_TYPE="{component_type}"\n'
+            f'template_file="{tmp_path / "launcher.template"}"\n'
+            + "".join(f'{name}="{value}"\n' for name, value in variables.items())
+            + self.section
+        )
+        result = subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                                timeout=30, cwd=tmp_path)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return (tmp_path / "launcher.properties").read_text()
+
+    def test_online_install(self, tmp_path):
+        generate_launcher_templates(str(tmp_path), {}, LAUNCHER_TEMPLATES)
+        template = (tmp_path / "launcher.wdm.template").read_text()
+
+        props = self._run(tmp_path, "WDM", template, {
+            "offline_mode": "false", "install_dir": "/opt/gk & co", "base64Token": "dG9r",
+            "ssl_path": "/certs/wdm.p12", "ssl_password": "secret",
+        })
+
+        lines = props.splitlines()
+        assert "installdir=/opt/gk & co" in lines
+        assert "identifierEncoded=dG9r" in lines
+        assert "useLocalFiles=0" in lines
+        assert "ssl_path=/certs/wdm.p12" in lines
+        assert "tomcat_package_local=" in lines
+        assert "@" not in props
+
+    def test_offline_storehub(self, tmp_path):
+        template = (
+            "# StoreHub\r\n"
+            "installdir=@INSTALL_DIR@\r\n"
+            "firebirdServerPath=/opt/firebird\r\n"
+            "firebird_driver_path_local=Jaybird\r\n"
+            "jre_package_local=@JRE_PACKAGE@\r\n"
+            "tomcat_package_version_local=@TOMCAT_VERSION@"
+        )
+
+        props = self._run(tmp_path, "STOREHUB-SERVICE", template, {
+            "offline_mode": "true", "install_dir": "/opt/gk", "jre_version": "17.0.9",
+            "jre_files": "Java/jre.zip", "tomcat_files": "Tomcat/tomcat.zip", "tomcat_version": "9.0.73",
+            "firebird_server_path": "/srv/firebird", "has_jaybird": "true",
+            "firebird_driver_path_local": "Jaybird/jaybird-5.jar",
+        })
+
+        assert props.splitlines() == [
+            "# StoreHub",
+            "installdir=/opt/gk",
+            "firebirdServerPath=/srv/firebird",
+            "firebird_driver_path_local=Jaybird/jaybird-5.jar",
+            f"jre_package_local={tmp_path}/Java/jre.zip",
+            "tomcat_package_version_local=9.0.73",
+        ]
+
+    def test_storehub_template_without_firebird_lines(self, tmp_path):
+        props = self._run(tmp_path, "STOREHUB-SERVICE", "installdir=@INSTALL_DIR@\n", {
+            "offline_mode": "false", "install_dir": "/opt/gk",
+            "firebird_server_path": "/srv/firebird", "has_jaybird": "false",
+        })
+
+        assert props.splitlines() == ["installdir=/opt/gk", "firebirdServerPath=/srv/firebird"]
+
+
+class TestPowerShellLauncherProperties:
+    """Write launcher.properties with the GKInstall.ps1 single-pass replacement"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        self.section = _block(read_template("GKInstall.ps1.template"), "# Paths\n$launchersPath",
+                              "\n# Deploy installer override file")
+        self.run_powershell = run_powershell
+
+    def test_online_install(self, tmp_path):
+        generate_launcher_templates(str(tmp_path / "helper" / "launchers"), {}, LAUNCHER_TEMPLATES)
+        script = (
+            "$ComponentType = 'WDM'\n"
+            "$offline_mode = $false\n"
+            # Replacement values are inserted literally, $1 is no group reference
+            "$install_dir = 'C:\\gk & co $1'\n"
+            "$base64Token = 'dG9r'\n"
+            "$ssl_path = 'C:\\certs\\wdm.p12'\n"
+            "$ssl_password = 'secret'\n"
+            + self.section
+        )
+
+        result = self.run_powershell(script, cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        props = (tmp_path / "launcher.properties").read_text()
+        lines = props.splitlines()
+        assert "installdir=C:\\gk & co $1" in lines
+        assert "identifierEncoded=dG9r" in lines
+        assert "useLocalFiles=0" in lines
+        assert "ssl_path=C:\\certs\\wdm.p12" in lines
+        assert "tomcat_package_local=" in lines
+        assert "@" not in props
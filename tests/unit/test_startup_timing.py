@@ -0,0 +1,62 @@
+"""
+Unit tests for startup timing and lazy imports of the main window.
+"""
+
+import subprocess
+import sys
+import pytest
+from gk_install_builder.utils import startup_timing
+
+
+@pytest.fixture(autouse=True)
+def clean_records(monkeypatch):
+    monkeypatch.setattr(startup_timing, "_records", [])
+    monkeypatch.setattr(startup_timing, "_first_frame_at", None)
+
+
+class TestStartupTiming:
+    """Tests for timed(), lazy_import() and the first frame report."""
+
+    def test_timed_records_even_on_error(self):
+        with pytest.raises(ValueError):
+            with startup_timing.timed("Broken"):
+                raise ValueError("boom")
+        assert [(kind, name) for kind, name, _ in startup_timing.get_records()] == [("init", "Broken")]
+
+    def test_lazy_import_returns_attribute(self):
+        assert startup_timing.lazy_import("json", "dumps")([1]) == "[1]"
+
+    def test_lazy_import_falls_back_to_dev_path(self):
+        module = startup_timing.lazy_import("gk_install_builder.json")
+        assert module is sys.modules["json"]
+        with pytest.raises(ImportError):
+            startup_timing.lazy_import("no_such_module_xyz")
+
+    def test_report_printed_at_first_frame_when_enabled(self, monkeypatch, capsys):
+        monkeypatch.setenv(startup_timing.STARTUP_TIMING_ENV, "1")
+        startup_timing.record("import", "heavy.module", 0.25)
+
+        assert startup_timing.mark_first_frame() >= 0
+        startup_timing.record("init", "LaterDialog", 0.01)
+
+        output = capsys.readouterr().out
+        assert "First frame after" in output
+        assert "heavy.module" in output
+        assert "LaterDialog: 10.0 ms (on first use)" in output
+
+    def test_silent_when_disabled(self, monkeypatch, capsys):
+        monkeypatch.delenv(startup_timing.STARTUP_TIMING_ENV, raising=False)
+        startup_timing.mark_first_frame()
+        assert capsys.readouterr().out == ""
+
+
+def test_main_does_not_import_heavy_modules():
+    """Importing the main window module must not pull in requests or the generator"""
+    code = (
+        "import sys, gk_install_builder.main; "
+        "print(sorted(m for m in ('requests', 'gk_install_builder.generator', "
+        "'gk_install_builder.dialogs.offline_package') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,331 @@
+"""
+Unit tests for the per-store structure cache.
+
+Tests the cache lifetime written by the generator and the store cache
+functions of the store-initialization and GKInstall templates.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from gk_install_builder.generators.helper_file_generator import (
+    generate_store_init_script,
+    get_store_cache_ttl,
+    DEFAULT_STORE_CACHE_TTL_MINUTES,
+)
+
+BASE_URL = "dsg.example.com"
+CACHE_KEY = "dsg.example.com_001_1234"
+STRUCTURE = {"childNodeList": [{"workstationId": "101", "structureUniqueName": "u1", "systemName": "GKR-OPOS-CLOUD"}]}
+
+# Stand-in for curl on PATH: logs "<method> <path>" and answers the store-initialization calls
+FAKE_CURL = """#!/bin/bash
+method=GET
+for arg in "$@"; do
+  case "$arg" in
+    GET|POST|PUT) method="$arg" ;;
+    https://*) url="$arg" ;;
+  esac
+done
+echo "$method ${url#https://dsg.example.com}" >> "$PWD/requests.log"
+case "$url" in
+  */structure/child-nodes/search) cat "$PWD/structure_response.json" ;;
+  */structure/nodes) exit 22 ;;
+  */business-units/*) echo '{"key":{"businessUnitGroupID":"42"}}' ;;
+  *) echo '{}' ;;
+esac
+"""
+
+# Stand-in for Invoke-RestMethod with the same answers
+FAKE_INVOKE_REST_METHOD = """function Invoke-RestMethod {
+    param($Uri, $Method, $Headers, $Body, $ContentType)
+    Add-Content -Path (Join-Path (Get-Location) 'requests.log') -Value "$($Method.ToString().ToUpper()) $($Uri -replace '^https://dsg.example.com', '')"
+    if ($Uri -like '*/structure/child-nodes/search') { return (Get-Content 'structure_response.json' -Raw | ConvertFrom-Json) }
+    if ($Uri -like '*/structure/nodes') { throw 'creation failed' }
+    if ($Uri -like '*/business-units/*') { return [pscustomobject]@{ key = [pscustomobject]@{ businessUnitGroupID = '42' } } }
+    return [pscustomobject]@{}
+}
+"""
+
+# Stand-in for curl in GKInstall.sh: config-service knows the RCS node and its rcs.url
+FAKE_RCS_CURL = r"""curl() {
+  echo "$*" >> requests.log
+  case "$*" in
+    *child-nodes*)
+      echo '{"childNodeList":[{"systemName":"GKR-Resource-Cache-Service","structureUniqueName":"r1","activeVersion":"v1"}]}' ;;
+    *parameter-contents*)
+      printf '{"parameterList":[{"name":"system.properties","content":"%s"}]}' \
+        "$(printf 'rcs.url=http\\://rcs\\:8180/rcs\n' | base64 -w0)" ;;
+  esac
+}
+"""
+
+
+def _cache_functions(content, bash):
+    """The TTL and the get/put functions shared by both scripts of a platform."""
+    start = content.index("STORE_CACHE_TTL_MINUTES=" if bash else "$StoreCacheTtlMinutes =")
+    end_marker = "store_cache_put() {" if bash else "function Save-StoreCacheEntry {"
+    end = content.index("\n}\n", content.index(end_marker)) + 3
+    return content[start:end]
+
+
+def _store_package(root, templates_dir, platform):
+    """Generate store-initialization for platform with the helper files it reads"""
+    generate_store_init_script(str(root), {"platform": platform, "store_cache_ttl_minutes": 30}, templates_dir)
+    for directory in ("init", "tokens", "structure"):
+        (root / "helper" / directory).mkdir(parents=True, exist_ok=True)
+    (root / "helper" / "tokens" / "access_token.txt").write_text("token")
+    (root / "helper" / "init" / "get_store.json").write_text('{"retailStoreId":"@RETAIL_STORE_ID@"}')
+    (root / "helper" / "structure" / "create_structure.json").write_text('{"newNode":{"workstationId":"@WORKSTATION_ID@"}}')
+    (root / "structure_response.json").write_text(json.dumps(STRUCTURE))
+
+
+def _requests(root):
+    path = root / "requests.log"
+    return path.read_text().splitlines() if path.exists() else []
+
+
+def _seed_stale_structure(root):
+    """Cache a structure that predates the node of workstation 101"""
+    entry = root / "helper" / "init" / "store_cache" / CACHE_KEY / "structure.json"
+    entry.parent.mkdir(parents=True)
+    entry.write_text('{"childNodeList":[]}')
+    (root / "structure_response.json").write_text('{"childNodeList":[]}')
+
+
+class TestStoreCacheTtl:
+    """Tests for get_store_cache_ttl()."""
+
+    @pytest.mark.parametrize("value, expected", [
+        (30, 30),
+        ("45", 45),
+        (0, 0),
+        (-5, 0),
+        ("soon", DEFAULT_STORE_CACHE_TTL_MINUTES),
+        (None, DEFAULT_STORE_CACHE_TTL_MINUTES),
+    ])
+    def test_values(self, value, expected):
+        assert get_store_cache_ttl({"store_cache_ttl_minutes": value}) == expected
+
+    def test_default(self):
+        assert get_store_cache_ttl({}) == DEFAULT_STORE_CACHE_TTL_MINUTES
+
+
+class TestStoreCacheTemplates:
+    """The scripts read and write the per-store cache"""
+
+    @pytest.mark.parametrize("platform, filename", [
+        ("Linux", "store-initialization.sh"),
+        ("Windows", "store-initialization.ps1"),
+    ])
+    def test_ttl_replaced(self, tmp_path, templates_dir, platform, filename):
+        generate_store_init_script(str(tmp_path), {"platform": platform, "store_cache_ttl_minutes": 30}, templates_dir)
+        content = (tmp_path / filename).read_text()
+        assert "@STORE_CACHE_TTL_MINUTES@" not in content
+        assert ("STORE_CACHE_TTL_MINUTES=30" if platform == "Linux" else "$StoreCacheTtlMinutes = 30") in content
+
+    def test_functions_shared_with_gkinstall(self, read_template):
+        for suffix, bash in ((".sh.template", True), (".ps1.template", False)):
+            assert (_cache_functions(read_template("GKInstall" + suffix), bash)
+                    == _cache_functions(read_template("store-initialization" + suffix), bash))
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not all(shutil.which(tool) for tool in ("bash", "find", "touch")),
+    reason="requires bash, find and touch"
+)
+class TestBashStoreCache:
+    """Run the store cache functions of store-initialization.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("store-initialization.sh.template")
+        self.functions = content[content.index(_cache_functions(content, bash=True)):
+                                 content.index("# Default values will be overridden by command line arguments")]
+
+    def _run(self, tmp_path, commands, ttl=120):
+        script = (
+            "set -e\n"
+            + self.functions.replace("@STORE_CACHE_TTL_MINUTES@", str(ttl))
+            + f'store_cache_init "{tmp_path}/helper/init" "test.example.com/dsg" "001" "S 1"\n'
+            + commands
+        )
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=30, cwd=tmp_path)
+
+    def _entry(self, tmp_path, name):
+        return tmp_path / "helper" / "init" / "store_cache" / "test.example.com_dsg_001_S_1" / name
+
+    def test_put_and_get(self, tmp_path):
+        result = self._run(tmp_path, 'store_cache_put "rcs_url.txt" "http://rcs:8180/rcs"\n'
+                                     'store_cache_get "rcs_url.txt"\n')
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert result.stdout.splitlines()[-1] == "http://rcs:8180/rcs"
+        assert self._entry(tmp_path, "rcs_url.txt").read_text() == "http://rcs:8180/rcs\n"
+        assert not list(self._entry(tmp_path, "").glob(".*"))
+
+    def test_expired_entry(self, tmp_path):
+        entry = self._entry(tmp_path, "structure.json")
+        entry.parent.mkdir(parents=True)
+        entry.write_text('{"childNodeList":[]}\n')
+        subprocess.run(["touch", "-d", "-3 minutes", str(entry)], check=True)
+
+        assert self._run(tmp_path, 'store_cache_get "structure.json"', ttl=5).returncode == 0
+        result = self._run(tmp_path, 'store_cache_get "structure.json"', ttl=2)
+        assert result.returncode == 1
+        assert result.stdout == ""
+
+    def test_disabled(self, tmp_path):
+        result = self._run(tmp_path, 'store_cache_put "rcs_url.txt" "http://rcs:8180/rcs"\n'
+                                     'store_cache_get "rcs_url.txt" || echo "MISS"\n', ttl=0)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "MISS"
+        assert not (tmp_path / "helper" / "init" / "store_cache").exists()
+
+    def test_invalidate(self, tmp_path):
+        result = self._run(tmp_path, 'store_cache_put "structure.json" "{}"\n'
+                                     'store_cache_invalidate "workstation structure creation failed"\n'
+                                     'store_cache_get "structure.json" || echo "MISS"\n')
+        assert result.returncode == 0, result.stderr
+        assert "Store cache invalidated (workstation structure creation failed)" in result.stdout
+        assert result.stdout.splitlines()[-1] == "MISS"
+        assert not self._entry(tmp_path, "").exists()
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win")
+    or not all(shutil.which(tool) for tool in ("bash", "find", "sed")),
+    reason="requires bash, find and sed"
+)
+class TestBashStoreInitialization:
+    """Run the generated store-initialization.sh against a stand-in for curl"""
+
+    def _run(self, root):
+        bin_dir = root / "bin"
+        bin_dir.mkdir(exist_ok=True)
+        (bin_dir / "curl").write_text(FAKE_CURL)
+        (bin_dir / "curl").chmod(0o755)
+        env = dict(os.environ, PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return subprocess.run(
+            ["bash", "store-initialization.sh", "--ComponentType", "POS", "--base_url", BASE_URL,
+             "--StoreId", "1234", "--WorkstationId", "101", "-y"],
+            capture_output=True, text=True, timeout=60, cwd=root, env=env
+        )
+
+    def test_second_installation_uses_cache(self, tmp_path, templates_dir):
+        _store_package(tmp_path, templates_dir, "Linux")
+
+        first = self._run(tmp_path)
+        second = self._run(tmp_path)
+
+        assert first.returncode == 0, first.stdout + first.stderr
+        assert second.returncode == 0, second.stdout + second.stderr
+        assert "Using cached store structure" in second.stdout
+        assert "Using cached business unit information" in second.stdout
+        assert _requests(tmp_path) == [
+            "POST /api/config/services/rest/infrastructure/v1/structure/child-nodes/search",
+            "GET /api/business-unit/rest/v1/business-units/1234",
+            "PUT /api/pos/master-data/rest/v1/workstations",
+            "PUT /api/pos/master-data/rest/v1/workstations",
+        ]
+
+    def test_failed_creation_invalidates_cache(self, tmp_path, templates_dir):
+        _store_package(tmp_path, templates_dir, "Linux")
+        _seed_stale_structure(tmp_path)
+
+        result = self._run(tmp_path)
+
+        # The initialization continues after the failed creation
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Store cache invalidated (workstation structure creation failed)" in result.stdout
+        assert _requests(tmp_path) == [
+            "POST /api/config/services/rest/infrastructure/v1/structure/nodes",
+            "POST /api/config/services/rest/infrastructure/v1/structure/child-nodes/search",
+            "GET /api/business-unit/rest/v1/business-units/1234",
+            "PUT /api/pos/master-data/rest/v1/workstations",
+        ]
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashGKInstallRcsUrl:
+    """Run the RCS URL autodetection of GKInstall.sh with the store cache"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        start = content.index('      if [ "$rcs_url" = "autodetect" ]; then')
+        self.script = (
+            _cache_functions(content, bash=True).replace("@STORE_CACHE_TTL_MINUTES@", "30")
+            + FAKE_RCS_CURL
+            + f'rcs_url="autodetect"\nbase_url="{BASE_URL}"\nserver="{BASE_URL}"\ntenant_id="001"\nstoreNumber="1234"\n'
+            + content[start:content.index("    fi\n    # ---- End pre-onboarding RCS URL resolution", start)]
+            + 'echo "RCS_URL=$rcs_url"\n'
+        )
+
+    def _run(self, root):
+        (root / "helper" / "tokens").mkdir(parents=True, exist_ok=True)
+        (root / "helper" / "tokens" / "access_token.txt").write_text("token")
+        return subprocess.run(["bash", "-c", f'script_dir="{root}"\n' + self.script],
+                              capture_output=True, text=True, timeout=30, cwd=root)
+
+    def test_autodetected_url_cached(self, tmp_path):
+        first = self._run(tmp_path)
+        second = self._run(tmp_path)
+
+        assert first.stdout.splitlines()[-1] == "RCS_URL=http://rcs:8180/rcs", first.stdout + first.stderr
+        assert second.stdout.splitlines()[-1] == "RCS_URL=http://rcs:8180/rcs"
+        assert "Using cached RCS URL of store 1234" in second.stdout
+        # Only the first run asks config-service
+        assert len(_requests(tmp_path)) == 2
+        assert (tmp_path / "helper" / "init" / "store_cache" / CACHE_KEY / "rcs_url.txt").exists()
+
+
+class TestPowerShellStoreInitialization:
+    """Run the generated store-initialization.ps1 against a stand-in for Invoke-RestMethod"""
+
+    @pytest.fixture(autouse=True)
+    def _runner(self, run_powershell):
+        self.run_powershell = run_powershell
+
+    def _run(self, root):
+        return self.run_powershell(
+            FAKE_INVOKE_REST_METHOD
+            + f"& '{root / 'store-initialization.ps1'}' -ComponentType POS -base_url {BASE_URL} "
+            "-StoreId 1234 -WorkstationId 101 -tenant_id 001 -y\nexit $LASTEXITCODE\n",
+            cwd=root
+        )
+
+    def test_second_installation_uses_cache(self, tmp_path, templates_dir):
+        _store_package(tmp_path, templates_dir, "Windows")
+
+        first = self._run(tmp_path)
+        second = self._run(tmp_path)
+
+        assert first.returncode == 0, first.stdout + first.stderr
+        assert second.returncode == 0, second.stdout + second.stderr
+        assert "Using cached store structure" in second.stdout
+        assert _requests(tmp_path) == [
+            "POST /api/config/services/rest/infrastructure/v1/structure/child-nodes/search",
+            "GET /api/business-unit/rest/v1/business-units/1234",
+            "PUT /api/pos/master-data/rest/v1/workstations",
+            "PUT /api/pos/master-data/rest/v1/workstations",
+        ]
+
+    def test_failed_creation_invalidates_cache(self, tmp_path, templates_dir):
+        _store_package(tmp_path, templates_dir, "Windows")
+        _seed_stale_structure(tmp_path)
+
+        result = self._run(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Store cache invalidated (workstation structure creation failed)" in result.stdout
+        assert _requests(tmp_path)[:2] == [
+            "POST /api/config/services/rest/infrastructure/v1/structure/nodes",
+            "POST /api/config/services/rest/infrastructure/v1/structure/child-nodes/search",
+        ]
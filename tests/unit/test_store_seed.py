@@ -0,0 +1,349 @@
+"""
+Unit tests for Store-LAN seeding.
+
+Tests the seed configuration and artifact checksums written by the generator
+and the seed server / seed pull functions of the GKInstall templates.
+"""
+
+import hashlib
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+import pytest
+from gk_install_builder.generators.store_seed import (
+    parse_seed_address,
+    build_seed_config,
+    write_seed_config,
+    build_artifact_checksums,
+    write_artifact_checksums,
+    SEED_DIR,
+    SEED_CONFIG_FILENAME,
+    ARTIFACT_CHECKSUMS_FILENAME,
+)
+from gk_install_builder.generator import ProjectGenerator
+
+
+def _seed_functions(content):
+    start = content.rindex("# =====", 0, content.index("# STORE-LAN SEEDING"))
+    end = content.index("# Function to extract version from any package filename", start)
+    return content[start:end]
+
+
+def _block(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+class TestSeedConfig:
+    """Tests for parse_seed_address() and build_seed_config()."""
+
+    @pytest.mark.parametrize("address, expected", [
+        ("store-pos-01", ("store-pos-01", 8765)),
+        ("10.0.0.5:9000", ("10.0.0.5", 9000)),
+        ("http://store-pos-01:9000/", ("store-pos-01", 9000)),
+        ("  ", None),
+        (None, None),
+    ])
+    def test_parse_address(self, address, expected):
+        assert parse_seed_address(address) == expected
+
+    def test_config_content(self):
+        lines = build_seed_config({
+            "store_seed_address": "store-pos-01", "store_seed_port": 9000,
+            "store_seed_timeout": "3", "store_seed_serve_minutes": 60
+        }).splitlines()
+        assert lines[1:] == ["host=store-pos-01", "port=9000", "timeout=3", "serve_minutes=60"]
+
+    def test_invalid_values_use_defaults(self):
+        text = build_seed_config({"store_seed_address": "seed", "store_seed_timeout": "soon"})
+        assert "timeout=5" in text
+        assert "serve_minutes=60" in text
+
+    def test_no_seed(self):
+        assert build_seed_config({"store_seed_address": ""}) is None
+
+
+class TestGeneratorSeed:
+    """Tests for write_seed_config() and the artifact checksums."""
+
+    def test_writes_and_removes_config(self, tmp_path):
+        path = write_seed_config(str(tmp_path), {"store_seed_address": "seed"})
+        assert path == os.path.join(str(tmp_path), SEED_DIR, SEED_CONFIG_FILENAME)
+        assert os.path.exists(path)
+
+        assert write_seed_config(str(tmp_path), {"store_seed_address": ""}) is None
+        assert not os.path.exists(path)
+
+    def test_generator_method(self, tmp_path):
+        ProjectGenerator()._generate_seed_config(str(tmp_path), {"store_seed_address": "seed:9000"})
+        assert "port=9000" in (tmp_path / SEED_DIR / SEED_CONFIG_FILENAME).read_text()
+
+    def test_checksums(self, tmp_path):
+        manifest = {"files": [
+            {"relative_path": "offline_package_POS/Launcher.run", "sha256": "a" * 64},
+            {"relative_path": "Java/jre.zip", "sha256": None},
+        ]}
+        write_artifact_checksums(manifest, str(tmp_path))
+        assert (tmp_path / ARTIFACT_CHECKSUMS_FILENAME).read_text() == (
+            "a" * 64 + "  offline_package_POS/Launcher.run\n"
+        )
+
+    def test_empty_manifest(self):
+        assert build_artifact_checksums({"files": []}) == ""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win")
+    or not all(shutil.which(tool) for tool in ("bash", "curl", "sha256sum", "python3", "timeout")),
+    reason="requires bash, curl, sha256sum, python3 and timeout"
+)
+class TestBashSeed:
+    """Serve a package from one directory and pull it into another"""
+
+    ARTIFACTS = {
+        "offline_package_POS/Launcher.run": b"launcher",
+        "offline_package_POS/installer file.jar": b"installer",
+        "Java/jre.zip": b"java",
+        "offline_package_WDM/Launcher.run": b"wdm",
+    }
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        self.functions = _seed_functions(content)
+        self.pull = _block(content, "# Store-LAN seeding: pull the offline artifacts", "\n# Delta offline package")
+        self.serve = _block(content, "  # Serve the offline artifacts to the other workstations",
+                            '\n  cleanup_installation "results_')
+        self.options = content[:content.index("\n# Validate ComponentType")]
+
+    def _write_package(self, root, port, with_artifacts):
+        (root / "helper" / "seed").mkdir(parents=True)
+        (root / "helper" / "seed" / "seed.txt").write_text(
+            f"host=127.0.0.1\nport={port}\ntimeout=2\nserve_minutes=1\n"
+        )
+        for path, data in self.ARTIFACTS.items():
+            if with_artifacts:
+                (root / path).parent.mkdir(parents=True, exist_ok=True)
+                (root / path).write_bytes(data)
+        (root / "offline_package.sha256").write_text("".join(
+            f"{hashlib.sha256(data).hexdigest()}  {path}\n" for path, data in self.ARTIFACTS.items()
+        ))
+        (root / "seed.sh").write_text(self.functions)
+
+    def _run(self, root, commands):
+        script = f'script_dir="{root}"\nsource "{root / "seed.sh"}"\n{commands}\n'
+        return subprocess.run(["bash", "-c", script], capture_output=True, text=True,
+                              timeout=60, cwd=root)
+
+    @pytest.fixture
+    def seed(self, tmp_path):
+        port = _free_port()
+        seed_root = tmp_path / "seed"
+        seed_root.mkdir()
+        self._write_package(seed_root, port, with_artifacts=True)
+        yield seed_root, port
+        pid_file = seed_root / "helper" / "seed" / "seed.pid"
+        if pid_file.exists():
+            subprocess.run(["kill", pid_file.read_text().strip()], capture_output=True)
+
+    def _wait_for(self, port):
+        for _ in range(50):
+            with socket.socket() as s:
+                if s.connect_ex(("127.0.0.1", port)) == 0:
+                    return
+            time.sleep(0.1)
+
+    def test_serve_and_pull(self, tmp_path, seed):
+        seed_root, port = seed
+        # A corrupted artifact is not published
+        (seed_root / "offline_package_WDM" / "Launcher.run").write_bytes(b"corrupt")
+
+        result = self._run(seed_root, "seed_serve_artifacts")
+        assert result.returncode == 0, result.stdout
+        assert "Serving 3 artifact(s) to the store on 127.0.0.1:" in result.stdout
+        assert "skipping offline_package_WDM/Launcher.run" in result.stdout
+        self._wait_for(port)
+
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, port, with_artifacts=False)
+        result = self._run(follower, 'seed_pull "offline_package_POS"')
+
+        assert result.returncode == 0, result.stdout
+        assert "Pulled 3 artifact(s)" in result.stdout
+        assert (follower / "offline_package_POS" / "installer file.jar").read_bytes() == b"installer"
+        assert (follower / "Java" / "jre.zip").read_bytes() == b"java"
+        # Artifacts of other components are not pulled
+        assert not (follower / "offline_package_WDM").exists()
+
+    def test_pull_requires_local_checksums(self, tmp_path, seed):
+        seed_root, port = seed
+        assert self._run(seed_root, "seed_serve_artifacts").returncode == 0
+        self._wait_for(port)
+
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, port, with_artifacts=False)
+        (follower / "offline_package.sha256").unlink()
+        result = self._run(follower, 'seed_pull "offline_package_POS"')
+        assert result.returncode == 1
+        assert "offline_package.sha256 not found" in result.stdout
+        assert not (follower / "offline_package.sha256").exists()
+        assert not (follower / "offline_package_POS").exists()
+
+    @pytest.mark.parametrize("path", [
+        "/etc/cron.d/x", "offline_package_POS/../../x", "../x", "offline_package_POS/a\\b",
+    ])
+    def test_unsafe_paths_rejected(self, tmp_path, path):
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, _free_port(), with_artifacts=False)
+        (follower / "offline_package.sha256").write_text(f"{'a' * 64}  {path}\n")
+        result = self._run(follower, 'seed_pull "offline_package_POS"')
+        assert result.returncode == 1
+        assert "rejecting unsafe path" in result.stdout
+
+    def test_unreachable_seed(self, tmp_path):
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, _free_port(), with_artifacts=False)
+        result = self._run(follower, 'seed_pull "offline_package_POS"')
+        assert result.returncode == 1
+        assert not list(follower.rglob("*.part"))
+
+    def test_seed_is_local(self, tmp_path):
+        (tmp_path / "helper" / "seed").mkdir(parents=True)
+        (tmp_path / "seed.sh").write_text(self.functions)
+        (tmp_path / "helper" / "seed" / "seed.txt").write_text(f"host={socket.gethostname().upper()}\n")
+        assert self._run(tmp_path, "seed_is_local").returncode == 0
+
+        (tmp_path / "helper" / "seed" / "seed.txt").write_text("host=some-other-host\n")
+        assert self._run(tmp_path, "seed_is_local").returncode == 1
+
+    def test_pull_switches_to_offline_mode(self, tmp_path, seed):
+        seed_root, port = seed
+        assert self._run(seed_root, "seed_serve_artifacts").returncode == 0
+        self._wait_for(port)
+
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, port, with_artifacts=False)
+        result = self._run(follower, f'offline_mode=false\npackage_dir="offline_package_POS"\n'
+                                     f'{self.pull}\necho "offline_mode=$offline_mode"')
+
+        assert result.stdout.splitlines()[-1] == "offline_mode=true", result.stdout
+        assert (follower / "offline_package_POS" / "Launcher.run").read_bytes() == b"launcher"
+
+    def test_dsg_used_without_seed(self, tmp_path):
+        follower = tmp_path / "follower"
+        follower.mkdir()
+        self._write_package(follower, _free_port(), with_artifacts=False)
+        result = self._run(follower, f'offline_mode=false\npackage_dir="offline_package_POS"\n'
+                                     f'{self.pull}\necho "offline_mode=$offline_mode"')
+
+        assert "Store seed unavailable, downloading from DSG" in result.stdout
+        assert result.stdout.splitlines()[-1] == "offline_mode=false"
+
+    @pytest.mark.parametrize("args, host, serves", [
+        ("--seed", "some-other-host", True),
+        ("", "some-other-host", False),
+        ("", socket.gethostname(), True),
+    ])
+    def test_serve_after_installation(self, tmp_path, args, host, serves):
+        (tmp_path / "helper" / "seed").mkdir(parents=True)
+        (tmp_path / "helper" / "seed" / "seed.txt").write_text(f"host={host}\n")
+        script = tmp_path / "GKInstall.sh"
+        script.write_text(
+            self.options + "\n" + self.functions
+            + 'seed_serve_artifacts() { echo "SERVING"; }\n'
+            + self.serve
+        )
+
+        result = subprocess.run(["bash", str(script)] + args.split(), capture_output=True, text=True,
+                                timeout=30, cwd=tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert ("SERVING" in result.stdout) == serves
+
+
+class TestPowerShellSeed:
+    """Run the seed pull and seed serve sections of GKInstall.ps1"""
+
+    ARTIFACTS = {
+        "offline_package_POS/Launcher.exe": b"launcher",
+        "Java/jre.zip": b"java",
+        "offline_package_WDM/Launcher.exe": b"wdm",
+    }
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        self.script = (
+            content[:content.index("\n)\n") + 3]
+            + '$offline_mode = $false\n$package_dir = "offline_package_POS"\n'
+            + _seed_functions(content)
+            + "function Start-SeedServer { Write-Host 'SERVING'; return $true }\n"
+            + _block(content, "# Store-LAN seeding: pull the offline artifacts", "\n# Delta offline package")
+            + 'Write-Host "offline_mode=$offline_mode"\n'
+            + _block(content, "    # Serve the offline artifacts to the other workstations",
+                     '\n    Invoke-InstallationCleanup -TargetDir "results_')
+        )
+        self.run_powershell = run_powershell
+
+    @pytest.fixture
+    def seed_url(self, tmp_path):
+        root = tmp_path / "seed"
+        for path, data in self.ARTIFACTS.items():
+            (root / path).parent.mkdir(parents=True, exist_ok=True)
+            (root / path).write_bytes(data)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SimpleHTTPRequestHandler, directory=str(root)))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield server.server_address[1]
+        server.shutdown()
+        server.server_close()
+
+    def _run(self, root, port, args="", host="127.0.0.1"):
+        (root / "helper" / "seed").mkdir(parents=True, exist_ok=True)
+        (root / "helper" / "seed" / "seed.txt").write_text(f"host={host}\nport={port}\ntimeout=2\n")
+        (root / "offline_package.sha256").write_text("".join(
+            f"{hashlib.sha256(data).hexdigest()}  {path}\n" for path, data in self.ARTIFACTS.items()
+        ))
+        (root / "GKInstall.ps1").write_text(self.script)
+        return self.run_powershell(f"& '{root / 'GKInstall.ps1'}' {args}\nexit $LASTEXITCODE\n", cwd=root)
+
+    def test_pull_switches_to_offline_mode(self, tmp_path, seed_url):
+        follower = tmp_path / "follower"
+        follower.mkdir()
+
+        result = self._run(follower, seed_url)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Pulled 2 artifact(s)" in result.stdout
+        assert "offline_mode=True" in result.stdout
+        assert (follower / "offline_package_POS" / "Launcher.exe").read_bytes() == b"launcher"
+        assert not (follower / "offline_package_WDM").exists()
+        # The seed address is not this workstation
+        assert "SERVING" not in result.stdout
+
+    def test_dsg_used_without_seed(self, tmp_path):
+        result = self._run(tmp_path, _free_port())
+        assert "Store seed unavailable, downloading from DSG" in result.stdout
+        assert "offline_mode=False" in result.stdout
+
+    def test_seed_switch_serves(self, tmp_path):
+        (tmp_path / "offline_package_POS").mkdir()
+        (tmp_path / "offline_package_POS" / "Launcher.exe").write_bytes(b"launcher")
+        result = self._run(tmp_path, _free_port(), args="-Seed", host="some-other-host")
+        assert "SERVING" in result.stdout
@@ -0,0 +1,308 @@
+"""
+Unit tests for the shared OAuth token cache in the install script templates.
+
+GKInstall and onboarding reuse one short-lived token from
+helper/tokens/token_cache.txt instead of each requesting their own.
+"""
+
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import pytest
+
+TOKEN_RESPONSE = '{"access_token":"tok-gk","expires_in":600}'
+
+
+def _cache_functions(content):
+    start = content.index("# SHARED OAUTH TOKEN CACHE")
+    start = content.rindex("# =====", 0, start)
+    end = content.index("token_expires_in() {", start)
+    end = content.index("\n}\n", end) + 3
+    return content[start:end]
+
+
+def _powershell_cache_functions(content):
+    start = content.index("$TokenCacheDefaultAge =")
+    end = content.index("\n}\n", content.index("function Save-CachedAccessToken")) + 3
+    return content[start:end]
+
+
+def _section(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+def _write_credentials(root, user="1001"):
+    tokens = root / "helper" / "tokens"
+    tokens.mkdir(parents=True, exist_ok=True)
+    (root / "helper" / "onboarding").mkdir(parents=True, exist_ok=True)
+    (tokens / "basic_auth_password.txt").write_text("c2VjcmV0")
+    (tokens / "form_password.txt").write_text("cHc=")
+    (tokens / "form_username.txt").write_text(user)
+
+
+def _calls(root):
+    calls = root / "token_requests.txt"
+    return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+
+class TestTokenCacheTemplates:
+    """GKInstall and onboarding carry the same cache"""
+
+    def test_bash_helpers_identical(self, read_template):
+        # The comment header differs per script, the functions must not
+        def body(name):
+            section = _cache_functions(read_template(name))
+            return section[section.index("TOKEN_CACHE_DEFAULT_AGE="):]
+
+        assert body("GKInstall.sh.template") == body("onboarding.sh.template")
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashTokenCache:
+    """Run token_cache_get/token_cache_put from GKInstall.sh"""
+
+    @pytest.fixture(autouse=True)
+    def _functions(self, read_template):
+        self.functions = _cache_functions(read_template("GKInstall.sh.template"))
+
+    def _run(self, tmp_path, commands):
+        (tmp_path / "cache.sh").write_text(self.functions)
+        script = f'source "{tmp_path / "cache.sh"}"\n{commands}\n'
+        return subprocess.run(
+            ["bash", "-c", script], capture_output=True, text=True, timeout=30, cwd=tmp_path
+        )
+
+    def test_put_then_get(self, tmp_path):
+        result = self._run(
+            tmp_path,
+            'token_cache_put . host 001 user tok123 600 && token_cache_get . host 001 user'
+        )
+        assert result.returncode == 0
+        assert result.stdout.strip() == "tok123"
+        assert (tmp_path / "access_token.txt").read_text() == "tok123"
+        assert not list(tmp_path.glob(".token_cache.*"))
+
+    def test_files_private(self, tmp_path):
+        self._run(tmp_path, "token_cache_put . host 001 user tok123 600")
+        for name in ("token_cache.txt", "access_token.txt"):
+            mode = stat.S_IMODE(os.stat(tmp_path / name).st_mode)
+            assert mode == 0o600
+
+    @pytest.mark.parametrize("args", ["other 001 user", "host 002 user", "host 001 someone"])
+    def test_mismatch_misses(self, tmp_path, args):
+        result = self._run(
+            tmp_path, f"token_cache_put . host 001 user tok123 600 && token_cache_get . {args}"
+        )
+        assert result.returncode == 1
+        assert result.stdout == ""
+
+    def test_expiring_token_misses(self, tmp_path):
+        # Lifetime within the skew counts as already expired
+        result = self._run(
+            tmp_path, "token_cache_put . host 001 user tok123 30 && token_cache_get . host 001 user"
+        )
+        assert result.returncode == 1
+
+    def test_lifetime_capped(self, tmp_path):
+        result = self._run(
+            tmp_path,
+            'now=$(date +%s); token_cache_put . host 001 user tok123 86400; '
+            'expires=$(sed -n "s/^expires_at=//p" token_cache.txt); echo $((expires - now))'
+        )
+        assert 0 < int(result.stdout.strip()) <= 901
+
+    def test_missing_expires_in_uses_default(self, tmp_path):
+        result = self._run(
+            tmp_path,
+            'token_cache_put . host 001 user tok123 "$(token_expires_in \'{"access_token":"x"}\')" '
+            "&& token_cache_get . host 001 user"
+        )
+        assert result.stdout.strip() == "tok123"
+
+    def test_expires_in_parsed(self, tmp_path):
+        result = self._run(
+            tmp_path, "token_expires_in '{\"access_token\":\"x\",\"expires_in\": 1800}'"
+        )
+        assert result.stdout.strip() == "1800"
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not shutil.which("bash"),
+    reason="requires bash"
+)
+class TestBashTokenReuse:
+    """GKInstall.sh caches the token it requests and onboarding.sh reuses it"""
+
+    @pytest.fixture(autouse=True)
+    def _templates(self, read_template):
+        self.gkinstall = read_template("GKInstall.sh.template")
+        self.onboarding = read_template("onboarding.sh.template")
+
+    def _curl_stub(self, root):
+        return (
+            f'curl() {{ echo "$*" >> "{root}/token_requests.txt"; '
+            f"echo '{TOKEN_RESPONSE}'; }}\n"
+        )
+
+    def _run_gkinstall(self, root):
+        (root / "gkinstall.sh").write_text(
+            self._curl_stub(root)
+            + _cache_functions(self.gkinstall)
+            + f'base_url="test.example.com"\ntenant_id="001"\nscript_dir="{root}"\n'
+            + _section(self.gkinstall, '  tokens_path="$script_dir/helper/tokens"\n  basic_auth_path=',
+                       "  # Fetch default version from API based on version_source")
+        )
+        return subprocess.run(["bash", str(root / "gkinstall.sh")], capture_output=True, text=True,
+                              timeout=30, cwd=root)
+
+    def _run_onboarding(self, root):
+        prefix = self.onboarding[:self.onboarding.index("# Second API call using the token")]
+        (root / "onboarding.sh").write_text(self._curl_stub(root) + prefix)
+        return subprocess.run(["bash", str(root / "onboarding.sh"), "--base_url", "test.example.com"],
+                              capture_output=True, text=True, timeout=30, cwd=root)
+
+    def test_onboarding_reuses_gkinstall_token(self, tmp_path):
+        _write_credentials(tmp_path)
+
+        result = self._run_gkinstall(tmp_path)
+        assert "OAuth token obtained and saved successfully" in result.stdout, result.stdout + result.stderr
+        result = self._run_onboarding(tmp_path)
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert "Reusing cached OAuth2 access token" in result.stdout
+        assert _calls(tmp_path) == 1
+        assert (tmp_path / "helper" / "tokens" / "access_token.txt").read_text() == "tok-gk"
+
+    def test_gkinstall_reuses_cached_token(self, tmp_path):
+        _write_credentials(tmp_path)
+
+        self._run_gkinstall(tmp_path)
+        result = self._run_gkinstall(tmp_path)
+
+        assert "Reusing cached OAuth token" in result.stdout
+        assert _calls(tmp_path) == 1
+
+    def test_other_user_requests_new_token(self, tmp_path):
+        _write_credentials(tmp_path)
+        self._run_gkinstall(tmp_path)
+
+        _write_credentials(tmp_path, user="1002")
+        result = self._run_onboarding(tmp_path)
+
+        assert "Access token successfully saved" in result.stdout
+        assert _calls(tmp_path) == 2
+
+    def test_cleanup_removes_cache(self, tmp_path):
+        _write_credentials(tmp_path)
+        self._run_gkinstall(tmp_path)
+        cleanup = _section(self.gkinstall, "cleanup_installation() {", "\n# Stop on first error")
+
+        env = {k: v for k, v in os.environ.items() if k != "GK_BUNDLE_DIR"}
+        result = subprocess.run(["bash", "-c", f'log_file="none.log"\n{cleanup}\ncleanup_installation done'],
+                                capture_output=True, text=True, timeout=30, cwd=tmp_path, env=env)
+
+        assert result.returncode == 0, result.stderr
+        assert not (tmp_path / "helper" / "tokens" / "access_token.txt").exists()
+        assert not (tmp_path / "helper" / "tokens" / "token_cache.txt").exists()
+
+
+class TestPowerShellTokenCache:
+    """Run Get-CachedAccessToken/Save-CachedAccessToken from GKInstall.ps1"""
+
+    @pytest.fixture(autouse=True)
+    def _functions(self, read_template, run_powershell):
+        self.functions = _powershell_cache_functions(read_template("GKInstall.ps1.template"))
+        self.run_powershell = run_powershell
+
+    def _run(self, tmp_path, commands):
+        return self.run_powershell(self.functions + commands, cwd=tmp_path)
+
+    def test_put_then_get(self, tmp_path):
+        result = self._run(tmp_path, (
+            'Save-CachedAccessToken -TokensPath . -BaseUrl host -TenantId 001 -User user -AccessToken tok123 -ExpiresIn 600\n'
+            'Write-Output "TOKEN=$(Get-CachedAccessToken -TokensPath . -BaseUrl host -TenantId 001 -User user)"\n'
+        ))
+        assert "TOKEN=tok123" in result.stdout, result.stdout + result.stderr
+        assert (tmp_path / "access_token.txt").read_text() == "tok123"
+        assert not list(tmp_path.glob(".token_cache.*"))
+
+    @pytest.mark.parametrize("args", ["-BaseUrl other -TenantId 001 -User user",
+                                      "-BaseUrl host -TenantId 002 -User user",
+                                      "-BaseUrl host -TenantId 001 -User someone"])
+    def test_mismatch_misses(self, tmp_path, args):
+        result = self._run(tmp_path, (
+            'Save-CachedAccessToken -TokensPath . -BaseUrl host -TenantId 001 -User user -AccessToken tok123 -ExpiresIn 600\n'
+            f'Write-Output "TOKEN=$(Get-CachedAccessToken -TokensPath . {args})"\n'
+        ))
+        assert "TOKEN=\n" in result.stdout
+
+    def test_lifetime_capped(self, tmp_path):
+        result = self._run(tmp_path, (
+            '$now = [DateTimeOffset]::UtcNow.ToUnixTimeSeconds()\n'
+            'Save-CachedAccessToken -TokensPath . -BaseUrl host -TenantId 001 -User user -AccessToken tok123 -ExpiresIn 86400\n'
+            '$expires = ((Get-Content token_cache.txt | Where-Object { $_ -like "expires_at=*" }) -split "=")[1]\n'
+            'Write-Output "LIFETIME=$([long]$expires - $now)"\n'
+        ))
+        lifetime = int(result.stdout.split("LIFETIME=")[1].split()[0])
+        assert 0 < lifetime <= 901
+
+
+class TestPowerShellTokenReuse:
+    """GKInstall.ps1 caches the token it requests and onboarding.ps1 reuses it"""
+
+    @pytest.fixture(autouse=True)
+    def _templates(self, read_template, run_powershell):
+        self.gkinstall = read_template("GKInstall.ps1.template")
+        self.onboarding = read_template("onboarding.ps1.template")
+        self.run_powershell = run_powershell
+
+    def _rest_stub(self, root):
+        return (
+            "function Invoke-RestMethod {\n"
+            f'    Add-Content -Path "{root / "token_requests.txt"}" -Value "$args"\n'
+            f"    return ('{TOKEN_RESPONSE}' | ConvertFrom-Json)\n"
+            "}\n"
+        )
+
+    def _run_gkinstall(self, root):
+        section = _section(self.gkinstall, '        $tokensPath = Join-Path $PSScriptRoot "helper\\tokens"',
+                           "    } catch {\n        Write-Host \"Warning: Failed to get fresh OAuth token")
+        script = (
+            self._rest_stub(root)
+            + _powershell_cache_functions(self.gkinstall)
+            + '$base_url = "test.example.com"\n$tenantId = "001"\n'
+            + section
+        )
+        return self.run_powershell(script, cwd=root)
+
+    def _run_onboarding(self, root):
+        prefix = self.onboarding[:self.onboarding.index("    # Second API call using the token")]
+        prefix = prefix.replace("# API endpoint\n", self._rest_stub(root) + "# API endpoint\n", 1)
+        prefix = prefix.replace('[string]$base_url = "test.cse.cloud4retail.co"', '[string]$base_url = "test.example.com"')
+        return self.run_powershell(prefix + '} catch {\n    Write-Host "ERROR: $_"\n}\n', cwd=root)
+
+    def test_onboarding_reuses_gkinstall_token(self, tmp_path):
+        _write_credentials(tmp_path)
+
+        result = self._run_gkinstall(tmp_path)
+        assert "OAuth token obtained and saved successfully" in result.stdout, result.stdout + result.stderr
+        result = self._run_onboarding(tmp_path)
+
+        assert "Reusing cached OAuth2 access token" in result.stdout, result.stdout + result.stderr
+        assert _calls(tmp_path) == 1
+        assert (tmp_path / "helper" / "tokens" / "access_token.txt").read_text() == "tok-gk"
+
+    def test_gkinstall_reuses_cached_token(self, tmp_path):
+        _write_credentials(tmp_path)
+
+        self._run_gkinstall(tmp_path)
+        result = self._run_gkinstall(tmp_path)
+
+        assert "Reusing cached OAuth token" in result.stdout
+        assert _calls(tmp_path) == 1
@@ -0,0 +1,202 @@
+"""
+Unit tests for the OAuth token manager.
+
+Tests token caching with expiry, proactive refresh, single-flight refresh
+for concurrent 401s and its use by the DSG REST browser.
+"""
+
+import threading
+import time
+import pytest
+import requests
+from unittest.mock import MagicMock, patch
+from gk_install_builder.integrations.token_manager import (
+    TokenManager,
+    get_token_manager,
+    request_oauth_token,
+)
+from gk_install_builder.generator import DSGRestBrowser
+from gk_install_builder.generators.offline_package_helpers import _get_with_token_refresh
+
+
+def _manager(requester, **kwargs):
+    return TokenManager("test.example.com", "001", "basic", "user", "pw", token_requester=requester, **kwargs)
+
+
+def _counting_requester(expires_in=3600, delay=0):
+    calls = []
+
+    def requester(base_url, tenant_id, basic, username, password):
+        calls.append(tenant_id)
+        if delay:
+            time.sleep(delay)
+        return f"token-{len(calls)}", expires_in
+
+    return requester, calls
+
+
+def _http_error(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(response=response)
+
+
+def _raise(error):
+    """Response whose raise_for_status raises the given error."""
+    response = MagicMock()
+    response.raise_for_status.side_effect = error
+    return response
+
+
+class TestTokenManager:
+    """Tests for TokenManager caching and refresh."""
+
+    def test_token_is_cached_until_expiry(self):
+        requester, calls = _counting_requester()
+        manager = _manager(requester)
+
+        assert manager.get_token() == "token-1"
+        assert manager.get_token() == "token-1"
+        assert len(calls) == 1
+
+    def test_refreshes_proactively_within_margin(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        requester, calls = _counting_requester(expires_in=300)
+        manager = _manager(requester, refresh_margin=60)
+
+        manager.get_token()
+        now[0] += 230
+        assert manager.get_token() == "token-1"
+        now[0] += 15
+        assert manager.get_token() == "token-2"
+        assert len(calls) == 2
+
+    def test_short_lifetime_caps_margin(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        requester, calls = _counting_requester(expires_in=30)
+        manager = _manager(requester, refresh_margin=60)
+
+        manager.get_token()
+        now[0] += 20
+        assert manager.get_token() == "token-1"
+        now[0] += 5
+        assert manager.get_token() == "token-2"
+        assert len(calls) == 2
+
+    def test_concurrent_401_refreshes_once(self):
+        requester, calls = _counting_requester(delay=0.05)
+        manager = _manager(requester)
+        manager.set_token("expired")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.refresh("expired"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["token-1"] * 8
+
+    def test_failed_refresh_returns_none_to_waiters(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def requester(base_url, tenant_id, basic, username, password):
+            started.set()
+            release.wait(5)
+            return None, None
+
+        manager = _manager(requester)
+        manager.set_token("expired")
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(manager.refresh("expired")))
+        leader.start()
+        started.wait(5)
+        waiters = [threading.Thread(target=lambda: results.append(manager.refresh("expired"))) for _ in range(4)]
+        for thread in waiters:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader] + waiters:
+            thread.join()
+
+        # Nobody gets the stale token back
+        assert results == [None] * 5
+
+    def test_late_401_reuses_already_refreshed_token(self):
+        requester, calls = _counting_requester()
+        manager = _manager(requester)
+        manager.set_token("expired")
+
+        assert manager.refresh("expired") == "token-1"
+        assert manager.refresh("expired") == "token-1"
+        assert len(calls) == 1
+
+    def test_missing_credentials(self):
+        requester = MagicMock()
+        manager = TokenManager("h", "001", "", "user", "pw", token_requester=requester)
+
+        assert manager.get_token() is None
+        requester.assert_not_called()
+
+    def test_listener_called_after_refresh(self):
+        requester, _ = _counting_requester()
+        manager = _manager(requester)
+        listener = MagicMock()
+        manager.add_listener(listener)
+
+        manager.get_token()
+        listener.assert_called_once_with("token-1")
+
+    def test_registry_per_tenant_and_credentials(self):
+        config = {"tenant_id": "001", "launchpad_oauth2": "a", "eh_launchpad_username": "u", "eh_launchpad_password": "p"}
+
+        first = get_token_manager("registry.example.com", config)
+        assert get_token_manager("registry.example.com", dict(config)) is first
+        assert get_token_manager("registry.example.com", dict(config, tenant_id="002")) is not first
+        assert get_token_manager("registry.example.com", dict(config, eh_launchpad_password="x")) is not first
+
+    def test_request_reads_expires_in(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = {"access_token": "abc", "expires_in": 1800}
+        with patch("requests.post", return_value=response) as post:
+            assert request_oauth_token("h", "001", "basic", "user", "pw") == ("abc", 1800)
+        assert post.call_args[0][0] == "https://h/auth-service/tenants/001/oauth/token"
+
+
+class TestDSGBrowserTokenRefresh:
+    """Tests for 401 handling in the DSG REST browser and download workers."""
+
+    def test_handle_api_request_retries_with_refreshed_token(self):
+        browser = DSGRestBrowser("test.example.com", bearer_token="old")
+        browser.token_manager = MagicMock()
+        browser.token_manager.current_token.return_value = None
+        browser.token_manager.refresh.return_value = "new"
+
+        ok = MagicMock()
+        request_func = MagicMock(side_effect=[_raise(_http_error(401)), ok])
+        assert browser._handle_api_request(request_func) is ok
+        browser.token_manager.refresh.assert_called_once_with("old")
+        assert browser.bearer_token == "new"
+
+    def test_handle_api_request_without_manager_raises(self):
+        browser = DSGRestBrowser("test.example.com", bearer_token="old")
+        with pytest.raises(requests.exceptions.HTTPError):
+            browser._handle_api_request(MagicMock(side_effect=[_raise(_http_error(401))]))
+
+    def test_download_get_retries_after_401(self):
+        browser = DSGRestBrowser("test.example.com", bearer_token="old")
+        browser.token_manager = MagicMock()
+        browser.token_manager.current_token.return_value = None
+        browser.token_manager.refresh.return_value = "new"
+        session = MagicMock()
+        session.get.side_effect = [MagicMock(status_code=401), MagicMock(status_code=200)]
+
+        response = _get_with_token_refresh(session, "https://x/file", browser)
+
+        assert response.status_code == 200
+        assert session.get.call_args_list[1][1]["headers"]["Authorization"] == "Bearer new"
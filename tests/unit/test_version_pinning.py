@@ -0,0 +1,157 @@
+"""
+Unit tests for build-time version pinning.
+
+Tests the pinned versions manifest and the generator hook that embeds it
+into the package.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+from unittest.mock import patch
+from gk_install_builder.generators.version_manifest import (
+    build_version_manifest,
+    compute_versions_digest,
+    PINNED_VERSIONS_DIR,
+    PINNED_VERSIONS_FILENAME,
+)
+from gk_install_builder.generator import ProjectGenerator
+
+
+
+def _write_manifest(root, tenant_id="001", tamper=False):
+    text = build_version_manifest({"POS": {"value": "v5.27.1", "source": "FP (Modified)"}},
+                                  {"base_url": "test.example.com", "tenant_id": tenant_id}, "FP")
+    if tamper:
+        text = text.replace("POS=v5.27.1", "POS=v9.9.9")
+    (root / PINNED_VERSIONS_DIR).mkdir(parents=True)
+    (root / PINNED_VERSIONS_DIR / PINNED_VERSIONS_FILENAME).write_text(text)
+
+
+def _block(content, start_marker, end_marker):
+    start = content.index(start_marker)
+    return content[start:content.index(end_marker, start)]
+
+
+class TestVersionManifest:
+    """Tests for the pinned versions manifest."""
+
+    def test_manifest_content_and_digest(self):
+        versions = {"POS": {"value": "v5.27.1", "source": "FP (Modified)"},
+                    "WDM": {"value": None, "source": None}}
+        text = build_version_manifest(versions, {"base_url": "test.example.com", "tenant_id": "002"}, "FP")
+        lines = text.splitlines()
+
+        assert "POS=v5.27.1" in lines
+        assert not any(line.startswith("WDM=") for line in lines)
+        assert "#tenant_id=002" in lines
+        assert f"#sha256={compute_versions_digest(['POS=v5.27.1'])}" in lines
+
+    def test_nothing_resolved(self):
+        assert build_version_manifest({"POS": {"value": None}}, {}, "FP") is None
+
+
+class TestGeneratorPinning:
+    """Tests for ProjectGenerator._pin_component_versions()."""
+
+    def _config(self, **overrides):
+        config = {"base_url": "test.example.com", "tenant_id": "001",
+                  "use_default_versions": True, "pin_versions_at_build": True}
+        config.update(overrides)
+        return config
+
+    def test_writes_manifest(self, tmp_path):
+        generator = ProjectGenerator()
+        resolved = {"POS": {"value": "v5.27.1", "source": "FP (Modified)"}}
+
+        with patch("gk_install_builder.generator.resolve_component_versions", return_value=resolved):
+            path = generator._pin_component_versions(str(tmp_path), self._config())
+
+        assert path == os.path.join(str(tmp_path), PINNED_VERSIONS_DIR, PINNED_VERSIONS_FILENAME)
+        assert "POS=v5.27.1" in open(path).read()
+
+    @pytest.mark.parametrize("overrides", [{"pin_versions_at_build": False}, {"use_default_versions": False}])
+    def test_disabled_removes_stale_manifest(self, tmp_path, overrides):
+        stale = tmp_path / PINNED_VERSIONS_DIR / PINNED_VERSIONS_FILENAME
+        stale.parent.mkdir(parents=True)
+        stale.write_text("POS=v1\n")
+
+        with patch("gk_install_builder.generator.resolve_component_versions") as resolve:
+            assert ProjectGenerator()._pin_component_versions(str(tmp_path), self._config(**overrides)) is None
+
+        resolve.assert_not_called()
+        assert not stale.exists()
+
+    def test_resolution_failure_writes_nothing(self, tmp_path):
+        with patch("gk_install_builder.generator.resolve_component_versions", return_value=None):
+            assert ProjectGenerator()._pin_component_versions(str(tmp_path), self._config()) is None
+        assert not (tmp_path / PINNED_VERSIONS_DIR / PINNED_VERSIONS_FILENAME).exists()
+
+
+@pytest.mark.skipif(
+    sys.platform.startswith("win") or not all(shutil.which(tool) for tool in ("bash", "sha256sum")),
+    reason="requires bash and sha256sum"
+)
+class TestBashPinnedVersions:
+    """Run the version selection of GKInstall.sh with a pinned versions manifest"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template):
+        content = read_template("GKInstall.sh.template")
+        self.script = (
+            _block(content, "# Function to read a version pinned at build time", "\n# =====")
+            + 'COMPONENT_TYPE="POS"\ntenant_id="001"\nbase_url="test.example.com"\nuse_default_versions=true\n'
+            + _block(content, "# Versions pinned at build time take precedence over the version APIs",
+                     'elif [ "$use_default_versions" = true ]; then')
+            + 'else\n  component_version="from-api"\nfi\necho "VERSION=$component_version"\n'
+        )
+
+    def _version(self, root):
+        (root / "GKInstall.sh").write_text(self.script)
+        result = subprocess.run(["bash", str(root / "GKInstall.sh")], capture_output=True, text=True,
+                                timeout=30, cwd=root)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result.stdout.splitlines()[-1]
+
+    def test_pinned_version_used_before_api(self, tmp_path):
+        _write_manifest(tmp_path)
+        assert self._version(tmp_path) == "VERSION=v5.27.1"
+
+    def test_tampered_manifest_ignored(self, tmp_path):
+        _write_manifest(tmp_path, tamper=True)
+        assert self._version(tmp_path) == "VERSION=from-api"
+
+    def test_manifest_of_other_tenant_ignored(self, tmp_path):
+        _write_manifest(tmp_path, tenant_id="002")
+        assert self._version(tmp_path) == "VERSION=from-api"
+
+
+class TestPowerShellPinnedVersions:
+    """Run the version selection of GKInstall.ps1 with a pinned versions manifest"""
+
+    @pytest.fixture(autouse=True)
+    def _template(self, read_template, run_powershell):
+        content = read_template("GKInstall.ps1.template")
+        self.script = (
+            _block(content, "# Function to read a version pinned at build time", "\n# =====")
+            + '$ComponentType = "POS"\n$tenantId = "001"\n$base_url = "test.example.com"\n$UseDefaultVersions = $true\n'
+            + _block(content, "# Versions pinned at build time take precedence over the version APIs",
+                     "} elseif ($UseDefaultVersions) {")
+            + '} else {\n    $component_version = "from-api"\n}\nWrite-Host "VERSION=$component_version"\n'
+        )
+        self.run_powershell = run_powershell
+
+    def _version(self, root):
+        result = self.run_powershell(self.script, cwd=root)
+        assert result.returncode == 0, result.stdout + result.stderr
+        return result.stdout.splitlines()[-1]
+
+    def test_pinned_version_used_before_api(self, tmp_path):
+        _write_manifest(tmp_path)
+        assert self._version(tmp_path) == "VERSION=v5.27.1"
+
+    def test_tampered_manifest_ignored(self, tmp_path):
+        _write_manifest(tmp_path, tamper=True)
+        assert self._version(tmp_path) == "VERSION=from-api"
@@ -0,0 +1,171 @@
+"""
+Unit tests for the component version resolver.
+
+Tests single-pass FP/FPD property mapping, concurrent Config-Service
+resolution and the cached VersionResolutionService.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from gk_install_builder.integrations.version_resolver import (
+    parse_function_pack_properties,
+    fetch_function_pack_versions,
+    fetch_config_service_versions,
+    generate_api_token,
+    normalize_version_source,
+    VersionResolutionService,
+    COMPONENT_PROPERTY_IDS,
+)
+
+
+def _response(status_code, payload):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = payload
+    return response
+
+
+def _get_by_url(responses):
+    """requests.get side effect answering by URL, independent of call order."""
+    def get(url, **kwargs):
+        for fragment, response in responses.items():
+            if fragment in url:
+                return response
+        return _response(404, None)
+    return get
+
+
+def _config(**overrides):
+    config = {"base_url": "test.example.com", "tenant_id": "001", "api_version": "new",
+              "default_version_source": "FP"}
+    config.update(overrides)
+    return config
+
+
+class TestFunctionPackResolution:
+    """Tests for FP/FPD property mapping."""
+
+    def test_preferred_property_wins(self):
+        versions = {component: {"value": None, "source": None} for component in COMPONENT_PROPERTY_IDS}
+        parse_function_pack_properties([
+            {"propertyId": "POSClient_Version", "value": "v5.26.0"},
+            {"propertyId": "POSClient_Update_Version", "value": "v5.27.1"},
+            {"propertyId": "WDM_Update_Version", "value": "v5.25.0"},
+            {"propertyId": "Unrelated_Property", "value": "x"},
+        ], versions, "FP (Modified)")
+
+        assert versions["POS"] == {"value": "v5.27.1", "source": "FP (Modified)"}
+        assert versions["WDM"]["value"] == "v5.25.0"
+        assert versions["LPA-SERVICE"]["value"] is None
+
+    def test_fpd_only_fills_missing_components(self):
+        fp = [{"propertyId": "WDM_Version", "value": "v5.27.0"}]
+        fpd = [{"propertyId": "WDM_Version", "value": "v5.20.0"},
+               {"propertyId": "LPA_Version", "value": "v5.26.0"}]
+
+        with patch("requests.get", side_effect=_get_by_url({"scope=FP&": _response(200, fp),
+                                                            "scope=FPD&": _response(200, fpd)})):
+            versions = fetch_function_pack_versions("test.example.com", "token", "001", "legacy")
+
+        assert versions["WDM"] == {"value": "v5.27.0", "source": "FP (Modified)"}
+        assert versions["LPA-SERVICE"] == {"value": "v5.26.0", "source": "FPD (Default)"}
+
+    def test_new_api_falls_back_to_legacy_url(self):
+        with patch("requests.get", side_effect=_get_by_url({"/employee-hub-service/services/rest/v1/properties?scope=FP&":
+                                                            _response(200, [{"propertyId": "RCS_Version", "value": "v1"}])})) as get:
+            versions = fetch_function_pack_versions("test.example.com", "token")
+
+        urls = [c[0][0] for c in get.call_args_list]
+        assert any(url.startswith("https://test.example.com/api/employee-hub-service") for url in urls)
+        assert versions["RCS-SERVICE"]["value"] == "v1"
+
+
+class TestConfigServiceResolution:
+    """Tests for Config-Service resolution."""
+
+    def test_picks_highest_version_per_component(self):
+        def post(url, json=None, **kwargs):
+            lists = {"CSE-wdm": ["v5.9.0", "v5.27.0", "v5.26.3"], "CSE-lps-lpa": []}
+            return _response(200, {"versionNameList": lists[json["systemName"]]})
+
+        with patch("requests.post", side_effect=post) as mock_post:
+            versions = fetch_config_service_versions("test.example.com", "token",
+                                                     {"WDM": "CSE-wdm", "LPA-SERVICE": "CSE-lps-lpa"})
+
+        assert list(versions) == ["WDM", "LPA-SERVICE"]
+        assert versions["WDM"]["value"] == "v5.27.0"
+        assert versions["WDM"]["source"] == "Config-Service"
+        assert versions["LPA-SERVICE"]["value"] is None
+        assert mock_post.call_count == 2
+
+    def test_failed_component_does_not_fail_others(self):
+        def post(url, json=None, **kwargs):
+            if json["systemName"] == "bad":
+                raise ConnectionError("reset")
+            return _response(200, {"versionNameList": ["v1.0.0"]})
+
+        with patch("requests.post", side_effect=post):
+            versions = fetch_config_service_versions("h", "t", {"POS": "bad", "WDM": "good"})
+
+        assert versions["POS"]["value"] is None
+        assert versions["WDM"]["value"] == "v1.0.0"
+
+
+class TestVersionResolutionService:
+    """Tests for caching in VersionResolutionService."""
+
+    def _service(self, ttl=300):
+        token_provider = MagicMock(return_value="token")
+        return VersionResolutionService(ttl=ttl, token_provider=token_provider), token_provider
+
+    def test_second_resolve_uses_cache(self):
+        service, token_provider = self._service()
+        with patch("gk_install_builder.integrations.version_resolver.fetch_function_pack_versions",
+                   return_value={"POS": {"value": "v1", "source": "FP (Modified)"}}) as fetch:
+            first = service.resolve(_config())
+            second = service.resolve(_config())
+
+        assert first is second
+        assert fetch.call_count == 1
+        assert token_provider.call_count == 1
+        assert service.cached_age(_config()) is not None
+
+    def test_cache_is_per_tenant_and_scope(self):
+        service, _ = self._service()
+        with patch("gk_install_builder.integrations.version_resolver.fetch_function_pack_versions", return_value={}) as fp, \
+             patch("gk_install_builder.integrations.version_resolver.fetch_config_service_versions", return_value={}) as cs:
+            service.resolve(_config())
+            service.resolve(_config(tenant_id="002"))
+            service.resolve(_config(default_version_source="CONFIG-SERVICE"))
+
+        assert fp.call_count == 2
+        assert cs.call_count == 1
+
+    @pytest.mark.parametrize("refresh_action", ["refresh", "invalidate", "expired"])
+    def test_refresh_invalidate_and_ttl(self, refresh_action):
+        service, _ = self._service(ttl=0 if refresh_action == "expired" else 300)
+        with patch("gk_install_builder.integrations.version_resolver.fetch_function_pack_versions", return_value={}) as fetch:
+            service.resolve(_config())
+            if refresh_action == "invalidate":
+                service.invalidate(tenant_id="001")
+            service.resolve(_config(), refresh=refresh_action == "refresh")
+
+        assert fetch.call_count == 2
+
+    def test_no_token_is_not_cached(self):
+        service = VersionResolutionService(token_provider=MagicMock(return_value=None))
+        assert service.resolve(_config()) is None
+        assert service.cached_age(_config()) is None
+
+
+class TestHelpers:
+    """Tests for token and source helpers."""
+
+    def test_token_requires_credentials(self):
+        with patch("requests.post") as post:
+            assert generate_api_token("test.example.com", {"launchpad_oauth2": "x"}) is None
+        post.assert_not_called()
+
+    def test_normalize_version_source(self):
+        assert normalize_version_source("CONFIG-SERVICE") == "CONFIG"
+        assert normalize_version_source("FP") == "FP"
@@ -11,7 +11,8 @@ from gk_install_builder.utils.version_sorting import (
     sort_versions,
     get_latest_version,
     compare_versions,
-    is_prerelease
+    is_prerelease,
+    VersionIndex
 )
 
 
@@ -364,3 +365,52 @@ class TestComplexScenarios:
         assert len(target_versions) == 4  # 5.30, 5.27, 5.26.1, 5.26.0
         assert "v5.24.0" not in target_versions
         assert "v5.25.0" not in target_versions
+
+
+class TestVersionIndex:
+    """Test VersionIndex queries on a list parsed once."""
+
+    VERSIONS = ["v5.26.1", "v5.27.0-RC1", "invalid", "v5.26.0", "5.25.3", "v5.27.0-SNAPSHOT", "v6.0.0-beta"]
+
+    def test_sorted_matches_sort_versions(self):
+        index = VersionIndex(self.VERSIONS)
+        assert index.sorted() == sort_versions(self.VERSIONS)
+        assert index.sorted(descending=False) == sort_versions(self.VERSIONS, descending=False)
+        assert len(index) == len(self.VERSIONS)
+
+    def test_latest_and_latest_stable(self):
+        index = VersionIndex(self.VERSIONS)
+        assert index.latest() == get_latest_version(self.VERSIONS) == "v6.0.0-beta"
+        assert index.latest_stable() == "v5.26.1"
+        assert VersionIndex(["invalid"]).latest() is None
+        assert VersionIndex([]).latest_stable() is None
+
+    def test_in_range(self):
+        index = VersionIndex(self.VERSIONS)
+        assert index.in_range("5.26.0", "v5.26.1") == ["v5.26.1", "v5.26.0"]
+        assert index.in_range(minimum="5.27.0-RC1", descending=False) == ["v5.27.0-RC1", "v6.0.0-beta"]
+        assert index.in_range("bogus") == []
+
+    def test_with_prefix_includes_prereleases(self):
+        index = VersionIndex(self.VERSIONS)
+        assert index.with_prefix("5.27") == ["v5.27.0-RC1", "v5.27.0-SNAPSHOT"]
+        assert index.with_prefix("v5", descending=False) == ["5.25.3", "v5.26.0", "v5.26.1",
+                                                             "v5.27.0-SNAPSHOT", "v5.27.0-RC1"]
+        assert index.with_prefix("5.x") == []
+
+    def test_parsing_is_memoized(self):
+        from gk_install_builder.utils.version_sorting import _parse_version_cached
+        _parse_version_cached.cache_clear()
+        sort_versions(["v9.1.0", "v9.0.0"])
+        get_latest_version(["v9.1.0", "v9.0.0"])
+        compare_versions("v9.1.0", "v9.0.0")
+        assert _parse_version_cached.cache_info().misses == 2
+
+
+class TestSortVersionDirs:
+    """Test natural version ordering of DSG version folders."""
+
+    def test_versions_before_other_names(self):
+        from gk_install_builder.generators.offline_package_helpers import sort_version_dirs
+        dirs = [{"name": "5.9.0"}, {"name": "latest"}, {"name": "5.10.0"}, {"name": "5.10.0-RC1"}]
+        assert [d["name"] for d in sort_version_dirs(dirs)] == ["5.10.0", "5.10.0-RC1", "5.9.0", "latest"]